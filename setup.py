@@ -148,9 +148,12 @@ exts = dict(
     _stl={'source': 'statsmodels/tsa/_stl.pyx'},
     _exponential_smoothers={'source': 'statsmodels/tsa/_exponential_smoothers.pyx'},  # noqa: E501
     _innovations={'source': 'statsmodels/tsa/_innovations.pyx'},
+    _arma_process={'source': 'statsmodels/tsa/_arma_process.pyx'},
     _hamilton_filter={'source': 'statsmodels/tsa/regime_switching/_hamilton_filter.pyx.in'},  # noqa: E501
     _kim_smoother={'source': 'statsmodels/tsa/regime_switching/_kim_smoother.pyx.in'},  # noqa: E501
     _arma_innovations={'source': 'statsmodels/tsa/innovations/_arma_innovations.pyx.in'},  # noqa: E501
+    _var_simulation={'source': 'statsmodels/tsa/vector_ar/_var_simulation.pyx'},  # noqa: E501
+    _recursive_ls={'source': 'statsmodels/regression/_recursive_ls.pyx'},
     linbin={'source': 'statsmodels/nonparametric/linbin.pyx'},
     _smoothers_lowess={'source': 'statsmodels/nonparametric/_smoothers_lowess.pyx'},  # noqa: E501
     kalman_loglike={'source': 'statsmodels/tsa/kalmanf/kalman_loglike.pyx',
@@ -1306,6 +1306,38 @@ class Poisson(CountModel):
         L = np.exp(np.dot(X,params) + exposure + offset)
         return L
 
+    def _deriv_mean_dparams(self, params):
+        """
+        Derivative of the expected endog with respect to the parameters.
+
+        Parameters
+        ----------
+        params : ndarray
+            parameter at which score is evaluated
+
+        Returns
+        -------
+        The value of the derivative of the expected endog with respect
+        to the parameter vector.
+        """
+        return self.predict(params)[:, None] * self.exog
+
+    def _deriv_score_obs_dendog(self, params):
+        """derivative of score_obs w.r.t. endog
+
+        Parameters
+        ----------
+        params : ndarray
+            parameter at which score is evaluated
+
+        Returns
+        -------
+        derivative : ndarray_2d
+            The derivative of the score_obs with respect to endog, which is
+            exog for the Poisson model.
+        """
+        return self.exog
+
 
 class GeneralizedPoisson(CountModel):
     __doc__ = """
@@ -1905,6 +1937,85 @@ class Logit(BinaryModel):
         L = self.cdf(np.dot(X,params))
         return -np.dot(L*(1-L)*X.T,X)
 
+    def score_factor(self, params):
+        """
+        Logit model score_factor for each observation
+
+        Parameters
+        ----------
+        params : array_like
+            The parameters of the model
+
+        Returns
+        -------
+        score : ndarray, (nobs,)
+            The score factor, derivative of the loglikelihood function with
+            respect to the linear predictor evaluated at `params`
+
+        Notes
+        -----
+        .. math:: \\frac{\\partial\\ln L_{i}}{\\partial\\beta}=\\left(y_{i}-\\Lambda_{i}\\right)
+
+        for observations :math:`i=1,...,n`
+        """
+        L = self.cdf(np.dot(self.exog, params))
+        return self.endog - L
+
+    def hessian_factor(self, params):
+        """
+        Logit model Hessian factor
+
+        Parameters
+        ----------
+        params : array_like
+            The parameters of the model
+
+        Returns
+        -------
+        hess : ndarray, (nobs,)
+            The Hessian factor, negative of the second derivative of the
+            loglikelihood function with respect to the linear predictor
+            evaluated at `params`
+
+        Notes
+        -----
+        .. math:: \\Lambda_{i}\\left(1-\\Lambda_{i}\\right)
+        """
+        L = self.cdf(np.dot(self.exog, params))
+        return L * (1 - L)
+
+    def _deriv_mean_dparams(self, params):
+        """
+        Derivative of the expected endog with respect to the parameters.
+
+        Parameters
+        ----------
+        params : ndarray
+            parameter at which score is evaluated
+
+        Returns
+        -------
+        The value of the derivative of the expected endog with respect
+        to the parameter vector.
+        """
+        return self.hessian_factor(params)[:, None] * self.exog
+
+    def _deriv_score_obs_dendog(self, params):
+        """derivative of score_obs w.r.t. endog
+
+        Parameters
+        ----------
+        params : ndarray
+            parameter at which score is evaluated
+
+        Returns
+        -------
+        derivative : ndarray_2d
+            The derivative of the score_obs with respect to endog, which is
+            exog for the Logit model.
+        """
+        return self.exog
+
     @Appender(DiscreteModel.fit.__doc__)
     def fit(self, start_params=None, method='newton', maxiter=35,
             full_output=1, disp=1, callback=None, **kwargs):
@@ -3869,6 +3980,30 @@ class PoissonResults(CountResults):
         p = self.predict()  # fittedvalues is still linear
         return (self.model.endog - p)/np.sqrt(p)
 
+    def get_influence(self, n_jobs=1):
+        """
+        Get an instance of MLEInfluence with influence and outlier measures
+
+        Parameters
+        ----------
+        n_jobs : int, optional
+            Number of jobs used to reestimate the model without each
+            observation if the exact leave-one-observation-out results are
+            requested. Default is 1.
+
+        Returns
+        -------
+        infl : MLEInfluence instance
+            The instance has methods to calculate the main influence and
+            outlier measures as attributes.
+
+        See Also
+        --------
+        statsmodels.stats.outliers_influence.MLEInfluence
+        """
+        from statsmodels.stats.outliers_influence import MLEInfluence
+        return MLEInfluence(self, n_jobs=n_jobs)
+
 
 class L1PoissonResults(L1CountResults, PoissonResults):
     pass
@@ -4035,6 +4170,30 @@ class LogitResults(BinaryResults):
         # Generalized residuals
         return self.model.endog - self.predict()
 
+    def get_influence(self, n_jobs=1):
+        """
+        Get an instance of MLEInfluence with influence and outlier measures
+
+        Parameters
+        ----------
+        n_jobs : int, optional
+            Number of jobs used to reestimate the model without each
+            observation if the exact leave-one-observation-out results are
+            requested. Default is 1.
+
+        Returns
+        -------
+        infl : MLEInfluence instance
+            The instance has methods to calculate the main influence and
+            outlier measures as attributes.
+
+        See Also
+        --------
+        statsmodels.stats.outliers_influence.MLEInfluence
+        """
+        from statsmodels.stats.outliers_influence import MLEInfluence
+        return MLEInfluence(self, n_jobs=n_jobs)
+
 
 class ProbitResults(BinaryResults):
     __doc__ = _discrete_results_docs % {
@@ -0,0 +1,72 @@
+"""Timing of streaming decompositions versus refitting on all data
+
+Each new observation is decomposed by
+
+* refitting STL on all data received so far,
+* refitting STL on the sliding window only,
+* StreamingSTL with and without warm starts, and
+* StreamingSeasonalDecompose.
+"""
+import time
+
+import numpy as np
+
+from statsmodels.tsa.seasonal import (STL, StreamingSTL,
+                                      StreamingSeasonalDecompose)
+
+period = 24
+window = 7 * period
+nobs = 4000
+nhistory = 2000
+
+rs = np.random.RandomState(0)
+t = np.arange(nobs)
+y = (10 + np.sin(2 * np.pi * t / period) + 0.001 * t
+     + 0.3 * rs.standard_normal(nobs))
+
+
+def timer(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def full_refit():
+    for i in range(nhistory, nobs):
+        STL(y[:i + 1], period=period).fit()
+
+
+def window_refit():
+    for i in range(nhistory, nobs):
+        STL(y[i + 1 - window:i + 1], period=period).fit()
+
+
+def streaming(warm_start):
+    stream = StreamingSTL(period, window=window, warm_start=warm_start)
+    stream.update(y[:nhistory])
+
+    def run():
+        for value in y[nhistory:]:
+            stream.update(value)
+    return run
+
+
+def streaming_ma():
+    stream = StreamingSeasonalDecompose(period, window=window)
+    for value in y[:nhistory]:
+        stream.update(value)
+
+    def run():
+        for value in y[nhistory:]:
+            stream.update(value)
+    return run
+
+
+nupdates = nobs - nhistory
+print('Seconds per update, {0} updates, window {1}'.format(nupdates, window))
+for name, func in (('STL, refit on all data', full_refit),
+                   ('STL, refit on window', window_refit),
+                   ('StreamingSTL, cold start', streaming(False)),
+                   ('StreamingSTL, warm start', streaming(True)),
+                   ('StreamingSeasonalDecompose', streaming_ma())):
+    print('{0:<30s}{1:12.6f}'.format(name, timer(func) / nupdates))
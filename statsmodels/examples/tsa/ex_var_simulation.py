@@ -0,0 +1,75 @@
+"""Timing of VAR(p) simulation and lag matrix construction
+
+Compares, for a VAR with 20 equations and 12 lags,
+
+* simulating one long path with a Python loop and with varsim,
+* simulating many shorter paths at once with varsim, and
+* building the lagged endog matrix with a list comprehension and with
+  get_var_endog.
+"""
+import time
+
+import numpy as np
+
+from statsmodels.tsa.vector_ar import util
+
+neqs = 20
+nlags = 12
+nobs = 100000
+nsimulations = 100
+nobs_paths = 1000
+
+rs = np.random.RandomState(0)
+coefs = 0.5 / (neqs * nlags) * rs.standard_normal((nlags, neqs, neqs))
+intercept = rs.standard_normal(neqs)
+sig_u = np.eye(neqs)
+
+
+def timer(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def python_loop():
+    ugen = rs.multivariate_normal(np.zeros(neqs), sig_u, nobs)
+    result = np.zeros((nobs, neqs)) + intercept
+    result[nlags:] += ugen[nlags:]
+    for t in range(nlags, nobs):
+        ygen = result[t]
+        for j in range(nlags):
+            ygen += np.dot(coefs[j], result[t - j - 1])
+    return result
+
+
+def varsim():
+    return util.varsim(coefs, intercept, sig_u, steps=nobs)
+
+
+def varsim_paths():
+    return util.varsim(coefs, intercept, sig_u, steps=nobs_paths,
+                       nsimulations=nsimulations)
+
+
+y = varsim()
+
+
+def list_lags():
+    return np.array([y[t - nlags:t][::-1].ravel()
+                     for t in range(nlags, nobs)])
+
+
+def strided_lags():
+    return util.get_var_endog(y, nlags, trend='nc')
+
+
+print('neqs={0}, lags={1}, nobs={2}'.format(neqs, nlags, nobs))
+print('Seconds')
+for name, func in (('simulate, Python loop', python_loop),
+                   ('simulate, varsim', varsim),
+                   ('simulate {0}x{1}, varsim'.format(nsimulations,
+                                                       nobs_paths),
+                    varsim_paths),
+                   ('lag matrix, list', list_lags),
+                   ('lag matrix, get_var_endog', strided_lags)):
+    print('{0:<30s}{1:12.6f}'.format(name, timer(func)))
@@ -1708,7 +1708,7 @@ class GLMResults(base.LikelihoodModelResults):
         hd = (wexog * np.linalg.pinv(wexog).T).sum(1)
         return hd
 
-    def get_influence(self, observed=True):
+    def get_influence(self, observed=True, n_jobs=1):
         """
         Get an instance of GLMInfluence with influence and outlier measures
 
@@ -1718,6 +1718,10 @@ class GLMResults(base.LikelihoodModelResults):
             If true, then observed hessian is used in the hat matrix
             computation. If false, then the expected hessian is used.
             In the case of a canonical link function both are the same.
+        n_jobs : int, optional
+            Number of jobs used to reestimate the model without each
+            observation if the exact leave-one-observation-out results are
+            requested. Default is 1.
 
         Returns
         -------
@@ -1740,7 +1744,7 @@ class GLMResults(base.LikelihoodModelResults):
         hat_matrix_diag = self.get_hat_matrix_diag(observed=observed)
         infl = GLMInfluence(self, endog=wendog, exog=wexog,
                          resid=self.resid_pearson,
-                         hat_matrix_diag=hat_matrix_diag)
+                         hat_matrix_diag=hat_matrix_diag, n_jobs=n_jobs)
         return infl
 
     @Appender(base.LikelihoodModelResults.remove_data.__doc__)
@@ -0,0 +1,105 @@
+#cython: language_level=3, wraparound=False, cdivision=True, boundscheck=False
+"""
+Compiled recursive least squares updating
+
+License: BSD-3
+"""
+import numpy as np
+
+cimport scipy.linalg.cython_blas as blas
+
+
+def recursive_ols_update(double[:, ::1] exog, double[:, ::1] endog,
+                         double[:, ::1] xtxi, double[:, ::1] params,
+                         int start, double[:, ::1] resid,
+                         double[::1] varraw, double[:, :, ::1] params_path):
+    """
+    recursive_ols_update(exog, endog, xtxi, params, start, resid, varraw,
+                         params_path)
+
+    Recursive least squares for several response series with the same
+    regressors, starting at observation `start`.
+
+    Parameters
+    ----------
+    exog : ndarray
+        Regressors, shaped (nobs, k).
+    endog : ndarray
+        Response series in columns, shaped (nobs, m).
+    xtxi : ndarray
+        Inverse of X'X of the observations before `start`, shaped (k, k).
+        Updated in place, on exit only the lower triangle is valid.
+    params : ndarray
+        Estimates of the observations before `start`, shaped (k, m).
+        Updated in place to the estimates of all observations.
+    start : int
+        First observation that is added recursively.
+    resid : ndarray
+        Output array shaped (nobs, m). Rows `start`, ... are set to the
+        one-step-ahead prediction errors, i.e. the unscaled recursive
+        residuals.
+    varraw : ndarray
+        Output array shaped (nobs,). Elements `start`, ... are set to
+        1 + x_t' (X'X)^{-1} x_t, the variance factor of the prediction errors
+        where (X'X)^{-1} is based on the observations before t.
+    params_path : ndarray
+        Output array shaped (nobs, k, m) for the recursive estimates, or an
+        array with a zero first dimension if they are not needed.
+
+    Notes
+    -----
+    Each observation is a rank one update of the inverse of X'X, which does
+    not depend on endog, and of the estimates of all response series. A step
+    costs O(k**2 + k * m) operations with BLAS level 2 routines, and the loop
+    runs without the GIL.
+    """
+    cdef int nobs = exog.shape[0]
+    cdef int k = exog.shape[1]
+    cdef int m = endog.shape[1]
+    cdef int km = k * m
+    cdef int inc = 1
+    cdef int i
+    cdef double ft, alpha
+    cdef double one = 1.0
+    cdef double minus_one = -1.0
+    cdef double zero = 0.0
+    cdef bint store_params = params_path.shape[0] > 0
+    cdef double[::1] tmp = np.empty(k)
+
+    if endog.shape[0] != nobs or resid.shape[0] != nobs or \
+            varraw.shape[0] != nobs:
+        raise ValueError('exog, endog, resid and varraw must have the same '
+                         'number of observations')
+    if xtxi.shape[0] != k or xtxi.shape[1] != k or params.shape[0] != k or \
+            params.shape[1] != m or resid.shape[1] != m:
+        raise ValueError('shapes of xtxi, params or resid do not match')
+    if store_params and (params_path.shape[0] != nobs or
+                         params_path.shape[1] != k or
+                         params_path.shape[2] != m):
+        raise ValueError('params_path must be shaped (nobs, k, m)')
+    if k == 0 or m == 0:
+        return
+
+    # In Fortran order the C-contiguous params is its (m, k) transpose and
+    # the symmetric xtxi is unchanged
+    with nogil:
+        for i in range(start, nobs):
+            # prediction error with the previous estimates
+            blas.dcopy(&m, &endog[i, 0], &inc, &resid[i, 0], &inc)
+            blas.dgemv('N', &m, &k, &minus_one, &params[0, 0], &m,
+                       &exog[i, 0], &inc, &one, &resid[i, 0], &inc)
+
+            blas.dsymv('U', &k, &one, &xtxi[0, 0], &k, &exog[i, 0], &inc,
+                       &zero, &tmp[0], &inc)
+            ft = 1 + blas.ddot(&k, &exog[i, 0], &inc, &tmp[0], &inc)
+            varraw[i] = ft
+
+            # update inverse(X'X) and the estimates
+            alpha = -1 / ft
+            blas.dsyr('U', &k, &alpha, &tmp[0], &inc, &xtxi[0, 0], &k)
+            alpha = 1 / ft
+            blas.dger(&m, &k, &alpha, &resid[i, 0], &inc, &tmp[0], &inc,
+                      &params[0, 0], &m)
+            if store_params:
+                blas.dcopy(&km, &params[0, 0], &inc, &params_path[i, 0, 0],
+                           &inc)
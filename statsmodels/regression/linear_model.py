@@ -2294,7 +2294,8 @@ class RegressionResults(base.LikelihoodModelResults):
         - 'cluster' and required keyword `groups`, integer group indicator
 
             - `groups` array_like, integer (required) :
-                  index of clusters or groups
+                  index of clusters or groups, 1-dim or 2-dim with one
+                  column for each dimension of multiway clustering
             - `use_correction` bool (optional) :
                   If True the sandwich covariance is calculated with a small
                   sample correction.
@@ -2426,7 +2427,7 @@ class RegressionResults(base.LikelihoodModelResults):
                 self, nlags=maxlags, weights_func=weights_func,
                 use_correction=use_correction)
         elif cov_type.lower() == 'cluster':
-            # cluster robust standard errors, one- or two-way
+            # cluster robust standard errors, one- or multi-way
             groups = kwargs['groups']
             if not hasattr(groups, 'shape'):
                 groups = np.asarray(groups).T
@@ -2452,16 +2453,14 @@ class RegressionResults(base.LikelihoodModelResults):
                 if adjust_df:
                     # need to find number of groups
                     # duplicate work
-                    n_groups0 = len(np.unique(groups[:, 0]))
-                    n_groups1 = len(np.unique(groups[:, 1]))
-                    self.n_groups = (n_groups0, n_groups1)
-                    n_groups = min(n_groups0, n_groups1)  # use for adjust_df
-
-                # Note: sw.cov_cluster_2groups has 3 returns
-                res.cov_params_default = sw.cov_cluster_2groups(
-                    self, groups, use_correction=use_correction)[0]
+                    self.n_groups = tuple(len(np.unique(group))
+                                          for group in groups.T)
+                    n_groups = min(self.n_groups)  # use for adjust_df
+
+                res.cov_params_default = sw.cov_cluster_multiway(
+                    self, groups, use_correction=use_correction)
             else:
-                raise ValueError('only two groups are supported')
+                raise ValueError('groups needs to be 1- or 2-dimensional')
             res.cov_kwds['description'] = descriptions['cluster']
 
         elif cov_type.lower() == 'hac-panel':
@@ -10,8 +10,7 @@ import pytest
 import numpy as np
 from scipy import stats
 
-from numpy.testing import (assert_allclose, assert_equal, assert_warns,
-                           assert_raises)
+from numpy.testing import assert_allclose, assert_equal, assert_warns
 
 
 from statsmodels.regression.linear_model import OLS, WLS
@@ -428,11 +427,15 @@ class TestOLSRobustCluster2Input(CheckOLSRobustCluster, CheckOLSRobustNewMixin):
         self.rtol = 1e-6
         self.rtolh = 1e-10
 
-    def test_too_many_groups(self):
+    def test_3way_same_groups(self):
+        # inclusion-exclusion with identical groups gives one-way clustering
         long_groups = self.groups.reshape(-1, 1)
         groups3 = np.hstack((long_groups, long_groups, long_groups))
-        assert_raises(ValueError, self.res1.get_robustcov_results,'cluster',
-                      groups=groups3, use_correction=True, use_t=True)
+        res3 = self.res1.get_robustcov_results('cluster', groups=groups3,
+                                               use_correction=True, use_t=True)
+        res1 = self.res1.get_robustcov_results('cluster', groups=self.groups,
+                                               use_correction=True, use_t=True)
+        assert_allclose(res3.cov_params(), res1.cov_params(), rtol=1e-10)
 
     def test_2way_dataframe(self):
         import pandas as pd
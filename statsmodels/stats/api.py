@@ -27,7 +27,7 @@ from .stattools import durbin_watson, omni_normtest, jarque_bera
 
 from . import sandwich_covariance
 from .sandwich_covariance import (
-    cov_cluster, cov_cluster_2groups, cov_nw_panel,
+    cov_cluster, cov_cluster_2groups, cov_cluster_multiway, cov_nw_panel,
     cov_hac, cov_white_simple,
     cov_hc0, cov_hc1, cov_hc2, cov_hc3,
     se_cov
@@ -82,6 +82,7 @@ __all__ = ["acorr_lm", "acorr_breusch_godfrey", "acorr_ljungbox", "anova_lm", "b
            "multinomial_proportions_confint", "TTestPower", "TTestIndPower", "GofChisquarePower",
            "NormalIndPower", "FTestAnovaPower", "FTestPower", "tt_solve_power",
            "tt_ind_solve_power", "zt_ind_solve_power", "cov_cluster", "cov_cluster_2groups",
+           "cov_cluster_multiway",
            "cov_nw_panel", "cov_hac", "cov_white_simple", "cov_hc0", "cov_hc1", "cov_hc2",
            "cov_hc3", "se_cov", "CompareCox", "compare_cox", "CompareJ", "compare_j",
            "compare_encompassing", "HetGoldfeldQuandt", "het_goldfeldquandt", "het_breuschpagan",
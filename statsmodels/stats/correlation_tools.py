@@ -7,12 +7,18 @@ Author: Josef Perktold
 License: BSD-3
 """
 
+import os
+import tempfile
+import warnings
+
 import numpy as np
+from scipy import linalg
 import scipy.sparse as sparse
 from scipy.sparse.linalg import svds
 from scipy.optimize import fminbound
-import warnings
 
+from statsmodels.compat.scipy import SCIPY_GT_14
+from statsmodels.tools.parallel import parallel_func
 from statsmodels.tools.tools import Bunch
 from statsmodels.tools.sm_exceptions import (
     IterationLimitWarning, iteration_limit_doc)
@@ -25,7 +31,167 @@ def clip_evals(x, value=0):  # threshold=0, value=0):
     return x_new, clipped
 
 
-def corr_nearest(corr, threshold=1e-15, n_fact=100):
+def _smallest_eigenvalue(x):
+    """smallest eigenvalue of a symmetric matrix, without eigenvectors"""
+    k_vars = x.shape[0]
+    if SCIPY_GT_14:
+        kwds = dict(subset_by_index=[0, 0])
+    else:
+        kwds = dict(eigvals=(0, 0))
+    if k_vars < 50:
+        return np.linalg.eigvalsh(x)[0]
+    return linalg.eigh(x, eigvals_only=True, **kwds)[0]
+
+
+def _pcg(matvec, rhs, precond, tol, maxiter):
+    """preconditioned conjugate gradient for a positive definite system"""
+    x = np.zeros_like(rhs)
+    resid = rhs.copy()
+    tol = tol * np.linalg.norm(rhs)
+    z = resid / precond
+    direction = z.copy()
+    rz = resid.dot(z)
+    for _ in range(maxiter):
+        w = matvec(direction)
+        dw = direction.dot(w)
+        if dw <= 0:
+            break
+        step = rz / dw
+        x += step * direction
+        resid -= step * w
+        if np.linalg.norm(resid) <= tol:
+            break
+        z = resid / precond
+        rz, rz_old = resid.dot(z), rz
+        direction = z + rz / rz_old * direction
+    if not x.any():
+        # no progress, e.g. if the first direction has zero curvature
+        x = rhs / precond
+    return x
+
+
+class _PSDProjection(object):
+    """
+    Projection of a symmetric matrix on the positive semidefinite cone and
+    its generalized Jacobian, as used by the semismooth Newton method.
+    """
+
+    def __init__(self, mat):
+        evals, evecs = np.linalg.eigh(mat)
+        pos = evals > 0
+        self.evals = evals
+        self.pos_vecs = evecs[:, pos]
+        self.neg_vecs = evecs[:, ~pos]
+        lam_pos, lam_neg = evals[pos], evals[~pos]
+        # weights of the off-diagonal blocks of the Jacobian
+        self.omega = lam_pos[:, None] / (lam_pos[:, None] - lam_neg)
+
+    def diag(self):
+        """diagonal of the projected matrix"""
+        lam = self.evals[self.evals > 0]
+        return (self.pos_vecs ** 2).dot(lam)
+
+    def sumsq(self):
+        """squared Frobenius norm of the projected matrix"""
+        return (np.maximum(self.evals, 0) ** 2).sum()
+
+    def matrix(self):
+        """projected matrix"""
+        lam = self.evals[self.evals > 0]
+        return np.dot(self.pos_vecs * lam, self.pos_vecs.T)
+
+    def jac_diag(self, h):
+        """
+        diag(d Proj(mat)[diag(h)]), the Jacobian of diag(Proj(mat + diag(y)))
+
+        With P = [P_a, P_b], the eigenvectors of the positive and other
+        eigenvalues, the Jacobian is P (Omega * P' diag(h) P) P' where Omega
+        is one in the positive block, zero in the other block and omega in
+        the off-diagonal blocks. The smaller of the two blocks is used, so
+        that the cost is O(k**2 * min(k_a, k_b)).
+        """
+        pa, pb = self.pos_vecs, self.neg_vecs
+        if pa.shape[1] <= pb.shape[1]:
+            ha = (pa * h[:, None]).T
+            maa = ha.dot(pa)
+            mab = ha.dot(pb) * self.omega
+            return ((pa.dot(maa) * pa).sum(1) +
+                    2 * (pa.dot(mab) * pb).sum(1))
+        # complement, h - the Jacobian with one minus Omega
+        hb = (pb * h[:, None]).T
+        mbb = hb.dot(pb)
+        mab = hb.dot(pa).T * (1 - self.omega)
+        return h - ((pb.dot(mbb) * pb).sum(1) +
+                    2 * (pa.dot(mab) * pb).sum(1))
+
+    def jac_diag_precond(self):
+        """diagonal of the Jacobian as a map of h, for preconditioning"""
+        qa, qb = self.pos_vecs ** 2, self.neg_vecs ** 2
+        precond = qa.sum(1) ** 2 + 2 * (qa.dot(self.omega) * qb).sum(1)
+        return np.maximum(precond, 1e-8)
+
+
+def _corr_nearest_newton(corr, threshold, maxiter, tol=1e-11):
+    """
+    Nearest correlation matrix with the semismooth Newton method of Qi and
+    Sun (2006) applied to the dual problem.
+
+    The constraint that the smallest eigenvalue is at least threshold is
+    imposed by shifting, X = threshold * I + Z with Z positive semidefinite
+    and diag(Z) = 1 - threshold.
+
+    The iterations stop if the root mean square of the error in the diagonal
+    is below tol, or if it stalls at a small value because of the numerical
+    precision of the eigendecomposition.
+    """
+    k_vars = corr.shape[0]
+    g = (corr + corr.T) / 2.
+    g[np.diag_indices(k_vars)] -= threshold
+    b = np.full(k_vars, 1. - threshold)
+    # dual variables, the initial matrix has the required diagonal
+    y = b - np.diag(g)
+
+    def dual_objective(proj, y):
+        return proj.sumsq() / 2 - b.dot(y)
+
+    proj = _PSDProjection(g + np.diag(y))
+    fval = dual_objective(proj, y)
+    converged = False
+    norm_grad_old = np.inf
+    for _ in range(maxiter):
+        grad = proj.diag() - b
+        norm_grad = np.linalg.norm(grad) / np.sqrt(k_vars)
+        if norm_grad <= tol or (norm_grad < 1e-10 and
+                                norm_grad > norm_grad_old / 2):
+            converged = True
+            break
+        norm_grad_old = norm_grad
+
+        direction = _pcg(proj.jac_diag, -grad, proj.jac_diag_precond(),
+                         tol=min(1e-2, norm_grad), maxiter=200)
+        slope = grad.dot(direction)
+        # allow for rounding errors in the objective close to the optimum
+        fval_tol = 10 * np.finfo(np.float64).eps * max(1, abs(fval))
+        step = 1.
+        for _ in range(20):
+            y_new = y + step * direction
+            proj_new = _PSDProjection(g + np.diag(y_new))
+            fval_new = dual_objective(proj_new, y_new)
+            if fval_new <= fval + 1e-4 * step * slope + fval_tol:
+                break
+            step /= 2
+        y, proj, fval = y_new, proj_new, fval_new
+
+    if not converged:
+        warnings.warn(iteration_limit_doc, IterationLimitWarning)
+
+    # X = Z + threshold * I, where diag(Z) = 1 - threshold
+    x_new = proj.matrix()
+    x_new[np.diag_indices(k_vars)] = 1
+    return x_new
+
+
+def corr_nearest(corr, threshold=1e-15, n_fact=100, method="projection"):
     '''
     Find the nearest correlation matrix that is positive semi-definite.
 
@@ -41,7 +207,13 @@ def corr_nearest(corr, threshold=1e-15, n_fact=100):
     n_fact : int or float
         factor to determine the maximum number of iterations. The maximum
         number of iterations is the integer part of the number of columns in
-        the correlation matrix times n_fact.
+        the correlation matrix times n_fact. If method is "newton", then
+        n_fact is the maximum number of Newton iterations.
+    method : {"projection", "newton"}
+        "projection" (default) uses the alternating projections of Higham
+        (2002). "newton" uses the semismooth Newton method of Qi and Sun
+        (2006) for the dual problem, which converges quadratically and
+        is much faster for large matrices.
 
     Returns
     -------
@@ -63,15 +235,40 @@ def corr_nearest(corr, threshold=1e-15, n_fact=100):
     threshold. In this case, the returned array is not the original, but
     is equal to it within numerical precision.
 
+    The alternating projections compute a full eigendecomposition in each
+    iteration and can require many iterations. The Newton method usually
+    needs fewer than 10 eigendecompositions. It solves the Newton equations
+    with preconditioned conjugate gradients, where the Jacobian is applied
+    using the eigenvectors of the smaller of the sets of positive and
+    nonpositive eigenvalues. With method="newton" the smallest eigenvalue of
+    the input matrix is checked first without computing eigenvectors, and
+    a copy of the input matrix is returned if it is above the threshold.
+
     See Also
     --------
     corr_clipped
     cov_nearest
 
+    References
+    ----------
+    .. [*] Higham, N. J. (2002). Computing the nearest correlation matrix -
+       a problem from finance. IMA Journal of Numerical Analysis, 22(3),
+       329-343.
+    .. [*] Qi, H. and Sun, D. (2006). A quadratically convergent Newton
+       method for computing the nearest correlation matrix. SIAM Journal on
+       Matrix Analysis and Applications, 28(2), 360-385.
     '''
     k_vars = corr.shape[0]
     if k_vars != corr.shape[1]:
         raise ValueError("matrix is not square")
+    if method not in ("projection", "newton"):
+        raise ValueError("method must be 'projection' or 'newton'")
+
+    if method == "newton":
+        corr = np.asarray(corr, dtype=np.float64)
+        if _smallest_eigenvalue(corr) >= threshold:
+            return corr.copy()
+        return _corr_nearest_newton(corr, threshold, maxiter=int(n_fact))
 
     diff = np.zeros(corr.shape)
     x_new = corr.copy()
@@ -165,7 +362,8 @@ def cov_nearest(cov, method='clipped', threshold=1e-15, n_fact=100,
         initial covariance matrix
     method : str
         if "clipped", then the faster but less accurate ``corr_clipped`` is
-        used.if "nearest", then ``corr_nearest`` is used
+        used. If "nearest", then ``corr_nearest`` is used. If "newton", then
+        ``corr_nearest`` with the faster Newton method is used.
     threshold : float
         clipping threshold for smallest eigen value, see Notes
     n_fact : int or float
@@ -210,6 +408,9 @@ def cov_nearest(cov, method='clipped', threshold=1e-15, n_fact=100,
     cov_, std_ = cov2corr(cov, return_std=True)
     if method == 'clipped':
         corr_ = corr_clipped(cov_, threshold=threshold)
+    elif method == 'newton':
+        corr_ = corr_nearest(cov_, threshold=threshold, n_fact=n_fact,
+                             method='newton')
     else:  # method == 'nearest'
         corr_ = corr_nearest(cov_, threshold=threshold, n_fact=n_fact)
 
@@ -596,8 +797,8 @@ def corr_nearest_factor(corr, rank, ctol=1e-6, lam_min=1e-30,
     The input matrix `corr` can be a dense numpy array or any scipy
     sparse matrix.  The latter is useful if the input matrix is
     obtained by thresholding a very large sample correlation matrix.
-    If `corr` is sparse, the calculations are optimized to save
-    memory, so no working matrix with more than 10^6 elements is
+    The objective function and its gradient are computed from the
+    factors, so that no working matrix of the size of `corr` is
     constructed.
 
     References
@@ -644,40 +845,29 @@ def corr_nearest_factor(corr, rank, ctol=1e-6, lam_min=1e-30,
     else:
         raise ValueError("Matrix type not supported")
 
+    if type(corr1) == np.ndarray:
+        corr1_sumsq = (corr1 * corr1).sum()
+    else:
+        corr1_sumsq = (corr1.data ** 2).sum()
+
     # The gradient, from lemma 4.1 of BHR.
     def grad(X):
         gr = np.dot(X, np.dot(X.T, X))
-        if type(corr1) == np.ndarray:
-            gr -= np.dot(corr1, X)
-        else:
-            gr -= corr1.dot(X)
+        gr -= corr1.dot(X)
         gr -= (X*X).sum(1)[:, None] * X
         return 4*gr
 
     # The objective function (sum of squared deviations between fitted
-    # and observed arrays).
+    # and observed arrays), computed from the factors without forming
+    # XX'. Since corr1 has zero diagonal, this is
+    # ||XX'||^2 - sum of squared diagonal of XX' - 2 tr(X' corr1 X)
+    # + ||corr1||^2, where ||XX'|| = ||X'X||.
     def func(X):
-        if type(corr1) == np.ndarray:
-            M = np.dot(X, X.T)
-            np.fill_diagonal(M, 0)
-            M -= corr1
-            fval = (M*M).sum()
-            return fval
-        else:
-            fval = 0.
-            # Control the size of intermediates
-            max_ws = 1e6
-            bs = int(max_ws / X.shape[0])
-            ir = 0
-            while ir < X.shape[0]:
-                ir2 = min(ir+bs, X.shape[0])
-                u = np.dot(X[ir:ir2, :], X.T)
-                ii = np.arange(u.shape[0])
-                u[ii, ir+ii] = 0
-                u -= np.asarray(corr1[ir:ir2, :].todense())
-                fval += (u*u).sum()
-                ir += bs
-            return fval
+        xtx = np.dot(X.T, X)
+        fval = (xtx * xtx).sum() - ((X * X).sum(1) ** 2).sum()
+        fval -= 2 * (X * corr1.dot(X)).sum()
+        fval += corr1_sumsq
+        return fval
 
     rslt = _spg_optim(func, grad, X, _project_correlation_factors, ctol=ctol,
                       lam_min=lam_min, lam_max=lam_max, maxiter=maxiter)
@@ -770,25 +960,98 @@ def cov_nearest_factor_homog(cov, rank):
     return FactoredPSDMatrix(diag, fac_opt)
 
 
-def corr_thresholded(data, minabs=None, max_elt=1e7):
+def _standardized_rows(data, start, stop):
+    """Rows start:stop of data, row-standardized in memory"""
+    block = np.array(data[start:stop], dtype=np.float64)
+    block -= block.mean(1)[:, None]
+    sd = block.std(1, ddof=1)
+    small = sd <= 1e-5
+    block[~small] /= sd[~small][:, None]
+    block[small] = 0
+    return block
+
+
+def _corr_thresholded_strip(data, start, stop, bounds, minabs):
+    """
+    Thresholded correlations of the rows start:stop of data with all rows
+    in the blocks given by bounds that do not precede start.
+
+    Only the upper triangle, including the diagonal, is returned as arrays
+    of row indices, column indices and correlations.
+    """
+    ncol = data.shape[1]
+    right = _standardized_rows(data, start, stop)
+    left = right / (ncol - 1)
+    ipos_all, jpos_all, cor_values = [], [], []
+    for start2, stop2 in bounds:
+        if start2 < start:
+            continue
+        if start2 > start:
+            right = _standardized_rows(data, start2, stop2)
+        cm = np.dot(left, right.T)
+        ipos, jpos = np.divmod(np.flatnonzero(np.abs(cm) >= minabs),
+                               cm.shape[1])
+        if start2 == start:
+            upper = jpos >= ipos
+            ipos, jpos = ipos[upper], jpos[upper]
+        cor_values.append(cm[ipos, jpos])
+        ipos_all.append(ipos + start)
+        jpos_all.append(jpos + start2)
+    return (np.concatenate(ipos_all), np.concatenate(jpos_all),
+            np.concatenate(cor_values))
+
+
+def _spill_blocks(blocks, fname):
+    """Write an iterator of row blocks to fname, return its memmap"""
+    nrow, ncol = 0, None
+    with open(fname, "wb") as fh:
+        for block in blocks:
+            block = np.ascontiguousarray(block, dtype=np.float64)
+            if block.ndim != 2:
+                raise ValueError("data blocks must be 2-dimensional")
+            if ncol is None:
+                ncol = block.shape[1]
+            elif block.shape[1] != ncol:
+                raise ValueError("data blocks must have the same number of "
+                                 "columns")
+            block.tofile(fh)
+            nrow += block.shape[0]
+    if nrow == 0:
+        raise ValueError("data does not contain any rows")
+    return np.memmap(fname, dtype=np.float64, mode="r", shape=(nrow, ncol))
+
+
+def corr_thresholded(data, minabs=None, max_elt=1e7, n_jobs=1,
+                     return_format="coo"):
     r"""
     Construct a sparse matrix containing the thresholded row-wise
     correlation matrix from a data array.
 
     Parameters
     ----------
-    data : array_like
+    data : array_like or iterator
         The data from which the row-wise thresholded correlation
-        matrix is to be computed.
+        matrix is to be computed. This can be a memory-mapped array, which
+        is only read in blocks of rows, or an iterator or generator that
+        yields blocks of rows of the data, e.g. read from disk. Lists and
+        other sequences are converted to an array.
     minabs : non-negative real
         The threshold value; correlation coefficients smaller in
         magnitude than minabs are set to zero.  If None, defaults
         to 1 / sqrt(n), see Notes for more information.
+    max_elt : int
+        The maximum number of elements of the blocks of the data and of the
+        correlation matrix that are constructed at a time.
+    n_jobs : int
+        The number of blocks of rows that are processed in parallel, using
+        threads. Default is 1, -1 uses all cores.
+    return_format : {"coo", "csr"}
+        The sparse format of the returned matrix.
 
     Returns
     -------
-    cormat : sparse.coo_matrix
-        The thresholded correlation matrix, in COO format.
+    cormat : sparse.coo_matrix or sparse.csr_matrix
+        The thresholded correlation matrix, in COO format by default.
 
     Notes
     -----
@@ -806,6 +1069,14 @@ def corr_thresholded(data, minabs=None, max_elt=1e7):
     constructed.  However memory use could still be high if a large
     number of correlation values exceed `minabs` in magnitude.
 
+    The rows of the data are read and standardized in blocks, so that the
+    data is never copied into memory as a whole. Only the blocks of the
+    upper triangle of the correlation matrix are computed and only the
+    values that exceed the threshold are kept. If data is an iterator, then
+    the blocks are written to a temporary file that is memory-mapped,
+    since each block is needed for several blocks of the correlation
+    matrix.
+
     The thresholded matrix is returned in COO format, which can easily
     be converted to other sparse formats.
 
@@ -822,44 +1093,54 @@ def corr_thresholded(data, minabs=None, max_elt=1e7):
     >>> x = np.random.randn(100,1).dot(b.T) + np.random.randn(100,10)
     >>> cmat = corr_thresholded(x, 0.3)
     """
+    if return_format not in ("coo", "csr"):
+        raise ValueError("return_format must be 'coo' or 'csr'")
+
+    if not hasattr(data, "shape") and iter(data) is data:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data = _spill_blocks(data, os.path.join(tmpdir, "data.bin"))
+            try:
+                cmat = corr_thresholded(data, minabs=minabs, max_elt=max_elt,
+                                        n_jobs=n_jobs,
+                                        return_format=return_format)
+            finally:
+                # release the file before the directory is removed
+                del data
+        return cmat
+    if not hasattr(data, "shape"):
+        data = np.asarray(data)
 
     nrow, ncol = data.shape
 
     if minabs is None:
         minabs = 1. / float(ncol)
 
-    # Row-standardize the data
-    data = data.copy()
-    data -= data.mean(1)[:, None]
-    sd = data.std(1, ddof=1)
-    ii = np.flatnonzero(sd > 1e-5)
-    data[ii, :] /= sd[ii][:, None]
-    ii = np.flatnonzero(sd <= 1e-5)
-    data[ii, :] = 0
-
-    # Number of rows to process in one pass
-    bs = int(np.floor(max_elt / nrow))
-
-    ipos_all, jpos_all, cor_values = [], [], []
-
-    ir = 0
-    while ir < nrow:
-        ir2 = min(data.shape[0], ir + bs)
-        cm = np.dot(data[ir:ir2, :], data.T) / (ncol - 1)
-        cma = np.abs(cm)
-        ipos, jpos = np.nonzero(cma >= minabs)
-        ipos_all.append(ipos + ir)
-        jpos_all.append(jpos)
-        cor_values.append(cm[ipos, jpos])
-        ir += bs
-
-    ipos = np.concatenate(ipos_all)
-    jpos = np.concatenate(jpos_all)
-    cor_values = np.concatenate(cor_values)
-
-    cmat = sparse.coo_matrix((cor_values, (ipos, jpos)), (nrow, nrow))
-
-    return cmat
+    # Number of rows in a block, bounds the data blocks and the blocks of
+    # the correlation matrix
+    bs = int(min(np.sqrt(max_elt), max_elt / ncol))
+    bs = max(bs, 1)
+    bounds = [(ir, min(ir + bs, nrow)) for ir in range(0, nrow, bs)]
+
+    parallel, p_func, n_jobs = parallel_func(_corr_thresholded_strip,
+                                             n_jobs, verbose=0,
+                                             prefer="threads")
+    strips = parallel(p_func(data, start, stop, bounds, minabs)
+                      for start, stop in bounds)
+
+    ipos = np.concatenate([strip[0] for strip in strips])
+    jpos = np.concatenate([strip[1] for strip in strips])
+    cor_values = np.concatenate([strip[2] for strip in strips])
+    del strips
+
+    # mirror the upper triangle
+    lower = ipos != jpos
+    ipos, jpos = (np.concatenate((ipos, jpos[lower])),
+                  np.concatenate((jpos, ipos[lower])))
+    cor_values = np.concatenate((cor_values, cor_values[lower]))
+
+    if return_format == "csr":
+        return sparse.csr_matrix((cor_values, (ipos, jpos)), (nrow, nrow))
+    return sparse.coo_matrix((cor_values, (ipos, jpos)), (nrow, nrow))
 
 
 class MultivariateKernel(object):
@@ -27,6 +27,7 @@ missing:
 """
 from statsmodels.compat.pandas import deprecate_kwarg
 from statsmodels.compat.python import iteritems
+from statsmodels.compat.scipy import _next_regular
 
 from collections.abc import Iterable
 
@@ -34,6 +35,7 @@ import numpy as np
 import pandas as pd
 from scipy import stats
 
+from statsmodels.regression._recursive_ls import recursive_ols_update
 from statsmodels.regression.linear_model import OLS, RegressionResultsWrapper
 from statsmodels.tsa.tsatools import lagmat
 from statsmodels.tools.validation import (array_like, int_like, bool_like,
@@ -395,6 +397,160 @@ def compare_encompassing(results_x, results_z, cov_type="nonrobust",
                         columns=["stat", "pvalue", "df_num", "df_denom"])
 
 
+def _column_chunks(nobs, ncols, max_elements=2 ** 22):
+    """slices of columns so that a chunk has at most about max_elements"""
+    step = max(max_elements // max(nobs, 1), 1)
+    return [slice(i, i + step) for i in range(0, ncols, step)]
+
+
+def _acf_columns(x, nlags):
+    """autocorrelations of all columns of x up to nlags computed by FFT
+
+    The autocovariances are normalized by nobs, as in acf with the default
+    unbiased=False, and the columns are demeaned.
+    """
+    nobs, ncols = x.shape
+    n = _next_regular(2 * nobs + 1)
+    sacf = np.empty((nlags + 1, ncols))
+    for sl in _column_chunks(n, ncols):
+        xo = x[:, sl] - x[:, sl].mean(0)
+        frf = np.fft.rfft(xo, n=n, axis=0)
+        acov = np.fft.irfft(frf.real ** 2 + frf.imag ** 2, n=n, axis=0)
+        sacf[:, sl] = acov[:nlags + 1] / acov[0]
+    return sacf
+
+
+def _aux_basis(exog):
+    """orthonormal basis of the column space of an auxiliary design
+
+    Returns the basis, shaped (nobs, rank), and whether the constant is in
+    the column space, either explicitly or implicitly. The rank uses the same
+    tolerance as np.linalg.matrix_rank.
+    """
+    u, sv, _ = np.linalg.svd(exog, full_matrices=False)
+    tol = sv.max(initial=0) * max(exog.shape) * np.finfo(np.float64).eps
+    basis = u[:, sv > tol]
+    ones = np.ones(exog.shape[0])
+    resid_const = ones - basis.dot(basis.T.dot(ones))
+    hasconst = (np.linalg.norm(resid_const) <=
+                np.sqrt(np.finfo(np.float64).eps * exog.shape[0]))
+    return basis, hasconst
+
+
+def _aux_ols_batch(endog, exog):
+    """R-squared and F test of the OLS regressions of all columns of endog
+
+    All columns share the auxiliary design exog, which is factorized once.
+    The results are the same as rsquared, fvalue and f_pvalue of
+    ``OLS(endog[:, i], exog).fit()``.
+    """
+    nobs = endog.shape[0]
+    basis, hasconst = _aux_basis(exog)
+    ssr = np.empty(endog.shape[1])
+    tss = np.empty(endog.shape[1])
+    for sl in _column_chunks(*endog.shape):
+        y = endog[:, sl]
+        resid = y - basis.dot(basis.T.dot(y))
+        ssr[sl] = (resid ** 2).sum(0)
+        if hasconst:
+            y = y - y.mean(0)
+        tss[sl] = (y ** 2).sum(0)
+    df_model = basis.shape[1] - int(hasconst)
+    df_resid = nobs - basis.shape[1]
+    rsquared = 1 - ssr / tss
+    fval = (tss - ssr) / df_model / (ssr / df_resid)
+    fpval = stats.f.sf(fval, df_model, df_resid)
+    return rsquared, fval, fpval, df_model
+
+
+def _aux_lags_batch(endog, lags, exog=None):
+    """LM and F test of the lags of each column of endog in its own regression
+
+    Column i of endog is regressed on exog and ``lags[:, i]``, the lags of
+    the column. The shared part exog, which needs to span the constant, is
+    factorized once and partialled out of endog and of the lags (Frisch-Waugh)
+    so that only the normal equations of the lags are solved per column.
+
+    Parameters
+    ----------
+    endog : ndarray
+        Dependent variables, shaped (nobs, ncols).
+    lags : callable
+        lags(sl) returns the lagged regressors of the columns in slice sl,
+        shaped (nlags, nobs, len(sl)).
+    exog : ndarray, optional
+        Regressors shared by all columns. If None, then only a constant is
+        used.
+
+    Returns
+    -------
+    rsquared, fval, fpval : ndarray
+        The R-squared of the regressions and the F test that all coefficients
+        of the lags are zero.
+    df_resid : int
+        Residual degrees of freedom of the regressions.
+    """
+    nobs, ncols = endog.shape
+    if exog is None:
+        basis = np.full((nobs, 1), 1 / np.sqrt(nobs))
+    else:
+        basis, _ = _aux_basis(exog)
+    rsquared = np.empty(ncols)
+    ess = np.empty(ncols)
+    ssr = np.empty(ncols)
+    nlags = None
+    for sl in _column_chunks(nobs, ncols):
+        y = endog[:, sl]
+        x = lags(sl)
+        nlags = x.shape[0]
+        y = y - basis.dot(basis.T.dot(y))
+        xtx = np.empty((y.shape[1], nlags, nlags))
+        xty = np.empty((y.shape[1], nlags))
+        for j in range(nlags):
+            x[j] -= basis.dot(basis.T.dot(x[j]))
+            for k in range(j + 1):
+                xtx[:, j, k] = xtx[:, k, j] = np.einsum('nc,nc->c', x[j],
+                                                        x[k])
+            xty[:, j] = np.einsum('nc,nc->c', x[j], y)
+        try:
+            params = np.linalg.solve(xtx, xty[:, :, None])[:, :, 0]
+        except np.linalg.LinAlgError:
+            params = np.einsum('cjk,ck->cj', np.linalg.pinv(xtx), xty)
+        ess[sl] = np.einsum('cj,cj->c', params, xty)
+        ssr_restricted = (y ** 2).sum(0)
+        ssr[sl] = ssr_restricted - ess[sl]
+        y = endog[:, sl]
+        tss = ((y - y.mean(0)) ** 2).sum(0)
+        rsquared[sl] = 1 - ssr[sl] / tss
+    if nlags is None:
+        nlags = lags(slice(0, 0)).shape[0]
+    df_resid = nobs - basis.shape[1] - nlags
+    fval = ess / nlags / (ssr / df_resid)
+    fpval = stats.f.sf(fval, nlags, df_resid)
+    return rsquared, fval, fpval, df_resid
+
+
+def _lagged_columns(x, nlags, trim):
+    """lags(sl) callable for _aux_lags_batch
+
+    The lags 1, ..., nlags of the columns of x. If trim is True, then the
+    first nlags observations are dropped, otherwise the lags are padded with
+    zeros.
+    """
+    nobs = x.shape[0]
+    start = nlags if trim else 0
+
+    def lags(sl):
+        xsl = x[:, sl]
+        out = np.zeros((nlags, nobs - start, xsl.shape[1]))
+        for j in range(1, nlags + 1):
+            first = max(start, j)
+            out[j - 1, first - start:] = xsl[first - j:nobs - j]
+        return out
+
+    return lags
+
+
 def acorr_ljungbox(x, lags=None, boxpierce=False, model_df=0, period=None,
                    return_df=None):
     """
@@ -404,7 +560,8 @@ def acorr_ljungbox(x, lags=None, boxpierce=False, model_df=0, period=None,
     ----------
     x : array_like
         The data series. The data is demeaned before the test statistic is
-        computed.
+        computed. If x is 2-d, then each column is a data series and the
+        tests are computed for all columns at once.
     lags : {int, array_like}, default None
         If lags is an integer then this is taken to be the largest lag
         that is included, the test result is reported for all smaller lag
@@ -431,14 +588,18 @@ def acorr_ljungbox(x, lags=None, boxpierce=False, model_df=0, period=None,
     return_df : bool, default None
         Flag indicating whether to return the result as a single DataFrame
         with columns lb_stat, lb_pvalue, and optionally bp_stat and bp_pvalue.
-        After 0.12, this will become the only return method.  Set to True
-        to return the DataFrame or False to continue returning the 2 - 4
+        If x is 2-d, then the DataFrame has a column MultiIndex with the
+        statistic in the first level and the columns of x in the second
+        level. After 0.12, this will become the only return method.  Set to
+        True to return the DataFrame or False to continue returning the 2 - 4
         output. If None (the default), a warning is raised.
 
     Returns
     -------
     lbvalue : float or array
-        The Ljung-Box test statistic.
+        The Ljung-Box test statistic. If x is 2-d, then the statistics are
+        shaped (number of lags, number of columns of x). The same holds for
+        all other outputs.
     pvalue : float or array
         The p-value based on chi-square distribution. The p-value is computed
         as 1.0 - chi2.cdf(lbvalue, dof) where dof is lag - model_df. If
@@ -464,6 +625,9 @@ def acorr_ljungbox(x, lags=None, boxpierce=False, model_df=0, period=None,
     autocorrelation function. Ljung-Box test is has better finite-sample
     properties.
 
+    The autocorrelations are computed with the FFT, for all columns of x
+    at once if x is 2-d.
+
     References
     ----------
     .. [*] Green, W. "Econometric Analysis," 5th ed., Pearson, 2003.
@@ -477,7 +641,10 @@ def acorr_ljungbox(x, lags=None, boxpierce=False, model_df=0, period=None,
            lb_stat     lb_pvalue
     10  214.106992  1.827374e-40
     """
-    x = array_like(x, "x")
+    columns = getattr(x, "columns", None)
+    x = array_like(x, "x", ndim=None, maxdim=2)
+    if x.ndim == 2 and x.shape[1] == 1:
+        x = x[:, 0]
     period = int_like(period, "period", optional=True)
     return_df = bool_like(return_df, "return_df", optional=True)
     model_df = int_like(model_df, "model_df", optional=False)
@@ -503,17 +670,25 @@ def acorr_ljungbox(x, lags=None, boxpierce=False, model_df=0, period=None,
     lags = array_like(lags, "lags", dtype="int")
     maxlag = lags.max()
 
-    # Avoid cyclic import
-    from statsmodels.tsa.stattools import acf
     # normalize by nobs not (nobs-nlags)
-    # SS: unbiased=False is default now
-    sacf = acf(x, nlags=maxlag, fft=False)
-    sacf2 = sacf[1:maxlag + 1] ** 2 / (nobs - np.arange(1, maxlag + 1))
-    qljungbox = nobs * (nobs + 2) * np.cumsum(sacf2)[lags - 1]
+    sacf = _acf_columns(x.reshape(nobs, -1), maxlag)
+    denom = nobs - np.arange(1, maxlag + 1)
+    sacf2 = sacf[1:maxlag + 1] ** 2 / denom[:, None]
+    qljungbox = nobs * (nobs + 2) * np.cumsum(sacf2, axis=0)[lags - 1]
     adj_lags = lags - model_df
     pval = np.full_like(qljungbox, np.nan)
     loc = adj_lags > 0
-    pval[loc] = stats.chi2.sf(qljungbox[loc], adj_lags[loc])
+    pval[loc] = stats.chi2.sf(qljungbox[loc], adj_lags[loc][:, None])
+
+    def _to_frame(**results):
+        if x.ndim == 1:
+            return pd.DataFrame({key: val[:, 0] for key, val
+                                 in iteritems(results)}, index=lags)
+        return pd.concat({key: pd.DataFrame(val, index=lags, columns=columns)
+                          for key, val in iteritems(results)}, axis=1)
+
+    def _squeeze(val):
+        return val[:, 0] if x.ndim == 1 else val
 
     if return_df is None:
         msg = ("The value returned will change to a single DataFrame after "
@@ -525,19 +700,18 @@ def acorr_ljungbox(x, lags=None, boxpierce=False, model_df=0, period=None,
 
     if not boxpierce:
         if return_df:
-            return pd.DataFrame({"lb_stat": qljungbox, "lb_pvalue": pval},
-                                index=lags)
-        return qljungbox, pval
+            return _to_frame(lb_stat=qljungbox, lb_pvalue=pval)
+        return _squeeze(qljungbox), _squeeze(pval)
 
-    qboxpierce = nobs * np.cumsum(sacf[1:maxlag + 1] ** 2)[lags - 1]
+    qboxpierce = nobs * np.cumsum(sacf[1:maxlag + 1] ** 2, axis=0)[lags - 1]
     pvalbp = np.full_like(qljungbox, np.nan)
-    pvalbp[loc] = stats.chi2.sf(qboxpierce[loc], adj_lags[loc])
+    pvalbp[loc] = stats.chi2.sf(qboxpierce[loc], adj_lags[loc][:, None])
     if return_df:
-        return pd.DataFrame({"lb_stat": qljungbox, "lb_pvalue": pval,
-                             "bp_stat": qboxpierce, "bp_pvalue": pvalbp},
-                            index=lags)
+        return _to_frame(lb_stat=qljungbox, lb_pvalue=pval,
+                         bp_stat=qboxpierce, bp_pvalue=pvalbp)
 
-    return qljungbox, pval, qboxpierce, pvalbp
+    return (_squeeze(qljungbox), _squeeze(pval), _squeeze(qboxpierce),
+            _squeeze(pvalbp))
 
 
 @deprecate_kwarg("maxlag", "nlags")
@@ -553,7 +727,9 @@ def acorr_lm(resid, nlags=None, autolag="AIC", store=False, *, period=None,
     Parameters
     ----------
     resid : array_like
-        Time series to test.
+        Time series to test. If resid is 2-d, then each column is a time
+        series and the tests are computed for all columns at once. This
+        requires autolag=None, store=False and cov_type="nonrobust".
     nlags : int, default None
         Highest lag to use. The behavior of this parameter will change
         after 0.12.
@@ -582,14 +758,15 @@ def acorr_lm(resid, nlags=None, autolag="AIC", store=False, *, period=None,
 
     Returns
     -------
-    lm : float
-        Lagrange multiplier test statistic.
-    lmpval : float
+    lm : {float, ndarray}
+        Lagrange multiplier test statistic. If resid is 2-d, then all
+        statistics and p-values are arrays with one element per column.
+    lmpval : {float, ndarray}
         The p-value for Lagrange multiplier test.
-    fval : float
+    fval : {float, ndarray}
         The f statistic of the F test, alternative version of the same
         test based on F test for the parameter restriction.
-    fpval : float
+    fpval : {float, ndarray}
         The pvalue of the F test.
     res_store : ResultsStore, optional
         Intermediate results. Only returned if store=True.
@@ -608,8 +785,14 @@ def acorr_lm(resid, nlags=None, autolag="AIC", store=False, *, period=None,
     The test statistic is computed as (nobs - ddof) * r2 where r2 is the
     R-squared from a regression on the residual on nlags lags of the
     residual.
+
+    If resid is 2-d, then the auxiliary regressions are not fitted with OLS.
+    The constant is partialled out and the normal equations of the lags of
+    all columns are solved in one batch.
     """
-    resid = array_like(resid, "resid", ndim=1)
+    resid = array_like(resid, "resid", ndim=None, maxdim=2)
+    if resid.ndim == 2 and resid.shape[1] == 1:
+        resid = resid[:, 0]
     cov_type = string_like(cov_type, "cov_type")
     cov_kwargs = {} if cov_kwargs is None else cov_kwargs
     cov_kwargs = dict_like(cov_kwargs, "cov_kwargs")
@@ -630,6 +813,15 @@ def acorr_lm(resid, nlags=None, autolag="AIC", store=False, *, period=None,
     else:
         maxlag = nlags
 
+    if resid.ndim == 2:
+        if autolag or store or cov_type != "nonrobust":
+            raise ValueError("2-dimensional resid requires autolag=None, "
+                             "store=False and cov_type='nonrobust'")
+        rsquared, fval, fpval, _ = _aux_lags_batch(
+            resid[maxlag:], _lagged_columns(resid, maxlag, trim=True))
+        lm = (nobs - maxlag - ddof) * rsquared
+        return lm, stats.chi2.sf(lm, maxlag), fval, fpval
+
     xdall = lagmat(resid[:, None], maxlag, trim="both")
     nobs = xdall.shape[0]
     xdall = np.c_[np.ones((nobs, 1)), xdall]
@@ -698,7 +890,9 @@ def het_arch(resid, nlags=None, autolag=None, store=False, ddof=0):
     Parameters
     ----------
     resid : ndarray
-        residuals from an estimation, or time series
+        residuals from an estimation, or time series. If resid is 2-d, then
+        each column is a time series and the tests are computed for all
+        columns at once, see acorr_lm.
     nlags : int, default None
         Highest lag to use. The behavior of this parameter will change
         after 0.12.
@@ -716,14 +910,14 @@ def het_arch(resid, nlags=None, autolag=None, store=False, ddof=0):
 
     Returns
     -------
-    lm : float
+    lm : {float, ndarray}
         Lagrange multiplier test statistic
-    lmpval : float
+    lmpval : {float, ndarray}
         p-value for Lagrange multiplier test
-    fval : float
+    fval : {float, ndarray}
         fstatistic for F test, alternative version of the same test based on
         F test for the parameter restriction
-    fpval : float
+    fpval : {float, ndarray}
         pvalue for F test
     res_store : ResultsStore, optional
         Intermediate results. Returned if store is True.
@@ -745,7 +939,8 @@ def acorr_breusch_godfrey(res, nlags=None, store=False):
     ----------
     res : RegressionResults
         Estimation results for which the residuals are tested for serial
-        correlation.
+        correlation. If the residuals are 2-d, e.g. from OLS with 2-d endog,
+        then each column is tested. All columns share the exog of the model.
     nlags : int, default None
         Number of lags to include in the auxiliary regression. (nlags is
         highest lag).
@@ -755,24 +950,29 @@ def acorr_breusch_godfrey(res, nlags=None, store=False):
 
     Returns
     -------
-    lm : float
-        Lagrange multiplier test statistic.
-    lmpval : float
+    lm : {float, ndarray}
+        Lagrange multiplier test statistic. If the residuals are 2-d, then
+        all statistics and p-values are arrays with one element per column.
+    lmpval : {float, ndarray}
         The p-value for Lagrange multiplier test.
-    fval : float
+    fval : {float, ndarray}
         The value of the f statistic for F test, alternative version of the
         same test based on F test for the parameter restriction.
-    fpval : float
+    fpval : {float, ndarray}
         The pvalue for F test.
     res_store : ResultsStore
         A class instance that holds intermediate results. Only returned if
-        store=True.
+        store=True, which is not available for 2-d residuals.
 
     Notes
     -----
     BG adds lags of residual to exog in the design matrix for the auxiliary
     regression with residuals as endog. See [1]_, section 12.7.1.
 
+    For 2-d residuals, exog and the constant are factorized once and
+    partialled out, so that only the normal equations of the lags are solved
+    for each column.
+
     References
     ----------
     .. [1] Greene, W. H. Econometric Analysis. New Jersey. Prentice Hall;
@@ -780,9 +980,8 @@ def acorr_breusch_godfrey(res, nlags=None, store=False):
     """
 
     x = np.asarray(res.resid).squeeze()
-    if x.ndim != 1:
-        raise ValueError("Model resid must be a 1d array. Cannot be used on"
-                         " multivariate models.")
+    if x.ndim > 2:
+        raise ValueError("Model resid must be a 1d or 2d array.")
     exog_old = res.model.exog
     nobs = x.shape[0]
     if nlags is None:
@@ -796,6 +995,19 @@ def acorr_breusch_godfrey(res, nlags=None, store=False):
         nlags = np.trunc(12. * np.power(nobs / 100., 1 / 4.))
         nlags = int(nlags)
 
+    if x.ndim == 2:
+        if store:
+            raise ValueError("store is not available for 2d resid")
+        exog_old = np.asarray(exog_old)
+        if exog_old.shape[0] != nobs:
+            raise ValueError("Model resid must have the same number of "
+                             "observations as the model exog.")
+        exog = np.column_stack((exog_old, np.ones(nobs)))
+        rsquared, fval, fpval, _ = _aux_lags_batch(
+            x, _lagged_columns(x, nlags, trim=False), exog)
+        lm = nobs * rsquared
+        return lm, stats.chi2.sf(lm, nlags), fval, fpval
+
     x = np.concatenate((np.zeros(nlags), x))
 
     xdall = lagmat(x[:, None], nlags, trim="both")
@@ -842,20 +1054,22 @@ def het_breuschpagan(resid, exog_het):
         regression. If an array is given in exog, then the residuals are
         calculated by the an OLS regression or resid on exog. In this case
         resid should contain the dependent variable. Exog can be the same as x.
+        If resid is 2-d, then each column is tested and the outputs are
+        arrays with one element per column.
     exog_het : array_like
         This contains variables suspected of being related to
         heteroscedasticity in resid.
 
     Returns
     -------
-    lm : float
+    lm : {float, ndarray}
         lagrange multiplier statistic
-    lm_pvalue :float
+    lm_pvalue : {float, ndarray}
         p-value of lagrange multiplier test
-    fvalue : float
+    fvalue : {float, ndarray}
         f-statistic of the hypothesis that the error variance does not depend
         on x
-    f_pvalue : float
+    f_pvalue : {float, ndarray}
         p-value for the f-statistic
 
     Notes
@@ -876,6 +1090,8 @@ def het_breuschpagan(resid, exog_het):
     (Greene, section 17.6) and not with the explicit formula
     (Greene, section 11.4.3).
     The degrees of freedom for the p-value assume x is full rank.
+    If resid is 2-d, then exog_het is factorized only once for the auxiliary
+    regressions of all columns.
 
     References
     ----------
@@ -889,6 +1105,12 @@ def het_breuschpagan(resid, exog_het):
     x = np.asarray(exog_het)
     y = np.asarray(resid) ** 2
     nobs, nvars = x.shape
+    if y.ndim == 2 and y.shape[1] == 1:
+        y = y[:, 0]
+    if y.ndim == 2:
+        rsquared, fval, fpval, _ = _aux_ols_batch(y, x)
+        lm = nobs * rsquared
+        return lm, stats.chi2.sf(lm, nvars - 1), fval, fpval
     resols = OLS(y, x).fit()
     fval = resols.fvalue
     fpval = resols.f_pvalue
@@ -905,28 +1127,32 @@ def het_white(resid, exog):
     ----------
     resid : array_like
         The residuals. The squared residuals are used as the endogenous
-        variable.
+        variable. If resid is 2-d, then each column is tested and the
+        outputs are arrays with one element per column.
     exog : array_like
         The explanatory variables for the variance. Squares and interaction
         terms are automatically included in the auxiliary regression.
 
     Returns
     -------
-    lm : float
+    lm : {float, ndarray}
         The lagrange multiplier statistic.
-    lm_pvalue :float
+    lm_pvalue : {float, ndarray}
         The p-value of lagrange multiplier test.
-    fvalue : float
+    fvalue : {float, ndarray}
         The f-statistic of the hypothesis that the error variance does not
         depend on x. This is an alternative test variant not the original
         LM test.
-    f_pvalue : float
+    f_pvalue : {float, ndarray}
         The p-value for the f-statistic.
 
     Notes
     -----
     Assumes x contains constant (for counting dof).
 
+    If resid is 2-d, then the design of the auxiliary regression is
+    factorized only once for all columns.
+
     question: does f-statistic make sense? constant ?
 
     References
@@ -935,7 +1161,12 @@ def het_white(resid, exog):
     Greene 5th, example 11.3.
     """
     x = array_like(exog, "exog", ndim=2)
-    y = array_like(resid, "resid", ndim=2, shape=(x.shape[0], 1))
+    y = array_like(resid, "resid", ndim=None, maxdim=2)
+    if y.ndim == 2 and y.shape[1] == 1:
+        y = y[:, 0]
+    if y.shape[0] != x.shape[0]:
+        raise ValueError("resid and exog must have the same number of "
+                         "observations")
     if x.shape[1] < 2:
         raise ValueError("White's heteroskedasticity test requires exog to"
                          "have at least two columns where one is a constant.")
@@ -944,6 +1175,10 @@ def het_white(resid, exog):
     exog = x[:, i0] * x[:, i1]
     nobs, nvars = exog.shape
     assert nvars == nvars0 * (nvars0 - 1) / 2. + nvars0
+    if y.ndim == 2:
+        rsquared, fval, fpval, df_model = _aux_ols_batch(y ** 2, exog)
+        lm = nobs * rsquared
+        return lm, stats.chi2.sf(lm, df_model), fval, fpval
     resols = OLS(y ** 2, exog).fit()
     fval = resols.fvalue
     fpval = resols.f_pvalue
@@ -1255,7 +1490,8 @@ def linear_harvey_collier(res, order_by=None):
     Parameters
     ----------
     res : RegressionResults
-        A results instance from a linear regression.
+        A results instance from a linear regression. If endog is
+        2-dimensional, then the test is computed for each column.
     order_by : array_like, default None
         Integer array specifying the order of the residuals. If not provided,
         the order of the residuals is not changed. If provided, must have
@@ -1263,9 +1499,9 @@ def linear_harvey_collier(res, order_by=None):
 
     Returns
     -------
-    tvalue : float
+    tvalue : {float, ndarray}
         The test statistic, based on ttest_1sample.
-    pvalue : float
+    pvalue : {float, ndarray}
         The pvalue of the test.
 
     Notes
@@ -1532,7 +1768,9 @@ def recursive_olsresiduals(res, skip=None, lamda=0.0, alpha=0.95,
     Parameters
     ----------
     res : RegressionResults
-        Results from estimation of a regression model.
+        Results from estimation of a regression model. The endog of the model
+        can be 2-dimensional, with several response series that have the same
+        regressors, e.g. ``OLS(endog_2d, exog).fit()``.
     skip : int, default None
         The number of observations to use for initial OLS, if None then skip is
         set equal to the number of regressors (columns in exog).
@@ -1564,11 +1802,17 @@ def recursive_olsresiduals(res, skip=None, lamda=0.0, alpha=0.95,
     rcusumci : ndarray
         The confidence interval for cusum test using a size of alpha.
 
+    If the endog of the model is 2-dimensional with m columns, then the
+    returns have an additional last axis of length m, except for `rcusumci`,
+    e.g. `rresid` is (nobs, m) and `rparams` is (nobs, k_vars, m).
+
     Notes
     -----
     It produces same recursive residuals as other version. This version updates
     the inverse of the X'X matrix and does not require matrix inversion during
-    updating. looks efficient but no timing
+    updating. The updating is done in compiled code, and the update of the
+    inverse of the X'X matrix is shared by all columns of a 2-dimensional
+    endog, so that the cost of an additional response series is small.
 
     Confidence interval in Greene and Brown, Durbin and Evans is the same as
     in Ploberger after a little bit of algebra.
@@ -1594,12 +1838,15 @@ def recursive_olsresiduals(res, skip=None, lamda=0.0, alpha=0.95,
         y = y[order_by]
 
     nobs, nvars = x.shape
+    is_1d = y.ndim == 1
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y.reshape(nobs, -1), dtype=np.float64)
+    n_series = y.shape[1]
     if skip is None:
         skip = nvars
-    rparams = np.nan * np.zeros((nobs, nvars))
-    rresid = np.nan * np.zeros(nobs)
-    rypred = np.nan * np.zeros(nobs)
-    rvarraw = np.nan * np.zeros(nobs)
+    rparams = np.full((nobs, nvars, n_series), np.nan)
+    rresid = np.full((nobs, n_series), np.nan)
+    rvarraw = np.full(nobs, np.nan)
 
     x0 = x[:skip]
     y0 = y[:skip]
@@ -1608,38 +1855,28 @@ def recursive_olsresiduals(res, skip=None, lamda=0.0, alpha=0.95,
     xty = np.dot(x0.T, y0)  # xi * y   #np.dot(xi, y)
     beta = np.dot(xtxi, xty)
     rparams[skip - 1] = beta
-    yipred = np.dot(x[skip - 1], beta)
-    rypred[skip - 1] = yipred
-    rresid[skip - 1] = y[skip - 1] - yipred
+    rresid[skip - 1] = y[skip - 1] - np.dot(x[skip - 1], beta)
     rvarraw[skip - 1] = 1 + np.dot(x[skip - 1], np.dot(xtxi, x[skip - 1]))
-    for i in range(skip, nobs):
-        xi = x[i:i + 1, :]
-        yi = y[i]
-
-        # get prediction error with previous beta
-        yipred = np.dot(xi, beta)
-        rypred[i] = yipred
-        residi = yi - yipred
-        rresid[i] = residi
-
-        # update beta and inverse(X'X)
-        tmp = np.dot(xtxi, xi.T)
-        ft = 1 + np.dot(xi, tmp)
-
-        xtxi = xtxi - np.dot(tmp, tmp.T) / ft  # BigJudge equ 5.5.15
-
-        beta = beta + (tmp * residi / ft).ravel()  # BigJudge equ 5.5.14
-        rparams[i] = beta
-        rvarraw[i] = ft
-
-    rresid_scaled = rresid / np.sqrt(rvarraw)  # N(0,sigma2) distributed
+    # update beta and inverse(X'X), BigJudge equ 5.5.14 and 5.5.15
+    recursive_ols_update(x, y, np.ascontiguousarray(xtxi), beta, skip, rresid,
+                         rvarraw, rparams)
+    # prediction with previous beta
+    rypred = y - rresid
+
+    # N(0,sigma2) distributed
+    rresid_scaled = rresid / np.sqrt(rvarraw)[:, None]
     nrr = nobs - skip
     # sigma2 = rresid_scaled[skip-1:].var(ddof=1)  #var or sum of squares ?
     # Greene has var, jplv and Ploberger have sum of squares (Ass.:mean=0)
     # Gretl uses: by reverse engineering matching their numbers
-    sigma2 = rresid_scaled[skip:].var(ddof=1)
+    sigma2 = rresid_scaled[skip:].var(ddof=1, axis=0)
     rresid_standardized = rresid_scaled / np.sqrt(sigma2)  # N(0,1) distributed
-    rcusum = rresid_standardized[skip - 1:].cumsum()
+    rcusum = rresid_standardized[skip - 1:].cumsum(0)
+    if is_1d:
+        rresid, rparams, rypred = rresid[:, 0], rparams[:, :, 0], rypred[:, 0]
+        rresid_standardized = rresid_standardized[:, 0]
+        rresid_scaled = rresid_scaled[:, 0]
+        rcusum = rcusum[:, 0]
     # confidence interval points in Greene p136 looks strange. Cleared up
     # this assumes sum of independent standard normal, which does not take into
     # account that we make many tests at the same time
@@ -1667,11 +1904,12 @@ def breaks_hansen(olsresults):
     Parameters
     ----------
     olsresults : RegressionResults
-        Results from estimation of a regression model.
+        Results from estimation of a regression model. If endog is
+        2-dimensional, then the test is computed for each column.
 
     Returns
     -------
-    teststat : float
+    teststat : {float, ndarray}
         Hansen's test statistic.
     crit : ndarray
         The critical values at alpha=0.95 for different nvars.
@@ -1691,14 +1929,20 @@ def breaks_hansen(olsresults):
     Greene section 7.5.1, notation follows Greene
     """
     x = olsresults.model.exog
-    resid = array_like(olsresults.resid, "resid", shape=(x.shape[0], 1))
+    resid = np.asarray(olsresults.resid)
+    is_1d = resid.ndim == 1
+    resid = resid.reshape(x.shape[0], -1)
     nobs, nvars = x.shape
     resid2 = resid ** 2
-    ft = np.c_[x * resid[:, None], (resid2 - resid2.mean())]
+    # ft is (nobs, n_series, nvars + 1)
+    ft = np.concatenate((x[:, None, :] * resid[:, :, None],
+                         (resid2 - resid2.mean(0))[:, :, None]), axis=2)
     score = ft.cumsum(0)
-    f = nobs * (ft[:, :, None] * ft[:, None, :]).sum(0)
-    s = (score[:, :, None] * score[:, None, :]).sum(0)
-    h = np.trace(np.dot(np.linalg.inv(f), s))
+    f = nobs * np.einsum('tsi,tsj->sij', ft, ft)
+    s = np.einsum('tsi,tsj->sij', score, score)
+    h = np.trace(np.linalg.solve(f, s), axis1=1, axis2=2)
+    if is_1d:
+        h = h[0]
     crit95 = np.array([(2, 1.9), (6, 3.75), (15, 3.75), (19, 4.52)],
                       dtype=[("nobs", int), ("crit", float)])
     # TODO: get critical values from Bruce Hansen's 1992 paper
@@ -1712,17 +1956,18 @@ def breaks_cusumolsresid(resid, ddof=0):
     Parameters
     ----------
     resid : ndarray
-        An array of residuals from an OLS estimation.
+        An array of residuals from an OLS estimation. If resid is 2-dimensional
+        with more than one column, then the test is computed for each column.
     ddof : int
         The number of parameters in the OLS estimation, used as degrees
         of freedom correction for error variance.
 
     Returns
     -------
-    sup_b : float
+    sup_b : {float, ndarray}
         The test statistic, maximum of absolute value of scaled cumulative OLS
         residuals.
-    pval : float
+    pval : {float, ndarray}
         Probability of observing the data under the null hypothesis of no
         structural change, based on asymptotic distribution which is a Brownian
         Bridge
@@ -1747,15 +1992,17 @@ def breaks_cusumolsresid(resid, ddof=0):
     Ploberger, Werner, and Walter Kramer. “The Cusum Test with OLS Residuals.”
     Econometrica 60, no. 2 (March 1992): 271-285.
     """
-    resid = resid.ravel()
+    resid = np.asarray(resid)
+    if resid.ndim < 2 or resid.shape[1] == 1:
+        resid = resid.ravel()
     nobs = len(resid)
-    nobssigma2 = (resid ** 2).sum()
+    nobssigma2 = (resid ** 2).sum(0)
     if ddof > 0:
         nobssigma2 = nobssigma2 / (nobs - ddof) * nobs
     # b is asymptotically a Brownian Bridge
-    b = resid.cumsum() / np.sqrt(nobssigma2)  # use T*sigma directly
+    b = resid.cumsum(0) / np.sqrt(nobssigma2)  # use T*sigma directly
     # asymptotically distributed as standard Brownian Bridge
-    sup_b = np.abs(b).max()
+    sup_b = np.abs(b).max(0)
     crit = [(1, 1.63), (5, 1.36), (10, 1.22)]
     # Note stats.kstwobign.isf(0.1) is distribution of sup.abs of Brownian
     # Bridge
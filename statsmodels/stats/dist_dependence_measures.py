@@ -12,15 +12,20 @@ References
 .. Szekely, G.J., Rizzo, M.L., and Bakirov, N.K. (2007)
    "Measuring and testing dependence by correlation of distances".
    Annals of Statistics, Vol. 35 No. 6, pp. 2769-2794.
+.. Huo, X. and Szekely, G.J. (2016)
+   "Fast computing for distance covariance".
+   Technometrics, Vol. 58 No. 4, pp. 435-447.
 
 """
 import numpy as np
 import warnings
 from collections import namedtuple
 
-from scipy.spatial.distance import pdist, squareform
+from scipy.spatial.distance import cdist, pdist, squareform
 from scipy.stats import norm
 
+from statsmodels.tools.parallel import parallel_func
+
 
 DistDependStat = namedtuple(
     "DistDependStat",
@@ -29,7 +34,7 @@ DistDependStat = namedtuple(
 )
 
 
-def distance_covariance_test(x, y, B=None, method="auto"):
+def distance_covariance_test(x, y, B=None, method="auto", n_jobs=1):
     r"""The Distance Covariance (dCov) test
 
     Apply the Distance Covariance (dCov) test of independence to `x` and `y`.
@@ -65,6 +70,12 @@ def distance_covariance_test(x, y, B=None, method="auto"):
           the rows of `y` to obtain the null distribution.
         - `asym` : An asymptotic approximation of the distribution of the test
           statistic is used to find the p-value.
+    n_jobs : int, optional, default=1
+        The number of jobs used to compute the test statistic for the
+        permutations of `y` when the `emp` method is applied. ``-1`` uses all
+        available cores. The permutations are drawn from the global numpy
+        random state in the main process, so that the p-value does not
+        depend on `n_jobs`.
 
     Returns
     -------
@@ -89,11 +100,19 @@ def distance_covariance_test(x, y, B=None, method="auto"):
     from independence, including nonlinear or nonmonotone dependence
     structure.
 
+    The distance matrix of `x` is computed and centered only once for all
+    permutations of `y`. If both `x` and `y` are univariate, then no
+    distance matrix is needed and the test statistic of each permutation is
+    computed in O(n log(n)) operations with the algorithm of [2]_.
+
     References
     ----------
     .. [1] Szekely, G.J., Rizzo, M.L., and Bakirov, N.K. (2007)
        "Measuring and testing by correlation of distances".
        Annals of Statistics, Vol. 35 No. 6, pp. 2769-2794.
+    .. [2] Huo, X. and Szekely, G.J. (2016)
+       "Fast computing for distance covariance".
+       Technometrics, Vol. 58 No. 4, pp. 435-447.
 
     Examples
     --------
@@ -117,7 +136,8 @@ def distance_covariance_test(x, y, B=None, method="auto"):
 
     if method == "auto" and n <= 500 or method == "emp":
         chosen_method = "emp"
-        test_statistic, pval = _empirical_pvalue(x, y, B, n, stats)
+        test_statistic, pval = _empirical_pvalue(x, y, B, n, stats,
+                                                 n_jobs=n_jobs)
 
     elif method == "auto" and n > 500 or method == "asym":
         chosen_method = "asym"
@@ -186,7 +206,7 @@ def _validate_and_tranform_x_and_y(x, y):
     return x, y
 
 
-def _empirical_pvalue(x, y, B, n, stats):
+def _empirical_pvalue(x, y, B, n, stats, n_jobs=1):
     r"""Calculate the empirical p-value based on permutations of `y`'s rows
 
     Parameters
@@ -207,6 +227,8 @@ def _empirical_pvalue(x, y, B, n, stats):
     n : Number of observations found in each of `x` and `y`.
     stats: namedtuple
         The result obtained from calling ``distance_statistics(x, y)``.
+    n_jobs : int
+        The number of jobs used to evaluate the null distribution.
 
     Returns
     -------
@@ -217,7 +239,7 @@ def _empirical_pvalue(x, y, B, n, stats):
 
     """
     B = int(B) if B else int(np.floor(200 + 5000 / n))
-    empirical_dist = _get_test_statistic_distribution(x, y, B)
+    empirical_dist = _get_test_statistic_distribution(x, y, B, n_jobs=n_jobs)
     pval = 1 - np.searchsorted(
         sorted(empirical_dist), stats.test_statistic
     ) / len(empirical_dist)
@@ -249,7 +271,7 @@ def _asymptotic_pvalue(stats):
     return test_statistic, pval
 
 
-def _get_test_statistic_distribution(x, y, B):
+def _get_test_statistic_distribution(x, y, B, n_jobs=1):
     r"""
     Parameters
     ----------
@@ -267,22 +289,197 @@ def _get_test_statistic_distribution(x, y, B):
     B : int
         The number of iterations to perform when evaluating the null
         distribution.
+    n_jobs : int
+        The number of jobs used to compute the statistics of the
+        permutations.
 
     Returns
     -------
     emp_dist : array_like
         The empirical distribution of the test statistic.
 
+    Notes
+    -----
+    Permuting the rows of `y` permutes the rows and columns of its distance
+    matrix, and the test statistic is ``n * mean(A * B)`` where `A` and `B`
+    are the double centered distance matrices. Since `A` is double centered,
+    `B` can be replaced by the uncentered distance matrix of `y`, so the
+    distance matrices are computed and `A` is centered only once. For
+    univariate `x` and `y` the statistic of each permutation is computed
+    with the O(n log(n)) algorithm instead.
     """
-    y = y.copy()
-    emp_dist = np.zeros(B)
-    x_dist = squareform(pdist(x, "euclidean"))
+    x, y = _validate_and_tranform_x_and_y(x, y)
+    n = x.shape[0]
 
-    for i in range(B):
-        np.random.shuffle(y)
-        emp_dist[i] = distance_statistics(x, y, x_dist=x_dist).test_statistic
+    if x.shape[1] == 1 and y.shape[1] == 1:
+        x = np.asarray(x[:, 0], dtype=np.float64)
+        y = np.asarray(y[:, 0], dtype=np.float64)
+        order = np.argsort(x, kind="mergesort")
+        x_sorted = x[order] - x.mean()
+        a_rows = _dist_row_sums_1d(x)[order]
+        b_rows = _dist_row_sums_1d(y)
+        y_rank = np.empty(n, dtype=np.intp)
+        y_rank[np.argsort(y, kind="mergesort")] = np.arange(n)
+        func = _permutation_statistics_1d
+        args = (order, x_sorted, a_rows, y - y.mean(), y_rank, b_rows)
+    else:
+        a = squareform(pdist(x, "euclidean"))
+        a -= a.mean(axis=0, keepdims=True)
+        a -= a.mean(axis=1, keepdims=True)
+        func = _permutation_statistics_dist
+        args = (a, squareform(pdist(y, "euclidean")))
+
+    parallel, p_func, n_jobs = parallel_func(func, n_jobs, verbose=0)
+    # bound the memory used by the permutation indices
+    n_chunks = min(B, max(n_jobs, -(-B * n // 2 ** 20)))
+    emp_dist = parallel(p_func(perms, *args)
+                        for perms in _permutation_chunks(n, B, n_chunks))
+
+    return np.concatenate(emp_dist)
+
+
+def _permutation_chunks(n, B, n_chunks):
+    """Draw B permutations of range(n) in n_chunks arrays of permutations"""
+    for size in np.diff(np.linspace(0, B, n_chunks + 1).astype(int)):
+        yield np.array([np.random.permutation(n) for _ in range(size)])
+
+
+def _permutation_statistics_dist(perms, a_centered, b):
+    """test statistic for permutations of y given the distance matrices"""
+    n = b.shape[0]
+    stats = np.empty(len(perms))
+    for i, perm in enumerate(perms):
+        stats[i] = np.einsum("ij,ij->", a_centered,
+                             b[np.ix_(perm, perm)]) / n
+    return stats
+
+
+def _permutation_statistics_1d(perms, order, x_sorted, a_rows, y, y_rank,
+                               b_rows):
+    """test statistic for permutations of univariate y, O(n log(n)) each"""
+    n = len(y)
+    sum_a = a_rows.sum()
+    sum_b = b_rows.sum()
+    stats = np.empty(len(perms))
+    for i, perm in enumerate(perms):
+        idx = perm[order]
+        sum_ab = _dist_cross_sum_1d(x_sorted, y[idx], y_rank[idx])
+        stats[i] = (sum_ab / n - 2 * a_rows.dot(b_rows[idx]) / n ** 2 +
+                    sum_a * sum_b / n ** 3)
+    return stats
+
+
+def _dist_row_sums_1d(x):
+    """Row sums of the distance matrix of univariate x in O(n log(n))"""
+    n = len(x)
+    order = np.argsort(x, kind="mergesort")
+    x_sorted = x[order] - x.mean()
+    # sum of the smaller values and sum of the larger values
+    before = np.cumsum(x_sorted) - x_sorted
+    row_sums = np.empty(n)
+    row_sums[order] = (x_sorted * (2 * np.arange(n) - n) + x_sorted.sum() -
+                       2 * before)
+    return row_sums
+
+
+def _dist_cross_sum_1d(x_sorted, y, y_rank):
+    """Sum of |x_i - x_j| * |y_i - y_j| over all i, j in O(n log(n))
 
-    return emp_dist
+    Parameters
+    ----------
+    x_sorted : ndarray, 1-D
+        The sorted, univariate `x`.
+    y : ndarray, 1-D
+        The univariate `y` in the order of `x_sorted`.
+    y_rank : ndarray, 1-D
+        The ranks of `y`, integers ``0, ..., n - 1`` without ties.
+
+    Notes
+    -----
+    For j < i we have ``x_j <= x_i`` and the sum over pairs is
+    ``2 * U - T``, where T is the sum of ``(x_i - x_j) * (y_i - y_j)`` over
+    all pairs, and U is the same sum restricted to the pairs with
+    ``y_j < y_i``. Ties do not matter because the terms are zero. The terms
+    of U are expanded into sums of ``1, x_j, y_j, x_j * y_j`` over the j that
+    precede i in both orders. These dominance sums are computed by a merge
+    over dyadic blocks of positions, as in [1]_.
+
+    References
+    ----------
+    .. [1] Huo, X. and Szekely, G.J. (2016)
+       "Fast computing for distance covariance".
+       Technometrics, Vol. 58 No. 4, pp. 435-447.
+    """
+    n = len(y)
+    x = x_sorted - x_sorted.mean()
+    y = y - y.mean()
+    weights = np.column_stack((np.ones(n), x, y, x * y))
+    dominance = np.zeros((n, 4))
+    position = np.arange(n)
+    half = 1
+    while half < n:
+        # elements in the right half of a block of size 2 * half get the
+        # sums over the elements in the left half with smaller rank
+        block = position // (2 * half)
+        right = (position // half) % 2 == 1
+        key = block * n + y_rank
+        left_idx = np.nonzero(~right)[0]
+        right_idx = np.nonzero(right)[0]
+        left_order = left_idx[np.argsort(key[left_idx])]
+        left_key = key[left_order]
+        cum = np.zeros((len(left_order) + 1, 4))
+        np.cumsum(weights[left_order], axis=0, out=cum[1:])
+        upper = np.searchsorted(left_key, key[right_idx])
+        lower = np.searchsorted(left_key, block[right_idx] * n)
+        dominance[right_idx] += cum[upper] - cum[lower]
+        half *= 2
+
+    count, sum_x, sum_y, sum_xy = dominance.T
+    u = (x * y * count - x * sum_y - y * sum_x + sum_xy).sum()
+    t = n * x.dot(y)
+    return 2 * (2 * u - t)
+
+
+def _dist_sums(x, y):
+    """Sums that determine the distance dependence statistics
+
+    Returns the sums of the products of the distances of `x` and `y`, of the
+    squared distances of `x` and of `y`, and the row sums of both distance
+    matrices. The n by n distance matrices are never stored at once.
+    Univariate `x` and `y` use O(n log(n)) algorithms, otherwise the
+    distances are computed for blocks of rows.
+    """
+    n = x.shape[0]
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x = x - x.mean(0)
+    y = y - y.mean(0)
+    # sum of squared euclidean distances
+    sum_aa = 2 * n * (x ** 2).sum()
+    sum_bb = 2 * n * (y ** 2).sum()
+
+    if x.shape[1] == 1 and y.shape[1] == 1:
+        x = x[:, 0]
+        y = y[:, 0]
+        order = np.argsort(x, kind="mergesort")
+        y_rank = np.empty(n, dtype=np.intp)
+        y_rank[np.argsort(y[order], kind="mergesort")] = np.arange(n)
+        sum_ab = _dist_cross_sum_1d(x[order], y[order], y_rank)
+        return (sum_ab, sum_aa, sum_bb, _dist_row_sums_1d(x),
+                _dist_row_sums_1d(y))
+
+    a_rows = np.empty(n)
+    b_rows = np.empty(n)
+    sum_ab = 0.
+    block_size = max(2 ** 20 // n, 1)
+    for start in range(0, n, block_size):
+        sl = slice(start, start + block_size)
+        a = cdist(x[sl], x, "euclidean")
+        b = cdist(y[sl], y, "euclidean")
+        a_rows[sl] = a.sum(1)
+        b_rows[sl] = b.sum(1)
+        sum_ab += np.einsum("ij,ij->", a, b)
+    return sum_ab, sum_aa, sum_bb, a_rows, b_rows
 
 
 def distance_statistics(x, y, x_dist=None, y_dist=None):
@@ -328,11 +525,29 @@ def distance_statistics(x, y, x_dist=None, y_dist=None):
         - S : float - The mean of the euclidean distances in `x` multiplied
           by those of `y`. Mostly used internally.
 
+    Notes
+    -----
+    If neither `x_dist` nor `y_dist` is given, then the n by n distance
+    matrices are not constructed. The statistics only depend on the sums of
+    the products of distances and on the row sums of the distance matrices,
+    because for double centered `A` and distance matrix `b` of `y`
+
+    .. math:: \sum_{ij} A_{ij} B_{ij} = \sum_{ij} a_{ij} b_{ij} -
+              \frac{2}{n} \sum_i a_{i.} b_{i.} + \frac{1}{n^2} a_{..} b_{..}
+
+    If both `x` and `y` are univariate, then these sums are computed in
+    O(n log(n)) operations and O(n) memory with the algorithm of [2]_.
+    Otherwise, the distances are computed for blocks of rows, which needs
+    O(n**2) operations but only O(n) memory.
+
     References
     ----------
     .. [1] Szekely, G.J., Rizzo, M.L., and Bakirov, N.K. (2007)
        "Measuring and testing dependence by correlation of distances".
        Annals of Statistics, Vol. 35 No. 6, pp. 2769-2794.
+    .. [2] Huo, X. and Szekely, G.J. (2016)
+       "Fast computing for distance covariance".
+       Technometrics, Vol. 58 No. 4, pp. 435-447.
 
     Examples
     --------
@@ -351,23 +566,43 @@ def distance_statistics(x, y, x_dist=None, y_dist=None):
 
     n = x.shape[0]
 
-    a = x_dist if x_dist is not None else squareform(pdist(x, "euclidean"))
-    b = y_dist if y_dist is not None else squareform(pdist(y, "euclidean"))
+    if x_dist is None and y_dist is None:
+        sum_ab, sum_aa, sum_bb, a_rows, b_rows = _dist_sums(x, y)
+        a_mean = a_rows.sum() / n ** 2
+        b_mean = b_rows.sum() / n ** 2
+
+        def _mean_product(sum_prod, rows1, mean1, rows2, mean2):
+            # rounding can give tiny negative values for independent samples
+            mean_prod = (sum_prod / n ** 2 - 2 * rows1.dot(rows2) / n ** 3 +
+                         mean1 * mean2)
+            return max(mean_prod, 0)
+
+        dcov = np.sqrt(_mean_product(sum_ab, a_rows, a_mean, b_rows, b_mean))
+        dvar_x = np.sqrt(_mean_product(sum_aa, a_rows, a_mean, a_rows,
+                                       a_mean))
+        dvar_y = np.sqrt(_mean_product(sum_bb, b_rows, b_mean, b_rows,
+                                       b_mean))
+    else:
+        a = (x_dist if x_dist is not None
+             else squareform(pdist(x, "euclidean")))
+        b = (y_dist if y_dist is not None
+             else squareform(pdist(y, "euclidean")))
+
+        a_row_means = a.mean(axis=0, keepdims=True)
+        b_row_means = b.mean(axis=0, keepdims=True)
+        a_col_means = a.mean(axis=1, keepdims=True)
+        b_col_means = b.mean(axis=1, keepdims=True)
+        a_mean = a.mean()
+        b_mean = b.mean()
 
-    a_row_means = a.mean(axis=0, keepdims=True)
-    b_row_means = b.mean(axis=0, keepdims=True)
-    a_col_means = a.mean(axis=1, keepdims=True)
-    b_col_means = b.mean(axis=1, keepdims=True)
-    a_mean = a.mean()
-    b_mean = b.mean()
+        A = a - a_row_means - a_col_means + a_mean
+        B = b - b_row_means - b_col_means + b_mean
 
-    A = a - a_row_means - a_col_means + a_mean
-    B = b - b_row_means - b_col_means + b_mean
+        dcov = np.sqrt(np.multiply(A, B).mean())
+        dvar_x = np.sqrt(np.multiply(A, A).mean())
+        dvar_y = np.sqrt(np.multiply(B, B).mean())
 
     S = a_mean * b_mean
-    dcov = np.sqrt(np.multiply(A, B).mean())
-    dvar_x = np.sqrt(np.multiply(A, A).mean())
-    dvar_y = np.sqrt(np.multiply(B, B).mean())
     dcor = dcov / np.sqrt(dvar_x * dvar_y)
 
     test_statistic = n * dcov ** 2
@@ -7,6 +7,7 @@ Author: Josef Perktold
 License: BSD-3
 """
 from collections import defaultdict
+import copy
 
 import numpy as np
 
@@ -16,6 +17,7 @@ from statsmodels.graphics._regressionplots_doc import _plot_influence_doc
 from statsmodels.regression.linear_model import OLS
 from statsmodels.stats.multitest import multipletests
 from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.parallel import parallel_func
 from statsmodels.tools.tools import maybe_unwrap_results
 
 
@@ -179,7 +181,7 @@ def variance_inflation_factor(exog, exog_idx):
 
     See Also
     --------
-    xxx : class for regression diagnostics  TODO: does not exist yet
+    variance_inflation_factors : VIF for all variables
 
     References
     ----------
@@ -194,6 +196,242 @@ def variance_inflation_factor(exog, exog_idx):
     return vif
 
 
+def _moments_chunked(exog, chunksize=None):
+    """mean, centered cross-products and range of the columns of exog
+
+    exog is either an array or an iterator of row blocks of the array. The
+    blocks are combined with the pairwise update of Chan, Golub and LeVeque
+    so that only one block needs to be in memory.
+    """
+    if hasattr(exog, 'shape') or iter(exog) is not exog:
+        exog = np.asarray(exog, dtype=np.float64)
+        if exog.ndim != 2:
+            raise ValueError('exog must be 2-dimensional')
+        if chunksize is None:
+            blocks = (exog[sl] for sl in _row_chunks(*exog.shape,
+                                                     max_elements=2 ** 20))
+        else:
+            blocks = (exog[i:i + chunksize]
+                      for i in range(0, exog.shape[0], chunksize))
+    else:
+        blocks = exog
+
+    nobs = 0
+    mean = m2 = exog_min = exog_max = None
+    for block in blocks:
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim != 2:
+            raise ValueError('blocks of exog must be 2-dimensional')
+        nobs_b = block.shape[0]
+        if nobs_b == 0:
+            continue
+        mean_b = block.mean(0)
+        block = block - mean_b
+        m2_b = np.dot(block.T, block)
+        block += mean_b
+        if nobs == 0:
+            mean, m2 = mean_b, m2_b
+            exog_min, exog_max = block.min(0), block.max(0)
+        else:
+            delta = mean_b - mean
+            nobs_all = nobs + nobs_b
+            m2 = m2 + m2_b + np.outer(delta, delta) * (nobs * nobs_b /
+                                                       nobs_all)
+            mean = mean + delta * (nobs_b / nobs_all)
+            exog_min = np.minimum(exog_min, block.min(0))
+            exog_max = np.maximum(exog_max, block.max(0))
+        nobs += nobs_b
+    if nobs == 0:
+        raise ValueError('exog does not contain any observations')
+    return nobs, mean, m2, exog_min, exog_max
+
+
+def _inv_rank_revealing(mat):
+    """inverse of a positive semi-definite matrix with singular fallback
+
+    Returns
+    -------
+    inv_diag : ndarray
+        Diagonal of the inverse. It is inf for the columns that are linear
+        combinations of other columns.
+    keep : ndarray
+        Index of a maximal set of linearly independent columns, that contains
+        all columns with finite inv_diag.
+    inv_keep : ndarray
+        Inverse of ``mat[keep][:, keep]``.
+    null : ndarray
+        Basis of the null space of mat.
+    """
+    k = mat.shape[0]
+    eigval, eigvec = np.linalg.eigh(mat)
+    tol = max(eigval.max(), 0) * k * np.finfo(np.float64).eps
+    null = eigvec[:, eigval <= tol]
+    if null.shape[1] == 0:
+        inv = np.linalg.inv(mat)
+        return np.diag(inv).copy(), np.arange(k), inv, null
+
+    from scipy import linalg
+    # columns that are linear combinations of other columns
+    collinear = (np.abs(null) > np.sqrt(np.finfo(np.float64).eps)).any(1)
+    idx_collinear = np.nonzero(collinear)[0]
+    rank = len(idx_collinear) - null.shape[1]
+    sub = mat[np.ix_(idx_collinear, idx_collinear)]
+    _, _, piv = linalg.qr(sub, pivoting=True)
+    keep = np.sort(np.concatenate((np.nonzero(~collinear)[0],
+                                   idx_collinear[piv[:rank]])))
+    inv_keep = np.linalg.inv(mat[np.ix_(keep, keep)])
+    inv_diag = np.full(k, np.inf)
+    free = ~collinear[keep]
+    inv_diag[keep[free]] = np.diag(inv_keep)[free]
+    return inv_diag, keep, inv_keep, null
+
+
+def variance_inflation_factors(exog, chunksize=None):
+    """variance inflation factors, VIF, for all exogenous variables
+
+    This gives the same results as calling `variance_inflation_factor` for
+    each column of exog, but all VIF are computed from a single
+    factorization of the cross-product matrix of exog instead of one
+    auxiliary regression per variable. Only for variables that are linear
+    combinations of the other variables the results differ, these have an
+    infinite VIF here, while the auxiliary regressions give values that
+    depend on floating point noise.
+
+    Parameters
+    ----------
+    exog : array_like or iterator
+        design matrix with all explanatory variables, as for example used in
+        regression. This can also be an iterator that yields the design
+        matrix in blocks of rows, e.g. read from disk, so that the full
+        matrix is never in memory.
+    chunksize : int, optional
+        number of rows used in the computation of the cross-product matrix
+        at a time if exog is an array. The default uses blocks with about a
+        million elements.
+
+    Returns
+    -------
+    vif : ndarray
+        variance inflation factor for each column of exog. It is inf for
+        columns that are linear combinations of the other columns.
+
+    See Also
+    --------
+    variance_inflation_factor : VIF for one variable
+
+    Notes
+    -----
+    The VIF of a variable is ``1 / (1 - rsquared)`` of the auxiliary
+    regression of the variable on all other variables, which equals
+    ``tss_i * inv(exog.T @ exog)[i, i]``. The total sum of squares `tss_i`
+    is centered if the other variables contain a constant, explicitly or
+    implicitly, and uncentered otherwise, as in OLS.
+
+    If exog has a constant column, then the VIF of the other variables are
+    the diagonal elements of the inverse of the correlation matrix, which
+    is computed from centered cross-products for numerical accuracy. The
+    cross-products are accumulated over blocks of rows.
+
+    If the design matrix is singular, then the variables that are linear
+    combinations of other variables are identified from the null space of
+    the cross-product matrix and have infinite VIF. The VIF of the
+    remaining variables are computed from a maximal set of linearly
+    independent variables, which spans the same space.
+
+    References
+    ----------
+    https://en.wikipedia.org/wiki/Variance_inflation_factor
+    """
+    nobs, mean, m2, exog_min, exog_max = _moments_chunked(exog, chunksize)
+    k_vars = len(mean)
+    vif = np.full(k_vars, np.inf)
+    eps = np.sqrt(np.finfo(np.float64).eps)
+
+    const = np.nonzero((exog_min == exog_max) & (mean != 0))[0]
+    nonconst = np.nonzero(exog_min != exog_max)[0]
+    if len(const) == 1 and len(nonconst) == k_vars - 1:
+        # Partialling out the constant is centering, the VIF are the
+        # diagonal of the inverse of the correlation matrix
+        std = np.sqrt(np.diag(m2)[nonconst])
+        corr = m2[np.ix_(nonconst, nonconst)] / np.outer(std, std)
+        inv_diag, keep, inv_keep, null = _inv_rank_revealing(corr)
+        vif[nonconst] = inv_diag
+        # VIF of the constant is nobs / ssr of regressing it on the others
+        mean_std = mean[nonconst] / std * np.sqrt(nobs)
+        if np.all(np.abs(np.dot(null.T, mean_std)) <=
+                  eps * max(1, np.linalg.norm(mean_std))):
+            vif[const] = 1 + mean_std[keep].dot(inv_keep).dot(mean_std[keep])
+        return vif
+
+    # general case, uncentered cross-products scaled to unit diagonal
+    xtx = m2 + nobs * np.outer(mean, mean)
+    tss_uncentered = np.diag(xtx)
+    scale = np.sqrt(tss_uncentered)
+    scale[scale == 0] = 1
+    inv_diag, keep, inv_keep, _ = _inv_rank_revealing(
+        xtx / np.outer(scale, scale))
+    # Regress the constant on the columns in keep. If it is in their span,
+    # then it is in the span of the other columns for all variables that do
+    # not contribute to it.
+    xt1 = (nobs * mean / scale)[keep]
+    coef = np.zeros(k_vars)
+    coef[keep] = inv_keep.dot(xt1)
+    ssr_const = nobs - xt1.dot(coef[keep])
+    has_const = (ssr_const <= eps * nobs) & (np.abs(coef) <= eps *
+                                             np.sqrt(nobs))
+    tss = np.where(has_const, np.diag(m2), tss_uncentered)
+    finite = np.isfinite(inv_diag)
+    vif[finite] = (tss / scale ** 2 * inv_diag)[finite]
+    return vif
+
+
+def _row_chunks(nobs, k_vars, max_elements=2 ** 16):
+    """slices of rows so that chunks of nobs x k_vars arrays stay small
+    """
+    chunksize = max(max_elements // max(k_vars, 1), 1)
+    for start in range(0, nobs, chunksize):
+        yield slice(start, start + chunksize)
+
+
+def _fit_looo(model_class, endog, exog, init_kwds, fit_kwds, indices):
+    """reestimate a model dropping each observation in indices in turn
+
+    Arrays in init_kwds with one row per observation are subset in the same
+    way as endog and exog.
+
+    Returns
+    -------
+    params, scale, det_cov_params : ndarray
+        Results of the estimates for the observations in indices.
+    """
+    nobs = endog.shape[0]
+    params = np.empty((len(indices), exog.shape[1]))
+    scale = np.empty(len(indices))
+    det_cov_params = np.empty(len(indices))
+    for j, idx in enumerate(indices):
+        mask = np.ones(nobs, bool)
+        mask[idx] = False
+        kwds = {}
+        for key, value in init_kwds.items():
+            if (isinstance(value, np.ndarray) and value.ndim > 0 and
+                    value.shape[0] == nobs):
+                kwds[key] = value[mask]
+            else:
+                # e.g. the family instance in GLM has state
+                kwds[key] = copy.deepcopy(value)
+        mod_i = model_class(endog[mask], exog[mask], **kwds)
+        family = getattr(mod_i, 'family', None)
+        if 'n_trials' in kwds and hasattr(family, 'initialize'):
+            # family Binomial creates `n` i.e. `n_trials`
+            # we need to reset it
+            family.n = kwds['n_trials']
+        res_i = mod_i.fit(**fit_kwds)
+        params[j] = res_i.params
+        scale[j] = res_i.scale
+        det_cov_params[j] = np.linalg.det(res_i.cov_params())
+    return params, scale, det_cov_params
+
+
 class _BaseInfluenceMixin(object):
     """common methods between OLSInfluence and MLE/GLMInfluence
     """
@@ -313,9 +551,9 @@ class MLEInfluence(_BaseInfluenceMixin):
     other arguments are only to override default behavior and are used instead
     of the corresponding attribute of the results class.
     By default resid_pearson is used as resid.
-
-
-
+    n_jobs : int
+        Number of jobs used in the exact leave-one-observation-out
+        reestimation of the model, see ``params_not_obsi``. Default is 1.
 
     Attributes
     ----------
@@ -339,6 +577,9 @@ class MLEInfluence(_BaseInfluenceMixin):
         errors of a predicted mean of the response.
     params_one : is the one step parameter estimate computed as ``params``
         from the full sample minus ``d_params``.
+    params_not_obsi : exact parameter estimates reestimating the model
+        without each observation. This requires nobs estimations of the model
+        which can be run in parallel, see ``n_jobs``.
 
     Notes
     -----
@@ -346,6 +587,13 @@ class MLEInfluence(_BaseInfluenceMixin):
     Binomial and Gaussian). There will be some differences for non-canonical
     links or if a robust cov_type is used.
 
+    The one step measures only require the Hessian of the full sample and
+    are computed in chunks of observations in O(nobs k_vars**2) operations,
+    so that they are available also for large samples. This requires the
+    helper methods ``_deriv_mean_dparams`` and ``_deriv_score_obs_dendog``
+    of the model, which are currently available in GLM and in the discrete
+    Logit and Poisson models.
+
     Warning: This does currently not work for constrained or penalized models,
     e.g. models estimated with fit_constrained or fit_regularized.
 
@@ -359,7 +607,8 @@ class MLEInfluence(_BaseInfluenceMixin):
     """
 
     def __init__(self, results, resid=None, endog=None, exog=None,
-                 hat_matrix_diag=None, cov_params=None, scale=None):
+                 hat_matrix_diag=None, cov_params=None, scale=None,
+                 n_jobs=1):
         # I'm not calling super for now, OLS attributes might not be available
         # check which model is allowed
         self.results = results = maybe_unwrap_results(results)
@@ -372,12 +621,23 @@ class MLEInfluence(_BaseInfluenceMixin):
         self.cov_params = (cov_params if cov_params is not None
                            else results.cov_params())
         self.model_class = results.model.__class__
+        self.n_jobs = n_jobs
 
         self.hessian = self.results.model.hessian(self.results.params)
-        self.score_obs = self.results.model.score_obs(self.results.params)
         if hat_matrix_diag is not None:
             self._hat_matrix_diag = hat_matrix_diag
 
+    @cache_readonly
+    def score_obs(self):
+        """score_obs of the model at the estimated parameters
+        """
+        return self.results.model.score_obs(self.results.params)
+
+    @cache_readonly
+    def _hessian_inv(self):
+        # inverse of the negative hessian, computed once for all observations
+        return np.linalg.inv(-self.hessian)
+
     @cache_readonly
     def hat_matrix_diag(self):
         """Diagonal of the generalized leverage
@@ -391,7 +651,10 @@ class MLEInfluence(_BaseInfluenceMixin):
         dsdy = self.results.model._deriv_score_obs_dendog(self.results.params)
         # dmu_dp = 1 /
         #      self.results.model.family.link.deriv(self.results.fittedvalues)
-        h = (dmu_dp * np.linalg.solve(-self.hessian, dsdy.T).T).sum(1)
+        h = np.empty(self.nobs)
+        for sl in _row_chunks(self.nobs, self.k_vars):
+            h[sl] = np.einsum('ij,ij->i', dmu_dp[sl],
+                              np.dot(dsdy[sl], self._hessian_inv))
         return h
 
     @cache_readonly
@@ -401,9 +664,15 @@ class MLEInfluence(_BaseInfluenceMixin):
         This uses one-step approximation of the parameter change to deleting
         one observation.
         """
-        so_noti = self.score_obs.sum(0) - self.score_obs
-        beta_i = np.linalg.solve(self.hessian, so_noti.T).T
-        return beta_i / (1 - self.hat_matrix_diag)[:, None]
+        score_obs = self.score_obs
+        score = score_obs.sum(0)
+        factor = 1 / (1 - self.hat_matrix_diag)
+        beta_i = np.empty(score_obs.shape)
+        for sl in _row_chunks(self.nobs, self.k_vars):
+            # solve(hessian, score - score_obs_i)
+            beta_i[sl] = np.dot(score_obs[sl] - score, self._hessian_inv)
+            beta_i[sl] *= factor[sl, None]
+        return beta_i
 
     @cache_readonly
     def dfbetas(self):
@@ -439,8 +708,12 @@ class MLEInfluence(_BaseInfluenceMixin):
         chi-square distribution instead of F-distribution, or if we make it
         dependent on the fit keyword use_t.
         """
-        cooks_d2 = (self.d_params * np.linalg.solve(self.cov_params,
-                                                    self.d_params.T).T).sum(1)
+        d_params = self.d_params
+        cov_inv = np.linalg.inv(self.cov_params)
+        cooks_d2 = np.empty(self.nobs)
+        for sl in _row_chunks(self.nobs, self.k_vars):
+            cooks_d2[sl] = np.einsum('ij,ij->i', d_params[sl],
+                                     np.dot(d_params[sl], cov_inv))
         cooks_d2 /= self.k_vars
         from scipy import stats
         # alpha = 0.1
@@ -482,7 +755,19 @@ class MLEInfluence(_BaseInfluenceMixin):
         # results.params might be a pandas.Series
         params = np.asarray(self.results.params)
         deriv = self.results.model._deriv_mean_dparams(params)
-        return (deriv * self.d_params).sum(1)
+        return np.einsum('ij,ij->i', deriv, self.d_params)
+
+    @cache_readonly
+    def _se_mean(self):
+        # standard errors of the predicted mean by the delta method, this is
+        # the same as se_mean of results.get_prediction
+        params = np.asarray(self.results.params)
+        deriv = self.results.model._deriv_mean_dparams(params)
+        var_mean = np.empty(self.nobs)
+        for sl in _row_chunks(self.nobs, self.k_vars):
+            var_mean[sl] = np.einsum('ij,ij->i', deriv[sl],
+                                     np.dot(deriv[sl], self.cov_params))
+        return np.sqrt(var_mean)
 
     @property
     def d_fittedvalues_scaled(self):
@@ -496,7 +781,49 @@ class MLEInfluence(_BaseInfluenceMixin):
         # Note: this and the previous methods are for the response
         # and not for a weighted response, i.e. not the self.exog, self.endog
         # this will be relevant for WLS comparing fitted endog versus wendog
-        return self.d_fittedvalues / self._get_prediction.se_mean
+        return self.d_fittedvalues / self._se_mean
+
+    @property
+    def params_not_obsi(self):
+        """parameter estimates for all LOOO regressions
+
+        This reestimates the model dropping one observation at a time,
+        starting at the parameter estimates of the full sample. The
+        estimation is run in parallel if n_jobs is larger than one.
+        """
+        return self._res_looo['params']
+
+    @cache_readonly
+    def _res_looo(self):
+        """collect required results from the LOOO loop
+
+        all results will be attached.
+        currently only 'params', 'mse_resid', 'det_cov_params' are stored
+
+        Reestimates the model with endog and exog dropping one observation
+        at a time. The observations are split into chunks that are processed
+        in parallel if n_jobs is larger than one.
+
+        Warning: This will need refactoring and API changes to be able to
+        add options.
+        """
+        model = self.results.model
+        init_kwds = model._get_init_kwds()
+        fit_kwds = dict(start_params=np.asarray(self.results.params),
+                        method='newton', disp=0)
+
+        parallel, p_func, n_jobs = parallel_func(_fit_looo, self.n_jobs,
+                                                 verbose=0)
+        n_chunks = 1 if n_jobs == 1 else min(4 * n_jobs, self.nobs)
+        chunks = np.array_split(np.arange(self.nobs), n_chunks)
+        res = parallel(p_func(self.model_class, model.endog, model.exog,
+                              init_kwds, fit_kwds, idx)
+                       for idx in chunks)
+        params, scale, det_cov_params = [np.concatenate(r) for r in zip(*res)]
+
+        return dict(params=params, scale=scale, mse_resid=scale,
+                    # alias for now
+                    det_cov_params=det_cov_params)
 
     def summary_frame(self):
         """
@@ -554,15 +881,13 @@ class OLSInfluence(_BaseInfluenceMixin):
     -----
     One part of the results can be calculated without any auxiliary regression
     (some of which have the `_internal` postfix in the name. Other statistics
-    require leave-one-observation-out (LOOO) auxiliary regression, and will be
-    slower (mainly results with `_external` postfix in the name).
-    The auxiliary LOOO regression only the required results are stored.
-
-    Using the LOO measures is currently only recommended if the data set
-    is not too large. One possible approach for LOOO measures would be to
-    identify possible problem observations with the _internal measures, and
-    then run the leave-one-observation-out only with observations that are
-    possible outliers. (However, this is not yet available in an automated way.)
+    are based on leave-one-observation-out (LOOO) estimates (mainly results
+    with `_external` postfix in the name). The LOOO estimates are not computed
+    by auxiliary regressions, but in closed form from the diagonal of the hat
+    matrix using the rank one update formulas for dropping an observation,
+    see e.g. Belsley, Kuh and Welsch (1980). Only the required results are
+    stored. The LOOO estimates use the whitened model, so they also match
+    leave-one-out WLS regressions.
 
     This should be extended to general least squares.
 
@@ -593,7 +918,7 @@ class OLSInfluence(_BaseInfluenceMixin):
         -----
         temporarily calculated here, this should go to model class
         """
-        return (self.exog * self.results.model.pinv_wexog.T).sum(1)
+        return np.einsum('ij,ji->i', self.exog, self.results.model.pinv_wexog)
 
     @cache_readonly
     def resid_press(self):
@@ -654,8 +979,6 @@ class OLSInfluence(_BaseInfluenceMixin):
         """Studentized residuals using LOOO variance
 
         this uses sigma from leave-one-out estimates
-
-        requires leave one out loop for observations
         """
         sigma_looo = np.sqrt(self.sigma2_not_obsi)
         return self.get_resid_studentized_external(sigma=sigma_looo)
@@ -739,7 +1062,7 @@ class OLSInfluence(_BaseInfluenceMixin):
         """dffits measure for influence of an observation
 
         based on resid_studentized_external,
-        uses results from leave-one-observation-out loop
+        uses results from leave-one-observation-out estimates
 
         It is recommended that observations with dffits large than a
         threshold of 2 sqrt{k / n} where k is the number of parameters, should
@@ -766,7 +1089,7 @@ class OLSInfluence(_BaseInfluenceMixin):
     def dfbetas(self):
         """dfbetas
 
-        uses results from leave-one-observation-out loop
+        uses results from leave-one-observation-out estimates
         """
         dfbetas = self.results.params - self.params_not_obsi  # [None,:]
         dfbetas /= np.sqrt(self.sigma2_not_obsi[:, None])
@@ -777,7 +1100,7 @@ class OLSInfluence(_BaseInfluenceMixin):
     def dfbeta(self):
         """dfbetas
 
-        uses results from leave-one-observation-out loop
+        uses results from leave-one-observation-out estimates
         """
         dfbeta = self.results.params - self.params_not_obsi
         return dfbeta
@@ -788,7 +1111,7 @@ class OLSInfluence(_BaseInfluenceMixin):
 
         This is 'mse_resid' from each auxiliary regression.
 
-        uses results from leave-one-observation-out loop
+        uses results from leave-one-observation-out estimates
         """
         return np.asarray(self._res_looo['mse_resid'])
 
@@ -796,7 +1119,7 @@ class OLSInfluence(_BaseInfluenceMixin):
     def params_not_obsi(self):
         """parameter estimates for all LOOO regressions
 
-        uses results from leave-one-observation-out loop
+        uses results from leave-one-observation-out estimates
         """
         return np.asarray(self._res_looo['params'])
 
@@ -804,7 +1127,7 @@ class OLSInfluence(_BaseInfluenceMixin):
     def det_cov_params_not_obsi(self):
         """determinant of cov_params of all LOOO regressions
 
-        uses results from leave-one-observation-out loop
+        uses results from leave-one-observation-out estimates
         """
         return np.asarray(self._res_looo['det_cov_params'])
 
@@ -814,7 +1137,6 @@ class OLSInfluence(_BaseInfluenceMixin):
 
         This uses determinant of the estimate of the parameter covariance
         from leave-one-out estimates.
-        requires leave one out loop for observations
         """
         # do not use inplace division / because then we change original
         cov_ratio = (self.det_cov_params_not_obsi
@@ -867,26 +1189,19 @@ class OLSInfluence(_BaseInfluenceMixin):
         this needs more thought, memory versus speed
         not yet used in any other parts, not sufficiently tested
         """
-        # reverse the structure, access store, if fail calculate ?
-        # this creates keys in store even if store = false ! bug
         if endog_idx == 'endog':
             stored = self.aux_regression_endog
-            if hasattr(stored, drop_idx):
-                return stored[drop_idx]
             x_i = self.results.model.endog
-
         else:
             # nested dictionary
-            try:
-                self.aux_regression_exog[endog_idx][drop_idx]
-            except KeyError:
-                pass
-
-            stored = self.aux_regression_exog[endog_idx]
-            stored = {}
-
+            stored = self.aux_regression_exog.get(endog_idx, {})
+            if store:
+                self.aux_regression_exog[endog_idx] = stored
             x_i = self.exog[:, endog_idx]
 
+        if drop_idx in stored:
+            return stored[drop_idx]
+
         k_vars = self.exog.shape[1]
         mask = np.arange(k_vars) != drop_idx
         x_noti = self.exog[:, mask]
@@ -927,33 +1242,48 @@ class OLSInfluence(_BaseInfluenceMixin):
 
     @cache_readonly
     def _res_looo(self):
-        """collect required results from the LOOO loop
+        """collect required results of the LOOO regressions
 
-        all results will be attached.
         currently only 'params', 'mse_resid', 'det_cov_params' are stored
 
-        regresses endog on exog dropping one observation at a time
+        These are the results of regressing endog on exog dropping one
+        observation at a time, but they are computed without auxiliary
+        regressions. The rank one updates are applied to the whitened
+        model, X = wexog and e = wresid, so that they are exact for OLS and
+        WLS. With h the diagonal of the hat matrix of the whitened model
+        and x the whitened exog of observation i, dropping the observation
+        gives
 
-        this uses a nobs loop, only attributes of the OLS instance are stored.
-        """
-        from statsmodels.sandbox.tools.cross_val import LeaveOneOut
-
-        def get_det_cov_params(res):
-            return np.linalg.det(res.cov_params())
+        - params_i = params - (X'X)^{-1} x e / (1 - h)
+        - ssr_i = ssr - e**2 / (1 - h) and df_resid_i = df_resid - 1
+        - det((X'X - x x')^{-1}) = det((X'X)^{-1}) / (1 - h)
 
-        endog = self.results.model.endog
-        exog = self.results.model.exog
+        For GLS with a non-diagonal sigma this drops one observation of the
+        whitened model and not of the original data.
 
-        params = np.zeros(exog.shape, dtype=np.float)
-        mse_resid = np.zeros(endog.shape, dtype=np.float)
-        det_cov_params = np.zeros(endog.shape, dtype=np.float)
-
-        cv_iter = LeaveOneOut(self.nobs)
-        for inidx, outidx in cv_iter:
-            res_i = self.model_class(endog[inidx], exog[inidx]).fit()
-            params[outidx] = res_i.params
-            mse_resid[outidx] = res_i.mse_resid
-            det_cov_params[outidx] = get_det_cov_params(res_i)
+        The observations are processed in chunks, so that the temporary
+        arrays do not grow with nobs.
+        """
+        results = self.results
+        exog = results.model.wexog
+        ncp = results.normalized_cov_params
+        resid = np.asarray(results.wresid, dtype=np.float64)
+        hii = np.einsum('ij,ji->i', exog, results.model.pinv_wexog)
+        loo_resid = resid / (1 - hii)
+
+        df_resid = results.df_resid - 1
+        mse_resid = (results.ssr - resid * loo_resid) / df_resid
+        # det of cov_params is the product of mse_resid ** k_vars and the
+        # det of normalized_cov_params, computed in logs against overflow
+        _, logdet = np.linalg.slogdet(ncp)
+        det_cov_params = np.exp(self.k_vars * np.log(mse_resid) + logdet -
+                                np.log1p(-hii))
+
+        params = np.empty((self.nobs, self.k_vars))
+        for sl in _row_chunks(self.nobs, self.k_vars):
+            params[sl] = np.dot(exog[sl], ncp)
+            params[sl] *= -loo_resid[sl, None]
+            params[sl] += results.params
 
         return dict(params=params, mse_resid=mse_resid,
                     det_cov_params=det_cov_params)
@@ -1196,7 +1526,7 @@ class GLMInfluence(MLEInfluence):
         if hasattr(self, '_hat_matrix_diag'):
             return self._hat_matrix_diag
         else:
-            return self.results.get_hat_matrix()
+            return self.results.get_hat_matrix_diag()
 
     @cache_readonly
     def d_params(self):
@@ -1208,9 +1538,15 @@ class GLMInfluence(MLEInfluence):
         one observation.
         """
 
-        beta_i = np.linalg.pinv(self.exog) * self.resid_studentized
-        beta_i /= np.sqrt(1 - self.hat_matrix_diag)
-        return beta_i.T
+        # rows of pinv(exog).T are x_i' pinv(exog'exog)
+        exog = self.exog
+        xtx_pinv = np.linalg.pinv(np.dot(exog.T, exog))
+        factor = self.resid_studentized / np.sqrt(1 - self.hat_matrix_diag)
+        beta_i = np.empty(exog.shape)
+        for sl in _row_chunks(self.nobs, self.k_vars):
+            beta_i[sl] = np.dot(exog[sl], xtx_pinv)
+            beta_i[sl] *= factor[sl, None]
+        return beta_i
 
     # same computation as OLS
     @cache_readonly
@@ -1303,72 +1639,3 @@ class GLMInfluence(MLEInfluence):
         """
         # in discrete we cannot reuse results.fittedvalues
         return self.results.predict() - self._fittedvalues_one
-
-    @cache_readonly
-    def _res_looo(self):
-        """collect required results from the LOOO loop
-
-        all results will be attached.
-        currently only 'params', 'mse_resid', 'det_cov_params' are stored
-
-        Reestimates the model with endog and exog dropping one observation
-        at a time
-
-        This uses a nobs loop, only attributes of the results instance are
-        stored.
-
-        Warning: This will need refactoring and API changes to be able to
-        add options.
-        """
-        from statsmodels.sandbox.tools.cross_val import LeaveOneOut
-        get_det_cov_params = lambda res: np.linalg.det(res.cov_params())
-
-        endog = self.results.model.endog
-        exog = self.results.model.exog
-
-        init_kwds = self.results.model._get_init_kwds()
-        # We need to drop obs also from extra arrays
-        freq_weights = init_kwds.pop('freq_weights')
-        var_weights = init_kwds.pop('var_weights')
-        offset = offset_ = init_kwds.pop('offset')
-        exposure = exposure_ = init_kwds.pop('exposure')
-        n_trials = init_kwds.pop('n_trials', None)
-        # family Binomial creates `n` i.e. `n_trials`
-        # we need to reset it
-        # TODO: figure out how to do this properly
-        if hasattr(init_kwds['family'], 'initialize'):
-            # assume we have Binomial
-            is_binomial = True
-        else:
-            is_binomial = False
-
-        params = np.zeros(exog.shape, dtype=np.float)
-        scale = np.zeros(endog.shape, dtype=np.float)
-        det_cov_params = np.zeros(endog.shape, dtype=np.float)
-
-        cv_iter = LeaveOneOut(self.nobs)
-        for inidx, outidx in cv_iter:
-            if offset is not None:
-                offset_ = offset[inidx]
-            if exposure is not None:
-                exposure_ = exposure[inidx]
-            if n_trials is not None:
-                init_kwds['n_trials'] = n_trials[inidx]
-
-            mod_i = self.model_class(endog[inidx], exog[inidx],
-                                     offset=offset_,
-                                     exposure=exposure_,
-                                     freq_weights=freq_weights[inidx],
-                                     var_weights=var_weights[inidx],
-                                     **init_kwds)
-            if is_binomial:
-                mod_i.family.n = init_kwds['n_trials']
-            res_i = mod_i.fit(start_params=self.results.params,
-                              method='newton')
-            params[outidx] = res_i.params.copy()
-            scale[outidx] = res_i.scale
-            det_cov_params[outidx] = get_det_cov_params(res_i)
-
-        return dict(params=params, scale=scale, mse_resid=scale,
-                    # alias for now
-                    det_cov_params=det_cov_params)
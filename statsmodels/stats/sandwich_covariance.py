@@ -101,12 +101,16 @@ for inference with clustered errors,” The Review of Economics and
 Statistics 90, no. 3 (2008): 414–427.
 
 """
+from itertools import combinations
+
 import numpy as np
+import pandas as pd
 
-from statsmodels.tools.grouputils import combine_indices, group_sums
+from statsmodels.tools.grouputils import group_sums
 from statsmodels.stats.moment_helpers import se_cov
 
-__all__ = ['cov_cluster', 'cov_cluster_2groups', 'cov_hac', 'cov_nw_panel',
+__all__ = ['cov_cluster', 'cov_cluster_2groups', 'cov_cluster_multiway',
+           'cov_hac', 'cov_nw_panel',
            'cov_white_simple',
            'cov_hc0', 'cov_hc1', 'cov_hc2', 'cov_hc3',
            'se_cov', 'weights_bartlett', 'weights_uniform']
@@ -359,6 +363,96 @@ kernel_dict = {'bartlett': weights_bartlett,
                'uniform': weights_uniform}
 
 
+def _hac_filter(x, weights, first=None):
+    '''one-sided kernel filter of x, restricted to lags within groups
+
+    y_t = sum_{j=0}^{nlags} weights[j] * x_{t-j} summing only over t-j that
+    are in the same group as t, i.e. t-j >= first[t]
+
+    Parameters
+    ----------
+    x : ndarray, (nobs, k_var)
+    weights : ndarray, (nlags+1,)
+    first : None or ndarray of int, (nobs,)
+        index of the first observation of the group of each observation. If
+        None, then x is a single time series.
+
+    Returns
+    -------
+    y : ndarray, (nobs, k_var)
+
+    Notes
+    -----
+    If the weights are linear in the lag, as the Bartlett and the uniform
+    kernel, and there are at least 16 lags, then the filter is computed
+    from cumulative sums of x and of t * x in O(nobs * k_var) operations
+    independent of the number of lags.
+    To limit cancellation, the columns of x are centered before the
+    cumulative sums are taken, and the filtered means are added back
+    exactly. The cumulative sums are restarted for blocks of 16 * (nlags + 1)
+    observations, so that t is small relative to the window. Otherwise the
+    filter needs one pass over the data for each lag.
+    '''
+    nobs = x.shape[0]
+    weights = np.asarray(weights, dtype=np.float64)
+    nlags = len(weights) - 1
+    idx = np.arange(nobs)
+    lowest = np.maximum(idx - nlags, 0)
+    if first is not None:
+        lowest = np.maximum(lowest, first)
+
+    slope = weights[0] - weights[1] if nlags > 0 else 0.
+    if nlags < 16 or not np.allclose(
+            weights, weights[0] - slope * np.arange(nlags + 1), rtol=0,
+            atol=1e-12 * np.abs(weights).max()):
+        y = weights[0] * x
+        for lag in range(1, min(nlags, nobs - 1) + 1):
+            valid = (lowest[lag:] <= idx[:-lag])[:, None]
+            y[lag:] += weights[lag] * np.where(valid, x[:-lag], 0)
+        return y
+
+    # weights[j] = weights[0] - slope * j, so that with sums over
+    # i = lowest[t], ..., t we have
+    # y_t = (weights[0] - slope * t) * sum x_i + slope * sum i * x_i
+    # The filter of the column means is the mean times the sum of the
+    # weights in the window of each observation.
+    mean = x.mean(0)
+    x = x - mean
+    cum_weights = np.cumsum(weights)
+    y = cum_weights[idx - lowest][:, None] * mean
+    block_size = 16 * (nlags + 1)
+    for start in range(0, nobs, block_size):
+        stop = min(start + block_size, nobs)
+        offset = max(start - nlags, 0)
+        xb = x[offset:stop]
+        tb = np.arange(stop - offset, dtype=np.float64)[:, None]
+        cum_x = np.zeros((xb.shape[0] + 1,) + xb.shape[1:])
+        np.cumsum(xb, axis=0, out=cum_x[1:])
+        cum_tx = np.zeros_like(cum_x)
+        np.cumsum(tb * xb, axis=0, out=cum_tx[1:])
+        t0 = start - offset
+        lo = lowest[start:stop] - offset
+        y[start:stop] += ((weights[0] - slope * tb[t0:]) * (cum_x[t0 + 1:] -
+                                                            cum_x[lo]) +
+                          slope * (cum_tx[t0 + 1:] - cum_tx[lo]))
+    return y
+
+
+def _hac_kernel_sum(x, weights, first=None):
+    '''kernel weighted sum of autocovariance matrices
+
+    S = weights[0] * x'x + sum_{j=1}^{nlags} weights[j] * (G_j + G_j')
+
+    where G_j = sum_t x_t x_{t-j}' over t and t-j in the same group. This
+    equals x'y + y'x - weights[0] * x'x, with y the one-sided kernel filter
+    of x computed by `_hac_filter`, so that no loop over lags or groups is
+    required.
+    '''
+    y = _hac_filter(x, weights, first=first)
+    s = np.dot(x.T, y)
+    return s + s.T - weights[0] * np.dot(x.T, x)
+
+
 def S_hac_simple(x, nlags=None, weights_func=weights_bartlett):
     '''inner covariance matrix for HAC (Newey, West) sandwich
 
@@ -388,6 +482,10 @@ def S_hac_simple(x, nlags=None, weights_func=weights_bartlett):
 
     options might change when other kernels besides Bartlett are available.
 
+    The lagged cross-products are not accumulated in a loop over lags. For
+    kernels with weights that are linear in the lag, e.g. Bartlett and
+    uniform, the computational cost does not depend on nlags.
+
     '''
 
     if x.ndim == 1:
@@ -398,13 +496,7 @@ def S_hac_simple(x, nlags=None, weights_func=weights_bartlett):
 
     weights = weights_func(nlags)
 
-    S = weights[0] * np.dot(x.T, x)  #weights[0] just for completeness, is 1
-
-    for lag in range(1, nlags+1):
-        s = np.dot(x[lag:].T, x[:-lag])
-        S += weights[lag] * (s + s.T)
-
-    return S
+    return _hac_kernel_sum(x, weights)
 
 def S_white_simple(x):
     '''inner covariance matrix for White heteroscedastistity sandwich
@@ -473,6 +565,83 @@ def S_hac_groupsum(x, time, nlags=None, weights_func=weights_bartlett):
     return S_hac_simple(x_group_sums, nlags=nlags, weights_func=weights_func)
 
 
+def _group_segments(group):
+    '''sort order of group and start of each group in the sorted order'''
+    group = np.asarray(group)
+    order = np.argsort(group, kind='mergesort')
+    group_sorted = group[order]
+    change = np.nonzero(group_sorted[1:] != group_sorted[:-1])[0] + 1
+    return order, np.concatenate(([0], change))
+
+
+def _group_sums_sorted(x, group):
+    '''sums of the rows of x by group, in sorted order of the groups
+
+    This sorts the observations once and sums over the contiguous segments
+    of each group with np.add.reduceat. It does not need dummy variables and
+    group can have any sortable dtype.
+    '''
+    order, starts = _group_segments(group)
+    return np.add.reduceat(x[order], starts, axis=0)
+
+
+def _combine_codes(codes):
+    '''integer codes of the intersection of groups given by integer codes'''
+    combined = codes[0]
+    for code in codes[1:]:
+        # refactorize after each step, so that the codes cannot overflow
+        combined = pd.factorize(combined * (code.max() + 1) + code)[0]
+    return combined
+
+
+def _cluster_meats(xu, groups):
+    '''inner covariance matrices for all intersections of the groups
+
+    Parameters
+    ----------
+    xu : ndarray, (nobs, k_params)
+        scores or x_i * u_i
+    groups : list of ndarray
+        list of group indicators, each of length nobs
+
+    Returns
+    -------
+    meats : dict
+        The keys are the tuples of indices into groups of all non-empty
+        subsets of groups. The values are the inner covariance matrix for
+        clusters given by the intersection of the groups in the subset and
+        the number of clusters.
+
+    Notes
+    -----
+    The observations are sorted only once, by the intersection of all
+    groups. The sums of xu over the intersections of a subset of groups are
+    then computed by aggregating the sums of these cells.
+    '''
+    n_ways = len(groups)
+    codes = [pd.factorize(np.asarray(group))[0] for group in groups]
+    order, starts = _group_segments(_combine_codes(codes))
+    cell_sums = np.add.reduceat(xu[order], starts, axis=0)
+    cell_codes = [code[order[starts]] for code in codes]
+
+    meats = {}
+    for n_subset in range(1, n_ways + 1):
+        for subset in combinations(range(n_ways), n_subset):
+            if n_subset == n_ways:
+                sums = cell_sums
+            else:
+                key = _combine_codes([cell_codes[i] for i in subset])
+                sums = _group_sums_sorted(cell_sums, key)
+            meats[subset] = (np.dot(sums.T, sums), sums.shape[0])
+    return meats
+
+
+def _cluster_correction(n_groups, nobs, k_params):
+    '''small sample correction factor for cluster robust covariance'''
+    return (n_groups / (n_groups - 1.) *
+            ((nobs - 1.) / float(nobs - k_params)))
+
+
 def S_crosssection(x, group):
     '''inner covariance matrix for White on group sums sandwich
 
@@ -482,7 +651,10 @@ def S_crosssection(x, group):
     This is used by cov_cluster and indirectly verified
 
     '''
-    x_group_sums = group_sums(x, group).T  #TODO: why transposed
+    x = np.asarray(x)
+    if x.ndim == 1:
+        x = x[:, None]
+    x_group_sums = _group_sums_sorted(x, group)
 
     return S_white_simple(x_group_sums)
 
@@ -520,24 +692,18 @@ def cov_cluster(results, group, use_correction=True):
     same result as Stata in UCLA example and same as Peterson
 
     '''
-    #TODO: currently used version of groupsums requires 2d resid
     xu, hessian_inv = _get_sandwich_arrays(results, cov_type='clu')
 
-    if not hasattr(group, 'dtype') or group.dtype != np.dtype('int'):
-        clusters, group = np.unique(group, return_inverse=True)
-    else:
-        clusters = np.unique(group)
-
-    scale = S_crosssection(xu, group)
+    x_group_sums = _group_sums_sorted(xu, group)
+    scale = S_white_simple(x_group_sums)
 
     nobs, k_params = xu.shape
-    n_groups = len(clusters) #replace with stored group attributes if available
+    n_groups = x_group_sums.shape[0]
 
     cov_c = _HCCM2(hessian_inv, scale)
 
     if use_correction:
-        cov_c *= (n_groups / (n_groups - 1.) *
-                  ((nobs-1.) / float(nobs - k_params)))
+        cov_c *= _cluster_correction(n_groups, nobs, k_params)
 
     return cov_c
 
@@ -579,17 +745,20 @@ def cov_cluster_2groups(results, group, group2=None, use_correction=True):
     else:
         group0 = group
         group1 = group2
-        group = (group0, group1)
 
+    xu, hessian_inv = _get_sandwich_arrays(results, cov_type='clu')
+    nobs, k_params = xu.shape
+    meats = _cluster_meats(xu, [group0, group1])
 
-    cov0 = cov_cluster(results, group0, use_correction=use_correction)
-    #[0] because we get still also returns bse
-    cov1 = cov_cluster(results, group1, use_correction=use_correction)
+    covs = {}
+    for subset, (scale, n_groups) in meats.items():
+        covs[subset] = _HCCM2(hessian_inv, scale)
+        if use_correction:
+            covs[subset] *= _cluster_correction(n_groups, nobs, k_params)
+    cov0, cov1 = covs[(0,)], covs[(1,)]
 
     # cov of cluster formed by intersection of two groups
-    cov01 = cov_cluster(results,
-                        combine_indices(group)[0],
-                        use_correction=use_correction)
+    cov01 = covs[(0, 1)]
 
     #robust cov matrix for union of groups
     cov_both = cov0 + cov1 - cov01
@@ -598,6 +767,71 @@ def cov_cluster_2groups(results, group, group2=None, use_correction=True):
     return cov_both, cov0, cov1
 
 
+def cov_cluster_multiway(results, groups, use_correction=True):
+    '''cluster robust covariance matrix for any number of clusterings
+
+    Parameters
+    ----------
+    results : result instance
+       result of a regression. The scores are results.model.wexog times
+       results.wresid, or the model's score_obs or jac if it has one, and
+       the bread is results.normalized_cov_params or the inverse hessian.
+       A tuple (jac, hessian_inv) is also accepted.
+    groups : array_like, (nobs, n_ways)
+       group indicators, one column for each dimension of clustering. A list
+       of 1-dimensional group indicators is also accepted.
+    use_correction : bool
+       If true (default), then the small sample correction factor is used
+       for each of the cluster robust covariance matrices that are combined.
+
+    Returns
+    -------
+    cov : ndarray, (k_vars, k_vars)
+        cluster robust covariance matrix for parameter estimates, for
+        clustering in all dimensions
+
+    Notes
+    -----
+    This uses the inclusion-exclusion formula of Cameron, Gelbach and Miller
+    (2011). The cluster robust covariance matrices for the intersections of
+    an odd number of groups are added and those for the intersections of an
+    even number of groups are subtracted. With two groups this is the same
+    as the first return of `cov_cluster_2groups`.
+
+    The scores are computed only once, and the observations are sorted only
+    once by the intersection of all groups. The group sums for all other
+    intersections are aggregated from the sums within these cells with
+    np.add.reduceat, so that no group dummies are needed.
+
+    References
+    ----------
+    A. Colin Cameron, Jonah B. Gelbach, and Douglas L. Miller, "Robust
+    Inference With Multiway Clustering," Journal of Business and Economic
+    Statistics 29 (April 2011): 238-249.
+    '''
+    if not hasattr(groups, 'shape'):
+        groups = np.asarray(groups).T
+    if hasattr(groups, 'values'):
+        groups = groups.values
+    if groups.ndim == 1:
+        groups = groups[:, None]
+
+    xu, hessian_inv = _get_sandwich_arrays(results, cov_type='clu')
+    nobs, k_params = xu.shape
+    meats = _cluster_meats(xu, list(groups.T))
+
+    scale = np.zeros((k_params, k_params))
+    for subset, (meat, n_groups) in meats.items():
+        if use_correction:
+            meat = meat * _cluster_correction(n_groups, nobs, k_params)
+        if len(subset) % 2 == 1:
+            scale += meat
+        else:
+            scale -= meat
+
+    return _HCCM2(hessian_inv, scale)
+
+
 def cov_white_simple(results, use_correction=True):
     '''
     heteroscedasticity robust covariance matrix (White)
@@ -717,15 +951,24 @@ def S_nw_panel(xw, weights, groupidx):
     no denominator nobs used
 
     no reference for this, just accounting for time indices
+
+    This does not loop over groups or lags, the lagged cross-products
+    within groups are computed with the same kernel filter as in
+    `S_hac_simple`.
     '''
-    nlags = len(weights)-1
-
-    S = weights[0] * np.dot(xw.T, xw)  #weights just for completeness
-    for lag in range(1, nlags+1):
-        xw0, xwlag = lagged_groups(xw, lag, groupidx)
-        s = np.dot(xw0.T, xwlag)
-        S += weights[lag] * (s + s.T)
-    return S
+    xw = np.asarray(xw)
+    if xw.ndim == 1:
+        xw = xw[:, None]
+    # index of the first observation of the group of each observation,
+    # observations that are not in any group have no lags
+    first = np.arange(xw.shape[0])
+    starts, ends = np.asarray(groupidx, dtype=int).reshape(-1, 2).T
+    lengths = ends - starts
+    group_first = np.repeat(starts, lengths)
+    first[group_first + np.arange(lengths.sum()) -
+          np.repeat(np.cumsum(lengths) - lengths, lengths)] = group_first
+
+    return _hac_kernel_sum(xw, weights, first=first)
 
 
 def cov_nw_panel(results, nlags, groupidx, weights_func=weights_bartlett,
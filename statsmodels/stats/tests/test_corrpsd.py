@@ -104,6 +104,9 @@ def test_corr_psd():
     y = cov_nearest(x2, n_fact=100)
     assert_almost_equal(x2, y, decimal=14)
 
+    y = corr_nearest(x, method='newton')
+    assert_almost_equal(x, y, decimal=14)
+
 
 class CheckCorrPSDMixin(object):
 
@@ -121,6 +124,26 @@ class CheckCorrPSDMixin(object):
         #print evals[0] / 1e-7 - 1
         assert_allclose(evals[0], 1e-7, rtol=1e-6)
 
+    def test_nearest_newton(self):
+        x = self.x
+        res_r = self.res
+        y = corr_nearest(x, threshold=1e-7, method='newton')
+        assert_almost_equal(y, res_r.mat, decimal=3)
+        # R's nearPD stops earlier with a slightly larger distance
+        d = norm_f(x, y)
+        assert_allclose(d, res_r.normF, rtol=0.0015)
+        assert d <= res_r.normF
+        evals = np.linalg.eigvalsh(y)
+        assert_allclose(evals, res_r.eigenvalues[::-1], rtol=0.003, atol=1e-7)
+        assert_allclose(evals[0], 1e-7, rtol=1e-4)
+        assert_allclose(np.diag(y), 1, rtol=0, atol=1e-15)
+
+        # same solution as fully converged alternating projections
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            y1 = corr_nearest(x, threshold=1e-7, n_fact=1000)
+        assert_allclose(y, y1, rtol=0, atol=1e-9)
+
     def test_clipped(self):
         x = self.x
         res_r = self.res
@@ -174,6 +197,12 @@ class TestCovPSD(object):
         d = norm_f(x, y)
         assert_allclose(d, res_r.normF, rtol=0.15)
 
+        y = cov_nearest(x, method='newton')
+        assert_almost_equal(y, res_r.mat, decimal=3)
+        d = norm_f(x, y)
+        assert_allclose(d, res_r.normF, rtol=0.001)
+        assert d <= res_r.normF
+
 
 class TestCorrPSD1(CheckCorrPSDMixin):
 
@@ -209,6 +238,37 @@ def test_corrpsd_threshold(threshold):
     evals = np.linalg.eigvalsh(y)
     assert_allclose(evals[0], threshold, rtol=0.25, atol=1e-15)
 
+    y = corr_nearest(x, threshold=threshold, method='newton')
+    evals = np.linalg.eigvalsh(y)
+    assert_allclose(evals[0], threshold, rtol=1e-4, atol=1e-14)
+
+
+def test_corr_nearest_newton_large(reset_randomstate):
+    # noisy correlation matrix with factor structure
+    k_vars = 80
+    factors = np.random.standard_normal((k_vars, 3))
+    x = np.dot(factors, factors.T) + np.eye(k_vars)
+    std = np.sqrt(np.diag(x))
+    x = x / std / std[:, None]
+    noise = np.random.uniform(-0.3, 0.3, size=(k_vars, k_vars))
+    x += (noise + noise.T) / 2
+    np.fill_diagonal(x, 1)
+    assert np.linalg.eigvalsh(x)[0] < -0.5
+
+    y = corr_nearest(x, threshold=1e-6, method='newton')
+    evals = np.linalg.eigvalsh(y)
+    assert_allclose(evals[0], 1e-6, rtol=1e-4)
+    assert_allclose(np.diag(y), 1, rtol=0, atol=1e-15)
+    assert_allclose(y, y.T, rtol=0, atol=1e-15)
+
+    # optimality, <y - x, z - y> >= 0 for all feasible z
+    feasible = [np.eye(k_vars), corr_clipped(x, threshold=1e-6),
+                np.corrcoef(np.random.standard_normal((k_vars, 200)))]
+    for z in feasible:
+        z = z + (y - z) * 0.5
+        assert ((y - x) * (z - y)).sum() >= -1e-8
+    assert norm_f(x, y) < norm_f(x, feasible[1])
+
 
 class Test_Factor(object):
 
@@ -467,3 +527,34 @@ class Test_Factor(object):
         fcor *= (np.abs(fcor) >= 0.2)
 
         assert_allclose(tcor.todense(), fcor, rtol=0.25, atol=1e-3)
+
+    def test_corr_thresholded_blocks(self, reset_randomstate):
+        X = np.random.normal(size=(500, 8))
+        X[:50] += np.random.normal(size=(1, 8))
+        X[7] = 2
+        fcor = np.corrcoef(X[np.arange(500) != 7])
+        fcor = np.insert(np.insert(fcor, 7, 0, axis=0), 7, 0, axis=1)
+        fcor *= (np.abs(fcor) >= 0.3)
+
+        tcor = corr_thresholded(X, 0.3)
+        assert isinstance(tcor, sparse.coo_matrix)
+        assert_allclose(tcor.toarray(), fcor, atol=1e-13)
+
+        # small blocks of rows processed in parallel
+        tcor = corr_thresholded(X, 0.3, max_elt=1000, n_jobs=2,
+                                return_format="csr")
+        assert isinstance(tcor, sparse.csr_matrix)
+        assert_allclose(tcor.toarray(), fcor, atol=1e-13)
+
+        # iterator of blocks of rows
+        blocks = (X[i:i + 64] for i in range(0, 500, 64))
+        tcor = corr_thresholded(blocks, 0.3, max_elt=1000)
+        assert_allclose(tcor.toarray(), fcor, atol=1e-13)
+
+        # a list of rows is data, not an iterator of blocks
+        tcor = corr_thresholded(X.tolist(), 0.3, max_elt=1000)
+        assert tcor.shape == (500, 500)
+        assert_allclose(tcor.toarray(), fcor, atol=1e-13)
+
+        with pytest.raises(ValueError, match="same number of columns"):
+            corr_thresholded(iter([X[:10], X[10:, :4]]), 0.3)
@@ -274,8 +274,8 @@ class TestDiagnosticG(object):
         assert_almost_equal(bg2, bg3, decimal=13)
 
     def test_acorr_breusch_godfrey_multidim(self):
-        res = Bunch(resid=np.empty((100, 2)))
-        with pytest.raises(ValueError, match='Model resid must be a 1d array'):
+        res = Bunch(resid=np.empty((100, 2, 2)))
+        with pytest.raises(ValueError, match='Model resid must be a 1d or 2d'):
             smsdia.acorr_breusch_godfrey(res)
 
     def test_acorr_ljung_box(self):
@@ -1226,6 +1226,37 @@ def test_rainbow_exception(reset_randomstate):
     with pytest.raises(TypeError, match="order_by must contain"):
         smsdia.linear_rainbow(res, order_by=("x0",))
 
+
+def test_recursive_olsresiduals_2d_endog(reset_randomstate):
+    nobs = 120
+    exog = add_constant(np.random.standard_normal((nobs, 2)))
+    endog = (exog.dot(np.random.standard_normal((3, 4))) +
+             np.random.standard_normal((nobs, 4)))
+    res = OLS(endog, exog).fit()
+    order_by = np.random.permutation(nobs)
+
+    rr = smsdia.recursive_olsresiduals(res, skip=5, lamda=0.1,
+                                       order_by=order_by)
+    sup_b, pval, _ = smsdia.breaks_cusumolsresid(res.resid, ddof=3)
+    hansen = smsdia.breaks_hansen(res)[0]
+    for i in range(endog.shape[1]):
+        res_i = OLS(endog[:, i], exog).fit()
+        rr_i = smsdia.recursive_olsresiduals(res_i, skip=5, lamda=0.1,
+                                             order_by=order_by)
+        for arr, arr_i in zip(rr[:-1], rr_i[:-1]):
+            assert_allclose(arr[..., i], arr_i, rtol=1e-10, atol=1e-12)
+        assert_allclose(rr[-1], rr_i[-1])
+
+        sup_b_i, pval_i, _ = smsdia.breaks_cusumolsresid(res_i.resid, ddof=3)
+        assert_allclose(sup_b[i], sup_b_i, rtol=1e-12)
+        assert_allclose(pval[i], pval_i, rtol=1e-12)
+        assert_allclose(hansen[i], smsdia.breaks_hansen(res_i)[0],
+                        rtol=1e-12)
+
+    # recursive estimates with all observations are the OLS estimates
+    rparams = smsdia.recursive_olsresiduals(res)[1]
+    assert_allclose(rparams[-1], res.params, rtol=1e-10)
+
 # R code used in testing
 # J test
 #
@@ -1283,3 +1314,77 @@ def test_rainbow_exception(reset_randomstate):
 # M2 + fit(M1)-exp(fit(M2)) < 2.22e-16 ***
 # ---
 # Signif. codes:  0 ‘***’ 0.001 ‘**’ 0.01 ‘*’ 0.05 ‘.’ 0.1 ‘ ’ 1
+
+
+def test_diagnostic_2d_resid(reset_randomstate):
+    nobs, k_series = 150, 5
+    exog = add_constant(np.random.standard_normal((nobs, 2)))
+    endog = exog.dot(np.random.standard_normal((3, k_series)))
+    endog += (np.random.standard_normal((nobs, k_series)) *
+              (1 + np.abs(exog[:, 1:2])))
+    endog[:, 0] += np.cumsum(np.random.standard_normal(nobs)) / 5
+    res = OLS(endog, exog).fit()
+    resid = res.resid
+
+    def single(func, *args, **kwargs):
+        return np.array([func(resid[:, i], *args, **kwargs)
+                         for i in range(k_series)]).T
+
+    assert_allclose(smsdia.het_breuschpagan(resid, exog),
+                    single(smsdia.het_breuschpagan, exog), rtol=1e-10)
+    assert_allclose(smsdia.het_white(resid, exog),
+                    single(smsdia.het_white, exog), rtol=1e-10)
+    assert_allclose(smsdia.het_arch(resid, nlags=3),
+                    single(smsdia.het_arch, nlags=3), rtol=1e-10)
+    assert_allclose(smsdia.acorr_lm(resid, nlags=2, autolag=None, ddof=1),
+                    single(smsdia.acorr_lm, nlags=2, autolag=None, ddof=1),
+                    rtol=1e-10)
+
+    bg = smsdia.acorr_breusch_godfrey(res, nlags=4)
+    bg1 = np.array([smsdia.acorr_breusch_godfrey(
+        OLS(endog[:, i], exog).fit(), nlags=4) for i in range(k_series)]).T
+    assert_allclose(bg, bg1, rtol=1e-10)
+
+    lb = smsdia.acorr_ljungbox(resid, [1, 4, 8], boxpierce=True,
+                               model_df=2, return_df=False)
+    for i in range(k_series):
+        lb1 = smsdia.acorr_ljungbox(resid[:, i], [1, 4, 8], boxpierce=True,
+                                    model_df=2, return_df=False)
+        for val, val1 in zip(lb, lb1):
+            assert_allclose(val[:, i], val1, rtol=1e-10)
+
+    names = ["s{0}".format(i) for i in range(k_series)]
+    lb_df = smsdia.acorr_ljungbox(pd.DataFrame(resid, columns=names), 8,
+                                  return_df=True)
+    assert_allclose(lb_df["lb_stat"].values,
+                    smsdia.acorr_ljungbox(resid, 8, return_df=False)[0])
+    assert list(lb_df["lb_pvalue"].columns) == names
+
+    with pytest.raises(ValueError, match="2-dimensional resid requires"):
+        smsdia.het_arch(resid, nlags=3, store=True)
+
+
+def test_diagnostic_single_column_resid(reset_randomstate):
+    # (nobs, 1) resid is treated as 1-d
+    nobs = 100
+    exog = add_constant(np.random.standard_normal((nobs, 2)))
+    resid = np.random.standard_normal(nobs) * (1 + np.abs(exog[:, 1]))
+    resid2d = resid[:, None]
+
+    for func in [smsdia.het_breuschpagan, smsdia.het_white]:
+        res = func(resid2d, exog)
+        assert all(np.ndim(val) == 0 for val in res)
+        assert_allclose(res, func(resid, exog), rtol=1e-13)
+    res = smsdia.het_arch(resid2d, nlags=3)
+    assert all(np.ndim(val) == 0 for val in res)
+    assert_allclose(res, smsdia.het_arch(resid, nlags=3), rtol=1e-13)
+
+    lb = smsdia.acorr_ljungbox(pd.DataFrame(resid2d, columns=["a"]),
+                               [1, 4], boxpierce=True, return_df=False)
+    lb1 = smsdia.acorr_ljungbox(resid, [1, 4], boxpierce=True,
+                                return_df=False)
+    for val, val1 in zip(lb, lb1):
+        assert_equal(val.shape, (2,))
+        assert_allclose(val, val1, rtol=1e-13)
+    lb_df = smsdia.acorr_ljungbox(resid2d, [1, 4], return_df=True)
+    assert list(lb_df.columns) == ["lb_stat", "lb_pvalue"]
@@ -1,6 +1,8 @@
 import numpy as np
-from numpy.testing import assert_almost_equal
+from numpy.testing import assert_allclose, assert_almost_equal
+import pytest
 from pytest import raises as assert_raises, warns as assert_warns
+from scipy.spatial.distance import pdist, squareform
 
 import statsmodels.stats.dist_dependence_measures as ddm
 from statsmodels.datasets import get_rdataset
@@ -196,3 +198,57 @@ class TestDistDependenceMeasures(object):
     def test_dvar(self):
         assert_almost_equal(ddm.distance_variance(self.x),
                             self.dvar_x_exp, 4)
+
+
+@pytest.mark.parametrize("case", ["1d", "ties", "2d", "mixed"])
+def test_statistics_without_distance_matrices(case):
+    np.random.seed(1234)
+    n = 131
+    x = np.random.randn(n)
+    y = x ** 2 + np.random.randn(n)
+    if case == "ties":
+        x = np.random.randint(0, 4, size=n)
+        y = x + np.random.randint(0, 3, size=n)
+    elif case == "2d":
+        x = np.random.randn(n, 3)
+        y = x[:, :2] + np.random.randn(n, 2)
+    elif case == "mixed":
+        y = np.random.randn(n, 2) + x[:, None]
+
+    x2, y2 = ddm._validate_and_tranform_x_and_y(x, y)
+    x_dist = squareform(pdist(x2, "euclidean"))
+    y_dist = squareform(pdist(y2, "euclidean"))
+    expected = ddm.distance_statistics(x, y, x_dist=x_dist, y_dist=y_dist)
+
+    stats = ddm.distance_statistics(x, y)
+    assert_allclose(np.array(stats), np.array(expected), rtol=1e-10)
+
+
+@pytest.mark.parametrize("case", ["1d", "2d"])
+def test_permutation_distribution(case):
+    np.random.seed(987)
+    n = 40
+    x = np.random.randn(n)
+    y = x + np.random.randn(n)
+    if case == "2d":
+        x = np.random.randn(n, 2)
+        y = np.random.randn(n, 3)
+
+    np.random.seed(0)
+    emp_dist = ddm._get_test_statistic_distribution(x, y, 20)
+
+    # brute force, recompute the statistic for each permutation of y
+    x2, y2 = ddm._validate_and_tranform_x_and_y(x, y)
+    np.random.seed(0)
+    expected = []
+    for _ in range(20):
+        y_perm = y2[np.random.permutation(n)]
+        expected.append(ddm.distance_statistics(
+            x2, y_perm, x_dist=squareform(pdist(x2, "euclidean")),
+            y_dist=squareform(pdist(y_perm, "euclidean"))).test_statistic)
+    assert_allclose(emp_dist, expected, rtol=1e-10)
+
+    np.random.seed(0)
+    emp_dist_parallel = ddm._get_test_statistic_distribution(x, y, 20,
+                                                             n_jobs=2)
+    assert_allclose(emp_dist_parallel, emp_dist, rtol=1e-13)
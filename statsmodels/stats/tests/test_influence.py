@@ -13,11 +13,11 @@ import pandas as pd
 
 import pytest
 
-from statsmodels.regression.linear_model import OLS
+from statsmodels.regression.linear_model import OLS, WLS
 from statsmodels.genmod.generalized_linear_model import GLM
 from statsmodels.genmod import families
 
-from statsmodels.stats.outliers_influence import MLEInfluence
+from statsmodels.stats.outliers_influence import MLEInfluence, OLSInfluence
 
 cur_dir = os.path.abspath(os.path.dirname(__file__))
 
@@ -246,3 +246,106 @@ class TestInfluenceGaussianGLMOLS(InfluenceCompareExact):
         cols = ['cooks_d', 'standard_resid', 'hat_diag', 'dffits_internal']
         assert_allclose(df0[cols].values, df1[cols].values, rtol=1e-5)
         pdt.assert_index_equal(df0.index, df1.index)
+
+
+@pytest.mark.parametrize('weighted', [False, True])
+def test_ols_looo_closed_form(weighted):
+    # compare closed form LOOO results with explicit regressions
+    rs = np.random.RandomState(0)
+    nobs = 30
+    exog = np.column_stack((np.ones(nobs), rs.standard_normal((nobs, 2))))
+    endog = exog.sum(1) + rs.standard_normal(nobs)
+    weights = rs.uniform(0.2, 5, size=nobs) if weighted else np.ones(nobs)
+    res = WLS(endog, exog, weights=weights).fit()
+    infl = OLSInfluence(res)
+
+    params = np.empty((nobs, 3))
+    mse_resid = np.empty(nobs)
+    det_cov_params = np.empty(nobs)
+    for i in range(nobs):
+        mask = np.arange(nobs) != i
+        res_i = WLS(endog[mask], exog[mask], weights=weights[mask]).fit()
+        params[i] = res_i.params
+        mse_resid[i] = res_i.mse_resid
+        det_cov_params[i] = np.linalg.det(res_i.cov_params())
+
+    assert_allclose(infl.params_not_obsi, params, rtol=1e-12)
+    assert_allclose(infl.sigma2_not_obsi, mse_resid, rtol=1e-12)
+    assert_allclose(infl.det_cov_params_not_obsi, det_cov_params, rtol=1e-10)
+    assert_allclose(infl.cov_ratio,
+                    det_cov_params / np.linalg.det(res.cov_params()),
+                    rtol=1e-10)
+
+
+@pytest.mark.parametrize('model', ['logit', 'poisson'])
+def test_influence_discrete(model):
+    from statsmodels.discrete.discrete_model import Logit, Poisson
+    rs = np.random.RandomState(0)
+    nobs = 50
+    exog = np.column_stack((np.ones(nobs), rs.standard_normal((nobs, 2))))
+    linpred = exog.dot([0.2, 0.5, -0.5])
+    if model == 'logit':
+        endog = (rs.uniform(size=nobs) < 1 / (1 + np.exp(-linpred))) * 1.
+        mod_class, family = Logit, families.Binomial()
+    else:
+        endog = rs.poisson(np.exp(linpred))
+        mod_class, family = Poisson, families.Poisson()
+
+    res = mod_class(endog, exog).fit(disp=0)
+    res_glm = GLM(endog, exog, family=family).fit()
+    infl = res.get_influence()
+    infl_glm = MLEInfluence(res_glm)
+    for attr in ['hat_matrix_diag', 'd_params', 'dfbetas',
+                 'resid_studentized', 'd_fittedvalues',
+                 'd_fittedvalues_scaled']:
+        assert_allclose(getattr(infl, attr), getattr(infl_glm, attr),
+                        rtol=1e-6, atol=1e-10, err_msg=attr)
+    assert_allclose(infl.cooks_distance[0], infl_glm.cooks_distance[0],
+                    rtol=1e-6)
+    assert_allclose(infl_glm.d_fittedvalues_scaled,
+                    infl_glm.d_fittedvalues /
+                    res_glm.get_prediction().se_mean, rtol=1e-10)
+
+    # exact leave-one-observation-out estimates
+    params_looo = infl.params_not_obsi
+    infl_parallel = mod_class(endog, exog).fit(disp=0).get_influence(n_jobs=2)
+    assert_allclose(infl_parallel.params_not_obsi, params_looo, rtol=1e-12)
+    for i in [0, 7]:
+        mask = np.arange(nobs) != i
+        res_i = mod_class(endog[mask], exog[mask]).fit(disp=0)
+        assert_allclose(params_looo[i], res_i.params, rtol=1e-7)
+
+
+@pytest.mark.parametrize('case', ['const', 'noconst', 'dummies', 'collinear'])
+def test_variance_inflation_factors(case):
+    from statsmodels.stats.outliers_influence import (
+        variance_inflation_factor, variance_inflation_factors)
+    rs = np.random.RandomState(0)
+    nobs = 100
+    x = rs.standard_normal((nobs, 3))
+    x[:, 1] += x[:, 0]
+    if case == 'const':
+        # large means are handled by centering
+        exog = np.column_stack((np.ones(nobs), x + 1000))
+    elif case == 'noconst':
+        exog = x + 3
+    elif case == 'dummies':
+        # implicit constant
+        exog = np.column_stack((np.eye(3)[rs.randint(0, 3, nobs)], x))
+    else:
+        exog = np.column_stack((np.ones(nobs), x, x[:, 0] - 2 * x[:, 2]))
+
+    vif = variance_inflation_factors(exog)
+    collinear = np.zeros(exog.shape[1], bool)
+    if case == 'collinear':
+        collinear[[1, 3, 4]] = True
+    assert np.all(np.isinf(vif[collinear]))
+    desired = [variance_inflation_factor(exog, i)
+               for i in np.nonzero(~collinear)[0]]
+    assert_allclose(vif[~collinear], desired, rtol=1e-8)
+
+    # cross-products accumulated over blocks of rows
+    assert_allclose(variance_inflation_factors(exog, chunksize=7), vif,
+                    rtol=1e-10)
+    blocks = iter(np.array_split(exog, 6))
+    assert_allclose(variance_inflation_factors(blocks), vif, rtol=1e-10)
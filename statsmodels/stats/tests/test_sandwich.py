@@ -10,7 +10,8 @@ Created on Sat Dec 17 08:39:16 2011
 Author: Josef Perktold
 """
 import numpy as np
-from numpy.testing import assert_almost_equal
+from numpy.testing import assert_allclose, assert_almost_equal
+import pytest
 
 from statsmodels.regression.linear_model import OLS
 from statsmodels.tools.tools import add_constant
@@ -88,3 +89,88 @@ def test_hac_simple():
     cov3 = sw.cov_hac_simple(res_olsg, use_correction=False)
     cov4 = sw.cov_hac_simple(res_olsg, nlags=4, use_correction=False)
     assert_almost_equal(cov3, cov4, decimal=14)
+
+
+def test_cov_cluster_multiway():
+    np.random.seed(987125)
+    nobs = 500
+    exog = add_constant(np.random.randn(nobs, 2))
+    groups = np.column_stack((np.random.randint(0, 20, size=nobs),
+                              np.random.randint(0, 15, size=nobs),
+                              np.random.randint(0, 10, size=nobs)))
+    endog = exog.sum(1) + 0.1 * groups[:, 0] + np.random.randn(nobs)
+    res = OLS(endog, exog).fit()
+
+    # inclusion-exclusion with cov_cluster on the intersections of groups
+    cov_expected = 0
+    for subset in [[0], [1], [2], [0, 1], [0, 2], [1, 2], [0, 1, 2]]:
+        _, group = np.unique(groups[:, subset], axis=0, return_inverse=True)
+        sign = 1 if len(subset) % 2 else -1
+        cov_expected += sign * sw.cov_cluster(res, group)
+
+    cov = sw.cov_cluster_multiway(res, groups)
+    assert_allclose(cov, cov_expected, rtol=1e-10)
+    cov = sw.cov_cluster_multiway(res, [groups[:, 0], groups[:, 1].astype(str),
+                                        groups[:, 2]])
+    assert_allclose(cov, cov_expected, rtol=1e-10)
+
+    res_robust = res.get_robustcov_results('cluster', groups=groups)
+    assert_allclose(res_robust.cov_params(), cov_expected, rtol=1e-10)
+
+    cov2 = sw.cov_cluster_2groups(res, groups[:, 0], group2=groups[:, 1])
+    assert_allclose(sw.cov_cluster_multiway(res, groups[:, :2]), cov2[0],
+                    rtol=1e-10)
+
+
+@pytest.mark.parametrize("kernel", ["bartlett", "uniform", "nonlinear"])
+def test_hac_kernel_sums(kernel):
+    # compare with the sum over lags of lagged cross-products
+    weights_func = {"bartlett": sw.weights_bartlett,
+                    "uniform": sw.weights_uniform,
+                    "nonlinear": lambda nlags: 0.9 ** np.arange(nlags + 1)
+                    }[kernel]
+    np.random.seed(54321)
+    x = np.random.randn(300, 3) + 0.5
+    lengths = np.random.randint(1, 30, size=15)
+    ends = np.cumsum(lengths)
+    groupidx = list(zip(ends - lengths, ends))
+
+    for nlags in [1, 4, 25]:
+        weights = weights_func(nlags)
+        s_hac = weights[0] * x.T.dot(x)
+        s_panel = s_hac.copy()
+        for lag in range(1, nlags + 1):
+            s = x[lag:].T.dot(x[:-lag])
+            s_hac += weights[lag] * (s + s.T)
+            x0, xlag = sw.lagged_groups(x, lag, groupidx)
+            s = x0.T.dot(xlag)
+            s_panel += weights[lag] * (s + s.T)
+
+        assert_allclose(sw.S_hac_simple(x, nlags=nlags,
+                                        weights_func=weights_func),
+                        s_hac, rtol=1e-11)
+        assert_allclose(sw.S_nw_panel(x, weights, groupidx), s_panel,
+                        rtol=1e-11)
+
+
+@pytest.mark.parametrize("mean", [0, 5, 100])
+def test_hac_filter_accuracy(mean):
+    # cumulative sums of the linear kernels against a loop over lags for
+    # long and not centered series
+    rs = np.random.RandomState(0)
+    nobs = 100000
+    x = rs.standard_normal((nobs, 2)) + mean
+    first = np.repeat(np.arange(0, nobs, 5000), 5000)
+    for nlags in [20, 300]:
+        weights = sw.weights_bartlett(nlags)
+        for first_ in [None, first]:
+            lowest = np.maximum(np.arange(nobs) - nlags, 0)
+            if first_ is not None:
+                lowest = np.maximum(lowest, first_)
+            desired = weights[0] * x
+            for lag in range(1, nlags + 1):
+                valid = (lowest[lag:] <= np.arange(nobs - lag))[:, None]
+                desired[lag:] += weights[lag] * np.where(valid, x[:-lag], 0)
+            y = sw._hac_filter(x, weights, first=first_)
+            assert_allclose(y, desired, rtol=1e-12,
+                            atol=1e-12 * np.abs(desired).max())
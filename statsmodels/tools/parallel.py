@@ -14,7 +14,7 @@ from statsmodels.tools.sm_exceptions import (ModuleUnavailableWarning,
                                              module_unavailable_doc)
 
 
-def parallel_func(func, n_jobs, verbose=5):
+def parallel_func(func, n_jobs, verbose=5, prefer=None):
     """Return parallel instance with delayed function
 
     Util function to use joblib only if available
@@ -27,6 +27,9 @@ def parallel_func(func, n_jobs, verbose=5):
         Number of jobs to run in parallel
     verbose: int
         Verbosity level
+    prefer: {None, "processes", "threads"}
+        Soft hint for the joblib backend. Use "threads" when func releases
+        the GIL, e.g., when it spends most of its time in compiled code.
 
     Returns
     -------
@@ -51,7 +54,7 @@ def parallel_func(func, n_jobs, verbose=5):
         except ImportError:
             from sklearn.externals.joblib import Parallel, delayed
 
-        parallel = Parallel(n_jobs, verbose=verbose)
+        parallel = Parallel(n_jobs, verbose=verbose, prefer=prefer)
         my_func = delayed(func)
 
         if n_jobs == -1:
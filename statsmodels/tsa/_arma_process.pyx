@@ -0,0 +1,67 @@
+#cython: language_level=3, wraparound=False, cdivision=True, boundscheck=False
+"""
+Compiled recursion for filtering many ARMA processes at once
+
+License: BSD-3
+"""
+
+
+def arma_filter(const double[:, ::1] ar, const double[:, ::1] ma,
+                const double[:, ::1] eta,
+                double[:, ::1] out, int start=0):
+    """
+    arma_filter(ar, ma, eta, out, start=0)
+
+    Apply ARMA lag polynomials in place to a batch of series.
+
+    Parameters
+    ----------
+    ar : ndarray
+        Autoregressive lag polynomials, including the zero lag, shaped
+        (nseries, p + 1) or (1, p + 1) if shared by all series.
+    ma : ndarray
+        Moving average lag polynomials, including the zero lag, shaped
+        (nseries, q + 1) or (1, q + 1) if shared by all series.
+    eta : ndarray
+        The input series, shaped (nseries, nobs).
+    out : ndarray
+        Array shaped (nseries, nobs). On exit, for t >= start each row holds
+        y_t = (ma_0 eta_t + ... + ma_q eta_{t-q}
+               - ar_1 y_{t-1} - ... - ar_p y_{t-p}) / ar_0
+        where presample values of eta and y are zero.
+    start : int, optional
+        The first period to compute. Periods before `start` are taken as
+        given from `out`. Default is 0.
+
+    Notes
+    -----
+    With start=0 this is the same as ``scipy.signal.lfilter(ma, ar, eta)``
+    applied to each row, but allows the lag polynomials to differ across
+    rows. The loop runs without the GIL.
+    """
+    cdef Py_ssize_t nseries = eta.shape[0]
+    cdef Py_ssize_t nobs = eta.shape[1]
+    cdef Py_ssize_t p = ar.shape[1] - 1
+    cdef Py_ssize_t q = ma.shape[1] - 1
+    cdef Py_ssize_t s, t, j, ia, im
+    cdef double acc
+
+    if ar.shape[0] not in (1, nseries) or ma.shape[0] not in (1, nseries):
+        raise ValueError('ar and ma must have either one row or one row per'
+                         ' series')
+    if p < 0 or q < 0:
+        raise ValueError('ar and ma must include the zero lag')
+    if out.shape[0] != nseries or out.shape[1] != nobs:
+        raise ValueError('out must have the same shape as eta')
+
+    with nogil:
+        for s in range(nseries):
+            ia = s if ar.shape[0] > 1 else 0
+            im = s if ma.shape[0] > 1 else 0
+            for t in range(start, nobs):
+                acc = 0
+                for j in range(min(q, t) + 1):
+                    acc = acc + ma[im, j] * eta[s, t - j]
+                for j in range(1, min(p, t) + 1):
+                    acc = acc - ar[ia, j] * out[s, t - j]
+                out[s, t] = acc / ar[ia, 0]
@@ -277,20 +277,40 @@ cdef class STL(object):
         DecomposeResult
             Estimation results.
         """
+        return self._fit(inner_iter, outer_iter, None)
+
+    def _fit(self, inner_iter, outer_iter, trend):
+        """
+        Estimate components starting the inner loop from an initial trend
+
+        trend is None (start from 0) or an array with nobs elements. A good
+        initial trend, e.g., from a previous fit on overlapping data, allows
+        fewer inner iterations to be used.
+        """
         cdef Py_ssize_t i
+        cdef int n_inner
+        cdef double[::1] trend0
 
         if inner_iter is None:
             inner_iter = 2 if self.robust else 5
         if outer_iter is None:
             outer_iter = 15 if self.robust else 0
+        n_inner = inner_iter
 
         self._use_rw = False
         k = 0
         for i in range(self.nobs):
             self._season[i] = self._trend[i] = 0.0
             self._rw[i] = 1.0
+        if trend is not None:
+            trend0 = np.ascontiguousarray(trend, dtype=np.double)
+            if trend0.shape[0] != self.nobs:
+                raise ValueError('trend must have nobs elements')
+            for i in range(self.nobs):
+                self._trend[i] = trend0[i]
         while True:
-            self._onestp(inner_iter)
+            with nogil:
+                self._onestp(n_inner)
             k = k + 1
             if k > outer_iter:
                 break
@@ -316,7 +336,7 @@ cdef class STL(object):
 
         return DecomposeResult(self.endog, season, trend, resid, rw)
 
-    cdef void _onestp(self, int inner_iter):
+    cdef void _onestp(self, int inner_iter) nogil:
         """
         y, n, np, ns, nt, nl, isdeg, itdeg, ildeg, nsjump,
                 ntjump, nljump, ni, userw, rw, season, trend, work
@@ -329,6 +349,7 @@ cdef class STL(object):
                          self._work
         """
         cdef Py_ssize_t i, j, np
+        cdef int n, nl, ildeg, nljump, nt, itdeg, ntjump
         cdef double[:, ::1] work
         cdef double[::1] y, season, trend, rw
         # Original variable names
@@ -360,7 +381,7 @@ cdef class STL(object):
 
     cdef double _est(self, double[::1] y, int n, int len_, int ideg, int xs,
                      int nleft, int nright, double[::1] w, bint userw,
-                     double[::1] rw):
+                     double[::1] rw) nogil:
         cdef double rng, a, b, c, h, h1, h9, r, ys
         cdef Py_ssize_t j
 
@@ -406,7 +427,8 @@ cdef class STL(object):
         return ys
 
     cdef void _ess(self, double[::1] y, int n, int len_, int ideg, int njump,
-                   bint userw, double[::1] rw, double[::1] ys, double[::1] res):
+                   bint userw, double[::1] rw, double[::1] ys,
+                   double[::1] res) nogil:
         # TODO: Try with 1 data point!!? Establish minimums
         cdef Py_ssize_t i, j, k
         cdef double delta
@@ -480,7 +502,8 @@ cdef class STL(object):
                 for j in range(k, n):
                     ys[j] = ys[k - 1] + delta * ((j + 1) - k)
 
-    cdef void _ma(self, double[::1] x, int n, int len_, double[::1] ave):
+    cdef void _ma(self, double[::1] x, int n, int len_,
+                  double[::1] ave) nogil:
         cdef int newn
         cdef double flen, v
         cdef Py_ssize_t i, j, k, m
@@ -499,7 +522,7 @@ cdef class STL(object):
             k += 1
             m += 1
 
-    cdef void _fts(self):
+    cdef void _fts(self) nogil:
         """
         Original def:
         _fts(self, x, n, np, trend, work)
@@ -518,7 +541,7 @@ cdef class STL(object):
         self._ma(trend, n - np + 1, np, work)
         self._ma(work, n - 2 * np + 2, 3, trend)
 
-    cdef void _ss(self):
+    cdef void _ss(self) nogil:
         """
         _ss(self, y, n, np, ns, isdeg, nsjump, userw, rw, season, work1, work2,
             work3, work4)
@@ -527,7 +550,7 @@ cdef class STL(object):
                      work[1, :], work[2, :], work[3, :], work[4, :], season)
         """
         cdef Py_ssize_t i, j, m
-        cdef int n, np, ns, isdef, nsjump, k
+        cdef int n, np, ns, isdeg, nsjump, k, xs, nleft, nright
         cdef bint userw
         cdef double[::1] y, work1, work2, work3, work4, rw, season
 
@@ -1,5 +1,5 @@
 from scipy.stats import norm
-from numpy import array, polyval, inf, asarray
+from numpy import array, polyval, inf, asarray, ndim, where
 
 __all__ = ['mackinnonp', 'mackinnoncrit']
 
@@ -226,8 +226,9 @@ def mackinnonp(teststat, regression="c", N=1, lags=None):
 
     Parameters
     ----------
-    teststat : float
-        "T-value" from an Augmented Dickey-Fuller regression.
+    teststat : {float, ndarray}
+        "T-value" from an Augmented Dickey-Fuller regression, or an array of
+        them.
     regression : str {"c", "nc", "ct", "ctt"}
         This is the method of regression that was used.  Following MacKinnon's
         notation, this can be "c" for constant, "nc" for no constant, "ct" for
@@ -238,7 +239,7 @@ def mackinnonp(teststat, regression="c", N=1, lags=None):
 
     Returns
     -------
-    p-value : float
+    p-value : {float, ndarray}
         The p-value for the ADF statistic estimated using MacKinnon 1994.
 
     References
@@ -256,6 +257,14 @@ def mackinnonp(teststat, regression="c", N=1, lags=None):
     maxstat = _tau_maxs[regression]
     minstat = _tau_mins[regression]
     starstat = _tau_stars[regression]
+    if ndim(teststat) > 0:
+        teststat = asarray(teststat, dtype=float)
+        small = polyval(_tau_smallps[regression][N-1][::-1], teststat)
+        large = polyval(_tau_largeps[regression][N-1][::-1], teststat)
+        pvalue = norm.cdf(where(teststat <= starstat[N-1], small, large))
+        pvalue[teststat > maxstat[N-1]] = 1.0
+        pvalue[teststat < minstat[N-1]] = 0.0
+        return pvalue
     if teststat > maxstat[N-1]:
         return 1.0
     elif teststat < minstat[N-1]:
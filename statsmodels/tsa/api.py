@@ -7,8 +7,8 @@ __all__ = ['AR', 'arima', 'AutoReg', 'ARMA', 'ARIMA',
            'interp',
            'stattools',
            'acovf', 'acf', 'pacf', 'pacf_yw', 'pacf_ols', 'ccovf', 'ccf',
-           'periodogram', 'q_stat', 'coint', 'arma_order_select_ic',
-           'adfuller', 'kpss', 'bds',
+           'ccovf_matrix', 'ccf_matrix', 'periodogram', 'q_stat', 'coint',
+           'arma_order_select_ic', 'adfuller', 'adfuller_batch', 'kpss', 'bds',
            'datetools',
            'seasonal_decompose',
            'graphics',
@@ -17,7 +17,7 @@ __all__ = ['AR', 'arima', 'AutoReg', 'ARMA', 'ARIMA',
            'SARIMAX', 'UnobservedComponents', 'VARMAX', 'DynamicFactor',
            'MarkovRegression', 'MarkovAutoregression',
            'ExponentialSmoothing', 'SimpleExpSmoothing', 'Holt',
-           'arma_generate_sample', 'ArmaProcess', 'STL',
+           'arma_generate_sample', 'ArmaProcess', 'STL', 'MSTL',
            'bk_filter', 'cf_filter', 'hp_filter']
 
 from .ar_model import AR, AutoReg
@@ -34,9 +34,9 @@ from .tsatools import (add_trend, detrend, lagmat, lagmat2ds, add_lag)
 from . import interp
 from . import stattools
 from .stattools import (
-    acovf, acf, pacf, pacf_yw, pacf_ols, ccovf, ccf,
-    periodogram, q_stat, coint, arma_order_select_ic,
-    adfuller, kpss, bds)
+    acovf, acf, pacf, pacf_yw, pacf_ols, ccovf, ccf, ccovf_matrix,
+    ccf_matrix, periodogram, q_stat, coint, arma_order_select_ic,
+    adfuller, adfuller_batch, kpss, bds)
 from .base import datetools
 from .seasonal import seasonal_decompose
 from ..graphics import tsaplots as graphics
@@ -51,5 +51,5 @@ from .regime_switching.markov_regression import MarkovRegression
 from .regime_switching.markov_autoregression import MarkovAutoregression
 from .holtwinters import ExponentialSmoothing, SimpleExpSmoothing, Holt
 from .innovations import api as innovations
-from .seasonal import STL
+from .seasonal import STL, MSTL
 from .filters import bk_filter, cf_filter, hp_filter
@@ -8,6 +8,7 @@ import warnings
 import numpy as np
 
 from scipy.optimize import minimize
+from statsmodels.tools.numdiff import approx_fprime
 from statsmodels.tools.tools import Bunch
 from statsmodels.tsa.innovations import arma_innovations
 from statsmodels.tsa.stattools import acovf, innovations_algo
@@ -216,6 +217,21 @@ def innovations_mle(endog, order=(0, 0, 0), seasonal_order=(0, 0, 0, 0),
             raise ValueError('Given starting parameters imply a non-invertible'
                              ' MA process with `enforce_invertibility=True`.')
 
+    k_ar = spec.max_reduced_ar_order
+    k_ma = spec.max_reduced_ma_order
+
+    def reduced_params(params):
+        # Fixed length, since the polynomial coefficients are trimmed of
+        # trailing zeros
+        p.params = spec.constrain_params(params)
+        reduced = np.zeros(k_ar + k_ma + 1)
+        ar = -p.reduced_ar_poly.coef[1:]
+        ma = p.reduced_ma_poly.coef[1:]
+        reduced[:len(ar)] = ar
+        reduced[k_ar:k_ar + len(ma)] = ma
+        reduced[-1] = p.sigma2
+        return reduced
+
     def obj(params):
         p.params = spec.constrain_params(params)
 
@@ -223,6 +239,16 @@ def innovations_mle(endog, order=(0, 0, 0), seasonal_order=(0, 0, 0, 0),
             endog, ar_params=-p.reduced_ar_poly.coef[1:],
             ma_params=p.reduced_ma_poly.coef[1:], sigma2=p.sigma2)
 
+    def jac(params):
+        # Chain rule: analytic score with respect to the reduced polynomial
+        # coefficients times the derivative of the parameter transformation
+        reduced = reduced_params(params)
+        score = arma_innovations.arma_score(
+            endog, ar_params=reduced[:k_ar],
+            ma_params=reduced[k_ar:k_ar + k_ma], sigma2=reduced[-1])
+        return -np.dot(score, approx_fprime(params, reduced_params,
+                                            centered=True))
+
     # Untransform the starting parameters
     unconstrained_start_params = spec.unconstrain_params(start_params)
 
@@ -232,6 +258,8 @@ def innovations_mle(endog, order=(0, 0, 0), seasonal_order=(0, 0, 0, 0),
     if 'options' not in minimize_kwargs:
         minimize_kwargs['options'] = {}
     minimize_kwargs['options'].setdefault('maxiter', 100)
+    if 'method' not in minimize_kwargs:
+        minimize_kwargs.setdefault('jac', jac)
     minimize_results = minimize(obj, unconstrained_start_params,
                                 **minimize_kwargs)
 
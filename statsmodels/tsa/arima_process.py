@@ -24,12 +24,61 @@ from scipy import signal, optimize, linalg
 from statsmodels.compat.pandas import Appender
 from statsmodels.tools.docstring import remove_parameters, Docstring
 from statsmodels.tools.validation import array_like
+from statsmodels.tsa._arma_process import arma_filter
 
 __all__ = ['arma_acf', 'arma_acovf', 'arma_generate_sample',
            'arma_impulse_response', 'arma2ar', 'arma2ma', 'deconvolve',
            'lpol2index', 'index2lpol']
 
 
+def _arma_polys(ar, ma):
+    """
+    Lag polynomials as 2-d float arrays with one row per process
+
+    Rows are broadcast so that both arrays have the same number of rows.
+    """
+    dtype = np.result_type(np.asarray(ar), np.asarray(ma), float)
+    ar = np.atleast_2d(np.asarray(ar, dtype=dtype))
+    ma = np.atleast_2d(np.asarray(ma, dtype=dtype))
+    if ar.ndim > 2 or ma.ndim > 2:
+        raise ValueError('ar and ma must be at most two-dimensional')
+    nrows = max(ar.shape[0], ma.shape[0])
+    if ar.shape[0] not in (1, nrows) or ma.shape[0] not in (1, nrows):
+        raise ValueError('ar and ma must have the same number of rows')
+    ar = np.ascontiguousarray(np.broadcast_to(ar, (nrows, ar.shape[1])))
+    ma = np.ascontiguousarray(np.broadcast_to(ma, (nrows, ma.shape[1])))
+    return ar, ma
+
+
+def _fft_length(ar, ma, nobs, name='ar'):
+    """
+    FFT length so that the aliasing error of a stationary ARMA is negligible
+
+    The impulse response decays at the rate of the largest inverse root of
+    the autoregressive polynomial, rho, so that terms beyond lag L with
+    rho**L < eps do not matter. The returned length is a power of two
+    that is at least nobs plus the number of negligible lags.
+    """
+    ar = np.atleast_2d(ar)
+    p = ar.shape[1] - 1
+    rho = 0.
+    if p > 0:
+        companion = np.zeros((ar.shape[0], p, p), dtype=ar.dtype)
+        companion[:, 0] = -ar[:, 1:] / ar[:, :1]
+        companion[:, 1:, :-1] = np.eye(p - 1)
+        rho = np.abs(np.linalg.eigvals(companion)).max()
+    if rho >= 1:
+        raise ValueError('The FFT method requires all roots of the {0} lag'
+                         ' polynomial to be outside the unit'
+                         ' circle.'.format(name))
+    nlags = np.shape(ma)[-1]
+    if rho > 0:
+        # Margin for the polynomial growth due to repeated roots
+        eps = np.finfo(float).eps
+        nlags += int(np.ceil(2 * np.log(eps) / np.log(rho)))
+    return 1 << int(np.ceil(np.log2(max(nobs + nlags, 2))))
+
+
 # Remove after 0.11
 @deprecate_kwarg('sigma', 'scale')
 def arma_generate_sample(ar, ma, nsample, scale=1, distrvs=None,
@@ -41,16 +90,20 @@ def arma_generate_sample(ar, ma, nsample, scale=1, distrvs=None,
     ----------
     ar : array_like
         The coefficient for autoregressive lag polynomial, including zero lag.
+        If 2-d, each row is the lag polynomial of a separate process.
     ma : array_like
         The coefficient for moving-average lag polynomial, including zero lag.
+        If 2-d, each row is the lag polynomial of a separate process.
     nsample : int or tuple of ints
         If nsample is an integer, then this creates a 1d timeseries of
         length size. If nsample is a tuple, creates a len(nsample)
         dimensional time series where time is indexed along the input
         variable ``axis``. All series are unless ``distrvs`` generates
-        dependent data.
-    scale : float
-        The standard deviation of noise.
+        dependent data. If ``ar`` or ``ma`` is 2-d, nsample must be an
+        integer and one series is generated for each row, see Notes.
+    scale : {float, array_like}
+        The standard deviation of noise. If ``ar`` or ``ma`` is 2-d, this
+        can also be an array with one value per process.
     distrvs : function, random number generator
         A function that generates the random numbers, and takes sample size
         as argument. The default is np.random.randn.
@@ -73,6 +126,14 @@ def arma_generate_sample(ar, ma, nsample, scale=1, distrvs=None,
     conventions in statistics for ARMA processes, the AR parameters should
     have the opposite sign of what you might expect. See the examples below.
 
+    If ``ar`` or ``ma`` is 2-d, the returned array is 2-d with time indexed
+    along ``axis`` and one series for each of the ``nprocess`` processes
+    along the other axis. The random numbers are drawn as for
+    ``nsample=(nsample, nprocess)`` and ``axis=0``, so that processes with
+    identical lag polynomials give the same paths as the 1-d call. The
+    processes are filtered in a compiled loop, which is much faster than
+    calling this function once for each process in Monte Carlo studies.
+
     Examples
     --------
     >>> import numpy as np
@@ -87,6 +148,22 @@ def arma_generate_sample(ar, ma, nsample, scale=1, distrvs=None,
     array([ 0.79044189, -0.23140636,  0.70072904,  0.40608028])
     """
     distrvs = np.random.normal if distrvs is None else distrvs
+    if np.ndim(ar) == 2 or np.ndim(ma) == 2:
+        if np.ndim(nsample) != 0:
+            raise ValueError('nsample must be an integer when ar or ma is'
+                             ' 2-d.')
+        if axis not in (0, 1, -1, -2):
+            raise ValueError('axis must be 0 or 1 when ar or ma is 2-d.')
+        ar, ma = _arma_polys(ar, ma)
+        nprocess = ar.shape[0]
+        scale = np.broadcast_to(np.asarray(scale, dtype=float), (nprocess,))
+        eta = scale * distrvs(size=(nsample + burnin, nprocess))
+        eta = np.ascontiguousarray(eta.T, dtype=float)
+        out = np.empty_like(eta)
+        arma_filter(ar, ma, eta, out)
+        out = out[:, burnin:]
+        return out if axis in (1, -1) else out.T
+
     if np.ndim(nsample) == 0:
         nsample = [nsample]
     if burnin:
@@ -105,25 +182,46 @@ def arma_generate_sample(ar, ma, nsample, scale=1, distrvs=None,
     return signal.lfilter(ma, ar, eta, axis=axis)[fslice]
 
 
-def arma_acovf(ar, ma, nobs=10, sigma2=1, dtype=None):
+def arma_acovf(ar, ma, nobs=10, sigma2=1, dtype=None, fft=False):
     """
     Theoretical autocovariance function of ARMA process.
 
     Parameters
     ----------
-    ar : array_like, 1d
+    ar : array_like, 1d or 2d
         The coefficients for autoregressive lag polynomial, including zero lag.
-    ma : array_like, 1d
+        If 2d, each row is the lag polynomial of a separate process.
+    ma : array_like, 1d or 2d
         The coefficients for moving-average lag polynomial, including zero lag.
+        If 2d, each row is the lag polynomial of a separate process.
     nobs : int
         The number of terms (lags plus zero lag) to include in returned acovf.
-    sigma2 : float
-        Variance of the innovation term.
+    sigma2 : {float, array_like}
+        Variance of the innovation term. If ar or ma is 2d, this can also be
+        an array with one value per process.
+    dtype : dtype, optional
+        The dtype of the returned autocovariances. Default is the common type
+        of ar, ma and sigma2.
+    fft : bool, optional
+        If True, compute the autocovariances from the spectral density
+        using the FFT. This requires a stationary process. Default is False.
 
     Returns
     -------
     ndarray
-        The autocovariance of ARMA process given by ar, ma.
+        The autocovariance of ARMA process given by ar, ma. If ar or ma is
+        2d, this is 2d with one row per process.
+
+    Notes
+    -----
+    By default the first max(p, q) + 1 autocovariances are obtained by
+    solving the linear system (BD, eq. 3.3.8), and the remaining by the
+    autoregressive recursion. With ``fft=True`` all autocovariances are
+    obtained from one inverse FFT of ``sigma2 |ma|**2 / |ar|**2``, where
+    the FFT length is chosen so that the aliasing error is at the level of
+    machine precision. This requires O(n log n) operations for all lags
+    and processes at once, with n somewhat larger than nobs for persistent
+    processes.
 
     See Also
     --------
@@ -138,43 +236,69 @@ def arma_acovf(ar, ma, nobs=10, sigma2=1, dtype=None):
     if dtype is None:
         dtype = np.common_type(np.array(ar), np.array(ma), np.array(sigma2))
 
-    p = len(ar) - 1
-    q = len(ma) - 1
+    batch = np.ndim(ar) == 2 or np.ndim(ma) == 2
+    if np.any(np.real(sigma2) < 0):
+        raise ValueError('Must have positive innovation variance.')
+    if batch:
+        ar, ma = _arma_polys(ar, ma)
+        sigma2 = np.asarray(sigma2)[..., None]
+        nprocess = ar.shape[0]
+    else:
+        ar = np.asarray(ar)
+        ma = np.asarray(ma)
+
+    p = ar.shape[-1] - 1
+    q = ma.shape[-1] - 1
     m = max(p, q) + 1
 
-    if sigma2.real < 0:
-        raise ValueError('Must have positive innovation variance.')
+    if fft:
+        n = _fft_length(ar, ma, nobs)
+        spec = (np.abs(np.fft.rfft(ma, n)) /
+                np.abs(np.fft.rfft(ar, n)))**2
+        acovf = sigma2 * np.fft.irfft(spec, n)[..., :nobs]
+        return acovf.astype(dtype, copy=False)
 
     # Short-circuit for trivial corner-case
     if p == q == 0:
-        out = np.zeros(nobs, dtype=dtype)
-        out[0] = sigma2
+        out = np.zeros(ar.shape[:-1] + (nobs,), dtype=dtype)
+        out[..., 0] = sigma2[..., 0] if batch else sigma2
         return out
 
     # Get the moving average representation coefficients that we need
     ma_coeffs = arma2ma(ar, ma, lags=m)
 
     # Solve for the first m autocovariances via the linear system
-    # described by (BD, eq. 3.3.8)
-    A = np.zeros((m, m), dtype=dtype)
-    b = np.zeros((m, 1), dtype=dtype)
-    # We need a zero-right-padded version of ar params
-    tmp_ar = np.zeros(m, dtype=dtype)
-    tmp_ar[:p + 1] = ar
-    for k in range(m):
-        A[k, :(k + 1)] = tmp_ar[:(k + 1)][::-1]
-        A[k, 1:m - k] += tmp_ar[(k + 1):m]
-        b[k] = sigma2 * np.dot(ma[k:q + 1], ma_coeffs[:max((q + 1 - k), 0)])
-    acovf = np.zeros(max(nobs, m), dtype=dtype)
-    acovf[:m] = np.linalg.solve(A, b)[:, 0]
+    # described by (BD, eq. 3.3.8). We need zero-right-padded versions of
+    # the lag polynomials
+    tmp_ar = np.zeros(ar.shape[:-1] + (2 * m,), dtype=dtype)
+    tmp_ar[..., :p + 1] = ar
+    tmp_ma = np.zeros(ma.shape[:-1] + (m + q + 1,), dtype=dtype)
+    tmp_ma[..., :q + 1] = ma
+    k, j = np.ogrid[:m, :m]
+    A = (np.where(j <= k, tmp_ar[..., np.abs(k - j)], 0) +
+         np.where((j >= 1) & (k + j < m), tmp_ar[..., k + j], 0))
+    k, j = np.ogrid[:m, :q + 1]
+    b = sigma2 * np.sum(tmp_ma[..., k + j] * ma_coeffs[..., None, :q + 1],
+                        axis=-1)
+    acovf = np.zeros(ar.shape[:-1] + (max(nobs, m),), dtype=dtype)
+    acovf[..., :m] = np.linalg.solve(A, b[..., None])[..., 0]
 
     # Iteratively apply (BD, eq. 3.3.9) to solve for remaining autocovariances
-    if nobs > m:
+    if nobs > m and batch and not np.iscomplexobj(acovf):
+        acovf = np.ascontiguousarray(acovf, dtype=float)
+        arma_filter(ar, np.ones((1, 1)), np.zeros_like(acovf), acovf,
+                    start=m)
+    elif nobs > m and batch:
+        for i in range(nprocess):
+            zi = signal.lfiltic([1], ar[i], acovf[i, :m][::-1])
+            acovf[i, m:] = signal.lfilter(
+                [1], ar[i], np.zeros(nobs - m, dtype=dtype), zi=zi)[0]
+    elif nobs > m:
         zi = signal.lfiltic([1], ar, acovf[:m:][::-1])
         acovf[m:] = signal.lfilter([1], ar, np.zeros(nobs - m, dtype=dtype),
                                    zi=zi)[0]
 
-    return acovf[:nobs]
+    return acovf[..., :nobs].astype(dtype, copy=False)
 
 
 # Remove after 0.11
@@ -290,23 +414,30 @@ def arma_periodogram(ar, ma, worN=None, whole=0):
 
 # Remove after 0.11
 @deprecate_kwarg('nobs', 'leads')
-def arma_impulse_response(ar, ma, leads=100):
+def arma_impulse_response(ar, ma, leads=100, fft=False):
     """
     Compute the impulse response function (MA representation) for ARMA process.
 
     Parameters
     ----------
-    ar : array_like, 1d
-        The auto regressive lag polynomial.
-    ma : array_like, 1d
-        The moving average lag polynomial.
+    ar : array_like, 1d or 2d
+        The auto regressive lag polynomial. If 2d, each row is the lag
+        polynomial of a separate process.
+    ma : array_like, 1d or 2d
+        The moving average lag polynomial. If 2d, each row is the lag
+        polynomial of a separate process.
     leads : int
         The number of observations to calculate.
+    fft : bool, optional
+        If True, compute the impulse response by polynomial division in the
+        frequency domain using the FFT. This requires the roots of ``ar``
+        to be outside the unit circle. Default is False.
 
     Returns
     -------
     ndarray
-        The impulse response function with nobs elements.
+        The impulse response function with nobs elements. If ar or ma is
+        2d, this is 2d with one row per process.
 
     Notes
     -----
@@ -319,6 +450,12 @@ def arma_impulse_response(ar, ma, leads=100):
 
     Fully tested against matlab
 
+    For 2d lag polynomials the recursions for all processes run in one
+    compiled loop. With ``fft=True`` the impulse responses are computed as
+    the inverse FFT of ``ma / ar`` evaluated on the unit circle, where the
+    FFT length is chosen so that the aliasing error is at the level of
+    machine precision.
+
     Examples
     --------
     AR(1)
@@ -344,6 +481,23 @@ def arma_impulse_response(ar, ma, leads=100):
     array([ 1.        ,  1.3       ,  1.24      ,  0.992     ,  0.7936    ,
             0.63488   ,  0.507904  ,  0.4063232 ,  0.32505856,  0.26004685])
     """
+    if fft:
+        ar = np.asarray(ar)
+        ma = np.asarray(ma)
+        n = _fft_length(ar, ma, leads)
+        irf = np.fft.irfft(np.fft.rfft(ma, n) / np.fft.rfft(ar, n), n)
+        return irf[..., :leads]
+    if np.ndim(ar) == 2 or np.ndim(ma) == 2:
+        ar, ma = _arma_polys(ar, ma)
+        impulse = np.zeros((ar.shape[0], leads), dtype=ar.dtype)
+        impulse[:, 0] = 1.
+        if np.iscomplexobj(impulse):
+            return np.array([signal.lfilter(ma[i], ar[i], impulse[i])
+                             for i in range(ar.shape[0])])
+        irf = np.empty_like(impulse)
+        arma_filter(ar, ma, impulse, irf)
+        return irf
+
     impulse = np.zeros(leads)
     impulse[0] = 1.
     return signal.lfilter(ma, ar, impulse)
@@ -12,7 +12,6 @@ from statsmodels.tools.validation import array_like, PandasWrapper
 # radians per sample.
 
 
-# NOTE: uses a loop, could probably be sped-up for very large datasets
 def cffilter(x, low=6, high=32, drift=True):
     """
     Christiano Fitzgerald asymmetric, random walk filter.
@@ -52,6 +51,14 @@ def cffilter(x, low=6, high=32, drift=True):
     statsmodels.tsa.seasonal.STL
         Season-Trend decomposition using LOESS.
 
+    Notes
+    -----
+    The filtered value at each time is a weighted sum of all interior
+    observations, with weights depending only on the distance in time,
+    plus end-point corrections for the first and last observations. The
+    interior sums are computed for all times and all columns at once as a
+    single FFT convolution so that the cost is O(nobs log nobs) per series.
+
     Examples
     --------
     >>> dta = sm.datasets.macrodata.load_pandas().data
@@ -67,8 +74,8 @@ def cffilter(x, low=6, high=32, drift=True):
 
     .. plot:: plots/cff_plot.py
     """
-    #TODO: cythonize/vectorize loop?, add ability for symmetric filter,
-    #      and estimates of theta other than random walk.
+    # TODO: add ability for symmetric filter, and estimates of theta other
+    #       than random walk.
     if low < 2:
         raise ValueError("low must be >= 2")
     pw = PandasWrapper(x)
@@ -83,14 +90,27 @@ def cffilter(x, low=6, high=32, drift=True):
     J = np.arange(1, nobs + 1)
     Bj = (np.sin(b * J) - np.sin(a * J)) / (np.pi * J)
     B0 = (b - a) / np.pi
-    Bj = np.r_[B0, Bj][:, None]
-    y = np.zeros((nobs, nseries))
-
-    for i in range(nobs):
-        B = -.5 * Bj[0] - np.sum(Bj[1:-i - 2])
-        A = -Bj[0] - np.sum(Bj[1:-i - 2]) - np.sum(Bj[1:i]) - B
-        y[i] = (Bj[0] * x[i] + np.dot(Bj[1:-i - 2].T, x[i + 1:-1]) +
-                B * x[-1] + np.dot(Bj[1:i].T, x[1:i][::-1]) + A * x[0])
+    Bj = np.r_[B0, Bj]
+
+    # csum[k] = Bj[1] + ... + Bj[k]
+    csum = np.r_[0.0, np.cumsum(Bj[1:nobs - 1])]
+    i = np.arange(nobs)
+    forward = csum[np.maximum(nobs - 2 - i, 0)]
+    backward = csum[np.maximum(i - 1, 0)]
+    B = -.5 * B0 - forward
+    A = -B0 - forward - backward - B
+
+    # sum_{j=1}^{nobs-2} Bj[|i - j|] * x[j] for all i using a single FFT
+    # convolution of the interior observations with the symmetric weights
+    kernel = np.r_[Bj[nobs - 1:0:-1], Bj[:nobs]]
+    nfft = 1 << int(np.ceil(np.log2(kernel.shape[0] + nobs)))
+    conv = np.fft.irfft(np.fft.rfft(x[1:-1], nfft, axis=0) *
+                        np.fft.rfft(kernel, nfft)[:, None], nfft, axis=0)
+    y = conv[nobs - 2:2 * nobs - 2]
+    # end points are not interior, so their own weight is added explicitly
+    y[0] += B0 * x[0]
+    y[-1] += B0 * x[-1]
+    y += B[:, None] * x[-1] + A[:, None] * x[0]
     y = y.squeeze()
 
     cycle, trend = y.squeeze(), x.squeeze() - y
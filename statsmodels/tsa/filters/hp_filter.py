@@ -1,10 +1,33 @@
 
+from functools import lru_cache
+
 import numpy as np
-from scipy import sparse
-from scipy.sparse.linalg import spsolve
+from scipy import linalg
 from statsmodels.tools.validation import array_like, PandasWrapper
 
 
+@lru_cache(maxsize=16)
+def _hp_banded_factor(nobs, lamb):
+    """
+    Banded Cholesky factor of I + lamb * K'K
+
+    Returned in the upper form used by scipy.linalg.cho_solve_banded. The
+    factor is read-only since it is shared across calls.
+    """
+    diag = np.ones(nobs)
+    diag[:-2] += lamb
+    diag[1:-1] += 4 * lamb
+    diag[2:] += lamb
+    band = np.zeros((3, nobs))
+    band[2] = diag
+    band[1, 1:-1] -= 2 * lamb
+    band[1, 2:] -= 2 * lamb
+    band[0, 2:] = lamb
+    factor = linalg.cholesky_banded(band, lower=False)
+    factor.flags.writeable = False
+    return factor
+
+
 def hpfilter(x, lamb=1600):
     """
     Hodrick-Prescott filter.
@@ -12,7 +35,8 @@ def hpfilter(x, lamb=1600):
     Parameters
     ----------
     x : array_like
-        The time series to filter, 1-d.
+        The time series to filter, 1-d or 2-d. If 2-d, variables are assumed
+        to be in columns and all columns are filtered in a single solve.
     lamb : float
         The Hodrick-Prescott smoothing parameter. A value of 1600 is
         suggested for quarterly data. Ravn and Uhlig suggest using a value
@@ -44,8 +68,8 @@ def hpfilter(x, lamb=1600):
     min sum((x[t] - T[t])**2 + lamb*((T[t+1] - T[t]) - (T[t] - T[t-1]))**2)
      T   t
 
-    Here we implemented the HP filter as a ridge-regression rule using
-    scipy.sparse. In this sense, the solution can be written as
+    Here we implemented the HP filter as a ridge-regression rule. In this
+    sense, the solution can be written as
 
     T = inv(I + lamb*K'K)x
 
@@ -56,6 +80,11 @@ def hpfilter(x, lamb=1600):
     K[i,j] = -2 if i == j + 1
     K[i,j] = 0 otherwise
 
+    I + lamb*K'K is a symmetric positive definite pentadiagonal matrix. Its
+    banded Cholesky factor is computed in O(nobs) and is shared by all
+    columns of x. The factors of recently used (nobs, lamb) pairs are cached
+    so that repeated calls with series of the same length do not refactorize.
+
     References
     ----------
     Hodrick, R.J, and E. C. Prescott. 1980. "Postwar U.S. Business Cycles: An
@@ -87,15 +116,12 @@ def hpfilter(x, lamb=1600):
     .. plot:: plots/hpf_plot.py
     """
     pw = PandasWrapper(x)
-    x = array_like(x, 'x', ndim=1)
-    nobs = len(x)
-    I = sparse.eye(nobs, nobs)  # noqa:E741
-    offsets = np.array([0, 1, 2])
-    data = np.repeat([[1.], [-2.], [1.]], nobs, axis=1)
-    K = sparse.dia_matrix((data, offsets), shape=(nobs - 2, nobs))
-
-    use_umfpack = True
-    trend = spsolve(I+lamb*K.T.dot(K), x, use_umfpack=use_umfpack)
+    x = array_like(x, 'x', maxdim=2)
+    nobs = x.shape[0]
+    if nobs < 3:
+        raise ValueError('x must have at least 3 observations')
+    factor = _hp_banded_factor(nobs, float(lamb))
+    trend = linalg.cho_solve_banded((factor, False), x)
 
     cycle = x - trend
     return pw.wrap(cycle, append='cycle'), pw.wrap(trend, append='trend')
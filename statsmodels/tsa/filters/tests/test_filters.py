@@ -606,6 +606,54 @@ def test_hpfilter_pandas():
     assert_equal(cycle.name, "realgdp_cycle")
 
 
+def test_hpfilter_2d():
+    dta = macrodata.load_pandas().data[['realgdp', 'realcons', 'realinv']]
+    cycle, trend = hpfilter(dta.values, 1600)
+    for i, col in enumerate(dta):
+        cycle1, trend1 = hpfilter(dta[col].values, 1600)
+        assert_allclose(cycle[:, i], cycle1, rtol=1e-10, atol=1e-8)
+        assert_allclose(trend[:, i], trend1, rtol=1e-12)
+
+    cycle, trend = hpfilter(dta, 1600)
+    assert_equal(cycle.columns.values,
+                 ["realgdp_cycle", "realcons_cycle", "realinv_cycle"])
+    assert_allclose(cycle.values + trend.values, dta.values)
+
+
+def test_hpfilter_sparse():
+    # compare to explicit solve of the ridge-regression rule
+    rs = np.random.RandomState(0)
+    for nobs in (3, 4, 5, 40):
+        x = rs.standard_normal(nobs)
+        k = np.zeros((nobs - 2, nobs))
+        for i in range(nobs - 2):
+            k[i, i:i + 3] = [1., -2., 1.]
+        trend = np.linalg.solve(np.eye(nobs) + 129600 * k.T.dot(k), x)
+        assert_allclose(hpfilter(x, 129600)[1], trend, rtol=1e-8)
+
+
+def test_cfitz_filter_loop():
+    # direct evaluation of the filter weights
+    rs = np.random.RandomState(0)
+    x = rs.standard_normal((57, 3)).cumsum(0)
+    low, high = 6, 32
+    nobs = x.shape[0]
+    xd = x - np.arange(nobs)[:, None] * (x[-1] - x[0]) / (nobs - 1)
+    a, b = 2 * np.pi / high, 2 * np.pi / low
+    j = np.arange(1, nobs + 1)
+    bj = np.r_[(b - a) / np.pi, (np.sin(b * j) - np.sin(a * j)) / (np.pi * j)]
+    expected = np.zeros_like(x)
+    for i in range(nobs):
+        B = -.5 * bj[0] - np.sum(bj[1:-i - 2])
+        A = -bj[0] - np.sum(bj[1:-i - 2]) - np.sum(bj[1:i]) - B
+        expected[i] = (bj[0] * xd[i] + np.dot(bj[1:-i - 2], xd[i + 1:-1]) +
+                       B * xd[-1] + np.dot(bj[1:i], xd[1:i][::-1]) +
+                       A * xd[0])
+    cycle, trend = cffilter(x, low, high)
+    assert_allclose(cycle, expected, atol=1e-12)
+    assert_allclose(trend, xd - expected, atol=1e-12)
+
+
 class TestFilters(object):
     @classmethod
     def setup_class(cls):
@@ -0,0 +1,2942 @@
+#cython: boundscheck=False
+#cython: wraparound=False
+#cython: cdivision=False
+"""
+Innovations algorithm
+
+Author: Chad Fulton
+License: Simplified-BSD
+"""
+
+# Typical imports
+import numpy as np
+import warnings
+from statsmodels.tsa import arima_process
+from statsmodels.src.math cimport NPY_PI, dlog, zlog
+cimport numpy as cnp
+cimport cython
+
+cnp.import_array()
+
+cdef int C = 0
+
+
+cdef inline Py_ssize_t _iabs(Py_ssize_t x) nogil:
+    return -x if x < 0 else x
+
+
+
+cdef stoeplitz(int n, int offset0, int offset1,
+                        cnp.float32_t [:] in_column,
+                        cnp.float32_t [:, :] out_matrix):
+    """
+    toeplitz(int n, int o0, int o1, cnp.float32_t [:] in_column, cnp.float32_t [:, :] out_matrix
+    
+    Construct a Toeplitz block in a matrix in place
+
+    Parameters
+    ----------
+    n : int
+        The number of entries of `in_column` to use.
+    offset0 : int
+        The row offset for `out_matrix` at which to begin writing the Toeplitz
+        block.
+    offset1 : int
+        The column offset for `out_matrix` at which to begin writing the
+        Toeplitz block.
+    in_column : ndarray
+        The column used to construct the Toeplitz block.
+    out_matrix : ndarray
+        The matrix in which to write a Toeplitz block
+
+    Notes
+    -----
+    This function constructs the Toeplitz block in-place and does not return
+    any output.
+    """
+    cdef Py_ssize_t i, j
+
+    for i in range(n):
+        for j in range(i + 1):
+            out_matrix[offset0 + i, offset1 + j] = in_column[i - j]
+            if i != j:
+              # Note: scipy by default does complex conjugate, but not
+              # necessary here since we're only dealing with covariances,
+              # which will be real (except in the case of complex-step
+              # differentiation, but in that case we do not want to apply
+              # the conjugation anyway)
+              out_matrix[offset0 + j, offset1 + i] = in_column[i - j]
+
+
+cpdef sarma_transformed_acovf_fast(cnp.float32_t [:] ar,
+                                            cnp.float32_t [:] ma,
+                                            cnp.float32_t [:] arma_acovf):
+    """
+    arma_transformed_acovf_fast(cnp.float32_t [:] ar, cnp.float32_t [:] ma, cnp.float32_t [:] arma_acovf)
+    
+    Quickly construct the autocovariance matrix for a transformed process.
+
+    Using the autocovariance function for an ARMA process, constructs the
+    autocovariances associated with the transformed process described
+    in equation (3.3.1) of _[1] in a memory efficient, and so fast, way.
+
+    Parameters
+    ----------
+    ar : ndarray
+        Autoregressive coefficients, including the zero lag, where the sign
+        convention assumes the coefficients are part of the lag polynomial on
+        the left-hand-side of the ARMA definition (i.e. they have the opposite
+        sign from the usual econometrics convention in which the coefficients
+        are on the right-hand-side of the ARMA definition).
+    ma : ndarray
+        Moving average coefficients, including the zero lag, where the sign
+        convention assumes the coefficients are part of the lag polynomial on
+        the right-hand-side of the ARMA definition (i.e. they have the same
+        sign from the usual econometrics convention in which the coefficients
+        are on the right-hand-side of the ARMA definition).
+    arma_acovf : ndarray
+        The vector of autocovariances of the ARMA process.
+
+    Returns
+    -------
+    acovf : ndarray
+        A matrix containing the autocovariances of the portion of the
+        transformed process with time-varying autocovariances. Its dimension
+        is equal to `min(m * 2, n)` where `m = max(len(ar) - 1, len(ma) - 1)`
+        and `n` is the length of the input array `arma_acovf`. It is important
+        to note that only the values in the first `m` columns or `m` rows are
+        valid. In particular, the entries in the block `acovf[m:, m:]` should
+        not be used in any case (and in fact will always be equal to zeros).
+    acovf2 : ndarray
+        An array containing the autocovariance function of the portion of the
+        transformed process with time-invariant autocovariances. Its dimension
+        is equal to `max(n - m, 0)` where `n` is the length of the input
+        array `arma_acovf`.
+
+    Notes
+    -----
+    The definition of this autocovariance matrix is from _[1] equation 3.3.3.
+
+    This function assumes that the variance of the ARMA innovation term is
+    equal to one. If this is not true, then the calling program should replace
+    `arma_acovf` with `arma_acovf / sigma2`, where sigma2 is that variance.
+
+    This function is relatively fast even when `arma_acovf` is large, since
+    it only constructs the full autocovariance matrix for a generally small
+    subset of observations. The trade-off is that the output of this function
+    is somewhat more difficult to use.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t nobs, p, q, m, m2, n, i, j, r, tmp_ix
+    cdef cnp.npy_intp dim1[1]
+    cdef cnp.npy_intp dim2[2]
+    cdef cnp.float32_t [:, :] acovf
+    cdef cnp.float32_t [:] acovf2
+
+    nobs = arma_acovf.shape[0]
+    p = len(ar) - 1
+    q = len(ma) - 1
+    m = max(p, q)
+    m2 = 2 * m
+    n = min(m2, nobs)
+
+    dim2[0] = m2;
+    dim2[1] = m2;
+    acovf = cnp.PyArray_ZEROS(2, dim2, cnp.NPY_FLOAT32, C)
+    dim1[0] = max(nobs - m, 0);
+    acovf2 = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_FLOAT32, C)
+
+    # Set i, j = 1, ..., m   (which is then done)
+    stoeplitz(m, 0, 0, arma_acovf, acovf)
+
+    # Set i = 1, ..., m;         j = m + 1, ..., 2 m
+    # and i = m + 1, ..., 2 m;   j = 1, ..., m
+    if nobs > m:
+        for j in range(m):
+            for i in range(m, m2):
+                acovf[i, j] = arma_acovf[i - j]
+                for r in range(1, p + 1):
+                    tmp_ix = abs(r - (i - j))
+                    acovf[i, j] = acovf[i, j] - (-ar[r] * arma_acovf[tmp_ix])
+        acovf[:m, m:m2] = acovf[m:m2, :m].T
+
+    # Set values for |i - j| <= q, min(i, j) = m + 1, and max(i, j) <= nobs
+    if nobs > m:
+        for i in range(nobs - m):
+            for r in range(q + 1 - i):
+                acovf2[i] = acovf2[i] + ma[r] * ma[r + i]
+
+    return acovf[:n, :n], acovf2
+
+
+cpdef sarma_innovations_algo_fast(int nobs,
+                                           cnp.float32_t [:] ar_params,
+                                           cnp.float32_t [:] ma_params,
+                                           cnp.float32_t [:, :] acovf,
+                                           cnp.float32_t [:] acovf2):
+    """
+    arma_innovations_algo_fast(int nobs, cnp.float32_t [:] ar_params, cnp.float32_t [:] ma_params, cnp.float32_t [:, :] acovf, cnp.float32_t [:] acovf2)
+    
+    Quickly apply innovations algorithm for an ARMA process.
+
+    Parameters
+    ----------
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    acovf : ndarray
+        An `m * 2` x `m * 2` autocovariance matrix at least the first `m`
+        columns filled in, where `m = max(len(ar_params), ma_params)`
+        (see `arma_transformed_acovf_fast`).
+    acovf2 : ndarray
+        A `max(0, nobs - m)` length vector containing the autocovariance
+        function associated with the final `nobs - m` observations.
+
+    Returns
+    -------
+    theta : ndarray
+        The matrix of moving average coefficients from the innovations
+        algorithm.
+    v : ndarray
+        The vector of mean squared errors.
+
+    Notes
+    -----
+    The innovations algorithm is presented in _[1], section 2.5.2.
+
+    Details of the innovations algorithm applied to ARMA processes is given
+    in _[1] section 3.3 and in section 5.2.7.
+
+    This function is relatively fast even with a large number of observations
+    since we can exploit a number of known zeros in the theta array.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t i, j, k, n, _n, m, m2, p, q, start, start2
+    cdef cnp.npy_intp dim1[1]
+    cdef cnp.npy_intp dim2[2]
+    cdef cnp.float32_t [:, :] theta
+    cdef cnp.float32_t [:] v
+
+    p = len(ar_params)
+    q = len(ma_params)
+    m = max(p, q)
+    m2 = 2 * m
+
+    dim1[0] = nobs;
+    v = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_FLOAT32, C)
+    dim2[0] = nobs;
+    dim2[1] = m + 1;
+    theta = cnp.PyArray_ZEROS(2, dim2, cnp.NPY_FLOAT32, C)
+
+    if m > 0:
+        v[0] = acovf[0, 0]
+    else:
+        # (handle the corner case where p = q = 0)
+        v[0] = acovf2[0]
+
+    for n in range(nobs - 1):
+        _n = n + 1
+
+        start = 0 if n < m else n + 1 - q
+        for k in range(start, n + 1):
+            # See Brockwell and Davis, p. 100-101
+            # (here we have weak rather than strict inequality due to Python's
+            # zero indexing)
+            if n >= m and n - k >= q:
+                continue
+
+            if n + 1 < m2 and k < m:
+                theta[_n, n - k] = acovf[n + 1, k]
+            else:
+                theta[_n, n - k] = acovf2[n + 1 - k]
+
+            start2 = 0 if n < m else n - m
+            for j in range(start2, k):
+                if n - j < m + 1:
+                    theta[_n, n - k] = theta[_n, n - k] - theta[k - 1 + 1, k - j - 1] * theta[_n, n - j] * v[j]
+            theta[_n, n - k] = theta[_n, n - k] / v[k]
+
+        if n + 1 < m:
+            v[n + 1] = acovf[n + 1, n + 1]
+        else:
+            v[n + 1] = acovf2[0]
+        start = max(0, n - (m + 1) + 2)
+        for i in range(start, n + 1):
+            v[n + 1] = v[n + 1] - theta[_n, n - i]**2 * v[i]
+
+    return theta, v
+
+
+cpdef sarma_innovations_filter(cnp.float32_t [:] endog,
+                                        cnp.float32_t [:] ar_params,
+                                        cnp.float32_t [:] ma_params,
+                                        cnp.float32_t [:, :] theta):
+    """
+    arma_innovations_filter(cnp.float32_t [:] endog, cnp.float32_t [:] ar_params, cnp.float32_t [:] ma_params, cnp.float32_t [:, :] theta):
+    
+    Innovations filter for an ARMA process.
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    theta : ndarray
+        The matrix of moving average coefficients from the innovations
+        algorithm (see `arma_innovations_algo` or `arma_innovations_algo_fast`)
+
+    Returns
+    -------
+    u : ndarray
+        The vector of innovations: the one-step-ahead prediction errors from
+        applying the innovations algorithm.
+
+    Notes
+    -----
+    The innovations algorithm is presented in _[1], section 2.5.2.
+
+    Details of the innovations algorithm applied to ARMA processes is given
+    in _[1] section 3.3 and in section 5.2.7.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t nobs, i, k, j, m, p, q
+    cdef cnp.npy_intp dim1[1]
+    cdef cnp.float32_t [:] u
+    cdef cnp.float32_t hat
+
+    p = len(ar_params)
+    q = len(ma_params)
+    m = max(p, q)
+
+    nobs = theta.shape[0]
+    k = theta.shape[1]
+
+    dim1[0] = nobs;
+    u = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_FLOAT32, C)
+    u[0] = endog[0]
+
+    for i in range(1, nobs):
+        hat = 0
+        if i < m:
+            for j in range(i):
+                hat = hat + theta[i, j] * u[i - j - 1]
+        else:
+            for j in range(p):
+                hat = hat + ar_params[j] * endog[i - j - 1]
+            for j in range(q):
+                hat = hat + theta[i, j] * u[i - j - 1]
+        u[i] = endog[i] - hat
+
+    return u
+
+
+cpdef sarma_innovations(cnp.float32_t [:] endog,
+                                      cnp.float32_t [:] ar_params,
+                                      cnp.float32_t [:] ma_params,
+                                      cnp.float32_t sigma2):
+    """
+    arma_innovations(cnp.float32_t [:] endog, cnp.float32_t [:] ar_params, cnp.float32_t [:] ma_params):
+    
+    Compute innovations and variances based on an ARMA process.
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    sigma2 : ndarray
+        The ARMA innovation variance.
+
+    Returns
+    -------
+    u : ndarray
+        The vector of innovations: the one-step-ahead prediction errors from
+        applying the innovations algorithm.
+    v : ndarray
+        The vector of innovation variances.
+
+    Notes
+    -----
+    The innovations algorithm is presented in _[1], section 2.5.2.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t nobs = len(endog), i
+    cdef cnp.float32_t const
+    cdef cnp.float32_t [:] ar, ma, arma_acovf, llf_obs, acovf2, u, v
+    cdef cnp.float32_t [:, :] acovf
+    cdef cnp.npy_intp dim1[1]
+
+    dim1[0] = len(ar_params) + 1;
+    ar = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_FLOAT32, C)
+    dim1[0] = len(ma_params) + 1;
+    ma = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_FLOAT32, C)
+
+    ar[0] = 1
+    for i in range(1, len(ar_params) + 1):
+        ar[i] = -1 * ar_params[i - 1]
+    ma[0] = 1
+    ma[1:] = ma_params
+
+    arma_acovf = arima_process.arma_acovf(ar, ma, nobs, sigma2, dtype=np.float32) / sigma2
+    acovf, acovf2 = sarma_transformed_acovf_fast(ar, ma, arma_acovf)
+    theta, v = sarma_innovations_algo_fast(nobs, ar_params, ma_params, acovf, acovf2)
+    u = sarma_innovations_filter(endog, ar_params, ma_params, theta)
+
+    return u, v
+
+
+cpdef sarma_loglikeobs_fast(cnp.float32_t [:] endog,
+                                     cnp.float32_t [:] ar_params,
+                                     cnp.float32_t [:] ma_params,
+                                     cnp.float32_t sigma2):
+    """
+    sarma_loglikeobs_fast(cnp.float32_t [:] endog, cnp.float32_t [:] ar_params, cnp.float32_t [:] ma_params, cnp.float32_t sigma2)
+
+    Quickly calculate the loglikelihood of each observation for an ARMA process
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    sigma2 : ndarray
+        The ARMA innovation variance.
+
+    Returns
+    -------
+    loglike : ndarray of float
+        Array of loglikelihood values for each observation.
+
+    Notes
+    -----
+    Details related to computing the loglikelihood associated with an ARMA
+    process using the innovations algorithm are given in _[1] section 5.2.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+
+    cdef Py_ssize_t nobs = len(endog), i
+    cdef cnp.float32_t const
+    cdef cnp.float32_t [:] llf_obs, u, v
+    cdef cnp.npy_intp dim1[1]
+
+    u, v = sarma_innovations(endog, ar_params, ma_params, sigma2)
+
+    dim1[0] = nobs;
+    llf_obs = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_FLOAT32, C)
+
+    const = dlog(2*NPY_PI)
+    for i in range(nobs):
+        llf_obs[i] = -0.5 * u[i]**2 / (sigma2 * v[i]) - 0.5 * (const + dlog(sigma2 * v[i]))
+
+    return np.array(llf_obs, dtype=np.float32)
+
+
+cdef void s_arma_kappa_score(int nobs, int kd,
+                                     cnp.float32_t [:] ar_params,
+                                     cnp.float32_t [:] ma_params,
+                                     cnp.float32_t [:] gamma,
+                                     cnp.float32_t [:, :] dgamma,
+                                     cnp.float32_t [:, :] kappa,
+                                     cnp.float32_t [:, :, :] dkappa,
+                                     cnp.float32_t [:] kappa2,
+                                     cnp.float32_t [:, :] dkappa2) nogil:
+    """
+    Transformed process autocovariances and their derivatives, in place
+
+    Computes the same values as `arma_transformed_acovf_fast` with
+    `kappa2` holding the nonzero part of `acovf2`. If `kd` > 0, the
+    derivatives with respect to the `kd` = p + q ARMA parameters are
+    computed from the derivatives `dgamma` of the unit variance ARMA
+    autocovariances `gamma`, which must have at least 2 m + p elements.
+    """
+    cdef Py_ssize_t p, q, m, m2, n, i, j, r, a, s, h
+    cdef cnp.float32_t ma_r, ma_rh
+
+    p = ar_params.shape[0]
+    q = ma_params.shape[0]
+    m = max(p, q)
+    m2 = 2 * m
+    n = min(m2, nobs)
+
+    for i in range(n):
+        for j in range(n):
+            kappa[i, j] = 0
+            for a in range(kd):
+                dkappa[a, i, j] = 0
+
+    for i in range(min(m, n)):
+        for j in range(min(m, n)):
+            kappa[i, j] = gamma[_iabs(i - j)]
+            for a in range(kd):
+                dkappa[a, i, j] = dgamma[a, _iabs(i - j)]
+
+    if nobs > m:
+        for j in range(m):
+            for i in range(m, n):
+                h = i - j
+                kappa[i, j] = gamma[h]
+                for r in range(1, p + 1):
+                    kappa[i, j] = kappa[i, j] - ar_params[r - 1] * gamma[_iabs(r - h)]
+                kappa[j, i] = kappa[i, j]
+                for a in range(kd):
+                    dkappa[a, i, j] = dgamma[a, h]
+                    for r in range(1, p + 1):
+                        dkappa[a, i, j] = dkappa[a, i, j] - ar_params[r - 1] * dgamma[a, _iabs(r - h)]
+                    if a < p:
+                        dkappa[a, i, j] = dkappa[a, i, j] - gamma[_iabs(a + 1 - h)]
+                    dkappa[a, j, i] = dkappa[a, i, j]
+
+    # MA(q) autocovariances of the time-invariant part, where ma[0] = 1
+    for h in range(q + 1):
+        kappa2[h] = 0
+        for r in range(q + 1 - h):
+            ma_r = 1 if r == 0 else ma_params[r - 1]
+            ma_rh = 1 if r + h == 0 else ma_params[r + h - 1]
+            kappa2[h] = kappa2[h] + ma_r * ma_rh
+        for a in range(kd):
+            dkappa2[a, h] = 0
+            if a >= p:
+                s = a - p + 1
+                if s - h >= 0:
+                    dkappa2[a, h] = dkappa2[a, h] + (1 if s == h else ma_params[s - h - 1])
+                if s + h <= q:
+                    dkappa2[a, h] = dkappa2[a, h] + ma_params[s + h - 1]
+
+
+cdef void s_arma_innovations_algo_score(int nobs, int kd, int p,
+                                                int q,
+                                                cnp.float32_t [:, :] kappa,
+                                                cnp.float32_t [:, :, :] dkappa,
+                                                cnp.float32_t [:] kappa2,
+                                                cnp.float32_t [:, :] dkappa2,
+                                                cnp.float32_t [:, :] theta,
+                                                cnp.float32_t [:, :, :] dtheta,
+                                                cnp.float32_t [:] v,
+                                                cnp.float32_t [:, :] dv) nogil:
+    """
+    Innovations algorithm with derivatives, in place
+
+    Computes the same `theta` and `v` as `arma_innovations_algo_fast`, and
+    if `kd` > 0 their derivatives with respect to the ARMA parameters by
+    differentiating each step of the recursion.
+    """
+    cdef Py_ssize_t i, j, k, a, n, _n, m, m2, start, start2, h
+    cdef cnp.float32_t tmp
+
+    m = max(p, q)
+    m2 = 2 * m
+
+    for i in range(nobs):
+        for j in range(m + 1):
+            theta[i, j] = 0
+            for a in range(kd):
+                dtheta[a, i, j] = 0
+
+    if m > 0:
+        v[0] = kappa[0, 0]
+        for a in range(kd):
+            dv[a, 0] = dkappa[a, 0, 0]
+    else:
+        v[0] = kappa2[0]
+        for a in range(kd):
+            dv[a, 0] = dkappa2[a, 0]
+
+    for n in range(nobs - 1):
+        _n = n + 1
+
+        start = 0 if n < m else n + 1 - q
+        for k in range(start, n + 1):
+            if n >= m and n - k >= q:
+                continue
+
+            if n + 1 < m2 and k < m:
+                theta[_n, n - k] = kappa[n + 1, k]
+                for a in range(kd):
+                    dtheta[a, _n, n - k] = dkappa[a, n + 1, k]
+            else:
+                h = n + 1 - k
+                theta[_n, n - k] = kappa2[h] if h <= q else 0
+                for a in range(kd):
+                    dtheta[a, _n, n - k] = dkappa2[a, h] if h <= q else 0
+
+            start2 = 0 if n < m else n - m
+            for j in range(start2, k):
+                if n - j < m + 1:
+                    tmp = theta[k, k - j - 1] * theta[_n, n - j]
+                    theta[_n, n - k] = theta[_n, n - k] - tmp * v[j]
+                    for a in range(kd):
+                        dtheta[a, _n, n - k] = dtheta[a, _n, n - k] - (
+                            (dtheta[a, k, k - j - 1] * theta[_n, n - j]
+                             + theta[k, k - j - 1] * dtheta[a, _n, n - j]) * v[j]
+                            + tmp * dv[a, j])
+            theta[_n, n - k] = theta[_n, n - k] / v[k]
+            for a in range(kd):
+                dtheta[a, _n, n - k] = (
+                    (dtheta[a, _n, n - k] - theta[_n, n - k] * dv[a, k]) / v[k])
+
+        if n + 1 < m:
+            v[n + 1] = kappa[n + 1, n + 1]
+            for a in range(kd):
+                dv[a, n + 1] = dkappa[a, n + 1, n + 1]
+        else:
+            v[n + 1] = kappa2[0]
+            for a in range(kd):
+                dv[a, n + 1] = dkappa2[a, 0]
+        start = max(0, n - (m + 1) + 2)
+        for i in range(start, n + 1):
+            tmp = theta[_n, n - i]
+            v[n + 1] = v[n + 1] - tmp**2 * v[i]
+            for a in range(kd):
+                dv[a, n + 1] = dv[a, n + 1] - (
+                    2 * tmp * dtheta[a, _n, n - i] * v[i] + tmp**2 * dv[a, i])
+
+
+cpdef sarma_loglike_batch(cnp.float32_t [:, ::1] endog,
+                                   cnp.float32_t [:, ::1] ar_params,
+                                   cnp.float32_t [:, ::1] ma_params,
+                                   cnp.float32_t [::1] sigma2,
+                                   cnp.float32_t [:, ::1] gamma,
+                                   cnp.float32_t [:, :, ::1] dgamma,
+                                   int compute_score=False):
+    """
+    sarma_loglike_batch(cnp.float32_t [:, ::1] endog, cnp.float32_t [:, ::1] ar_params, cnp.float32_t [:, ::1] ma_params, cnp.float32_t [::1] sigma2, cnp.float32_t [:, ::1] gamma, cnp.float32_t [:, :, ::1] dgamma, int compute_score=False)
+
+    Loglikelihood and score of ARMA processes for sets of parameters and
+    series
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series processes, shaped (nseries, nobs).
+    ar_params : ndarray
+        Autoregressive parameters, shaped (nparams, p).
+    ma_params : ndarray
+        Moving average parameters, shaped (nparams, q).
+    sigma2 : ndarray
+        The ARMA innovation variances, shaped (nparams,).
+    gamma : ndarray
+        Unit variance autocovariances of the ARMA processes, shaped
+        (nparams, nlags) with nlags >= 2 max(p, q) + p.
+    dgamma : ndarray
+        Derivatives of `gamma` with respect to the AR and MA parameters,
+        shaped (nparams, p + q, nlags). Only used if `compute_score` is True.
+    compute_score : bool, optional
+        Whether to compute the score. Default is False.
+
+    Returns
+    -------
+    loglike : ndarray
+        Loglikelihood values, shaped (nparams, nseries).
+    score : ndarray
+        Score with respect to the AR, MA and variance parameters, shaped
+        (nparams, nseries, p + q + 1). Zeros if `compute_score` is False.
+
+    Notes
+    -----
+    For each set of parameters the innovations algorithm is applied once,
+    and the innovations filter is then applied to all series. The score is
+    computed by differentiating each step of the recursions (forward mode)
+    rather than by numerical differentiation. All loops run without the
+    GIL.
+    """
+    cdef Py_ssize_t nseries, nobs, nparams, p, q, m, kd, i, j, a, s, ip
+    cdef cnp.float32_t const, hat, dhat, weight, llf, sig2
+    cdef cnp.float32_t [:, ::1] loglike, theta, kappa, kappa2, dkappa2, dv, du
+    cdef cnp.float32_t [:, :, ::1] score, dtheta, dkappa
+    cdef cnp.float32_t [::1] v, u
+
+    nseries = endog.shape[0]
+    nobs = endog.shape[1]
+    nparams = ar_params.shape[0]
+    p = ar_params.shape[1]
+    q = ma_params.shape[1]
+    m = max(p, q)
+    kd = p + q if compute_score else 0
+
+    if gamma.shape[1] < 2 * m + p:
+        raise ValueError('gamma must have at least 2 max(p, q) + p columns')
+    if compute_score and (dgamma.shape[1] != p + q or
+                          dgamma.shape[2] < 2 * m + p):
+        raise ValueError('dgamma must be shaped (nparams, p + q, nlags)')
+
+    loglike = np.zeros((nparams, nseries), dtype=np.float32)
+    score = np.zeros((nparams, nseries, p + q + 1), dtype=np.float32)
+    kappa = np.zeros((2 * m, 2 * m), dtype=np.float32)
+    dkappa = np.zeros((kd, 2 * m, 2 * m), dtype=np.float32)
+    kappa2 = np.zeros((1, q + 1), dtype=np.float32)
+    dkappa2 = np.zeros((kd, q + 1), dtype=np.float32)
+    theta = np.zeros((nobs, m + 1), dtype=np.float32)
+    dtheta = np.zeros((kd, nobs, m + 1), dtype=np.float32)
+    v = np.zeros(nobs, dtype=np.float32)
+    dv = np.zeros((kd, nobs), dtype=np.float32)
+    u = np.zeros(nobs, dtype=np.float32)
+    du = np.zeros((kd, nobs), dtype=np.float32)
+
+    const = dlog(2*NPY_PI)
+    with nogil:
+        for ip in range(nparams):
+            sig2 = sigma2[ip]
+            s_arma_kappa_score(nobs, kd, ar_params[ip], ma_params[ip],
+                                        gamma[ip], dgamma[ip], kappa, dkappa,
+                                        kappa2[0], dkappa2)
+            s_arma_innovations_algo_score(nobs, kd, p, q, kappa,
+                                                  dkappa, kappa2[0], dkappa2,
+                                                  theta, dtheta, v, dv)
+
+            for s in range(nseries):
+                # Innovations filter, see arma_innovations_filter
+                for i in range(nobs):
+                    hat = 0
+                    for a in range(kd):
+                        du[a, i] = 0
+                    if i < m:
+                        for j in range(i):
+                            hat = hat + theta[i, j] * u[i - j - 1]
+                            for a in range(kd):
+                                du[a, i] = du[a, i] - (dtheta[a, i, j] * u[i - j - 1]
+                                                       + theta[i, j] * du[a, i - j - 1])
+                    else:
+                        for j in range(p):
+                            hat = hat + ar_params[ip, j] * endog[s, i - j - 1]
+                        for j in range(q):
+                            hat = hat + theta[i, j] * u[i - j - 1]
+                            for a in range(kd):
+                                du[a, i] = du[a, i] - (dtheta[a, i, j] * u[i - j - 1]
+                                                       + theta[i, j] * du[a, i - j - 1])
+                        for a in range(min(kd, p)):
+                            du[a, i] = du[a, i] - endog[s, i - a - 1]
+                    u[i] = endog[s, i] - hat
+
+                    weight = u[i] / (sig2 * v[i])
+                    llf = -0.5 * u[i] * weight - 0.5 * (const + dlog(sig2 * v[i]))
+                    loglike[ip, s] = loglike[ip, s] + llf
+                    if compute_score:
+                        for a in range(kd):
+                            score[ip, s, a] = score[ip, s, a] + (
+                                -weight * du[a, i]
+                                + 0.5 * (u[i] * weight - 1) * dv[a, i] / v[i])
+                        score[ip, s, kd] = score[ip, s, kd] + 0.5 * (u[i] * weight - 1) / sig2
+
+    return np.asarray(loglike), np.asarray(score)
+
+
+cdef dtoeplitz(int n, int offset0, int offset1,
+                        cnp.float64_t [:] in_column,
+                        cnp.float64_t [:, :] out_matrix):
+    """
+    toeplitz(int n, int o0, int o1, cnp.float64_t [:] in_column, cnp.float64_t [:, :] out_matrix
+    
+    Construct a Toeplitz block in a matrix in place
+
+    Parameters
+    ----------
+    n : int
+        The number of entries of `in_column` to use.
+    offset0 : int
+        The row offset for `out_matrix` at which to begin writing the Toeplitz
+        block.
+    offset1 : int
+        The column offset for `out_matrix` at which to begin writing the
+        Toeplitz block.
+    in_column : ndarray
+        The column used to construct the Toeplitz block.
+    out_matrix : ndarray
+        The matrix in which to write a Toeplitz block
+
+    Notes
+    -----
+    This function constructs the Toeplitz block in-place and does not return
+    any output.
+    """
+    cdef Py_ssize_t i, j
+
+    for i in range(n):
+        for j in range(i + 1):
+            out_matrix[offset0 + i, offset1 + j] = in_column[i - j]
+            if i != j:
+              # Note: scipy by default does complex conjugate, but not
+              # necessary here since we're only dealing with covariances,
+              # which will be real (except in the case of complex-step
+              # differentiation, but in that case we do not want to apply
+              # the conjugation anyway)
+              out_matrix[offset0 + j, offset1 + i] = in_column[i - j]
+
+
+cpdef darma_transformed_acovf_fast(cnp.float64_t [:] ar,
+                                            cnp.float64_t [:] ma,
+                                            cnp.float64_t [:] arma_acovf):
+    """
+    arma_transformed_acovf_fast(cnp.float64_t [:] ar, cnp.float64_t [:] ma, cnp.float64_t [:] arma_acovf)
+    
+    Quickly construct the autocovariance matrix for a transformed process.
+
+    Using the autocovariance function for an ARMA process, constructs the
+    autocovariances associated with the transformed process described
+    in equation (3.3.1) of _[1] in a memory efficient, and so fast, way.
+
+    Parameters
+    ----------
+    ar : ndarray
+        Autoregressive coefficients, including the zero lag, where the sign
+        convention assumes the coefficients are part of the lag polynomial on
+        the left-hand-side of the ARMA definition (i.e. they have the opposite
+        sign from the usual econometrics convention in which the coefficients
+        are on the right-hand-side of the ARMA definition).
+    ma : ndarray
+        Moving average coefficients, including the zero lag, where the sign
+        convention assumes the coefficients are part of the lag polynomial on
+        the right-hand-side of the ARMA definition (i.e. they have the same
+        sign from the usual econometrics convention in which the coefficients
+        are on the right-hand-side of the ARMA definition).
+    arma_acovf : ndarray
+        The vector of autocovariances of the ARMA process.
+
+    Returns
+    -------
+    acovf : ndarray
+        A matrix containing the autocovariances of the portion of the
+        transformed process with time-varying autocovariances. Its dimension
+        is equal to `min(m * 2, n)` where `m = max(len(ar) - 1, len(ma) - 1)`
+        and `n` is the length of the input array `arma_acovf`. It is important
+        to note that only the values in the first `m` columns or `m` rows are
+        valid. In particular, the entries in the block `acovf[m:, m:]` should
+        not be used in any case (and in fact will always be equal to zeros).
+    acovf2 : ndarray
+        An array containing the autocovariance function of the portion of the
+        transformed process with time-invariant autocovariances. Its dimension
+        is equal to `max(n - m, 0)` where `n` is the length of the input
+        array `arma_acovf`.
+
+    Notes
+    -----
+    The definition of this autocovariance matrix is from _[1] equation 3.3.3.
+
+    This function assumes that the variance of the ARMA innovation term is
+    equal to one. If this is not true, then the calling program should replace
+    `arma_acovf` with `arma_acovf / sigma2`, where sigma2 is that variance.
+
+    This function is relatively fast even when `arma_acovf` is large, since
+    it only constructs the full autocovariance matrix for a generally small
+    subset of observations. The trade-off is that the output of this function
+    is somewhat more difficult to use.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t nobs, p, q, m, m2, n, i, j, r, tmp_ix
+    cdef cnp.npy_intp dim1[1]
+    cdef cnp.npy_intp dim2[2]
+    cdef cnp.float64_t [:, :] acovf
+    cdef cnp.float64_t [:] acovf2
+
+    nobs = arma_acovf.shape[0]
+    p = len(ar) - 1
+    q = len(ma) - 1
+    m = max(p, q)
+    m2 = 2 * m
+    n = min(m2, nobs)
+
+    dim2[0] = m2;
+    dim2[1] = m2;
+    acovf = cnp.PyArray_ZEROS(2, dim2, cnp.NPY_FLOAT64, C)
+    dim1[0] = max(nobs - m, 0);
+    acovf2 = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_FLOAT64, C)
+
+    # Set i, j = 1, ..., m   (which is then done)
+    dtoeplitz(m, 0, 0, arma_acovf, acovf)
+
+    # Set i = 1, ..., m;         j = m + 1, ..., 2 m
+    # and i = m + 1, ..., 2 m;   j = 1, ..., m
+    if nobs > m:
+        for j in range(m):
+            for i in range(m, m2):
+                acovf[i, j] = arma_acovf[i - j]
+                for r in range(1, p + 1):
+                    tmp_ix = abs(r - (i - j))
+                    acovf[i, j] = acovf[i, j] - (-ar[r] * arma_acovf[tmp_ix])
+        acovf[:m, m:m2] = acovf[m:m2, :m].T
+
+    # Set values for |i - j| <= q, min(i, j) = m + 1, and max(i, j) <= nobs
+    if nobs > m:
+        for i in range(nobs - m):
+            for r in range(q + 1 - i):
+                acovf2[i] = acovf2[i] + ma[r] * ma[r + i]
+
+    return acovf[:n, :n], acovf2
+
+
+cpdef darma_innovations_algo_fast(int nobs,
+                                           cnp.float64_t [:] ar_params,
+                                           cnp.float64_t [:] ma_params,
+                                           cnp.float64_t [:, :] acovf,
+                                           cnp.float64_t [:] acovf2):
+    """
+    arma_innovations_algo_fast(int nobs, cnp.float64_t [:] ar_params, cnp.float64_t [:] ma_params, cnp.float64_t [:, :] acovf, cnp.float64_t [:] acovf2)
+    
+    Quickly apply innovations algorithm for an ARMA process.
+
+    Parameters
+    ----------
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    acovf : ndarray
+        An `m * 2` x `m * 2` autocovariance matrix at least the first `m`
+        columns filled in, where `m = max(len(ar_params), ma_params)`
+        (see `arma_transformed_acovf_fast`).
+    acovf2 : ndarray
+        A `max(0, nobs - m)` length vector containing the autocovariance
+        function associated with the final `nobs - m` observations.
+
+    Returns
+    -------
+    theta : ndarray
+        The matrix of moving average coefficients from the innovations
+        algorithm.
+    v : ndarray
+        The vector of mean squared errors.
+
+    Notes
+    -----
+    The innovations algorithm is presented in _[1], section 2.5.2.
+
+    Details of the innovations algorithm applied to ARMA processes is given
+    in _[1] section 3.3 and in section 5.2.7.
+
+    This function is relatively fast even with a large number of observations
+    since we can exploit a number of known zeros in the theta array.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t i, j, k, n, _n, m, m2, p, q, start, start2
+    cdef cnp.npy_intp dim1[1]
+    cdef cnp.npy_intp dim2[2]
+    cdef cnp.float64_t [:, :] theta
+    cdef cnp.float64_t [:] v
+
+    p = len(ar_params)
+    q = len(ma_params)
+    m = max(p, q)
+    m2 = 2 * m
+
+    dim1[0] = nobs;
+    v = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_FLOAT64, C)
+    dim2[0] = nobs;
+    dim2[1] = m + 1;
+    theta = cnp.PyArray_ZEROS(2, dim2, cnp.NPY_FLOAT64, C)
+
+    if m > 0:
+        v[0] = acovf[0, 0]
+    else:
+        # (handle the corner case where p = q = 0)
+        v[0] = acovf2[0]
+
+    for n in range(nobs - 1):
+        _n = n + 1
+
+        start = 0 if n < m else n + 1 - q
+        for k in range(start, n + 1):
+            # See Brockwell and Davis, p. 100-101
+            # (here we have weak rather than strict inequality due to Python's
+            # zero indexing)
+            if n >= m and n - k >= q:
+                continue
+
+            if n + 1 < m2 and k < m:
+                theta[_n, n - k] = acovf[n + 1, k]
+            else:
+                theta[_n, n - k] = acovf2[n + 1 - k]
+
+            start2 = 0 if n < m else n - m
+            for j in range(start2, k):
+                if n - j < m + 1:
+                    theta[_n, n - k] = theta[_n, n - k] - theta[k - 1 + 1, k - j - 1] * theta[_n, n - j] * v[j]
+            theta[_n, n - k] = theta[_n, n - k] / v[k]
+
+        if n + 1 < m:
+            v[n + 1] = acovf[n + 1, n + 1]
+        else:
+            v[n + 1] = acovf2[0]
+        start = max(0, n - (m + 1) + 2)
+        for i in range(start, n + 1):
+            v[n + 1] = v[n + 1] - theta[_n, n - i]**2 * v[i]
+
+    return theta, v
+
+
+cpdef darma_innovations_filter(cnp.float64_t [:] endog,
+                                        cnp.float64_t [:] ar_params,
+                                        cnp.float64_t [:] ma_params,
+                                        cnp.float64_t [:, :] theta):
+    """
+    arma_innovations_filter(cnp.float64_t [:] endog, cnp.float64_t [:] ar_params, cnp.float64_t [:] ma_params, cnp.float64_t [:, :] theta):
+    
+    Innovations filter for an ARMA process.
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    theta : ndarray
+        The matrix of moving average coefficients from the innovations
+        algorithm (see `arma_innovations_algo` or `arma_innovations_algo_fast`)
+
+    Returns
+    -------
+    u : ndarray
+        The vector of innovations: the one-step-ahead prediction errors from
+        applying the innovations algorithm.
+
+    Notes
+    -----
+    The innovations algorithm is presented in _[1], section 2.5.2.
+
+    Details of the innovations algorithm applied to ARMA processes is given
+    in _[1] section 3.3 and in section 5.2.7.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t nobs, i, k, j, m, p, q
+    cdef cnp.npy_intp dim1[1]
+    cdef cnp.float64_t [:] u
+    cdef cnp.float64_t hat
+
+    p = len(ar_params)
+    q = len(ma_params)
+    m = max(p, q)
+
+    nobs = theta.shape[0]
+    k = theta.shape[1]
+
+    dim1[0] = nobs;
+    u = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_FLOAT64, C)
+    u[0] = endog[0]
+
+    for i in range(1, nobs):
+        hat = 0
+        if i < m:
+            for j in range(i):
+                hat = hat + theta[i, j] * u[i - j - 1]
+        else:
+            for j in range(p):
+                hat = hat + ar_params[j] * endog[i - j - 1]
+            for j in range(q):
+                hat = hat + theta[i, j] * u[i - j - 1]
+        u[i] = endog[i] - hat
+
+    return u
+
+
+cpdef darma_innovations(cnp.float64_t [:] endog,
+                                      cnp.float64_t [:] ar_params,
+                                      cnp.float64_t [:] ma_params,
+                                      cnp.float64_t sigma2):
+    """
+    arma_innovations(cnp.float64_t [:] endog, cnp.float64_t [:] ar_params, cnp.float64_t [:] ma_params):
+    
+    Compute innovations and variances based on an ARMA process.
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    sigma2 : ndarray
+        The ARMA innovation variance.
+
+    Returns
+    -------
+    u : ndarray
+        The vector of innovations: the one-step-ahead prediction errors from
+        applying the innovations algorithm.
+    v : ndarray
+        The vector of innovation variances.
+
+    Notes
+    -----
+    The innovations algorithm is presented in _[1], section 2.5.2.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t nobs = len(endog), i
+    cdef cnp.float64_t const
+    cdef cnp.float64_t [:] ar, ma, arma_acovf, llf_obs, acovf2, u, v
+    cdef cnp.float64_t [:, :] acovf
+    cdef cnp.npy_intp dim1[1]
+
+    dim1[0] = len(ar_params) + 1;
+    ar = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_FLOAT64, C)
+    dim1[0] = len(ma_params) + 1;
+    ma = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_FLOAT64, C)
+
+    ar[0] = 1
+    for i in range(1, len(ar_params) + 1):
+        ar[i] = -1 * ar_params[i - 1]
+    ma[0] = 1
+    ma[1:] = ma_params
+
+    arma_acovf = arima_process.arma_acovf(ar, ma, nobs, sigma2, dtype=float) / sigma2
+    acovf, acovf2 = darma_transformed_acovf_fast(ar, ma, arma_acovf)
+    theta, v = darma_innovations_algo_fast(nobs, ar_params, ma_params, acovf, acovf2)
+    u = darma_innovations_filter(endog, ar_params, ma_params, theta)
+
+    return u, v
+
+
+cpdef darma_loglikeobs_fast(cnp.float64_t [:] endog,
+                                     cnp.float64_t [:] ar_params,
+                                     cnp.float64_t [:] ma_params,
+                                     cnp.float64_t sigma2):
+    """
+    darma_loglikeobs_fast(cnp.float64_t [:] endog, cnp.float64_t [:] ar_params, cnp.float64_t [:] ma_params, cnp.float64_t sigma2)
+
+    Quickly calculate the loglikelihood of each observation for an ARMA process
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    sigma2 : ndarray
+        The ARMA innovation variance.
+
+    Returns
+    -------
+    loglike : ndarray of float
+        Array of loglikelihood values for each observation.
+
+    Notes
+    -----
+    Details related to computing the loglikelihood associated with an ARMA
+    process using the innovations algorithm are given in _[1] section 5.2.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+
+    cdef Py_ssize_t nobs = len(endog), i
+    cdef cnp.float64_t const
+    cdef cnp.float64_t [:] llf_obs, u, v
+    cdef cnp.npy_intp dim1[1]
+
+    u, v = darma_innovations(endog, ar_params, ma_params, sigma2)
+
+    dim1[0] = nobs;
+    llf_obs = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_FLOAT64, C)
+
+    const = dlog(2*NPY_PI)
+    for i in range(nobs):
+        llf_obs[i] = -0.5 * u[i]**2 / (sigma2 * v[i]) - 0.5 * (const + dlog(sigma2 * v[i]))
+
+    return np.array(llf_obs, dtype=float)
+
+
+cdef void d_arma_kappa_score(int nobs, int kd,
+                                     cnp.float64_t [:] ar_params,
+                                     cnp.float64_t [:] ma_params,
+                                     cnp.float64_t [:] gamma,
+                                     cnp.float64_t [:, :] dgamma,
+                                     cnp.float64_t [:, :] kappa,
+                                     cnp.float64_t [:, :, :] dkappa,
+                                     cnp.float64_t [:] kappa2,
+                                     cnp.float64_t [:, :] dkappa2) nogil:
+    """
+    Transformed process autocovariances and their derivatives, in place
+
+    Computes the same values as `arma_transformed_acovf_fast` with
+    `kappa2` holding the nonzero part of `acovf2`. If `kd` > 0, the
+    derivatives with respect to the `kd` = p + q ARMA parameters are
+    computed from the derivatives `dgamma` of the unit variance ARMA
+    autocovariances `gamma`, which must have at least 2 m + p elements.
+    """
+    cdef Py_ssize_t p, q, m, m2, n, i, j, r, a, s, h
+    cdef cnp.float64_t ma_r, ma_rh
+
+    p = ar_params.shape[0]
+    q = ma_params.shape[0]
+    m = max(p, q)
+    m2 = 2 * m
+    n = min(m2, nobs)
+
+    for i in range(n):
+        for j in range(n):
+            kappa[i, j] = 0
+            for a in range(kd):
+                dkappa[a, i, j] = 0
+
+    for i in range(min(m, n)):
+        for j in range(min(m, n)):
+            kappa[i, j] = gamma[_iabs(i - j)]
+            for a in range(kd):
+                dkappa[a, i, j] = dgamma[a, _iabs(i - j)]
+
+    if nobs > m:
+        for j in range(m):
+            for i in range(m, n):
+                h = i - j
+                kappa[i, j] = gamma[h]
+                for r in range(1, p + 1):
+                    kappa[i, j] = kappa[i, j] - ar_params[r - 1] * gamma[_iabs(r - h)]
+                kappa[j, i] = kappa[i, j]
+                for a in range(kd):
+                    dkappa[a, i, j] = dgamma[a, h]
+                    for r in range(1, p + 1):
+                        dkappa[a, i, j] = dkappa[a, i, j] - ar_params[r - 1] * dgamma[a, _iabs(r - h)]
+                    if a < p:
+                        dkappa[a, i, j] = dkappa[a, i, j] - gamma[_iabs(a + 1 - h)]
+                    dkappa[a, j, i] = dkappa[a, i, j]
+
+    # MA(q) autocovariances of the time-invariant part, where ma[0] = 1
+    for h in range(q + 1):
+        kappa2[h] = 0
+        for r in range(q + 1 - h):
+            ma_r = 1 if r == 0 else ma_params[r - 1]
+            ma_rh = 1 if r + h == 0 else ma_params[r + h - 1]
+            kappa2[h] = kappa2[h] + ma_r * ma_rh
+        for a in range(kd):
+            dkappa2[a, h] = 0
+            if a >= p:
+                s = a - p + 1
+                if s - h >= 0:
+                    dkappa2[a, h] = dkappa2[a, h] + (1 if s == h else ma_params[s - h - 1])
+                if s + h <= q:
+                    dkappa2[a, h] = dkappa2[a, h] + ma_params[s + h - 1]
+
+
+cdef void d_arma_innovations_algo_score(int nobs, int kd, int p,
+                                                int q,
+                                                cnp.float64_t [:, :] kappa,
+                                                cnp.float64_t [:, :, :] dkappa,
+                                                cnp.float64_t [:] kappa2,
+                                                cnp.float64_t [:, :] dkappa2,
+                                                cnp.float64_t [:, :] theta,
+                                                cnp.float64_t [:, :, :] dtheta,
+                                                cnp.float64_t [:] v,
+                                                cnp.float64_t [:, :] dv) nogil:
+    """
+    Innovations algorithm with derivatives, in place
+
+    Computes the same `theta` and `v` as `arma_innovations_algo_fast`, and
+    if `kd` > 0 their derivatives with respect to the ARMA parameters by
+    differentiating each step of the recursion.
+    """
+    cdef Py_ssize_t i, j, k, a, n, _n, m, m2, start, start2, h
+    cdef cnp.float64_t tmp
+
+    m = max(p, q)
+    m2 = 2 * m
+
+    for i in range(nobs):
+        for j in range(m + 1):
+            theta[i, j] = 0
+            for a in range(kd):
+                dtheta[a, i, j] = 0
+
+    if m > 0:
+        v[0] = kappa[0, 0]
+        for a in range(kd):
+            dv[a, 0] = dkappa[a, 0, 0]
+    else:
+        v[0] = kappa2[0]
+        for a in range(kd):
+            dv[a, 0] = dkappa2[a, 0]
+
+    for n in range(nobs - 1):
+        _n = n + 1
+
+        start = 0 if n < m else n + 1 - q
+        for k in range(start, n + 1):
+            if n >= m and n - k >= q:
+                continue
+
+            if n + 1 < m2 and k < m:
+                theta[_n, n - k] = kappa[n + 1, k]
+                for a in range(kd):
+                    dtheta[a, _n, n - k] = dkappa[a, n + 1, k]
+            else:
+                h = n + 1 - k
+                theta[_n, n - k] = kappa2[h] if h <= q else 0
+                for a in range(kd):
+                    dtheta[a, _n, n - k] = dkappa2[a, h] if h <= q else 0
+
+            start2 = 0 if n < m else n - m
+            for j in range(start2, k):
+                if n - j < m + 1:
+                    tmp = theta[k, k - j - 1] * theta[_n, n - j]
+                    theta[_n, n - k] = theta[_n, n - k] - tmp * v[j]
+                    for a in range(kd):
+                        dtheta[a, _n, n - k] = dtheta[a, _n, n - k] - (
+                            (dtheta[a, k, k - j - 1] * theta[_n, n - j]
+                             + theta[k, k - j - 1] * dtheta[a, _n, n - j]) * v[j]
+                            + tmp * dv[a, j])
+            theta[_n, n - k] = theta[_n, n - k] / v[k]
+            for a in range(kd):
+                dtheta[a, _n, n - k] = (
+                    (dtheta[a, _n, n - k] - theta[_n, n - k] * dv[a, k]) / v[k])
+
+        if n + 1 < m:
+            v[n + 1] = kappa[n + 1, n + 1]
+            for a in range(kd):
+                dv[a, n + 1] = dkappa[a, n + 1, n + 1]
+        else:
+            v[n + 1] = kappa2[0]
+            for a in range(kd):
+                dv[a, n + 1] = dkappa2[a, 0]
+        start = max(0, n - (m + 1) + 2)
+        for i in range(start, n + 1):
+            tmp = theta[_n, n - i]
+            v[n + 1] = v[n + 1] - tmp**2 * v[i]
+            for a in range(kd):
+                dv[a, n + 1] = dv[a, n + 1] - (
+                    2 * tmp * dtheta[a, _n, n - i] * v[i] + tmp**2 * dv[a, i])
+
+
+cpdef darma_loglike_batch(cnp.float64_t [:, ::1] endog,
+                                   cnp.float64_t [:, ::1] ar_params,
+                                   cnp.float64_t [:, ::1] ma_params,
+                                   cnp.float64_t [::1] sigma2,
+                                   cnp.float64_t [:, ::1] gamma,
+                                   cnp.float64_t [:, :, ::1] dgamma,
+                                   int compute_score=False):
+    """
+    darma_loglike_batch(cnp.float64_t [:, ::1] endog, cnp.float64_t [:, ::1] ar_params, cnp.float64_t [:, ::1] ma_params, cnp.float64_t [::1] sigma2, cnp.float64_t [:, ::1] gamma, cnp.float64_t [:, :, ::1] dgamma, int compute_score=False)
+
+    Loglikelihood and score of ARMA processes for sets of parameters and
+    series
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series processes, shaped (nseries, nobs).
+    ar_params : ndarray
+        Autoregressive parameters, shaped (nparams, p).
+    ma_params : ndarray
+        Moving average parameters, shaped (nparams, q).
+    sigma2 : ndarray
+        The ARMA innovation variances, shaped (nparams,).
+    gamma : ndarray
+        Unit variance autocovariances of the ARMA processes, shaped
+        (nparams, nlags) with nlags >= 2 max(p, q) + p.
+    dgamma : ndarray
+        Derivatives of `gamma` with respect to the AR and MA parameters,
+        shaped (nparams, p + q, nlags). Only used if `compute_score` is True.
+    compute_score : bool, optional
+        Whether to compute the score. Default is False.
+
+    Returns
+    -------
+    loglike : ndarray
+        Loglikelihood values, shaped (nparams, nseries).
+    score : ndarray
+        Score with respect to the AR, MA and variance parameters, shaped
+        (nparams, nseries, p + q + 1). Zeros if `compute_score` is False.
+
+    Notes
+    -----
+    For each set of parameters the innovations algorithm is applied once,
+    and the innovations filter is then applied to all series. The score is
+    computed by differentiating each step of the recursions (forward mode)
+    rather than by numerical differentiation. All loops run without the
+    GIL.
+    """
+    cdef Py_ssize_t nseries, nobs, nparams, p, q, m, kd, i, j, a, s, ip
+    cdef cnp.float64_t const, hat, dhat, weight, llf, sig2
+    cdef cnp.float64_t [:, ::1] loglike, theta, kappa, kappa2, dkappa2, dv, du
+    cdef cnp.float64_t [:, :, ::1] score, dtheta, dkappa
+    cdef cnp.float64_t [::1] v, u
+
+    nseries = endog.shape[0]
+    nobs = endog.shape[1]
+    nparams = ar_params.shape[0]
+    p = ar_params.shape[1]
+    q = ma_params.shape[1]
+    m = max(p, q)
+    kd = p + q if compute_score else 0
+
+    if gamma.shape[1] < 2 * m + p:
+        raise ValueError('gamma must have at least 2 max(p, q) + p columns')
+    if compute_score and (dgamma.shape[1] != p + q or
+                          dgamma.shape[2] < 2 * m + p):
+        raise ValueError('dgamma must be shaped (nparams, p + q, nlags)')
+
+    loglike = np.zeros((nparams, nseries), dtype=float)
+    score = np.zeros((nparams, nseries, p + q + 1), dtype=float)
+    kappa = np.zeros((2 * m, 2 * m), dtype=float)
+    dkappa = np.zeros((kd, 2 * m, 2 * m), dtype=float)
+    kappa2 = np.zeros((1, q + 1), dtype=float)
+    dkappa2 = np.zeros((kd, q + 1), dtype=float)
+    theta = np.zeros((nobs, m + 1), dtype=float)
+    dtheta = np.zeros((kd, nobs, m + 1), dtype=float)
+    v = np.zeros(nobs, dtype=float)
+    dv = np.zeros((kd, nobs), dtype=float)
+    u = np.zeros(nobs, dtype=float)
+    du = np.zeros((kd, nobs), dtype=float)
+
+    const = dlog(2*NPY_PI)
+    with nogil:
+        for ip in range(nparams):
+            sig2 = sigma2[ip]
+            d_arma_kappa_score(nobs, kd, ar_params[ip], ma_params[ip],
+                                        gamma[ip], dgamma[ip], kappa, dkappa,
+                                        kappa2[0], dkappa2)
+            d_arma_innovations_algo_score(nobs, kd, p, q, kappa,
+                                                  dkappa, kappa2[0], dkappa2,
+                                                  theta, dtheta, v, dv)
+
+            for s in range(nseries):
+                # Innovations filter, see arma_innovations_filter
+                for i in range(nobs):
+                    hat = 0
+                    for a in range(kd):
+                        du[a, i] = 0
+                    if i < m:
+                        for j in range(i):
+                            hat = hat + theta[i, j] * u[i - j - 1]
+                            for a in range(kd):
+                                du[a, i] = du[a, i] - (dtheta[a, i, j] * u[i - j - 1]
+                                                       + theta[i, j] * du[a, i - j - 1])
+                    else:
+                        for j in range(p):
+                            hat = hat + ar_params[ip, j] * endog[s, i - j - 1]
+                        for j in range(q):
+                            hat = hat + theta[i, j] * u[i - j - 1]
+                            for a in range(kd):
+                                du[a, i] = du[a, i] - (dtheta[a, i, j] * u[i - j - 1]
+                                                       + theta[i, j] * du[a, i - j - 1])
+                        for a in range(min(kd, p)):
+                            du[a, i] = du[a, i] - endog[s, i - a - 1]
+                    u[i] = endog[s, i] - hat
+
+                    weight = u[i] / (sig2 * v[i])
+                    llf = -0.5 * u[i] * weight - 0.5 * (const + dlog(sig2 * v[i]))
+                    loglike[ip, s] = loglike[ip, s] + llf
+                    if compute_score:
+                        for a in range(kd):
+                            score[ip, s, a] = score[ip, s, a] + (
+                                -weight * du[a, i]
+                                + 0.5 * (u[i] * weight - 1) * dv[a, i] / v[i])
+                        score[ip, s, kd] = score[ip, s, kd] + 0.5 * (u[i] * weight - 1) / sig2
+
+    return np.asarray(loglike), np.asarray(score)
+
+
+cdef ctoeplitz(int n, int offset0, int offset1,
+                        cnp.complex64_t [:] in_column,
+                        cnp.complex64_t [:, :] out_matrix):
+    """
+    toeplitz(int n, int o0, int o1, cnp.complex64_t [:] in_column, cnp.complex64_t [:, :] out_matrix
+    
+    Construct a Toeplitz block in a matrix in place
+
+    Parameters
+    ----------
+    n : int
+        The number of entries of `in_column` to use.
+    offset0 : int
+        The row offset for `out_matrix` at which to begin writing the Toeplitz
+        block.
+    offset1 : int
+        The column offset for `out_matrix` at which to begin writing the
+        Toeplitz block.
+    in_column : ndarray
+        The column used to construct the Toeplitz block.
+    out_matrix : ndarray
+        The matrix in which to write a Toeplitz block
+
+    Notes
+    -----
+    This function constructs the Toeplitz block in-place and does not return
+    any output.
+    """
+    cdef Py_ssize_t i, j
+
+    for i in range(n):
+        for j in range(i + 1):
+            out_matrix[offset0 + i, offset1 + j] = in_column[i - j]
+            if i != j:
+              # Note: scipy by default does complex conjugate, but not
+              # necessary here since we're only dealing with covariances,
+              # which will be real (except in the case of complex-step
+              # differentiation, but in that case we do not want to apply
+              # the conjugation anyway)
+              out_matrix[offset0 + j, offset1 + i] = in_column[i - j]
+
+
+cpdef carma_transformed_acovf_fast(cnp.complex64_t [:] ar,
+                                            cnp.complex64_t [:] ma,
+                                            cnp.complex64_t [:] arma_acovf):
+    """
+    arma_transformed_acovf_fast(cnp.complex64_t [:] ar, cnp.complex64_t [:] ma, cnp.complex64_t [:] arma_acovf)
+    
+    Quickly construct the autocovariance matrix for a transformed process.
+
+    Using the autocovariance function for an ARMA process, constructs the
+    autocovariances associated with the transformed process described
+    in equation (3.3.1) of _[1] in a memory efficient, and so fast, way.
+
+    Parameters
+    ----------
+    ar : ndarray
+        Autoregressive coefficients, including the zero lag, where the sign
+        convention assumes the coefficients are part of the lag polynomial on
+        the left-hand-side of the ARMA definition (i.e. they have the opposite
+        sign from the usual econometrics convention in which the coefficients
+        are on the right-hand-side of the ARMA definition).
+    ma : ndarray
+        Moving average coefficients, including the zero lag, where the sign
+        convention assumes the coefficients are part of the lag polynomial on
+        the right-hand-side of the ARMA definition (i.e. they have the same
+        sign from the usual econometrics convention in which the coefficients
+        are on the right-hand-side of the ARMA definition).
+    arma_acovf : ndarray
+        The vector of autocovariances of the ARMA process.
+
+    Returns
+    -------
+    acovf : ndarray
+        A matrix containing the autocovariances of the portion of the
+        transformed process with time-varying autocovariances. Its dimension
+        is equal to `min(m * 2, n)` where `m = max(len(ar) - 1, len(ma) - 1)`
+        and `n` is the length of the input array `arma_acovf`. It is important
+        to note that only the values in the first `m` columns or `m` rows are
+        valid. In particular, the entries in the block `acovf[m:, m:]` should
+        not be used in any case (and in fact will always be equal to zeros).
+    acovf2 : ndarray
+        An array containing the autocovariance function of the portion of the
+        transformed process with time-invariant autocovariances. Its dimension
+        is equal to `max(n - m, 0)` where `n` is the length of the input
+        array `arma_acovf`.
+
+    Notes
+    -----
+    The definition of this autocovariance matrix is from _[1] equation 3.3.3.
+
+    This function assumes that the variance of the ARMA innovation term is
+    equal to one. If this is not true, then the calling program should replace
+    `arma_acovf` with `arma_acovf / sigma2`, where sigma2 is that variance.
+
+    This function is relatively fast even when `arma_acovf` is large, since
+    it only constructs the full autocovariance matrix for a generally small
+    subset of observations. The trade-off is that the output of this function
+    is somewhat more difficult to use.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t nobs, p, q, m, m2, n, i, j, r, tmp_ix
+    cdef cnp.npy_intp dim1[1]
+    cdef cnp.npy_intp dim2[2]
+    cdef cnp.complex64_t [:, :] acovf
+    cdef cnp.complex64_t [:] acovf2
+
+    nobs = arma_acovf.shape[0]
+    p = len(ar) - 1
+    q = len(ma) - 1
+    m = max(p, q)
+    m2 = 2 * m
+    n = min(m2, nobs)
+
+    dim2[0] = m2;
+    dim2[1] = m2;
+    acovf = cnp.PyArray_ZEROS(2, dim2, cnp.NPY_COMPLEX64, C)
+    dim1[0] = max(nobs - m, 0);
+    acovf2 = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_COMPLEX64, C)
+
+    # Set i, j = 1, ..., m   (which is then done)
+    ctoeplitz(m, 0, 0, arma_acovf, acovf)
+
+    # Set i = 1, ..., m;         j = m + 1, ..., 2 m
+    # and i = m + 1, ..., 2 m;   j = 1, ..., m
+    if nobs > m:
+        for j in range(m):
+            for i in range(m, m2):
+                acovf[i, j] = arma_acovf[i - j]
+                for r in range(1, p + 1):
+                    tmp_ix = abs(r - (i - j))
+                    acovf[i, j] = acovf[i, j] - (-ar[r] * arma_acovf[tmp_ix])
+        acovf[:m, m:m2] = acovf[m:m2, :m].T
+
+    # Set values for |i - j| <= q, min(i, j) = m + 1, and max(i, j) <= nobs
+    if nobs > m:
+        for i in range(nobs - m):
+            for r in range(q + 1 - i):
+                acovf2[i] = acovf2[i] + ma[r] * ma[r + i]
+
+    return acovf[:n, :n], acovf2
+
+
+cpdef carma_innovations_algo_fast(int nobs,
+                                           cnp.complex64_t [:] ar_params,
+                                           cnp.complex64_t [:] ma_params,
+                                           cnp.complex64_t [:, :] acovf,
+                                           cnp.complex64_t [:] acovf2):
+    """
+    arma_innovations_algo_fast(int nobs, cnp.complex64_t [:] ar_params, cnp.complex64_t [:] ma_params, cnp.complex64_t [:, :] acovf, cnp.complex64_t [:] acovf2)
+    
+    Quickly apply innovations algorithm for an ARMA process.
+
+    Parameters
+    ----------
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    acovf : ndarray
+        An `m * 2` x `m * 2` autocovariance matrix at least the first `m`
+        columns filled in, where `m = max(len(ar_params), ma_params)`
+        (see `arma_transformed_acovf_fast`).
+    acovf2 : ndarray
+        A `max(0, nobs - m)` length vector containing the autocovariance
+        function associated with the final `nobs - m` observations.
+
+    Returns
+    -------
+    theta : ndarray
+        The matrix of moving average coefficients from the innovations
+        algorithm.
+    v : ndarray
+        The vector of mean squared errors.
+
+    Notes
+    -----
+    The innovations algorithm is presented in _[1], section 2.5.2.
+
+    Details of the innovations algorithm applied to ARMA processes is given
+    in _[1] section 3.3 and in section 5.2.7.
+
+    This function is relatively fast even with a large number of observations
+    since we can exploit a number of known zeros in the theta array.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t i, j, k, n, _n, m, m2, p, q, start, start2
+    cdef cnp.npy_intp dim1[1]
+    cdef cnp.npy_intp dim2[2]
+    cdef cnp.complex64_t [:, :] theta
+    cdef cnp.complex64_t [:] v
+
+    p = len(ar_params)
+    q = len(ma_params)
+    m = max(p, q)
+    m2 = 2 * m
+
+    dim1[0] = nobs;
+    v = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_COMPLEX64, C)
+    dim2[0] = nobs;
+    dim2[1] = m + 1;
+    theta = cnp.PyArray_ZEROS(2, dim2, cnp.NPY_COMPLEX64, C)
+
+    if m > 0:
+        v[0] = acovf[0, 0]
+    else:
+        # (handle the corner case where p = q = 0)
+        v[0] = acovf2[0]
+
+    for n in range(nobs - 1):
+        _n = n + 1
+
+        start = 0 if n < m else n + 1 - q
+        for k in range(start, n + 1):
+            # See Brockwell and Davis, p. 100-101
+            # (here we have weak rather than strict inequality due to Python's
+            # zero indexing)
+            if n >= m and n - k >= q:
+                continue
+
+            if n + 1 < m2 and k < m:
+                theta[_n, n - k] = acovf[n + 1, k]
+            else:
+                theta[_n, n - k] = acovf2[n + 1 - k]
+
+            start2 = 0 if n < m else n - m
+            for j in range(start2, k):
+                if n - j < m + 1:
+                    theta[_n, n - k] = theta[_n, n - k] - theta[k - 1 + 1, k - j - 1] * theta[_n, n - j] * v[j]
+            theta[_n, n - k] = theta[_n, n - k] / v[k]
+
+        if n + 1 < m:
+            v[n + 1] = acovf[n + 1, n + 1]
+        else:
+            v[n + 1] = acovf2[0]
+        start = max(0, n - (m + 1) + 2)
+        for i in range(start, n + 1):
+            v[n + 1] = v[n + 1] - theta[_n, n - i]**2 * v[i]
+
+    return theta, v
+
+
+cpdef carma_innovations_filter(cnp.complex64_t [:] endog,
+                                        cnp.complex64_t [:] ar_params,
+                                        cnp.complex64_t [:] ma_params,
+                                        cnp.complex64_t [:, :] theta):
+    """
+    arma_innovations_filter(cnp.complex64_t [:] endog, cnp.complex64_t [:] ar_params, cnp.complex64_t [:] ma_params, cnp.complex64_t [:, :] theta):
+    
+    Innovations filter for an ARMA process.
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    theta : ndarray
+        The matrix of moving average coefficients from the innovations
+        algorithm (see `arma_innovations_algo` or `arma_innovations_algo_fast`)
+
+    Returns
+    -------
+    u : ndarray
+        The vector of innovations: the one-step-ahead prediction errors from
+        applying the innovations algorithm.
+
+    Notes
+    -----
+    The innovations algorithm is presented in _[1], section 2.5.2.
+
+    Details of the innovations algorithm applied to ARMA processes is given
+    in _[1] section 3.3 and in section 5.2.7.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t nobs, i, k, j, m, p, q
+    cdef cnp.npy_intp dim1[1]
+    cdef cnp.complex64_t [:] u
+    cdef cnp.complex64_t hat
+
+    p = len(ar_params)
+    q = len(ma_params)
+    m = max(p, q)
+
+    nobs = theta.shape[0]
+    k = theta.shape[1]
+
+    dim1[0] = nobs;
+    u = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_COMPLEX64, C)
+    u[0] = endog[0]
+
+    for i in range(1, nobs):
+        hat = 0
+        if i < m:
+            for j in range(i):
+                hat = hat + theta[i, j] * u[i - j - 1]
+        else:
+            for j in range(p):
+                hat = hat + ar_params[j] * endog[i - j - 1]
+            for j in range(q):
+                hat = hat + theta[i, j] * u[i - j - 1]
+        u[i] = endog[i] - hat
+
+    return u
+
+
+cpdef carma_innovations(cnp.complex64_t [:] endog,
+                                      cnp.complex64_t [:] ar_params,
+                                      cnp.complex64_t [:] ma_params,
+                                      cnp.complex64_t sigma2):
+    """
+    arma_innovations(cnp.complex64_t [:] endog, cnp.complex64_t [:] ar_params, cnp.complex64_t [:] ma_params):
+    
+    Compute innovations and variances based on an ARMA process.
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    sigma2 : ndarray
+        The ARMA innovation variance.
+
+    Returns
+    -------
+    u : ndarray
+        The vector of innovations: the one-step-ahead prediction errors from
+        applying the innovations algorithm.
+    v : ndarray
+        The vector of innovation variances.
+
+    Notes
+    -----
+    The innovations algorithm is presented in _[1], section 2.5.2.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t nobs = len(endog), i
+    cdef cnp.complex64_t const
+    cdef cnp.complex64_t [:] ar, ma, arma_acovf, llf_obs, acovf2, u, v
+    cdef cnp.complex64_t [:, :] acovf
+    cdef cnp.npy_intp dim1[1]
+
+    dim1[0] = len(ar_params) + 1;
+    ar = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_COMPLEX64, C)
+    dim1[0] = len(ma_params) + 1;
+    ma = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_COMPLEX64, C)
+
+    ar[0] = 1
+    for i in range(1, len(ar_params) + 1):
+        ar[i] = -1 * ar_params[i - 1]
+    ma[0] = 1
+    ma[1:] = ma_params
+
+    arma_acovf = arima_process.arma_acovf(ar, ma, nobs, sigma2, dtype=np.complex64) / sigma2
+    acovf, acovf2 = carma_transformed_acovf_fast(ar, ma, arma_acovf)
+    theta, v = carma_innovations_algo_fast(nobs, ar_params, ma_params, acovf, acovf2)
+    u = carma_innovations_filter(endog, ar_params, ma_params, theta)
+
+    return u, v
+
+
+cpdef carma_loglikeobs_fast(cnp.complex64_t [:] endog,
+                                     cnp.complex64_t [:] ar_params,
+                                     cnp.complex64_t [:] ma_params,
+                                     cnp.complex64_t sigma2):
+    """
+    carma_loglikeobs_fast(cnp.complex64_t [:] endog, cnp.complex64_t [:] ar_params, cnp.complex64_t [:] ma_params, cnp.complex64_t sigma2)
+
+    Quickly calculate the loglikelihood of each observation for an ARMA process
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    sigma2 : ndarray
+        The ARMA innovation variance.
+
+    Returns
+    -------
+    loglike : ndarray of float
+        Array of loglikelihood values for each observation.
+
+    Notes
+    -----
+    Details related to computing the loglikelihood associated with an ARMA
+    process using the innovations algorithm are given in _[1] section 5.2.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+
+    cdef Py_ssize_t nobs = len(endog), i
+    cdef cnp.complex64_t const
+    cdef cnp.complex64_t [:] llf_obs, u, v
+    cdef cnp.npy_intp dim1[1]
+
+    u, v = carma_innovations(endog, ar_params, ma_params, sigma2)
+
+    dim1[0] = nobs;
+    llf_obs = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_COMPLEX64, C)
+
+    const = zlog(2*NPY_PI)
+    for i in range(nobs):
+        llf_obs[i] = -0.5 * u[i]**2 / (sigma2 * v[i]) - 0.5 * (const + zlog(sigma2 * v[i]))
+
+    return np.array(llf_obs, dtype=np.complex64)
+
+
+cdef void c_arma_kappa_score(int nobs, int kd,
+                                     cnp.complex64_t [:] ar_params,
+                                     cnp.complex64_t [:] ma_params,
+                                     cnp.complex64_t [:] gamma,
+                                     cnp.complex64_t [:, :] dgamma,
+                                     cnp.complex64_t [:, :] kappa,
+                                     cnp.complex64_t [:, :, :] dkappa,
+                                     cnp.complex64_t [:] kappa2,
+                                     cnp.complex64_t [:, :] dkappa2) nogil:
+    """
+    Transformed process autocovariances and their derivatives, in place
+
+    Computes the same values as `arma_transformed_acovf_fast` with
+    `kappa2` holding the nonzero part of `acovf2`. If `kd` > 0, the
+    derivatives with respect to the `kd` = p + q ARMA parameters are
+    computed from the derivatives `dgamma` of the unit variance ARMA
+    autocovariances `gamma`, which must have at least 2 m + p elements.
+    """
+    cdef Py_ssize_t p, q, m, m2, n, i, j, r, a, s, h
+    cdef cnp.complex64_t ma_r, ma_rh
+
+    p = ar_params.shape[0]
+    q = ma_params.shape[0]
+    m = max(p, q)
+    m2 = 2 * m
+    n = min(m2, nobs)
+
+    for i in range(n):
+        for j in range(n):
+            kappa[i, j] = 0
+            for a in range(kd):
+                dkappa[a, i, j] = 0
+
+    for i in range(min(m, n)):
+        for j in range(min(m, n)):
+            kappa[i, j] = gamma[_iabs(i - j)]
+            for a in range(kd):
+                dkappa[a, i, j] = dgamma[a, _iabs(i - j)]
+
+    if nobs > m:
+        for j in range(m):
+            for i in range(m, n):
+                h = i - j
+                kappa[i, j] = gamma[h]
+                for r in range(1, p + 1):
+                    kappa[i, j] = kappa[i, j] - ar_params[r - 1] * gamma[_iabs(r - h)]
+                kappa[j, i] = kappa[i, j]
+                for a in range(kd):
+                    dkappa[a, i, j] = dgamma[a, h]
+                    for r in range(1, p + 1):
+                        dkappa[a, i, j] = dkappa[a, i, j] - ar_params[r - 1] * dgamma[a, _iabs(r - h)]
+                    if a < p:
+                        dkappa[a, i, j] = dkappa[a, i, j] - gamma[_iabs(a + 1 - h)]
+                    dkappa[a, j, i] = dkappa[a, i, j]
+
+    # MA(q) autocovariances of the time-invariant part, where ma[0] = 1
+    for h in range(q + 1):
+        kappa2[h] = 0
+        for r in range(q + 1 - h):
+            ma_r = 1 if r == 0 else ma_params[r - 1]
+            ma_rh = 1 if r + h == 0 else ma_params[r + h - 1]
+            kappa2[h] = kappa2[h] + ma_r * ma_rh
+        for a in range(kd):
+            dkappa2[a, h] = 0
+            if a >= p:
+                s = a - p + 1
+                if s - h >= 0:
+                    dkappa2[a, h] = dkappa2[a, h] + (1 if s == h else ma_params[s - h - 1])
+                if s + h <= q:
+                    dkappa2[a, h] = dkappa2[a, h] + ma_params[s + h - 1]
+
+
+cdef void c_arma_innovations_algo_score(int nobs, int kd, int p,
+                                                int q,
+                                                cnp.complex64_t [:, :] kappa,
+                                                cnp.complex64_t [:, :, :] dkappa,
+                                                cnp.complex64_t [:] kappa2,
+                                                cnp.complex64_t [:, :] dkappa2,
+                                                cnp.complex64_t [:, :] theta,
+                                                cnp.complex64_t [:, :, :] dtheta,
+                                                cnp.complex64_t [:] v,
+                                                cnp.complex64_t [:, :] dv) nogil:
+    """
+    Innovations algorithm with derivatives, in place
+
+    Computes the same `theta` and `v` as `arma_innovations_algo_fast`, and
+    if `kd` > 0 their derivatives with respect to the ARMA parameters by
+    differentiating each step of the recursion.
+    """
+    cdef Py_ssize_t i, j, k, a, n, _n, m, m2, start, start2, h
+    cdef cnp.complex64_t tmp
+
+    m = max(p, q)
+    m2 = 2 * m
+
+    for i in range(nobs):
+        for j in range(m + 1):
+            theta[i, j] = 0
+            for a in range(kd):
+                dtheta[a, i, j] = 0
+
+    if m > 0:
+        v[0] = kappa[0, 0]
+        for a in range(kd):
+            dv[a, 0] = dkappa[a, 0, 0]
+    else:
+        v[0] = kappa2[0]
+        for a in range(kd):
+            dv[a, 0] = dkappa2[a, 0]
+
+    for n in range(nobs - 1):
+        _n = n + 1
+
+        start = 0 if n < m else n + 1 - q
+        for k in range(start, n + 1):
+            if n >= m and n - k >= q:
+                continue
+
+            if n + 1 < m2 and k < m:
+                theta[_n, n - k] = kappa[n + 1, k]
+                for a in range(kd):
+                    dtheta[a, _n, n - k] = dkappa[a, n + 1, k]
+            else:
+                h = n + 1 - k
+                theta[_n, n - k] = kappa2[h] if h <= q else 0
+                for a in range(kd):
+                    dtheta[a, _n, n - k] = dkappa2[a, h] if h <= q else 0
+
+            start2 = 0 if n < m else n - m
+            for j in range(start2, k):
+                if n - j < m + 1:
+                    tmp = theta[k, k - j - 1] * theta[_n, n - j]
+                    theta[_n, n - k] = theta[_n, n - k] - tmp * v[j]
+                    for a in range(kd):
+                        dtheta[a, _n, n - k] = dtheta[a, _n, n - k] - (
+                            (dtheta[a, k, k - j - 1] * theta[_n, n - j]
+                             + theta[k, k - j - 1] * dtheta[a, _n, n - j]) * v[j]
+                            + tmp * dv[a, j])
+            theta[_n, n - k] = theta[_n, n - k] / v[k]
+            for a in range(kd):
+                dtheta[a, _n, n - k] = (
+                    (dtheta[a, _n, n - k] - theta[_n, n - k] * dv[a, k]) / v[k])
+
+        if n + 1 < m:
+            v[n + 1] = kappa[n + 1, n + 1]
+            for a in range(kd):
+                dv[a, n + 1] = dkappa[a, n + 1, n + 1]
+        else:
+            v[n + 1] = kappa2[0]
+            for a in range(kd):
+                dv[a, n + 1] = dkappa2[a, 0]
+        start = max(0, n - (m + 1) + 2)
+        for i in range(start, n + 1):
+            tmp = theta[_n, n - i]
+            v[n + 1] = v[n + 1] - tmp**2 * v[i]
+            for a in range(kd):
+                dv[a, n + 1] = dv[a, n + 1] - (
+                    2 * tmp * dtheta[a, _n, n - i] * v[i] + tmp**2 * dv[a, i])
+
+
+cpdef carma_loglike_batch(cnp.complex64_t [:, ::1] endog,
+                                   cnp.complex64_t [:, ::1] ar_params,
+                                   cnp.complex64_t [:, ::1] ma_params,
+                                   cnp.complex64_t [::1] sigma2,
+                                   cnp.complex64_t [:, ::1] gamma,
+                                   cnp.complex64_t [:, :, ::1] dgamma,
+                                   int compute_score=False):
+    """
+    carma_loglike_batch(cnp.complex64_t [:, ::1] endog, cnp.complex64_t [:, ::1] ar_params, cnp.complex64_t [:, ::1] ma_params, cnp.complex64_t [::1] sigma2, cnp.complex64_t [:, ::1] gamma, cnp.complex64_t [:, :, ::1] dgamma, int compute_score=False)
+
+    Loglikelihood and score of ARMA processes for sets of parameters and
+    series
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series processes, shaped (nseries, nobs).
+    ar_params : ndarray
+        Autoregressive parameters, shaped (nparams, p).
+    ma_params : ndarray
+        Moving average parameters, shaped (nparams, q).
+    sigma2 : ndarray
+        The ARMA innovation variances, shaped (nparams,).
+    gamma : ndarray
+        Unit variance autocovariances of the ARMA processes, shaped
+        (nparams, nlags) with nlags >= 2 max(p, q) + p.
+    dgamma : ndarray
+        Derivatives of `gamma` with respect to the AR and MA parameters,
+        shaped (nparams, p + q, nlags). Only used if `compute_score` is True.
+    compute_score : bool, optional
+        Whether to compute the score. Default is False.
+
+    Returns
+    -------
+    loglike : ndarray
+        Loglikelihood values, shaped (nparams, nseries).
+    score : ndarray
+        Score with respect to the AR, MA and variance parameters, shaped
+        (nparams, nseries, p + q + 1). Zeros if `compute_score` is False.
+
+    Notes
+    -----
+    For each set of parameters the innovations algorithm is applied once,
+    and the innovations filter is then applied to all series. The score is
+    computed by differentiating each step of the recursions (forward mode)
+    rather than by numerical differentiation. All loops run without the
+    GIL.
+    """
+    cdef Py_ssize_t nseries, nobs, nparams, p, q, m, kd, i, j, a, s, ip
+    cdef cnp.complex64_t const, hat, dhat, weight, llf, sig2
+    cdef cnp.complex64_t [:, ::1] loglike, theta, kappa, kappa2, dkappa2, dv, du
+    cdef cnp.complex64_t [:, :, ::1] score, dtheta, dkappa
+    cdef cnp.complex64_t [::1] v, u
+
+    nseries = endog.shape[0]
+    nobs = endog.shape[1]
+    nparams = ar_params.shape[0]
+    p = ar_params.shape[1]
+    q = ma_params.shape[1]
+    m = max(p, q)
+    kd = p + q if compute_score else 0
+
+    if gamma.shape[1] < 2 * m + p:
+        raise ValueError('gamma must have at least 2 max(p, q) + p columns')
+    if compute_score and (dgamma.shape[1] != p + q or
+                          dgamma.shape[2] < 2 * m + p):
+        raise ValueError('dgamma must be shaped (nparams, p + q, nlags)')
+
+    loglike = np.zeros((nparams, nseries), dtype=np.complex64)
+    score = np.zeros((nparams, nseries, p + q + 1), dtype=np.complex64)
+    kappa = np.zeros((2 * m, 2 * m), dtype=np.complex64)
+    dkappa = np.zeros((kd, 2 * m, 2 * m), dtype=np.complex64)
+    kappa2 = np.zeros((1, q + 1), dtype=np.complex64)
+    dkappa2 = np.zeros((kd, q + 1), dtype=np.complex64)
+    theta = np.zeros((nobs, m + 1), dtype=np.complex64)
+    dtheta = np.zeros((kd, nobs, m + 1), dtype=np.complex64)
+    v = np.zeros(nobs, dtype=np.complex64)
+    dv = np.zeros((kd, nobs), dtype=np.complex64)
+    u = np.zeros(nobs, dtype=np.complex64)
+    du = np.zeros((kd, nobs), dtype=np.complex64)
+
+    const = zlog(2*NPY_PI)
+    with nogil:
+        for ip in range(nparams):
+            sig2 = sigma2[ip]
+            c_arma_kappa_score(nobs, kd, ar_params[ip], ma_params[ip],
+                                        gamma[ip], dgamma[ip], kappa, dkappa,
+                                        kappa2[0], dkappa2)
+            c_arma_innovations_algo_score(nobs, kd, p, q, kappa,
+                                                  dkappa, kappa2[0], dkappa2,
+                                                  theta, dtheta, v, dv)
+
+            for s in range(nseries):
+                # Innovations filter, see arma_innovations_filter
+                for i in range(nobs):
+                    hat = 0
+                    for a in range(kd):
+                        du[a, i] = 0
+                    if i < m:
+                        for j in range(i):
+                            hat = hat + theta[i, j] * u[i - j - 1]
+                            for a in range(kd):
+                                du[a, i] = du[a, i] - (dtheta[a, i, j] * u[i - j - 1]
+                                                       + theta[i, j] * du[a, i - j - 1])
+                    else:
+                        for j in range(p):
+                            hat = hat + ar_params[ip, j] * endog[s, i - j - 1]
+                        for j in range(q):
+                            hat = hat + theta[i, j] * u[i - j - 1]
+                            for a in range(kd):
+                                du[a, i] = du[a, i] - (dtheta[a, i, j] * u[i - j - 1]
+                                                       + theta[i, j] * du[a, i - j - 1])
+                        for a in range(min(kd, p)):
+                            du[a, i] = du[a, i] - endog[s, i - a - 1]
+                    u[i] = endog[s, i] - hat
+
+                    weight = u[i] / (sig2 * v[i])
+                    llf = -0.5 * u[i] * weight - 0.5 * (const + zlog(sig2 * v[i]))
+                    loglike[ip, s] = loglike[ip, s] + llf
+                    if compute_score:
+                        for a in range(kd):
+                            score[ip, s, a] = score[ip, s, a] + (
+                                -weight * du[a, i]
+                                + 0.5 * (u[i] * weight - 1) * dv[a, i] / v[i])
+                        score[ip, s, kd] = score[ip, s, kd] + 0.5 * (u[i] * weight - 1) / sig2
+
+    return np.asarray(loglike), np.asarray(score)
+
+
+cdef ztoeplitz(int n, int offset0, int offset1,
+                        cnp.complex128_t [:] in_column,
+                        cnp.complex128_t [:, :] out_matrix):
+    """
+    toeplitz(int n, int o0, int o1, cnp.complex128_t [:] in_column, cnp.complex128_t [:, :] out_matrix
+    
+    Construct a Toeplitz block in a matrix in place
+
+    Parameters
+    ----------
+    n : int
+        The number of entries of `in_column` to use.
+    offset0 : int
+        The row offset for `out_matrix` at which to begin writing the Toeplitz
+        block.
+    offset1 : int
+        The column offset for `out_matrix` at which to begin writing the
+        Toeplitz block.
+    in_column : ndarray
+        The column used to construct the Toeplitz block.
+    out_matrix : ndarray
+        The matrix in which to write a Toeplitz block
+
+    Notes
+    -----
+    This function constructs the Toeplitz block in-place and does not return
+    any output.
+    """
+    cdef Py_ssize_t i, j
+
+    for i in range(n):
+        for j in range(i + 1):
+            out_matrix[offset0 + i, offset1 + j] = in_column[i - j]
+            if i != j:
+              # Note: scipy by default does complex conjugate, but not
+              # necessary here since we're only dealing with covariances,
+              # which will be real (except in the case of complex-step
+              # differentiation, but in that case we do not want to apply
+              # the conjugation anyway)
+              out_matrix[offset0 + j, offset1 + i] = in_column[i - j]
+
+
+cpdef zarma_transformed_acovf_fast(cnp.complex128_t [:] ar,
+                                            cnp.complex128_t [:] ma,
+                                            cnp.complex128_t [:] arma_acovf):
+    """
+    arma_transformed_acovf_fast(cnp.complex128_t [:] ar, cnp.complex128_t [:] ma, cnp.complex128_t [:] arma_acovf)
+    
+    Quickly construct the autocovariance matrix for a transformed process.
+
+    Using the autocovariance function for an ARMA process, constructs the
+    autocovariances associated with the transformed process described
+    in equation (3.3.1) of _[1] in a memory efficient, and so fast, way.
+
+    Parameters
+    ----------
+    ar : ndarray
+        Autoregressive coefficients, including the zero lag, where the sign
+        convention assumes the coefficients are part of the lag polynomial on
+        the left-hand-side of the ARMA definition (i.e. they have the opposite
+        sign from the usual econometrics convention in which the coefficients
+        are on the right-hand-side of the ARMA definition).
+    ma : ndarray
+        Moving average coefficients, including the zero lag, where the sign
+        convention assumes the coefficients are part of the lag polynomial on
+        the right-hand-side of the ARMA definition (i.e. they have the same
+        sign from the usual econometrics convention in which the coefficients
+        are on the right-hand-side of the ARMA definition).
+    arma_acovf : ndarray
+        The vector of autocovariances of the ARMA process.
+
+    Returns
+    -------
+    acovf : ndarray
+        A matrix containing the autocovariances of the portion of the
+        transformed process with time-varying autocovariances. Its dimension
+        is equal to `min(m * 2, n)` where `m = max(len(ar) - 1, len(ma) - 1)`
+        and `n` is the length of the input array `arma_acovf`. It is important
+        to note that only the values in the first `m` columns or `m` rows are
+        valid. In particular, the entries in the block `acovf[m:, m:]` should
+        not be used in any case (and in fact will always be equal to zeros).
+    acovf2 : ndarray
+        An array containing the autocovariance function of the portion of the
+        transformed process with time-invariant autocovariances. Its dimension
+        is equal to `max(n - m, 0)` where `n` is the length of the input
+        array `arma_acovf`.
+
+    Notes
+    -----
+    The definition of this autocovariance matrix is from _[1] equation 3.3.3.
+
+    This function assumes that the variance of the ARMA innovation term is
+    equal to one. If this is not true, then the calling program should replace
+    `arma_acovf` with `arma_acovf / sigma2`, where sigma2 is that variance.
+
+    This function is relatively fast even when `arma_acovf` is large, since
+    it only constructs the full autocovariance matrix for a generally small
+    subset of observations. The trade-off is that the output of this function
+    is somewhat more difficult to use.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t nobs, p, q, m, m2, n, i, j, r, tmp_ix
+    cdef cnp.npy_intp dim1[1]
+    cdef cnp.npy_intp dim2[2]
+    cdef cnp.complex128_t [:, :] acovf
+    cdef cnp.complex128_t [:] acovf2
+
+    nobs = arma_acovf.shape[0]
+    p = len(ar) - 1
+    q = len(ma) - 1
+    m = max(p, q)
+    m2 = 2 * m
+    n = min(m2, nobs)
+
+    dim2[0] = m2;
+    dim2[1] = m2;
+    acovf = cnp.PyArray_ZEROS(2, dim2, cnp.NPY_COMPLEX128, C)
+    dim1[0] = max(nobs - m, 0);
+    acovf2 = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_COMPLEX128, C)
+
+    # Set i, j = 1, ..., m   (which is then done)
+    ztoeplitz(m, 0, 0, arma_acovf, acovf)
+
+    # Set i = 1, ..., m;         j = m + 1, ..., 2 m
+    # and i = m + 1, ..., 2 m;   j = 1, ..., m
+    if nobs > m:
+        for j in range(m):
+            for i in range(m, m2):
+                acovf[i, j] = arma_acovf[i - j]
+                for r in range(1, p + 1):
+                    tmp_ix = abs(r - (i - j))
+                    acovf[i, j] = acovf[i, j] - (-ar[r] * arma_acovf[tmp_ix])
+        acovf[:m, m:m2] = acovf[m:m2, :m].T
+
+    # Set values for |i - j| <= q, min(i, j) = m + 1, and max(i, j) <= nobs
+    if nobs > m:
+        for i in range(nobs - m):
+            for r in range(q + 1 - i):
+                acovf2[i] = acovf2[i] + ma[r] * ma[r + i]
+
+    return acovf[:n, :n], acovf2
+
+
+cpdef zarma_innovations_algo_fast(int nobs,
+                                           cnp.complex128_t [:] ar_params,
+                                           cnp.complex128_t [:] ma_params,
+                                           cnp.complex128_t [:, :] acovf,
+                                           cnp.complex128_t [:] acovf2):
+    """
+    arma_innovations_algo_fast(int nobs, cnp.complex128_t [:] ar_params, cnp.complex128_t [:] ma_params, cnp.complex128_t [:, :] acovf, cnp.complex128_t [:] acovf2)
+    
+    Quickly apply innovations algorithm for an ARMA process.
+
+    Parameters
+    ----------
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    acovf : ndarray
+        An `m * 2` x `m * 2` autocovariance matrix at least the first `m`
+        columns filled in, where `m = max(len(ar_params), ma_params)`
+        (see `arma_transformed_acovf_fast`).
+    acovf2 : ndarray
+        A `max(0, nobs - m)` length vector containing the autocovariance
+        function associated with the final `nobs - m` observations.
+
+    Returns
+    -------
+    theta : ndarray
+        The matrix of moving average coefficients from the innovations
+        algorithm.
+    v : ndarray
+        The vector of mean squared errors.
+
+    Notes
+    -----
+    The innovations algorithm is presented in _[1], section 2.5.2.
+
+    Details of the innovations algorithm applied to ARMA processes is given
+    in _[1] section 3.3 and in section 5.2.7.
+
+    This function is relatively fast even with a large number of observations
+    since we can exploit a number of known zeros in the theta array.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t i, j, k, n, _n, m, m2, p, q, start, start2
+    cdef cnp.npy_intp dim1[1]
+    cdef cnp.npy_intp dim2[2]
+    cdef cnp.complex128_t [:, :] theta
+    cdef cnp.complex128_t [:] v
+
+    p = len(ar_params)
+    q = len(ma_params)
+    m = max(p, q)
+    m2 = 2 * m
+
+    dim1[0] = nobs;
+    v = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_COMPLEX128, C)
+    dim2[0] = nobs;
+    dim2[1] = m + 1;
+    theta = cnp.PyArray_ZEROS(2, dim2, cnp.NPY_COMPLEX128, C)
+
+    if m > 0:
+        v[0] = acovf[0, 0]
+    else:
+        # (handle the corner case where p = q = 0)
+        v[0] = acovf2[0]
+
+    for n in range(nobs - 1):
+        _n = n + 1
+
+        start = 0 if n < m else n + 1 - q
+        for k in range(start, n + 1):
+            # See Brockwell and Davis, p. 100-101
+            # (here we have weak rather than strict inequality due to Python's
+            # zero indexing)
+            if n >= m and n - k >= q:
+                continue
+
+            if n + 1 < m2 and k < m:
+                theta[_n, n - k] = acovf[n + 1, k]
+            else:
+                theta[_n, n - k] = acovf2[n + 1 - k]
+
+            start2 = 0 if n < m else n - m
+            for j in range(start2, k):
+                if n - j < m + 1:
+                    theta[_n, n - k] = theta[_n, n - k] - theta[k - 1 + 1, k - j - 1] * theta[_n, n - j] * v[j]
+            theta[_n, n - k] = theta[_n, n - k] / v[k]
+
+        if n + 1 < m:
+            v[n + 1] = acovf[n + 1, n + 1]
+        else:
+            v[n + 1] = acovf2[0]
+        start = max(0, n - (m + 1) + 2)
+        for i in range(start, n + 1):
+            v[n + 1] = v[n + 1] - theta[_n, n - i]**2 * v[i]
+
+    return theta, v
+
+
+cpdef zarma_innovations_filter(cnp.complex128_t [:] endog,
+                                        cnp.complex128_t [:] ar_params,
+                                        cnp.complex128_t [:] ma_params,
+                                        cnp.complex128_t [:, :] theta):
+    """
+    arma_innovations_filter(cnp.complex128_t [:] endog, cnp.complex128_t [:] ar_params, cnp.complex128_t [:] ma_params, cnp.complex128_t [:, :] theta):
+    
+    Innovations filter for an ARMA process.
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    theta : ndarray
+        The matrix of moving average coefficients from the innovations
+        algorithm (see `arma_innovations_algo` or `arma_innovations_algo_fast`)
+
+    Returns
+    -------
+    u : ndarray
+        The vector of innovations: the one-step-ahead prediction errors from
+        applying the innovations algorithm.
+
+    Notes
+    -----
+    The innovations algorithm is presented in _[1], section 2.5.2.
+
+    Details of the innovations algorithm applied to ARMA processes is given
+    in _[1] section 3.3 and in section 5.2.7.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t nobs, i, k, j, m, p, q
+    cdef cnp.npy_intp dim1[1]
+    cdef cnp.complex128_t [:] u
+    cdef cnp.complex128_t hat
+
+    p = len(ar_params)
+    q = len(ma_params)
+    m = max(p, q)
+
+    nobs = theta.shape[0]
+    k = theta.shape[1]
+
+    dim1[0] = nobs;
+    u = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_COMPLEX128, C)
+    u[0] = endog[0]
+
+    for i in range(1, nobs):
+        hat = 0
+        if i < m:
+            for j in range(i):
+                hat = hat + theta[i, j] * u[i - j - 1]
+        else:
+            for j in range(p):
+                hat = hat + ar_params[j] * endog[i - j - 1]
+            for j in range(q):
+                hat = hat + theta[i, j] * u[i - j - 1]
+        u[i] = endog[i] - hat
+
+    return u
+
+
+cpdef zarma_innovations(cnp.complex128_t [:] endog,
+                                      cnp.complex128_t [:] ar_params,
+                                      cnp.complex128_t [:] ma_params,
+                                      cnp.complex128_t sigma2):
+    """
+    arma_innovations(cnp.complex128_t [:] endog, cnp.complex128_t [:] ar_params, cnp.complex128_t [:] ma_params):
+    
+    Compute innovations and variances based on an ARMA process.
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    sigma2 : ndarray
+        The ARMA innovation variance.
+
+    Returns
+    -------
+    u : ndarray
+        The vector of innovations: the one-step-ahead prediction errors from
+        applying the innovations algorithm.
+    v : ndarray
+        The vector of innovation variances.
+
+    Notes
+    -----
+    The innovations algorithm is presented in _[1], section 2.5.2.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+    cdef Py_ssize_t nobs = len(endog), i
+    cdef cnp.complex128_t const
+    cdef cnp.complex128_t [:] ar, ma, arma_acovf, llf_obs, acovf2, u, v
+    cdef cnp.complex128_t [:, :] acovf
+    cdef cnp.npy_intp dim1[1]
+
+    dim1[0] = len(ar_params) + 1;
+    ar = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_COMPLEX128, C)
+    dim1[0] = len(ma_params) + 1;
+    ma = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_COMPLEX128, C)
+
+    ar[0] = 1
+    for i in range(1, len(ar_params) + 1):
+        ar[i] = -1 * ar_params[i - 1]
+    ma[0] = 1
+    ma[1:] = ma_params
+
+    arma_acovf = arima_process.arma_acovf(ar, ma, nobs, sigma2, dtype=complex) / sigma2
+    acovf, acovf2 = zarma_transformed_acovf_fast(ar, ma, arma_acovf)
+    theta, v = zarma_innovations_algo_fast(nobs, ar_params, ma_params, acovf, acovf2)
+    u = zarma_innovations_filter(endog, ar_params, ma_params, theta)
+
+    return u, v
+
+
+cpdef zarma_loglikeobs_fast(cnp.complex128_t [:] endog,
+                                     cnp.complex128_t [:] ar_params,
+                                     cnp.complex128_t [:] ma_params,
+                                     cnp.complex128_t sigma2):
+    """
+    zarma_loglikeobs_fast(cnp.complex128_t [:] endog, cnp.complex128_t [:] ar_params, cnp.complex128_t [:] ma_params, cnp.complex128_t sigma2)
+
+    Quickly calculate the loglikelihood of each observation for an ARMA process
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray
+        Autoregressive parameters.
+    ma_params : ndarray
+        Moving average parameters.
+    sigma2 : ndarray
+        The ARMA innovation variance.
+
+    Returns
+    -------
+    loglike : ndarray of float
+        Array of loglikelihood values for each observation.
+
+    Notes
+    -----
+    Details related to computing the loglikelihood associated with an ARMA
+    process using the innovations algorithm are given in _[1] section 5.2.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2009.
+       Time Series: Theory and Methods. 2nd ed. 1991.
+       New York, NY: Springer.
+    """
+
+    cdef Py_ssize_t nobs = len(endog), i
+    cdef cnp.complex128_t const
+    cdef cnp.complex128_t [:] llf_obs, u, v
+    cdef cnp.npy_intp dim1[1]
+
+    u, v = zarma_innovations(endog, ar_params, ma_params, sigma2)
+
+    dim1[0] = nobs;
+    llf_obs = cnp.PyArray_ZEROS(1, dim1, cnp.NPY_COMPLEX128, C)
+
+    const = zlog(2*NPY_PI)
+    for i in range(nobs):
+        llf_obs[i] = -0.5 * u[i]**2 / (sigma2 * v[i]) - 0.5 * (const + zlog(sigma2 * v[i]))
+
+    return np.array(llf_obs, dtype=complex)
+
+
+cdef void z_arma_kappa_score(int nobs, int kd,
+                                     cnp.complex128_t [:] ar_params,
+                                     cnp.complex128_t [:] ma_params,
+                                     cnp.complex128_t [:] gamma,
+                                     cnp.complex128_t [:, :] dgamma,
+                                     cnp.complex128_t [:, :] kappa,
+                                     cnp.complex128_t [:, :, :] dkappa,
+                                     cnp.complex128_t [:] kappa2,
+                                     cnp.complex128_t [:, :] dkappa2) nogil:
+    """
+    Transformed process autocovariances and their derivatives, in place
+
+    Computes the same values as `arma_transformed_acovf_fast` with
+    `kappa2` holding the nonzero part of `acovf2`. If `kd` > 0, the
+    derivatives with respect to the `kd` = p + q ARMA parameters are
+    computed from the derivatives `dgamma` of the unit variance ARMA
+    autocovariances `gamma`, which must have at least 2 m + p elements.
+    """
+    cdef Py_ssize_t p, q, m, m2, n, i, j, r, a, s, h
+    cdef cnp.complex128_t ma_r, ma_rh
+
+    p = ar_params.shape[0]
+    q = ma_params.shape[0]
+    m = max(p, q)
+    m2 = 2 * m
+    n = min(m2, nobs)
+
+    for i in range(n):
+        for j in range(n):
+            kappa[i, j] = 0
+            for a in range(kd):
+                dkappa[a, i, j] = 0
+
+    for i in range(min(m, n)):
+        for j in range(min(m, n)):
+            kappa[i, j] = gamma[_iabs(i - j)]
+            for a in range(kd):
+                dkappa[a, i, j] = dgamma[a, _iabs(i - j)]
+
+    if nobs > m:
+        for j in range(m):
+            for i in range(m, n):
+                h = i - j
+                kappa[i, j] = gamma[h]
+                for r in range(1, p + 1):
+                    kappa[i, j] = kappa[i, j] - ar_params[r - 1] * gamma[_iabs(r - h)]
+                kappa[j, i] = kappa[i, j]
+                for a in range(kd):
+                    dkappa[a, i, j] = dgamma[a, h]
+                    for r in range(1, p + 1):
+                        dkappa[a, i, j] = dkappa[a, i, j] - ar_params[r - 1] * dgamma[a, _iabs(r - h)]
+                    if a < p:
+                        dkappa[a, i, j] = dkappa[a, i, j] - gamma[_iabs(a + 1 - h)]
+                    dkappa[a, j, i] = dkappa[a, i, j]
+
+    # MA(q) autocovariances of the time-invariant part, where ma[0] = 1
+    for h in range(q + 1):
+        kappa2[h] = 0
+        for r in range(q + 1 - h):
+            ma_r = 1 if r == 0 else ma_params[r - 1]
+            ma_rh = 1 if r + h == 0 else ma_params[r + h - 1]
+            kappa2[h] = kappa2[h] + ma_r * ma_rh
+        for a in range(kd):
+            dkappa2[a, h] = 0
+            if a >= p:
+                s = a - p + 1
+                if s - h >= 0:
+                    dkappa2[a, h] = dkappa2[a, h] + (1 if s == h else ma_params[s - h - 1])
+                if s + h <= q:
+                    dkappa2[a, h] = dkappa2[a, h] + ma_params[s + h - 1]
+
+
+cdef void z_arma_innovations_algo_score(int nobs, int kd, int p,
+                                                int q,
+                                                cnp.complex128_t [:, :] kappa,
+                                                cnp.complex128_t [:, :, :] dkappa,
+                                                cnp.complex128_t [:] kappa2,
+                                                cnp.complex128_t [:, :] dkappa2,
+                                                cnp.complex128_t [:, :] theta,
+                                                cnp.complex128_t [:, :, :] dtheta,
+                                                cnp.complex128_t [:] v,
+                                                cnp.complex128_t [:, :] dv) nogil:
+    """
+    Innovations algorithm with derivatives, in place
+
+    Computes the same `theta` and `v` as `arma_innovations_algo_fast`, and
+    if `kd` > 0 their derivatives with respect to the ARMA parameters by
+    differentiating each step of the recursion.
+    """
+    cdef Py_ssize_t i, j, k, a, n, _n, m, m2, start, start2, h
+    cdef cnp.complex128_t tmp
+
+    m = max(p, q)
+    m2 = 2 * m
+
+    for i in range(nobs):
+        for j in range(m + 1):
+            theta[i, j] = 0
+            for a in range(kd):
+                dtheta[a, i, j] = 0
+
+    if m > 0:
+        v[0] = kappa[0, 0]
+        for a in range(kd):
+            dv[a, 0] = dkappa[a, 0, 0]
+    else:
+        v[0] = kappa2[0]
+        for a in range(kd):
+            dv[a, 0] = dkappa2[a, 0]
+
+    for n in range(nobs - 1):
+        _n = n + 1
+
+        start = 0 if n < m else n + 1 - q
+        for k in range(start, n + 1):
+            if n >= m and n - k >= q:
+                continue
+
+            if n + 1 < m2 and k < m:
+                theta[_n, n - k] = kappa[n + 1, k]
+                for a in range(kd):
+                    dtheta[a, _n, n - k] = dkappa[a, n + 1, k]
+            else:
+                h = n + 1 - k
+                theta[_n, n - k] = kappa2[h] if h <= q else 0
+                for a in range(kd):
+                    dtheta[a, _n, n - k] = dkappa2[a, h] if h <= q else 0
+
+            start2 = 0 if n < m else n - m
+            for j in range(start2, k):
+                if n - j < m + 1:
+                    tmp = theta[k, k - j - 1] * theta[_n, n - j]
+                    theta[_n, n - k] = theta[_n, n - k] - tmp * v[j]
+                    for a in range(kd):
+                        dtheta[a, _n, n - k] = dtheta[a, _n, n - k] - (
+                            (dtheta[a, k, k - j - 1] * theta[_n, n - j]
+                             + theta[k, k - j - 1] * dtheta[a, _n, n - j]) * v[j]
+                            + tmp * dv[a, j])
+            theta[_n, n - k] = theta[_n, n - k] / v[k]
+            for a in range(kd):
+                dtheta[a, _n, n - k] = (
+                    (dtheta[a, _n, n - k] - theta[_n, n - k] * dv[a, k]) / v[k])
+
+        if n + 1 < m:
+            v[n + 1] = kappa[n + 1, n + 1]
+            for a in range(kd):
+                dv[a, n + 1] = dkappa[a, n + 1, n + 1]
+        else:
+            v[n + 1] = kappa2[0]
+            for a in range(kd):
+                dv[a, n + 1] = dkappa2[a, 0]
+        start = max(0, n - (m + 1) + 2)
+        for i in range(start, n + 1):
+            tmp = theta[_n, n - i]
+            v[n + 1] = v[n + 1] - tmp**2 * v[i]
+            for a in range(kd):
+                dv[a, n + 1] = dv[a, n + 1] - (
+                    2 * tmp * dtheta[a, _n, n - i] * v[i] + tmp**2 * dv[a, i])
+
+
+cpdef zarma_loglike_batch(cnp.complex128_t [:, ::1] endog,
+                                   cnp.complex128_t [:, ::1] ar_params,
+                                   cnp.complex128_t [:, ::1] ma_params,
+                                   cnp.complex128_t [::1] sigma2,
+                                   cnp.complex128_t [:, ::1] gamma,
+                                   cnp.complex128_t [:, :, ::1] dgamma,
+                                   int compute_score=False):
+    """
+    zarma_loglike_batch(cnp.complex128_t [:, ::1] endog, cnp.complex128_t [:, ::1] ar_params, cnp.complex128_t [:, ::1] ma_params, cnp.complex128_t [::1] sigma2, cnp.complex128_t [:, ::1] gamma, cnp.complex128_t [:, :, ::1] dgamma, int compute_score=False)
+
+    Loglikelihood and score of ARMA processes for sets of parameters and
+    series
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series processes, shaped (nseries, nobs).
+    ar_params : ndarray
+        Autoregressive parameters, shaped (nparams, p).
+    ma_params : ndarray
+        Moving average parameters, shaped (nparams, q).
+    sigma2 : ndarray
+        The ARMA innovation variances, shaped (nparams,).
+    gamma : ndarray
+        Unit variance autocovariances of the ARMA processes, shaped
+        (nparams, nlags) with nlags >= 2 max(p, q) + p.
+    dgamma : ndarray
+        Derivatives of `gamma` with respect to the AR and MA parameters,
+        shaped (nparams, p + q, nlags). Only used if `compute_score` is True.
+    compute_score : bool, optional
+        Whether to compute the score. Default is False.
+
+    Returns
+    -------
+    loglike : ndarray
+        Loglikelihood values, shaped (nparams, nseries).
+    score : ndarray
+        Score with respect to the AR, MA and variance parameters, shaped
+        (nparams, nseries, p + q + 1). Zeros if `compute_score` is False.
+
+    Notes
+    -----
+    For each set of parameters the innovations algorithm is applied once,
+    and the innovations filter is then applied to all series. The score is
+    computed by differentiating each step of the recursions (forward mode)
+    rather than by numerical differentiation. All loops run without the
+    GIL.
+    """
+    cdef Py_ssize_t nseries, nobs, nparams, p, q, m, kd, i, j, a, s, ip
+    cdef cnp.complex128_t const, hat, dhat, weight, llf, sig2
+    cdef cnp.complex128_t [:, ::1] loglike, theta, kappa, kappa2, dkappa2, dv, du
+    cdef cnp.complex128_t [:, :, ::1] score, dtheta, dkappa
+    cdef cnp.complex128_t [::1] v, u
+
+    nseries = endog.shape[0]
+    nobs = endog.shape[1]
+    nparams = ar_params.shape[0]
+    p = ar_params.shape[1]
+    q = ma_params.shape[1]
+    m = max(p, q)
+    kd = p + q if compute_score else 0
+
+    if gamma.shape[1] < 2 * m + p:
+        raise ValueError('gamma must have at least 2 max(p, q) + p columns')
+    if compute_score and (dgamma.shape[1] != p + q or
+                          dgamma.shape[2] < 2 * m + p):
+        raise ValueError('dgamma must be shaped (nparams, p + q, nlags)')
+
+    loglike = np.zeros((nparams, nseries), dtype=complex)
+    score = np.zeros((nparams, nseries, p + q + 1), dtype=complex)
+    kappa = np.zeros((2 * m, 2 * m), dtype=complex)
+    dkappa = np.zeros((kd, 2 * m, 2 * m), dtype=complex)
+    kappa2 = np.zeros((1, q + 1), dtype=complex)
+    dkappa2 = np.zeros((kd, q + 1), dtype=complex)
+    theta = np.zeros((nobs, m + 1), dtype=complex)
+    dtheta = np.zeros((kd, nobs, m + 1), dtype=complex)
+    v = np.zeros(nobs, dtype=complex)
+    dv = np.zeros((kd, nobs), dtype=complex)
+    u = np.zeros(nobs, dtype=complex)
+    du = np.zeros((kd, nobs), dtype=complex)
+
+    const = zlog(2*NPY_PI)
+    with nogil:
+        for ip in range(nparams):
+            sig2 = sigma2[ip]
+            z_arma_kappa_score(nobs, kd, ar_params[ip], ma_params[ip],
+                                        gamma[ip], dgamma[ip], kappa, dkappa,
+                                        kappa2[0], dkappa2)
+            z_arma_innovations_algo_score(nobs, kd, p, q, kappa,
+                                                  dkappa, kappa2[0], dkappa2,
+                                                  theta, dtheta, v, dv)
+
+            for s in range(nseries):
+                # Innovations filter, see arma_innovations_filter
+                for i in range(nobs):
+                    hat = 0
+                    for a in range(kd):
+                        du[a, i] = 0
+                    if i < m:
+                        for j in range(i):
+                            hat = hat + theta[i, j] * u[i - j - 1]
+                            for a in range(kd):
+                                du[a, i] = du[a, i] - (dtheta[a, i, j] * u[i - j - 1]
+                                                       + theta[i, j] * du[a, i - j - 1])
+                    else:
+                        for j in range(p):
+                            hat = hat + ar_params[ip, j] * endog[s, i - j - 1]
+                        for j in range(q):
+                            hat = hat + theta[i, j] * u[i - j - 1]
+                            for a in range(kd):
+                                du[a, i] = du[a, i] - (dtheta[a, i, j] * u[i - j - 1]
+                                                       + theta[i, j] * du[a, i - j - 1])
+                        for a in range(min(kd, p)):
+                            du[a, i] = du[a, i] - endog[s, i - a - 1]
+                    u[i] = endog[s, i] - hat
+
+                    weight = u[i] / (sig2 * v[i])
+                    llf = -0.5 * u[i] * weight - 0.5 * (const + zlog(sig2 * v[i]))
+                    loglike[ip, s] = loglike[ip, s] + llf
+                    if compute_score:
+                        for a in range(kd):
+                            score[ip, s, a] = score[ip, s, a] + (
+                                -weight * du[a, i]
+                                + 0.5 * (u[i] * weight - 1) * dv[a, i] / v[i])
+                        score[ip, s, kd] = score[ip, s, kd] + 0.5 * (u[i] * weight - 1) / sig2
+
+    return np.asarray(loglike), np.asarray(score)
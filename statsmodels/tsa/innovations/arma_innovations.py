@@ -7,6 +7,95 @@ from scipy.linalg.blas import find_best_blas_type
 from . import _arma_innovations
 
 
+def _arma_acovf_batch(ar_params, ma_params, nlags, score=False):
+    """
+    Unit variance ARMA autocovariances for sets of parameters
+
+    Parameters
+    ----------
+    ar_params : ndarray
+        Autoregressive parameters, shaped (nparams, p).
+    ma_params : ndarray
+        Moving average parameters, shaped (nparams, q).
+    nlags : int
+        The number of autocovariances (including the zero lag) to return.
+    score : bool, optional
+        Whether to also return the derivatives with respect to the AR and MA
+        parameters. Default is False.
+
+    Returns
+    -------
+    gamma : ndarray
+        Autocovariances, shaped (nparams, nlags).
+    dgamma : ndarray
+        Derivatives of `gamma`, shaped (nparams, p + q, nlags). Only returned
+        if `score` is True.
+
+    Notes
+    -----
+    Solves the linear system of Brockwell and Davis (1991), eq. 3.3.8, as in
+    `arima_process.arma_acovf`, for all parameter sets at once. The
+    derivatives follow from differentiating the same system.
+    """
+    nparams, p = ar_params.shape
+    q = ma_params.shape[1]
+    k = p + q
+    m = max(p, q) + 1
+    dtype = np.result_type(ar_params, ma_params, float)
+    ma = np.concatenate([np.ones((nparams, 1), dtype=dtype), ma_params],
+                        axis=1)
+
+    # MA(infinity) weights and their derivatives
+    psi = np.zeros((nparams, m), dtype=dtype)
+    dpsi = np.zeros((nparams, k, m), dtype=dtype)
+    psi[:, 0] = 1
+    for j in range(1, m):
+        if j <= q:
+            psi[:, j] = ma[:, j]
+            dpsi[:, p + j - 1, j] = 1
+        for r in range(1, min(j, p) + 1):
+            psi[:, j] += ar_params[:, r - 1] * psi[:, j - r]
+            dpsi[:, :, j] += ar_params[:, r - 1, None] * dpsi[:, :, j - r]
+            dpsi[:, r - 1, j] += psi[:, j - r]
+
+    # Linear system for the first m autocovariances
+    A = np.zeros((nparams, m, m), dtype=dtype)
+    b = np.zeros((nparams, m), dtype=dtype)
+    db = np.zeros((nparams, k, m), dtype=dtype)
+    for i in range(m):
+        A[:, i, i] = 1
+        for r in range(1, p + 1):
+            A[:, i, abs(i - r)] -= ar_params[:, r - 1]
+        if i <= q:
+            b[:, i] = np.sum(ma[:, i:] * psi[:, :q + 1 - i], axis=1)
+            db[:, :, i] = np.sum(ma[:, None, i:] * dpsi[:, :, :q + 1 - i],
+                                 axis=2)
+            for s in range(max(i, 1), q + 1):
+                db[:, p + s - 1, i] += psi[:, s - i]
+
+    gamma = np.zeros((nparams, max(nlags, m)), dtype=dtype)
+    gamma[:, :m] = np.linalg.solve(A, b[..., None])[..., 0]
+    for h in range(m, gamma.shape[1]):
+        for r in range(1, p + 1):
+            gamma[:, h] += ar_params[:, r - 1] * gamma[:, h - r]
+
+    if not score:
+        return gamma[:, :nlags]
+
+    # Differentiating A gamma = b gives A dgamma = db - dA gamma
+    for s in range(1, p + 1):
+        db[:, s - 1] += gamma[:, np.abs(np.arange(m) - s)]
+    dgamma = np.zeros((nparams, k, gamma.shape[1]), dtype=dtype)
+    if k > 0:
+        dgamma[:, :, :m] = np.linalg.solve(A[:, None], db[..., None])[..., 0]
+    for h in range(m, gamma.shape[1]):
+        for r in range(1, p + 1):
+            dgamma[:, :, h] += ar_params[:, r - 1, None] * dgamma[:, :, h - r]
+            dgamma[:, r - 1, h] += gamma[:, h - r]
+
+    return gamma[:, :nlags], dgamma[..., :nlags]
+
+
 def arma_innovations(endog, ar_params=None, ma_params=None, sigma2=1,
                      normalize=False, prefix=None):
     """
@@ -126,6 +215,106 @@ def arma_loglike(endog, ar_params=None, ma_params=None, sigma2=1, prefix=None):
     return np.sum(llf_obs)
 
 
+def arma_loglike_batch(endog, ar_params=None, ma_params=None, sigma2=1,
+                       score=False, prefix=None):
+    """
+    Compute ARMA log-likelihoods for sets of parameters and series.
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process, may be univariate or multivariate,
+        in which case each column is treated as a separate series.
+    ar_params : ndarray, optional
+        Autoregressive parameters. May be two-dimensional, in which case each
+        row is a separate set of parameters.
+    ma_params : ndarray, optional
+        Moving average parameters. May be two-dimensional, in which case each
+        row is a separate set of parameters.
+    sigma2 : ndarray, optional
+        The ARMA innovation variance, scalar or one value per set of
+        parameters. Default is 1.
+    score : bool, optional
+        Whether or not to also return the score. Default is False.
+    prefix : str, optional
+        The BLAS prefix associated with the datatype. Default is to find the
+        best datatype based on given input. This argument is typically only
+        used internally.
+
+    Returns
+    -------
+    loglike : ndarray
+        The joint loglikelihood for each set of parameters and each series,
+        shaped (nparams, nseries). Dimensions for one-dimensional parameters
+        or a one-dimensional `endog` are dropped.
+    score : ndarray
+        The score with respect to the AR, MA and variance parameters (in that
+        order), shaped (nparams, nseries, p + q + 1) with dimensions dropped
+        as for `loglike`. Only returned if `score=True`.
+
+    Notes
+    -----
+    The innovations algorithm is only run once for each set of parameters
+    and the filter is then applied to every series, all in compiled code
+    that does not hold the GIL. The score is computed analytically, by
+    differentiating the recursions, so that it is exact and does not require
+    additional loglikelihood evaluations.
+    """
+    endog = np.array(endog)
+    squeezed_endog = endog.ndim == 1
+    if squeezed_endog:
+        endog = endog[:, None]
+    if endog.ndim != 2:
+        raise ValueError('endog must be one- or two-dimensional.')
+
+    ar_params = np.asarray([] if ar_params is None else ar_params)
+    ma_params = np.asarray([] if ma_params is None else ma_params)
+    sigma2 = np.asarray(sigma2)
+    squeezed_params = (ar_params.ndim <= 1 and ma_params.ndim <= 1 and
+                       sigma2.ndim == 0)
+    ar_params = np.atleast_2d(ar_params)
+    ma_params = np.atleast_2d(ma_params)
+    nparams = max(ar_params.shape[0], ma_params.shape[0], sigma2.size)
+    ar_params = np.broadcast_to(ar_params, (nparams, ar_params.shape[1]))
+    ma_params = np.broadcast_to(ma_params, (nparams, ma_params.shape[1]))
+    sigma2 = np.broadcast_to(sigma2.ravel(), (nparams,))
+    p = ar_params.shape[1]
+    q = ma_params.shape[1]
+
+    if prefix is None:
+        prefix, dtype, _ = find_best_blas_type(
+            [endog, ar_params, ma_params, sigma2])
+    dtype = prefix_dtype_map[prefix]
+
+    endog = np.ascontiguousarray(endog.T, dtype=dtype)
+    ar_params = np.array(ar_params, dtype=dtype, order="C")
+    ma_params = np.array(ma_params, dtype=dtype, order="C")
+    sigma2 = np.array(sigma2, dtype=dtype)
+
+    nlags = max(2 * max(p, q) + p, 1)
+    if score:
+        gamma, dgamma = _arma_acovf_batch(ar_params, ma_params, nlags,
+                                          score=True)
+    else:
+        gamma = _arma_acovf_batch(ar_params, ma_params, nlags)
+        dgamma = np.zeros((nparams, 0, nlags))
+    gamma = np.ascontiguousarray(gamma, dtype=dtype)
+    dgamma = np.ascontiguousarray(dgamma, dtype=dtype)
+
+    func = getattr(_arma_innovations, prefix + 'arma_loglike_batch')
+    llf, llf_score = func(endog, ar_params, ma_params, sigma2, gamma, dgamma,
+                          score)
+
+    if squeezed_endog:
+        llf = llf[:, 0]
+        llf_score = llf_score[:, 0]
+    if squeezed_params:
+        llf = llf[0]
+        llf_score = llf_score[0]
+
+    return (llf, llf_score) if score else llf
+
+
 def arma_loglikeobs(endog, ar_params=None, ma_params=None, sigma2=1,
                     prefix=None):
     """
@@ -200,21 +389,16 @@ def arma_score(endog, ar_params=None, ma_params=None, sigma2=1,
 
     Notes
     -----
-    This is a numerical approximation, calculated using first-order complex
-    step differentiation on the `arma_loglike` method.
+    The score is computed analytically by differentiating the innovations
+    algorithm and filter, see `arma_loglike_batch`.
     """
-    ar_params = [] if ar_params is None else ar_params
-    ma_params = [] if ma_params is None else ma_params
-
-    p = len(ar_params)
-    q = len(ma_params)
-
-    def func(params):
-        return arma_loglike(endog, params[:p], params[p:p + q], params[p + q:])
+    ar_params = np.atleast_1d([] if ar_params is None else ar_params)
+    ma_params = np.atleast_1d([] if ma_params is None else ma_params)
+    sigma2 = np.asarray(sigma2).ravel()[0]
 
-    params0 = np.r_[ar_params, ma_params, sigma2]
-    epsilon = _get_epsilon(params0, 2., None, len(params0))
-    return approx_fprime_cs(params0, func, epsilon)
+    _, score = arma_loglike_batch(endog, ar_params, ma_params, sigma2,
+                                  score=True, prefix=prefix)
+    return score
 
 
 def arma_scoreobs(endog, ar_params=None, ma_params=None, sigma2=1,
@@ -4,8 +4,9 @@ Tests for ARMA innovations algorithm wrapper
 
 import numpy as np
 import pytest
-from numpy.testing import assert_allclose
+from numpy.testing import assert_allclose, assert_equal
 
+from statsmodels.tools.numdiff import approx_fprime_cs
 from statsmodels.tsa.innovations import arma_innovations
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 
@@ -42,3 +43,45 @@ def test_innovations_algo_filter_kalman_filter(ar_params, ma_params, sigma2):
     # Note: the tolerance on the two gets worse as more nobs are added
     assert_allclose(score, mod.score(params), atol=1e-5)
     assert_allclose(score_obs, mod.score_obs(params), atol=1e-5)
+
+
+@pytest.mark.parametrize("k_ar,k_ma", [(0, 0), (1, 0), (0, 1), (2, 1),
+                                       (1, 3), (4, 2)])
+@pytest.mark.parametrize("nobs", [1, 3, 50])
+def test_arma_loglike_batch(k_ar, k_ma, nobs):
+    # Test the batched loglikelihood and analytic score against the
+    # single-series routines and complex-step differentiation
+    rs = np.random.RandomState(1234)
+    endog = rs.normal(size=(nobs, 3))
+    ar_params = rs.uniform(-0.2, 0.2, size=(4, k_ar))
+    ma_params = rs.uniform(-0.4, 0.4, size=(4, k_ma))
+    sigma2 = rs.uniform(0.5, 2, size=4)
+
+    llf, score = arma_innovations.arma_loglike_batch(
+        endog, ar_params, ma_params, sigma2, score=True)
+    assert_equal(llf.shape, (4, 3))
+    assert_equal(score.shape, (4, 3, k_ar + k_ma + 1))
+
+    for i in range(4):
+        for j in range(3):
+            def func(params):
+                return arma_innovations.arma_loglike(
+                    endog[:, j], params[:k_ar], params[k_ar:k_ar + k_ma],
+                    params[-1])
+
+            params = np.r_[ar_params[i], ma_params[i], sigma2[i]]
+            assert_allclose(llf[i, j], func(params))
+            assert_allclose(score[i, j], approx_fprime_cs(params, func),
+                            atol=1e-10)
+
+    # One-dimensional inputs drop the corresponding dimension
+    llf = arma_innovations.arma_loglike_batch(endog[:, 0], ar_params,
+                                              ma_params, sigma2)
+    assert_equal(llf.shape, (4,))
+    llf = arma_innovations.arma_loglike_batch(endog, ar_params[0],
+                                              ma_params[0], sigma2[0])
+    assert_equal(llf.shape, (3,))
+    llf = arma_innovations.arma_loglike_batch(endog[:, 0], ar_params[0],
+                                              ma_params[0], sigma2[0])
+    assert_allclose(llf, arma_innovations.arma_loglike(
+        endog[:, 0], ar_params[0], ma_params[0], sigma2[0]))
@@ -228,13 +228,70 @@ class MarkovAutoregression(markov_regression.MarkovRegression):
         # Compute the conditional likelihoods
         variance = params[self.parameters['variance']].squeeze()
         if self.switching_variance:
-            variance = np.reshape(variance, (self.k_regimes, 1, 1))
+            variance = np.reshape(variance,
+                                  (self.k_regimes,) + (1,) * (self.order + 1))
 
         conditional_loglikelihoods = (
             -0.5 * resid**2 / variance - 0.5 * np.log(2 * np.pi * variance))
 
         return conditional_loglikelihoods
 
+    def _score_conditional_loglikelihoods(self, params, result):
+        """
+        Analytic score contribution of the conditional loglikelihoods
+        """
+        probabilities = result.smoothed_joint_probabilities
+        resid = self._resid(params)
+
+        variance = params[self.parameters['variance']]
+        if not self.switching_variance:
+            variance = np.repeat(variance, self.k_regimes)
+
+        if self._k_exog > 0:
+            xb = []
+            for i in range(self.k_regimes):
+                coeffs = params[self.parameters[i, 'exog']]
+                xb.append(np.dot(self.orig_exog, coeffs))
+
+        score = np.zeros(self.k_params)
+        lag_axes = tuple(range(self.order))
+        for i in range(self.k_regimes):
+            # Weighted residuals conditional on S_t = i
+            tmp = probabilities[i] * resid[i] / variance[i]
+
+            # Variances
+            score[self.parameters[i, 'variance']] += 0.5 * np.sum(
+                probabilities[i] * (resid[i]**2 / variance[i] - 1)
+            ) / variance[i]
+
+            # Regression coefficients, through y_t - x_t beta^{(S_t)}
+            if self._k_exog > 0:
+                score[self.parameters[i, 'exog']] += np.dot(
+                    self.exog.T, np.sum(tmp, axis=lag_axes))
+
+            # Autoregressive coefficients and, through
+            # y_{t-j} - x_{t-j} beta^{(S_{t-j})}, regression coefficients
+            ar_coeffs = params[self.parameters[i, 'autoregressive']]
+            ar_score = np.zeros(self.order)
+            for j in range(1, self.order + 1):
+                # Marginalize to S_t = i, S_{t-j} = k
+                axes = tuple(ax for ax in lag_axes if not ax == j - 1)
+                weights = np.sum(tmp, axis=axes)
+
+                start = self.order - j
+                end = -j
+                for k in range(self.k_regimes):
+                    lagged = self.orig_endog[start:end]
+                    if self._k_exog > 0:
+                        lagged = lagged - xb[k][start:end]
+                        score[self.parameters[k, 'exog']] -= (
+                            ar_coeffs[j - 1] *
+                            np.dot(self.orig_exog[start:end].T, weights[k]))
+                    ar_score[j - 1] += np.dot(weights[k], lagged)
+            score[self.parameters[i, 'autoregressive']] += ar_score
+
+        return score
+
     @property
     def _res_classes(self):
         return {'fit': (MarkovAutoregressionResults,
@@ -249,12 +306,14 @@ class MarkovAutoregression(markov_regression.MarkovRegression):
             self, params0)
 
         tmp = np.sqrt(result.smoothed_marginal_probabilities)
+        variance0 = params0[self.parameters['variance']]
 
         # Regression coefficients
         coeffs = None
         if self._k_exog > 0:
             coeffs = self._em_exog(result, self.endog, self.exog,
-                                   self.parameters.switching['exog'], tmp)
+                                   self.parameters.switching['exog'], tmp,
+                                   variance0)
             for i in range(self.k_regimes):
                 params1[self.parameters[i, 'exog']] = coeffs[i]
 
@@ -262,11 +321,12 @@ class MarkovAutoregression(markov_regression.MarkovRegression):
         if self.order > 0:
             if self._k_exog > 0:
                 ar_coeffs, variance = self._em_autoregressive(
-                    result, coeffs)
+                    result, coeffs, variance=variance0)
             else:
                 ar_coeffs = self._em_exog(
                     result, self.endog, self.exog_ar,
-                    self.parameters.switching['autoregressive'])
+                    self.parameters.switching['autoregressive'],
+                    variance=variance0)
                 variance = self._em_variance(
                     result, self.endog, self.exog_ar, ar_coeffs, tmp)
             for i in range(self.k_regimes):
@@ -275,7 +335,7 @@ class MarkovAutoregression(markov_regression.MarkovRegression):
 
         return result, params1
 
-    def _em_autoregressive(self, result, betas, tmp=None):
+    def _em_autoregressive(self, result, betas, tmp=None, variance=None):
         """
         EM step for autoregressive coefficients and variances
         """
@@ -290,19 +350,22 @@ class MarkovAutoregression(markov_regression.MarkovRegression):
 
         # The difference between this and `_em_exog` is that here we have a
         # different endog and exog for each regime
-        coeffs = np.zeros((self.k_regimes,) + (self.order,))
+        endog = resid[:, self.order:]
+        exog = np.array([lagmat(resid[i], self.order)[self.order:]
+                         for i in range(self.k_regimes)])
+        weights = result.smoothed_marginal_probabilities
+        if self.switching_variance and variance is not None:
+            weights = weights / np.reshape(variance, (self.k_regimes, 1))
+        coeffs = self._em_weighted_least_squares(
+            endog, exog, self.parameters.switching['autoregressive'], weights)
+
         variance = np.zeros((self.k_regimes,))
-        exog = np.zeros((self.nobs, self.order))
         for i in range(self.k_regimes):
-            endog = resid[i, self.order:]
-            exog = lagmat(resid[i], self.order)[self.order:]
-            tmp_endog = tmp[i] * endog
-            tmp_exog = tmp[i][:, None] * exog
-
-            coeffs[i] = np.dot(np.linalg.pinv(tmp_exog), tmp_endog)
+            tmp_endog = tmp[i] * endog[i]
+            tmp_exog = tmp[i][:, None] * exog[i]
 
             if self.switching_variance:
-                tmp_resid = endog - np.dot(exog, coeffs[i])
+                tmp_resid = endog[i] - np.dot(exog[i], coeffs[i])
                 variance[i] = (np.sum(
                     tmp_resid**2 * result.smoothed_marginal_probabilities[i]) /
                     np.sum(result.smoothed_marginal_probabilities[i]))
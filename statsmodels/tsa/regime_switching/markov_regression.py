@@ -189,6 +189,32 @@ class MarkovRegression(markov_switching.MarkovSwitching):
 
         return conditional_loglikelihoods
 
+    def _score_conditional_loglikelihoods(self, params, result):
+        """
+        Analytic score contribution of the conditional loglikelihoods
+        """
+        probabilities = result.smoothed_marginal_probabilities
+        resid = self.endog - self.predict_conditional(params)[:, 0]
+
+        variance = params[self.parameters['variance']]
+        if not self.switching_variance:
+            variance = np.repeat(variance, self.k_regimes)
+
+        score = np.zeros(self.k_params)
+        tmp = probabilities * resid / variance[:, None]
+        for i in range(self.k_regimes):
+            # Regression coefficients
+            if self._k_exog > 0:
+                score[self.parameters[i, 'exog']] += np.dot(self.exog.T,
+                                                            tmp[i])
+
+            # Variances
+            score[self.parameters[i, 'variance']] += 0.5 * np.sum(
+                probabilities[i] * (resid[i]**2 / variance[i] - 1)
+            ) / variance[i]
+
+        return score
+
     @property
     def _res_classes(self):
         return {'fit': (MarkovRegressionResults,
@@ -203,6 +229,10 @@ class MarkovRegression(markov_switching.MarkovSwitching):
         This uses the inherited _em_iteration method for computing the
         non-TVTP transition probabilities and then performs the EM step for
         regression coefficients and variances.
+
+        When the variance is switching, the regression coefficients are
+        updated conditional on the previous iteration's variances (an
+        expectation / conditional maximization step).
         """
         # Inherited parameters
         result, params1 = super(MarkovRegression, self)._em_iteration(params0)
@@ -213,7 +243,8 @@ class MarkovRegression(markov_switching.MarkovSwitching):
         coeffs = None
         if self._k_exog > 0:
             coeffs = self._em_exog(result, self.endog, self.exog,
-                                   self.parameters.switching['exog'], tmp)
+                                   self.parameters.switching['exog'], tmp,
+                                   params0[self.parameters['variance']])
             for i in range(self.k_regimes):
                 params1[self.parameters[i, 'exog']] = coeffs[i]
 
@@ -224,13 +255,25 @@ class MarkovRegression(markov_switching.MarkovSwitching):
 
         return result, params1
 
-    def _em_exog(self, result, endog, exog, switching, tmp=None):
+    def _em_exog(self, result, endog, exog, switching, tmp=None,
+                 variance=None):
         """
         EM step for regression coefficients
         """
         k_exog = exog.shape[1]
         coeffs = np.zeros((self.k_regimes, k_exog))
 
+        # With both switching and non-switching coefficients, or with
+        # non-switching coefficients and a switching variance, the
+        # coefficients must be estimated jointly across regimes
+        if not np.all(switching) and (np.any(switching) or
+                                      self.switching_variance):
+            weights = result.smoothed_marginal_probabilities
+            if self.switching_variance and variance is not None:
+                weights = weights / np.reshape(variance, (self.k_regimes, 1))
+            return self._em_weighted_least_squares(endog, exog, switching,
+                                                   weights)
+
         # First, estimate non-switching coefficients
         if not np.all(switching):
             nonswitching_exog = exog[:, ~switching]
@@ -252,6 +295,55 @@ class MarkovRegression(markov_switching.MarkovSwitching):
 
         return coeffs
 
+    def _em_weighted_least_squares(self, endog, exog, switching, weights):
+        """
+        Weighted least squares for possibly switching coefficients
+
+        Parameters
+        ----------
+        endog : ndarray
+            Dependent variable, shaped (nobs,) or, if it is regime-specific,
+            (k_regimes, nobs).
+        exog : ndarray
+            Regressors, shaped (nobs, k) or, if they are regime-specific,
+            (k_regimes, nobs, k).
+        switching : ndarray
+            Boolean array of length k indicating which coefficients switch.
+        weights : ndarray
+            Regime weights, shaped (k_regimes, nobs).
+
+        Returns
+        -------
+        coeffs : ndarray
+            Coefficients, shaped (k_regimes, k).
+        """
+        nobs = weights.shape[-1]
+        k_exog = exog.shape[-1]
+        k_switching = np.sum(switching)
+        k_nonswitching = k_exog - k_switching
+        endog = np.broadcast_to(endog, (self.k_regimes, nobs))
+        exog = np.broadcast_to(exog, (self.k_regimes, nobs, k_exog))
+
+        # Stack the regimes, with non-switching coefficients shared across
+        # regimes and a block for the switching coefficients of each regime
+        tmp = np.sqrt(weights)
+        design = np.zeros((self.k_regimes, nobs,
+                           k_nonswitching + self.k_regimes * k_switching))
+        design[..., :k_nonswitching] = tmp[..., None] * exog[..., ~switching]
+        for i in range(self.k_regimes):
+            start = k_nonswitching + i * k_switching
+            design[i, :, start:start + k_switching] = (
+                tmp[i][:, None] * exog[i][:, switching])
+        params = np.dot(
+            np.linalg.pinv(design.reshape(self.k_regimes * nobs, -1)),
+            (tmp * endog).ravel())
+
+        coeffs = np.zeros((self.k_regimes, k_exog))
+        coeffs[:, ~switching] = params[:k_nonswitching]
+        coeffs[:, switching] = np.reshape(params[k_nonswitching:],
+                                          (self.k_regimes, k_switching))
+        return coeffs
+
     def _em_variance(self, result, endog, exog, betas, tmp=None):
         """
         EM step for variances
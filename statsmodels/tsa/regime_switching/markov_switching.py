@@ -12,6 +12,7 @@ import pandas as pd
 from scipy.special import logsumexp
 
 from statsmodels.tools.tools import Bunch
+from statsmodels.tools.parallel import parallel_func
 from statsmodels.tools.numdiff import approx_fprime_cs, approx_hess_cs
 from statsmodels.tools.decorators import cache_readonly
 from statsmodels.tools.eval_measures import aic, bic, hqic
@@ -26,7 +27,9 @@ from statsmodels.tsa.statespace.tools import find_best_blas_type, prepare_exog
 
 from statsmodels.tsa.regime_switching._hamilton_filter import (
     shamilton_filter_log, dhamilton_filter_log, chamilton_filter_log,
-    zhamilton_filter_log)
+    zhamilton_filter_log, shamilton_filter_log_tvtp,
+    dhamilton_filter_log_tvtp, chamilton_filter_log_tvtp,
+    zhamilton_filter_log_tvtp)
 from statsmodels.tsa.regime_switching._kim_smoother import (
     skim_smoother_log, dkim_smoother_log, ckim_smoother_log, zkim_smoother_log)
 
@@ -35,12 +38,35 @@ prefix_hamilton_filter_log_map = {
     'c': chamilton_filter_log, 'z': zhamilton_filter_log
 }
 
+prefix_hamilton_filter_log_tvtp_map = {
+    's': shamilton_filter_log_tvtp, 'd': dhamilton_filter_log_tvtp,
+    'c': chamilton_filter_log_tvtp, 'z': zhamilton_filter_log_tvtp
+}
+
 prefix_kim_smoother_log_map = {
     's': skim_smoother_log, 'd': dkim_smoother_log,
     'c': ckim_smoother_log, 'z': zkim_smoother_log
 }
 
 
+def _search_em(model, params, em_iter):
+    """
+    EM iterations from one random start; returns None if they fail
+
+    Defined at the module level so that it can be used with joblib.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            proposed_params = model._fit_em(params, transformed=False,
+                                            maxiter=em_iter,
+                                            return_params=True)
+            proposed_llf = model.loglike(proposed_params)
+        except Exception:  # FIXME: catch something specific
+            return None
+    return proposed_params, proposed_llf
+
+
 def _logistic(x):
     """
     Note that this is not a vectorized function
@@ -164,9 +190,144 @@ def cy_hamilton_filter_log(initial_probabilities, regime_transition,
     regime_transition = np.log(np.maximum(regime_transition, 1e-20))
 
     # Storage
-    # Pr[S_t = s_t | Y_t]
-    filtered_marginal_probabilities = (
-        np.zeros((k_regimes, nobs), dtype=dtype))
+    (predicted_joint_probabilities, joint_loglikelihoods,
+     filtered_joint_probabilities) = _hamilton_filter_log_storage(
+        initial_probabilities, regime_transition, order, nobs, dtype)
+
+    # Get appropriate subset of transition matrix
+    if regime_transition.shape[-1] > 1:
+        regime_transition = regime_transition[..., model_order:]
+
+    # Run Cython filter iterations
+    prefix, dtype, _ = find_best_blas_type((
+        regime_transition, conditional_loglikelihoods, joint_loglikelihoods,
+        predicted_joint_probabilities, filtered_joint_probabilities))
+    func = prefix_hamilton_filter_log_map[prefix]
+    func(nobs, k_regimes, order, regime_transition,
+         conditional_loglikelihoods.reshape(k_regimes**(order+1), nobs),
+         joint_loglikelihoods,
+         predicted_joint_probabilities.reshape(k_regimes**(order+1), nobs),
+         filtered_joint_probabilities.reshape(k_regimes**(order+1), nobs+1))
+
+    return _hamilton_filter_log_output(predicted_joint_probabilities,
+                                       joint_loglikelihoods,
+                                       filtered_joint_probabilities)
+
+
+def cy_hamilton_filter_log_tvtp(initial_probabilities, exog_tvtp,
+                                tvtp_coefficients, conditional_loglikelihoods,
+                                model_order):
+    """
+    Hamilton filter with time-varying transition probabilities.
+
+    The transition matrix of each period is computed inside the Cython
+    filter loop from the corresponding row of `exog_tvtp`, so that the
+    (k_regimes, k_regimes, nobs + order) transition array is not
+    constructed.
+
+    Parameters
+    ----------
+    initial_probabilities : ndarray
+        Array of initial probabilities, shaped (k_regimes,) giving the
+        distribution of the regime process at time t = -order where order
+        is a nonnegative integer.
+    exog_tvtp : ndarray
+        Array of exogenous variables for the time-varying transition
+        probabilities, shaped (nobs + order, k_tvtp).
+    tvtp_coefficients : ndarray
+        Array of logit coefficients, shaped (k_regimes - 1, k_regimes,
+        k_tvtp). Entry [i, j] contains the coefficients of the log odds of
+        moving from regime j to regime i relative to moving from regime j
+        to the last regime.
+    conditional_loglikelihoods : ndarray
+        Array of loglikelihoods conditional on the last `order+1` regimes,
+        shaped (k_regimes,)*(order + 1) + (nobs,).
+    model_order : int
+        The order of the model.
+
+    Returns
+    -------
+    tuple
+        Same output as `cy_hamilton_filter_log`.
+
+    See Also
+    --------
+    cy_hamilton_filter_log
+    """
+    # Dimensions
+    exog_tvtp = np.asarray(exog_tvtp)
+    k_regimes = len(initial_probabilities)
+    nobs = conditional_loglikelihoods.shape[-1]
+    order = conditional_loglikelihoods.ndim - 2
+    dtype = conditional_loglikelihoods.dtype
+
+    # Check for compatible shapes.
+    incompatible_shapes = (
+        exog_tvtp.shape[0] != nobs + model_order
+        or tvtp_coefficients.shape != (k_regimes - 1, k_regimes,
+                                       exog_tvtp.shape[1])
+        or conditional_loglikelihoods.shape[0] != k_regimes)
+    if incompatible_shapes:
+        raise ValueError('Arguments do not have compatible shapes')
+
+    # Only the transition matrices of the first `order` periods are needed
+    # outside of the filter loop, to initialize the joint probabilities
+    initial_regime_transition = _tvtp_regime_transition_matrix(
+        exog_tvtp[:max(order, 1)], tvtp_coefficients)
+    initial_probabilities = np.log(initial_probabilities)
+    initial_regime_transition = np.log(
+        np.maximum(initial_regime_transition, 1e-20))
+
+    # Storage
+    (predicted_joint_probabilities, joint_loglikelihoods,
+     filtered_joint_probabilities) = _hamilton_filter_log_storage(
+        initial_probabilities, initial_regime_transition, order, nobs, dtype)
+
+    # Run Cython filter iterations
+    prefix, dtype, _ = find_best_blas_type((
+        exog_tvtp, tvtp_coefficients, conditional_loglikelihoods,
+        joint_loglikelihoods, predicted_joint_probabilities,
+        filtered_joint_probabilities))
+    func = prefix_hamilton_filter_log_tvtp_map[prefix]
+    func(nobs, k_regimes, order,
+         np.asarray(exog_tvtp[model_order:], dtype=dtype),
+         np.asarray(tvtp_coefficients, dtype=dtype),
+         conditional_loglikelihoods.reshape(k_regimes**(order+1), nobs),
+         joint_loglikelihoods,
+         predicted_joint_probabilities.reshape(k_regimes**(order+1), nobs),
+         filtered_joint_probabilities.reshape(k_regimes**(order+1), nobs+1))
+
+    return _hamilton_filter_log_output(predicted_joint_probabilities,
+                                       joint_loglikelihoods,
+                                       filtered_joint_probabilities)
+
+
+def _tvtp_regime_transition_matrix(exog_tvtp, tvtp_coefficients):
+    """
+    Left-stochastic transition matrices from multinomial logit coefficients
+
+    Returns an array shaped (k_regimes, k_regimes, nobs).
+    """
+    k_regimes = tvtp_coefficients.shape[1]
+    nobs = exog_tvtp.shape[0]
+    logits = np.einsum('ijk,tk->ijt', tvtp_coefficients, exog_tvtp)
+    tmp = np.concatenate(
+        [np.zeros((1, k_regimes, nobs), dtype=logits.dtype), logits])
+    regime_transition = np.zeros(
+        (k_regimes, k_regimes, nobs),
+        dtype=np.promote_types(np.float64, logits.dtype))
+    regime_transition[:-1] = np.exp(logits - logsumexp(tmp, axis=0))
+    regime_transition[-1] = 1 - np.sum(regime_transition[:-1], axis=0)
+    return regime_transition
+
+
+def _hamilton_filter_log_storage(initial_probabilities, regime_transition,
+                                 order, nobs, dtype):
+    """
+    Allocate the Hamilton filter output and set the initial joint
+    probabilities, with regime_transition already in log space
+    """
+    k_regimes = len(initial_probabilities)
     # Pr[S_t = s_t, ... S_{t-r} = s_{t-r} | Y_{t-1}]
     # Has k_regimes^(order+1) elements
     predicted_joint_probabilities = np.zeros(
@@ -179,7 +340,6 @@ def cy_hamilton_filter_log(initial_probabilities, regime_transition,
         (k_regimes,) * (order + 1) + (nobs + 1,), dtype=dtype)
 
     # Initial probabilities
-    filtered_marginal_probabilities[:, 0] = initial_probabilities
     tmp = np.copy(initial_probabilities)
     shape = (k_regimes, k_regimes)
     transition_t = 0
@@ -190,21 +350,13 @@ def cy_hamilton_filter_log(initial_probabilities, regime_transition,
                          shape + (1,) * i) + tmp
     filtered_joint_probabilities[..., 0] = tmp
 
-    # Get appropriate subset of transition matrix
-    if regime_transition.shape[-1] > 1:
-        regime_transition = regime_transition[..., model_order:]
+    return (predicted_joint_probabilities, joint_loglikelihoods,
+            filtered_joint_probabilities)
 
-    # Run Cython filter iterations
-    prefix, dtype, _ = find_best_blas_type((
-        regime_transition, conditional_loglikelihoods, joint_loglikelihoods,
-        predicted_joint_probabilities, filtered_joint_probabilities))
-    func = prefix_hamilton_filter_log_map[prefix]
-    func(nobs, k_regimes, order, regime_transition,
-         conditional_loglikelihoods.reshape(k_regimes**(order+1), nobs),
-         joint_loglikelihoods,
-         predicted_joint_probabilities.reshape(k_regimes**(order+1), nobs),
-         filtered_joint_probabilities.reshape(k_regimes**(order+1), nobs+1))
 
+def _hamilton_filter_log_output(predicted_joint_probabilities,
+                                joint_loglikelihoods,
+                                filtered_joint_probabilities):
     # Save log versions for smoother
     predicted_joint_probabilities_log = predicted_joint_probabilities
     filtered_joint_probabilities_log = filtered_joint_probabilities
@@ -593,33 +745,29 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
 
         return probabilities
 
-    def _regime_transition_matrix_tvtp(self, params, exog_tvtp=None):
-        if exog_tvtp is None:
-            exog_tvtp = self.exog_tvtp
-        nobs = len(exog_tvtp)
+    def _tvtp_coefficients(self, params):
+        """
+        Logit coefficients of the TVTP transition probabilities
 
-        regime_transition_matrix = np.zeros(
-            (self.k_regimes, self.k_regimes, nobs),
+        Returns an array shaped (k_regimes - 1, k_regimes, k_tvtp), where
+        entry [i, j] contains the coefficients for moving from regime j to
+        regime i.
+        """
+        coefficients = np.zeros(
+            (self.k_regimes - 1, self.k_regimes, self.k_tvtp),
             dtype=np.promote_types(np.float64, params.dtype))
+        for j in range(self.k_regimes):
+            coefficients[:, j] = np.reshape(
+                params[self.parameters[j, 'regime_transition']],
+                (self.k_regimes - 1, self.k_tvtp))
+        return coefficients
 
-        # Compute the predicted values from the regression
-        for i in range(self.k_regimes):
-            coeffs = params[self.parameters[i, 'regime_transition']]
-            regime_transition_matrix[:-1, i, :] = np.dot(
-                exog_tvtp,
-                np.reshape(coeffs, (self.k_regimes-1, self.k_tvtp)).T).T
-
-        # Perform the logistic transformation
-        tmp = np.c_[np.zeros((nobs, self.k_regimes, 1)),
-                    regime_transition_matrix[:-1, :, :].T].T
-        regime_transition_matrix[:-1, :, :] = np.exp(
-            regime_transition_matrix[:-1, :, :] - logsumexp(tmp, axis=0))
-
-        # Compute the last column of the transition matrix
-        regime_transition_matrix[-1, :, :] = (
-            1 - np.sum(regime_transition_matrix[:-1, :, :], axis=0))
+    def _regime_transition_matrix_tvtp(self, params, exog_tvtp=None):
+        if exog_tvtp is None:
+            exog_tvtp = self.exog_tvtp
 
-        return regime_transition_matrix
+        return _tvtp_regime_transition_matrix(
+            exog_tvtp, self._tvtp_coefficients(params))
 
     def regime_transition_matrix(self, params, exog_tvtp=None):
         """
@@ -774,6 +922,27 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
                     initial_probabilities, regime_transition,
                     conditional_loglikelihoods, self.order))
 
+    def _loglikeobs_tvtp(self, params):
+        """
+        Loglikelihood of each period with time-varying transition
+        probabilities, computed inside the filter loop
+        """
+        # Only the first transition matrix is required for the (steady-state)
+        # initialization
+        regime_transition = self.regime_transition_matrix(
+            params, exog_tvtp=self.exog_tvtp[:1])
+        initial_probabilities = self.initial_probabilities(
+            params, regime_transition)
+
+        # Compute the conditional likelihoods
+        conditional_loglikelihoods = self._conditional_loglikelihoods(params)
+
+        # Apply the filter
+        return cy_hamilton_filter_log_tvtp(
+            initial_probabilities, self.exog_tvtp,
+            self._tvtp_coefficients(params), conditional_loglikelihoods,
+            self.order)[2]
+
     def filter(self, params, transformed=True, cov_type=None, cov_kwds=None,
                return_raw=False, results_class=None,
                results_wrapper_class=None):
@@ -949,6 +1118,9 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
         if not transformed:
             params = self.transform_params(params)
 
+        if self.tvtp:
+            return self._loglikeobs_tvtp(params)
+
         results = self._filter(params)
 
         return results[5]
@@ -978,10 +1150,133 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
             function.
         transformed : bool, optional
             Whether or not `params` is already transformed. Default is True.
+
+        Notes
+        -----
+        The score is computed using Fisher's identity, as the gradient of the
+        expected complete-data loglikelihood with the expectation taken with
+        respect to the smoothed joint regime probabilities. This requires a
+        single pass of the Hamilton filter and Kim smoother, rather than one
+        pass per parameter as with numerical differentiation.
         """
         params = np.array(params, ndmin=1)
 
-        return approx_fprime_cs(params, self.loglike, args=(transformed,))
+        if not transformed:
+            unconstrained = params
+            params = self.transform_params(params)
+
+        result = self.smooth(params, transformed=True, return_raw=True)
+        score = (self._score_regime_transition(params, result) +
+                 self._score_conditional_loglikelihoods(params, result))
+
+        # Chain rule for the parameter transformation
+        if not transformed:
+            jacobian = approx_fprime_cs(unconstrained, self.transform_params)
+            score = np.dot(score, jacobian)
+
+        return score
+
+    def _score_regime_transition(self, params, result):
+        """
+        Score contribution of the regime transition parameters
+
+        Notes
+        -----
+        This includes the contribution of the initial (possibly steady-state)
+        regime probabilities.
+        """
+        k_regimes = self.k_regimes
+        smoothed_joint_probabilities = result.smoothed_joint_probabilities
+        order = smoothed_joint_probabilities.ndim - 2
+        nobs = smoothed_joint_probabilities.shape[-1]
+
+        # The full transition matrix, including any pre-sample periods
+        regime_transition = self.regime_transition_matrix(params)
+        initial_probabilities = result.initial_probabilities
+        offset = regime_transition.shape[-1] - nobs if self.tvtp else 0
+
+        # The filter bounds transition probabilities away from zero, so that
+        # the loglikelihood does not depend on those below the bound
+        inverse_transition = np.zeros(regime_transition.shape)
+        mask = regime_transition > 1e-20
+        inverse_transition[mask] = 1. / regime_transition[mask]
+
+        # Partial derivatives of the expected complete-data loglikelihood with
+        # respect to each element of the regime transition matrix
+        partials = np.zeros(regime_transition.shape)
+
+        # S_t, S_{t-1} | T for t = 0, ..., nobs - 1
+        tmp = smoothed_joint_probabilities
+        for i in range(order - 1):
+            tmp = np.sum(tmp, axis=-2)
+        if self.tvtp:
+            partials[..., offset:] += tmp * inverse_transition[..., offset:]
+        else:
+            partials[..., 0] += (np.sum(tmp, axis=-1) *
+                                 inverse_transition[..., 0])
+
+        # Pre-sample transitions S_{-d}, S_{-d-1} | T for d = 1, ..., order - 1
+        initial_joint_probabilities = smoothed_joint_probabilities[..., 0]
+        for d in range(1, order):
+            axes = tuple(i for i in range(order + 1) if i not in (d, d + 1))
+            t = order - d if self.tvtp else 0
+            partials[..., t] += (
+                np.sum(initial_joint_probabilities, axis=axes) *
+                inverse_transition[..., t])
+
+        # Pre-sample marginal probabilities S_{-order} | T, where
+        # Pr[S_{-order}] is the initial probabilities propagated one period
+        weights = np.sum(initial_joint_probabilities, axis=tuple(range(order)))
+        marginal = np.dot(np.maximum(regime_transition[..., 0], 1e-20),
+                          initial_probabilities)
+        tmp = weights / np.maximum(marginal, 1e-20)
+        partials[..., 0] += (np.outer(tmp, initial_probabilities) *
+                             mask[..., 0])
+
+        # Steady-state initial probabilities also depend on the transition
+        # matrix, through the solution of (I - P) pi = 0, 1' pi = 1
+        if self._initialization == 'steady-state':
+            A = np.c_[(np.eye(k_regimes) - regime_transition[..., 0]).T,
+                      np.ones(k_regimes)].T
+            tmp = np.dot(np.linalg.pinv(A)[:, :k_regimes].T,
+                         np.dot(tmp, regime_transition[..., 0]))
+            partials[..., 0] += np.outer(tmp, initial_probabilities)
+
+        # Map into the parameters
+        score = np.zeros(self.k_params)
+        if not self.tvtp:
+            for j in range(k_regimes):
+                score[self.parameters[j, 'regime_transition']] = (
+                    partials[:-1, j, 0] - partials[-1, j, 0])
+        else:
+            # Partial derivatives of the multinomial logit transformation
+            tmp = regime_transition * (
+                partials - np.sum(partials * regime_transition, axis=0))
+            tmp = np.dot(tmp[:-1], np.asarray(self.exog_tvtp))
+            for j in range(k_regimes):
+                score[self.parameters[j, 'regime_transition']] = (
+                    tmp[:, j].ravel())
+
+        return score
+
+    def _score_conditional_loglikelihoods(self, params, result):
+        """
+        Score contribution of the conditional loglikelihoods
+
+        Notes
+        -----
+        This is the gradient of the conditional loglikelihoods weighted by the
+        smoothed joint probabilities, which are held fixed. Subclasses may
+        provide an analytic version; here it is computed by complex-step
+        differentiation, which does not require additional filter passes.
+        """
+        smoothed_joint_probabilities = result.smoothed_joint_probabilities
+
+        def func(params):
+            return np.sum(smoothed_joint_probabilities *
+                          self._conditional_loglikelihoods(params))
+
+        return approx_fprime_cs(params, func)
 
     def score_obs(self, params, transformed=True):
         """
@@ -1019,7 +1314,7 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
     def fit(self, start_params=None, transformed=True, cov_type='approx',
             cov_kwds=None, method='bfgs', maxiter=100, full_output=1, disp=0,
             callback=None, return_params=False, em_iter=5, search_reps=0,
-            search_iter=5, search_scale=1., **kwargs):
+            search_iter=5, search_scale=1., search_n_jobs=1, **kwargs):
         """
         Fits the model by maximum likelihood via Hamilton filter.
 
@@ -1080,6 +1375,9 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
             search parameter repetitions.
         search_scale : float or array, optional.
             Scale of variates for random start parameter search.
+        search_n_jobs : int, optional
+            Number of jobs used to run the random start parameter search in
+            parallel. -1 uses all cores. Default is 1.
         **kwargs
             Additional keyword arguments to pass to the optimizer.
 
@@ -1099,7 +1397,7 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
             start_params = self._start_params_search(
                 search_reps, start_params=start_params,
                 transformed=transformed, em_iter=search_iter,
-                scale=search_scale)
+                scale=search_scale, n_jobs=search_n_jobs)
             transformed = True
 
         # Get better start params through EM algorithm
@@ -1290,7 +1588,7 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
         return regime_transition
 
     def _start_params_search(self, reps, start_params=None, transformed=True,
-                             em_iter=5, scale=1.):
+                             em_iter=5, scale=1., n_jobs=1):
         """
         Search for starting parameters as random permutations of a vector
 
@@ -1310,6 +1608,10 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
             Scale of variates for random start parameter search. Can be given
             as an array of length equal to the number of parameters or as a
             single scalar.
+        n_jobs : int, optional
+            Number of jobs used to evaluate the random permutations in
+            parallel. -1 uses all cores. The selected parameters do not depend
+            on n_jobs.
 
         Notes
         -----
@@ -1342,21 +1644,14 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
 
         llf = self.loglike(start_params, transformed=False)
         params = start_params
-        for i in range(reps):
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-
-                try:
-                    proposed_params = self._fit_em(
-                        start_params + variates[i], transformed=False,
-                        maxiter=em_iter, return_params=True)
-                    proposed_llf = self.loglike(proposed_params)
-
-                    if proposed_llf > llf:
-                        llf = proposed_llf
-                        params = self.untransform_params(proposed_params)
-                except Exception:  # FIXME: catch something specific
-                    pass
+        parallel, p_func, n_jobs = parallel_func(_search_em, n_jobs,
+                                                 verbose=0)
+        proposed = parallel(p_func(self, start_params + variates[i], em_iter)
+                            for i in range(reps))
+        for out in proposed:
+            if out is not None and out[1] > llf:
+                llf = out[1]
+                params = self.untransform_params(out[0])
 
         # Return transformed parameters
         return self.transform_params(params)
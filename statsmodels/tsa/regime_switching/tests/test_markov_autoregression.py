@@ -14,6 +14,7 @@ import pandas as pd
 import pytest
 
 from statsmodels.tools import add_constant
+from statsmodels.tools.numdiff import approx_fprime_cs
 from statsmodels.tsa.regime_switching import markov_autoregression
 
 current_path = os.path.dirname(os.path.abspath(__file__))
@@ -241,6 +242,19 @@ class MarkovAutoregression(object):
         assert_allclose(res_em.llf, self.true['llf_fit_em'], atol=self.atol,
                         rtol=self.rtol)
 
+    def test_score(self):
+        # Analytic score against numerical derivatives of the loglikelihood
+        params = self.true['params']
+        assert_allclose(self.model.score(params),
+                        approx_fprime_cs(params, self.model.loglike),
+                        rtol=1e-5, atol=1e-7)
+
+        unconstrained = self.model.untransform_params(params)
+        assert_allclose(self.model.score(unconstrained, transformed=False),
+                        approx_fprime_cs(unconstrained, self.model.loglike,
+                                         args=(False,)),
+                        rtol=1e-5, atol=1e-7)
+
 
 hamilton_ar2_short_filtered_joint_probabilities = np.array([
          [[[4.99506987e-02,   6.44048275e-04,   6.22227140e-05,
@@ -375,7 +389,8 @@ class TestHamiltonAR2Short(MarkovAutoregression):
                             np.exp(-0.262658)**2, 0.013486, -0.057521],
             'llf': -10.14066,
             'llf_fit': -4.0523073,
-            'llf_fit_em': -8.885836
+            # EM estimates non-switching AR coefficients jointly across regimes
+            'llf_fit_em': -8.411868
         }
         super(TestHamiltonAR2Short, cls).setup_class(
             true, rgnp[-10:], k_regimes=2, order=2, switching_ar=False)
@@ -496,7 +511,8 @@ class TestHamiltonAR4(MarkovAutoregression):
                             -0.246983, -0.212923],
             'llf': -181.26339,
             'llf_fit': -181.26339,
-            'llf_fit_em': -183.85444,
+            # EM estimates non-switching AR coefficients jointly across regimes
+            'llf_fit_em': -183.669651,
             'bse_oim': np.r_[.0965189, .0377362, .2645396, .0745187, np.nan,
                              .1199942, .137663, .1069103, .1105311, ]
         }
@@ -810,6 +826,18 @@ class TestHamiltonAR1SwitchTVTP(MarkovAutoregression):
         assert_allclose(self.result.expected_durations, expected_durations,
                         rtol=1e-5, atol=1e-7)
 
+    def test_loglikeobs_tvtp(self):
+        # transition probabilities computed in the filter loop match the
+        # filter applied to the full transition array
+        params = self.true['params']
+        desired = self.model._filter(params)[5]
+        assert_allclose(self.model.loglikeobs(params), desired)
+
+        params = params + 1e-20j
+        params[2] += 1e-20j
+        desired = self.model._filter(params)[5]
+        assert_allclose(self.model.loglikeobs(params), desired)
+
 
 class TestFilardo(MarkovAutoregression):
     @classmethod
@@ -13,6 +13,7 @@ from numpy.testing import assert_allclose, assert_raises
 import pandas as pd
 import pytest
 
+from statsmodels.tools.numdiff import approx_fprime_cs
 from statsmodels.tsa.regime_switching import (markov_switching,
                                               markov_regression)
 
@@ -439,6 +440,19 @@ class MarkovRegression(object):
         assert_allclose(res_em.llf, self.true['llf_fit_em'], atol=self.atol,
                         rtol=self.rtol)
 
+    def test_score(self):
+        # Analytic score against numerical derivatives of the loglikelihood
+        params = self.true['params']
+        assert_allclose(self.model.score(params),
+                        approx_fprime_cs(params, self.model.loglike),
+                        rtol=1e-5, atol=1e-7)
+
+        unconstrained = self.model.untransform_params(params)
+        assert_allclose(self.model.score(unconstrained, transformed=False),
+                        approx_fprime_cs(unconstrained, self.model.loglike,
+                                         args=(False,)),
+                        rtol=1e-5, atol=1e-7)
+
 
 fedfunds_const_filtered_joint_probabilities = np.array([
          [[9.81875427e-01,   9.99977639e-01,   9.99982269e-01,
@@ -1016,6 +1030,34 @@ class TestFedFundsConstShort(MarkovRegression):
             np.log(conditional_likelihoods + 1e-20), model_order=0)
         assert_allclose(cy_results[0], expected_marginals, atol=1e-15)
 
+    def test_hamilton_filter_tvtp(self):
+        k_regimes = 3
+        nobs = 20
+        np.random.seed(1234)
+        initial_probabilities = np.r_[0.2, 0.3, 0.5]
+        exog_tvtp = np.c_[np.ones(nobs + 2), np.random.normal(size=nobs + 2)]
+        coefficients = np.random.normal(size=(k_regimes - 1, k_regimes, 2))
+        coefficients[0, 0, 0] = -60  # bound transition probability at 1e-20
+        regime_transition = markov_switching._tvtp_regime_transition_matrix(
+            exog_tvtp, coefficients)
+        assert_allclose(regime_transition.sum(0), 1)
+        for order in [0, 2]:
+            conditional_loglikelihoods = np.random.normal(
+                size=(k_regimes,) * (order + 1) + (nobs,))
+            desired = markov_switching.cy_hamilton_filter_log(
+                initial_probabilities, regime_transition[..., 2 - order:],
+                conditional_loglikelihoods, model_order=order)
+            actual = markov_switching.cy_hamilton_filter_log_tvtp(
+                initial_probabilities, exog_tvtp[2 - order:], coefficients,
+                conditional_loglikelihoods, model_order=order)
+            for i in range(len(desired)):
+                assert_allclose(actual[i], desired[i], atol=1e-14)
+
+        with assert_raises(ValueError):
+            markov_switching.cy_hamilton_filter_log_tvtp(
+                initial_probabilities, exog_tvtp, coefficients,
+                conditional_loglikelihoods, model_order=0)
+
     def test_hamilton_filter_shape_checks(self):
         k_regimes = 3
         nobs = 8
@@ -1136,11 +1178,26 @@ class TestFedFundsConstL1Exog3(MarkovRegression):
             true, fedfunds[4:], k_regimes=3,
             exog=np.c_[fedfunds[3:-1], ogap[4:], inf[4:]])
 
+    def test_score(self):
+        # The true parameters have a zero transition probability, so that they
+        # cannot be untransformed; only check the constrained score
+        params = self.true['params']
+        assert_allclose(self.model.score(params),
+                        approx_fprime_cs(params, self.model.loglike),
+                        rtol=1e-5, atol=1e-7)
+
     def test_fit(self, **kwargs):
         kwargs['search_reps'] = 20
         np.random.seed(1234)
         super(TestFedFundsConstL1Exog3, self).test_fit(**kwargs)
 
+    def test_start_params_search_n_jobs(self):
+        np.random.seed(1234)
+        desired = self.model._start_params_search(5, em_iter=2)
+        np.random.seed(1234)
+        actual = self.model._start_params_search(5, em_iter=2, n_jobs=2)
+        assert_allclose(actual, desired)
+
 
 class TestAreturnsConstL1Variance(MarkovRegression):
     # Results from Stata, see http://www.stata.com/manuals14/tsmswitch.pdf
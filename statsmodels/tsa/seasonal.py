@@ -8,11 +8,15 @@ import pandas as pd
 from pandas.core.nanops import nanmean as pd_nanmean
 from statsmodels.tsa._stl import STL
 
-from statsmodels.tools.validation import array_like, PandasWrapper
+from statsmodels.tools.parallel import parallel_func
+from statsmodels.tools.validation import (array_like, bool_like, int_like,
+                                          PandasWrapper)
 from statsmodels.tsa.tsatools import freq_to_period
 from .filters.filtertools import convolution_filter
 
-__all__ = ['STL', 'seasonal_decompose', 'seasonal_mean', 'DecomposeResult']
+__all__ = ['STL', 'MSTL', 'seasonal_decompose', 'seasonal_mean',
+           'DecomposeResult', 'batch_stl', 'StreamingSTL',
+           'StreamingSeasonalDecompose']
 
 
 def _extrapolate_trend(trend, npoints):
@@ -189,6 +193,533 @@ def seasonal_decompose(x, model="additive", filt=None, period=None,
                            resid=results[2], observed=results[3])
 
 
+def _check_periods(periods, windows, nobs):
+    if isinstance(periods, (int, np.integer)):
+        periods = [periods]
+    periods = [int_like(p, 'periods') for p in periods]
+    if len(periods) == 0:
+        raise ValueError('periods must contain at least one period')
+    if min(periods) < 2:
+        raise ValueError('periods must be integers >= 2')
+    if len(set(periods)) != len(periods):
+        raise ValueError('periods must be unique')
+    if 2 * max(periods) > nobs:
+        raise ValueError('endog must contain at least 2 complete cycles of '
+                         'the longest period')
+    if windows is None:
+        windows = [None] * len(periods)
+    elif isinstance(windows, (int, np.integer)):
+        windows = [windows]
+    if len(windows) != len(periods):
+        raise ValueError('windows must have the same length as periods')
+    order = np.argsort(periods)
+    periods = [periods[i] for i in order]
+    windows = [windows[i] for i in order]
+    windows = [7 + 4 * i if w is None else w for i, w in enumerate(windows)]
+    return periods, windows
+
+
+def _mstl(y, periods, windows, iterate, stl_kwargs, inner_iter, outer_iter):
+    """
+    Iterated STL on a 1-d contiguous array
+
+    Returns seasonal (nobs, nperiods), trend, resid and weights as ndarrays.
+    """
+    deseas = y.copy()
+    seasonal = np.zeros((y.shape[0], len(periods)))
+    iterate = 1 if len(periods) == 1 else iterate
+    for _ in range(iterate):
+        for i, (period, window) in enumerate(zip(periods, windows)):
+            deseas += seasonal[:, i]
+            res = STL(deseas, period=period, seasonal=window,
+                      **stl_kwargs).fit(inner_iter=inner_iter,
+                                        outer_iter=outer_iter)
+            seasonal[:, i] = res.seasonal
+            deseas -= seasonal[:, i]
+    trend = np.asarray(res.trend)
+    return seasonal, trend, deseas - trend, np.asarray(res.weights)
+
+
+class MSTL(object):
+    """
+    Season-Trend decomposition using LOESS for multiple seasonal components.
+
+    Parameters
+    ----------
+    endog : array_like
+        Data to be decomposed. Must be squeezable to 1-d.
+    periods : {int, sequence[int]}
+        Periodicity of each seasonal component, e.g., (24, 24 * 7) for hourly
+        data with daily and weekly seasonality. endog must contain at least
+        two complete cycles of the longest period.
+    windows : {int, sequence[int], None}, optional
+        Length of the seasonal smoother for each period. Must be odd
+        integers. If not provided, uses 7 + 4 * i for the i-th shortest
+        period, following the suggestion in [1]_.
+    iterate : int, optional
+        Number of passes over all seasonal components used to refine the
+        estimates. Ignored if there is a single period.
+    stl_kwargs : dict, optional
+        Additional keyword arguments passed to STL. ``period`` and
+        ``seasonal`` are set from periods and windows.
+
+    See Also
+    --------
+    statsmodels.tsa.seasonal.STL
+        Season-Trend decomposition using LOESS.
+    statsmodels.tsa.seasonal.batch_stl
+        STL or MSTL decomposition of many series.
+
+    Notes
+    -----
+    Each seasonal component is estimated using STL applied to the series
+    after removing all other current seasonal estimates, cycling from the
+    shortest to the longest period. The trend is the trend from the final
+    STL fit of the longest period and the residual is the remainder.
+
+    References
+    ----------
+    .. [1] K. Bandara, R. J. Hyndman and C. Bergmeir (2021) MSTL: A
+       Seasonal-Trend Decomposition Algorithm for Time Series with Multiple
+       Seasonal Patterns. arXiv:2107.13462.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from statsmodels.tsa.seasonal import MSTL
+    >>> t = np.arange(24 * 7 * 8)
+    >>> y = (np.sin(2 * np.pi * t / 24) + np.cos(2 * np.pi * t / (24 * 7))
+    ...      + 0.01 * t + np.random.standard_normal(t.shape[0]))
+    >>> res = MSTL(y, periods=(24, 24 * 7)).fit()
+    >>> res.seasonal.shape
+    (1344, 2)
+    """
+    def __init__(self, endog, periods, windows=None, iterate=2,
+                 stl_kwargs=None):
+        self.endog = endog
+        y = np.ascontiguousarray(np.squeeze(np.asarray(endog)),
+                                 dtype=np.double)
+        if y.ndim != 1:
+            raise ValueError('endog must be a 1d array')
+        self._y = y
+        self.nobs = y.shape[0]
+        self.periods, self.windows = _check_periods(periods, windows,
+                                                    self.nobs)
+        self.iterate = int_like(iterate, 'iterate')
+        if self.iterate < 1:
+            raise ValueError('iterate must be a positive integer')
+        stl_kwargs = {} if stl_kwargs is None else dict(stl_kwargs)
+        for key in ('period', 'seasonal'):
+            if key in stl_kwargs:
+                raise ValueError('{0} cannot be set in stl_kwargs'.format(key))
+        self._stl_kwargs = stl_kwargs
+
+    def fit(self, inner_iter=None, outer_iter=None):
+        """
+        Estimate seasonal components, trend and residuals.
+
+        Parameters
+        ----------
+        inner_iter : {int, None}, optional
+            Number of iterations to perform in the inner loop of each STL
+            fit. See STL.fit.
+        outer_iter : {int, None}, optional
+            Number of iterations to perform in the outer loop of each STL
+            fit. See STL.fit.
+
+        Returns
+        -------
+        DecomposeResult
+            Estimation results. The seasonal component has one column per
+            period, ordered from the shortest to the longest period.
+        """
+        seasonal, trend, resid, rw = _mstl(self._y, self.periods,
+                                           self.windows, self.iterate,
+                                           self._stl_kwargs, inner_iter,
+                                           outer_iter)
+        pw = PandasWrapper(self.endog)
+        names = ['seasonal_{0}'.format(p) for p in self.periods]
+        seasonal = pw.wrap(seasonal, columns=names)
+        trend = pw.wrap(trend, columns='trend')
+        resid = pw.wrap(resid, columns='resid')
+        rw = pw.wrap(rw, columns='robust_weight')
+        return DecomposeResult(self.endog, seasonal, trend, resid, rw)
+
+
+def _batch_stl_columns(y, columns, periods, windows, iterate, stl_kwargs,
+                       inner_iter, outer_iter):
+    nobs = y.shape[0]
+    ncol = columns.shape[0]
+    seasonal = np.empty((nobs, ncol, len(periods)))
+    trend = np.empty((nobs, ncol))
+    resid = np.empty((nobs, ncol))
+    rw = np.empty((nobs, ncol))
+    for j, col in enumerate(columns):
+        yj = np.ascontiguousarray(y[:, col])
+        res = _mstl(yj, periods, windows, iterate, stl_kwargs, inner_iter,
+                    outer_iter)
+        seasonal[:, j], trend[:, j], resid[:, j], rw[:, j] = res
+    return columns, seasonal, trend, resid, rw
+
+
+def batch_stl(endog, period=None, windows=None, iterate=2, n_jobs=1,
+              inner_iter=None, outer_iter=None, **kwargs):
+    """
+    STL or MSTL decomposition of each column of a 2-d array.
+
+    Parameters
+    ----------
+    endog : array_like
+        Data to be decomposed, nobs by nseries. Each column is decomposed
+        independently.
+    period : {int, sequence[int], None}, optional
+        Periodicity of the seasonal component. If a sequence, an MSTL
+        decomposition with one seasonal component per period is computed.
+        If None and endog is a pandas object, attempts to determine the
+        period from the index.
+    windows : {int, sequence[int], None}, optional
+        Length of the seasonal smoother, one per period. If None, uses 7
+        for a single period and 7 + 4 * i for the i-th shortest period
+        when there are several periods. See MSTL.
+    iterate : int, optional
+        Number of MSTL refinement passes when there are several periods.
+    n_jobs : int, optional
+        Number of worker threads. The LOESS iterations run without the GIL
+        so that columns are decomposed in parallel. -1 uses all cores.
+    inner_iter : {int, None}, optional
+        Number of iterations to perform in the inner loop. See STL.fit.
+    outer_iter : {int, None}, optional
+        Number of iterations to perform in the outer loop. See STL.fit.
+    **kwargs
+        Additional keyword arguments passed to STL, e.g., ``robust``.
+
+    Returns
+    -------
+    DecomposeResult
+        Estimation results. trend, resid and weights have shape
+        (nobs, nseries). seasonal has shape (nobs, nseries) when there is a
+        single period and (nobs, nseries, nperiods) otherwise. If endog is
+        a DataFrame, the components are DataFrames and, with several
+        periods, the seasonal columns are a MultiIndex of (series, period).
+
+    See Also
+    --------
+    statsmodels.tsa.seasonal.STL
+        Season-Trend decomposition using LOESS.
+    statsmodels.tsa.seasonal.MSTL
+        STL with multiple seasonal components.
+
+    Notes
+    -----
+    The result for each column is identical to applying STL (or MSTL) to
+    the column on its own.
+    """
+    pw = PandasWrapper(endog)
+    if period is None:
+        freq = getattr(getattr(endog, 'index', None), 'inferred_freq', None)
+        if freq is None:
+            raise ValueError('Unable to determine period from endog')
+        period = freq_to_period(freq)
+    y = array_like(endog, 'endog', ndim=2, dtype=np.double)
+    nobs, nseries = y.shape
+    single = isinstance(period, (int, np.integer))
+    periods, windows = _check_periods(period, windows, nobs)
+    iterate = int_like(iterate, 'iterate')
+    for key in ('period', 'seasonal'):
+        if key in kwargs:
+            raise ValueError('{0} cannot be set in kwargs'.format(key))
+
+    parallel, p_func, n_jobs = parallel_func(_batch_stl_columns, n_jobs,
+                                             verbose=0, prefer='threads')
+    nchunks = max(1, min(nseries, 4 * n_jobs))
+    chunks = np.array_split(np.arange(nseries), nchunks)
+    chunk_res = parallel(p_func(y, cols, periods, windows, iterate, kwargs,
+                                inner_iter, outer_iter) for cols in chunks)
+
+    seasonal = np.empty((nobs, nseries, len(periods)))
+    trend = np.empty((nobs, nseries))
+    resid = np.empty((nobs, nseries))
+    rw = np.empty((nobs, nseries))
+    for cols, s, t, r, w in chunk_res:
+        seasonal[:, cols], trend[:, cols] = s, t
+        resid[:, cols], rw[:, cols] = r, w
+
+    if single:
+        seasonal = seasonal[:, :, 0]
+        seasonal = pw.wrap(seasonal)
+    elif isinstance(endog, pd.DataFrame):
+        names = ['seasonal_{0}'.format(p) for p in periods]
+        columns = pd.MultiIndex.from_product([endog.columns, names])
+        seasonal = pw.wrap(seasonal.reshape((nobs, -1)), columns=columns)
+    observed = pw.wrap(y)
+    return DecomposeResult(observed, seasonal, pw.wrap(trend),
+                           pw.wrap(resid), pw.wrap(rw))
+
+
+class StreamingSTL(object):
+    """
+    STL decomposition over a sliding window of streaming data.
+
+    Parameters
+    ----------
+    period : int
+        Periodicity of the seasonal component.
+    window : {int, None}, optional
+        Number of most recent observations used in the decomposition. Must
+        be at least 2 * period. If None, uses 5 * period.
+    warm_start : bool, optional
+        Flag indicating whether each refit starts the inner loop from the
+        trend estimated in the previous update. If False, every update is
+        identical to fitting STL to the current window.
+    inner_iter : {int, None}, optional
+        Number of iterations to perform in the inner loop. If not provided
+        uses 1 when warm starting and the STL default otherwise. Updates
+        that add more than period observations are never warm started and
+        always use the STL default when inner_iter is not provided.
+    outer_iter : {int, None}, optional
+        Number of iterations to perform in the outer loop. See STL.fit.
+    **kwargs
+        Additional keyword arguments passed to STL, e.g., ``seasonal`` or
+        ``robust``.
+
+    See Also
+    --------
+    statsmodels.tsa.seasonal.STL
+        Season-Trend decomposition using LOESS.
+    statsmodels.tsa.seasonal.StreamingSeasonalDecompose
+        Streaming moving-average decomposition.
+
+    Notes
+    -----
+    Observations are kept in a buffer of size 2 * window so that appending
+    costs amortized O(1) and each update requires a single STL fit on the
+    window, which is O(window) irrespective of the number of observations
+    seen. When warm starting, the previous trend is shifted by the number
+    of new observations and the last value is carried forward, which is
+    usually close enough to the fixed point of the inner loop that a single
+    inner iteration is sufficient.
+
+    Unlike StreamingSeasonalDecompose, which returns a tuple with the
+    components of the latest observation, ``update`` returns a
+    DecomposeResult for the whole window, since every update refits all
+    components in the window.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from statsmodels.tsa.seasonal import StreamingSTL
+    >>> t = np.arange(1000)
+    >>> y = np.sin(2 * np.pi * t / 24) + np.random.standard_normal(1000)
+    >>> stream = StreamingSTL(period=24, window=24 * 7)
+    >>> for value in y:
+    ...     res = stream.update(value)
+    >>> latest_resid = res.resid[-1]
+    """
+    def __init__(self, period, window=None, warm_start=True,
+                 inner_iter=None, outer_iter=None, **kwargs):
+        self.period = int_like(period, 'period')
+        if self.period < 2:
+            raise ValueError('period must be a positive integer >= 2')
+        window = 5 * self.period if window is None else window
+        self.window = int_like(window, 'window')
+        if self.window < 2 * self.period:
+            raise ValueError('window must be at least 2 * period')
+        self.warm_start = bool_like(warm_start, 'warm_start')
+        self.inner_iter = inner_iter
+        self.outer_iter = outer_iter
+        self._stl_kwargs = kwargs
+        self._buffer = np.empty(2 * self.window)
+        self._start = self._end = 0
+        self._trend = None
+        self.nobs_seen = 0
+
+    @property
+    def data(self):
+        """The observations in the current window"""
+        return self._buffer[self._start:self._end]
+
+    def _append(self, values):
+        nnew = values.shape[0]
+        if nnew >= self.window:
+            self._buffer[:self.window] = values[-self.window:]
+            self._start, self._end = 0, self.window
+            return
+        if self._end + nnew > self._buffer.shape[0]:
+            keep = self._buffer[self._end - self.window + nnew:self._end]
+            self._buffer[:keep.shape[0]] = keep
+            self._start, self._end = 0, keep.shape[0]
+        self._buffer[self._end:self._end + nnew] = values
+        self._end += nnew
+        self._start = max(self._start, self._end - self.window)
+
+    def _initial_trend(self, nnew):
+        if self._trend is None or not self.warm_start or nnew > self.period:
+            return None
+        prev = self._trend
+        nobs = self._end - self._start
+        nkeep = min(prev.shape[0], nobs - nnew)
+        if nkeep <= 0:
+            return None
+        trend = np.empty(nobs)
+        trend[:nkeep] = prev[prev.shape[0] - nkeep:]
+        trend[nkeep:] = prev[-1]
+        return trend
+
+    def update(self, values):
+        """
+        Append new observations and refit the decomposition.
+
+        Parameters
+        ----------
+        values : {float, array_like}
+            One or more new observations, in time order.
+
+        Returns
+        -------
+        {DecomposeResult, None}
+            Decomposition of the current window. The last element of each
+            component corresponds to the latest observation. None until at
+            least 2 * period observations have been received.
+        """
+        values = array_like(values, 'values', ndim=1, dtype=np.double)
+        self._append(values)
+        self.nobs_seen += values.shape[0]
+        if self._end - self._start < 2 * self.period:
+            return None
+        trend0 = self._initial_trend(values.shape[0])
+        mod = STL(self.data.copy(), period=self.period, **self._stl_kwargs)
+        inner_iter = self.inner_iter
+        if inner_iter is None and trend0 is not None:
+            inner_iter = 1
+        res = mod._fit(inner_iter, self.outer_iter, trend0)
+        self._trend = np.asarray(res.trend)
+        return res
+
+
+class StreamingSeasonalDecompose(object):
+    """
+    Moving-average seasonal decomposition of streaming data.
+
+    Parameters
+    ----------
+    period : int
+        Period of the series.
+    model : {"additive", "multiplicative"}, optional
+        Type of seasonal component. Abbreviations are accepted.
+    filt : array_like, optional
+        The one-sided filter coefficients used to estimate the trend, where
+        filt[j] is the weight of the observation j periods in the past. If
+        not provided, uses the default filter of seasonal_decompose.
+    window : {int, None}, optional
+        Number of most recent detrended observations used to estimate the
+        seasonal component. If None, all observations are used.
+
+    See Also
+    --------
+    statsmodels.tsa.seasonal.seasonal_decompose
+        Seasonal decomposition using moving averages.
+    statsmodels.tsa.seasonal.StreamingSTL
+        Sliding-window STL decomposition.
+
+    Notes
+    -----
+    When window is None, the components of the latest observation are
+    identical to those computed by ``seasonal_decompose(x, period=period,
+    two_sided=False)`` applied to all observations received. When window is
+    set, they are identical to applying seasonal_decompose to the last
+    window + len(filt) - 1 observations.
+
+    Each update costs O(len(filt)), since the trend is a one-sided moving
+    average and running sums of the detrended values are kept for each
+    season. Past components are not revised, so ``update`` only returns a
+    tuple with the components of the latest observation, unlike
+    StreamingSTL.update, which returns a DecomposeResult for the window.
+    """
+    def __init__(self, period, model='additive', filt=None, window=None):
+        self.period = int_like(period, 'period')
+        if self.period < 2:
+            raise ValueError('period must be a positive integer >= 2')
+        self._multiplicative = model.startswith('m')
+        if filt is None:
+            if period % 2 == 0:
+                filt = np.array([.5] + [1] * (period - 1) + [.5]) / period
+            else:
+                filt = np.repeat(1. / period, period)
+        self.filt = array_like(filt, 'filt', ndim=1)
+        self.window = int_like(window, 'window', optional=True)
+        if self.window is not None and self.window < self.period:
+            raise ValueError('window must be at least period')
+        nfilt = self.filt.shape[0]
+        self._rev_filt = self.filt[::-1].copy()
+        self._x = np.zeros(nfilt)
+        self._detrended = np.full(self.window or 1, np.nan)
+        self._sums = np.zeros(self.period)
+        self._counts = np.zeros(self.period, dtype=np.int64)
+        self.nobs_seen = 0
+
+    def _season_averages(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg = self._sums / self._counts
+        if self._multiplicative:
+            return avg / np.mean(avg)
+        return avg - np.mean(avg)
+
+    def update(self, value):
+        """
+        Add a new observation.
+
+        Parameters
+        ----------
+        value : float
+            The latest observation.
+
+        Returns
+        -------
+        trend : float
+            The trend of the latest observation. The components are returned
+            as a tuple and not as a DecomposeResult. nan until len(filt)
+            observations have been received.
+        seasonal : float
+            The seasonal component of the latest observation. nan until
+            every season has at least one detrended observation.
+        resid : float
+            The residual of the latest observation.
+        """
+        value = float(value)
+        if self._multiplicative and value <= 0:
+            raise ValueError("Multiplicative seasonality is not appropriate "
+                             "for zero and negative values")
+        t = self.nobs_seen
+        nfilt = self._x.shape[0]
+        self._x[t % nfilt] = value
+        self.nobs_seen += 1
+        trend = np.nan
+        if self.nobs_seen >= nfilt:
+            # oldest to newest, so that the first weight applies to the
+            # latest observation
+            loc = (t + 1) % nfilt
+            ordered = np.concatenate((self._x[loc:], self._x[:loc]))
+            trend = ordered.dot(self._rev_filt)
+        detrended = value / trend if self._multiplicative else value - trend
+
+        if self.window is not None:
+            loc = t % self.window
+            old = self._detrended[loc]
+            if not np.isnan(old):
+                self._sums[(t - self.window) % self.period] -= old
+                self._counts[(t - self.window) % self.period] -= 1
+            self._detrended[loc] = detrended
+        if not np.isnan(detrended):
+            self._sums[t % self.period] += detrended
+            self._counts[t % self.period] += 1
+        seasonal = self._season_averages()[t % self.period]
+        if self._multiplicative:
+            resid = value / seasonal / trend
+        else:
+            resid = detrended - seasonal
+        return trend, seasonal, resid
+
+
 class DecomposeResult(object):
     """
     Results class for seasonal decompositions
@@ -12,6 +12,7 @@ from scipy import stats
 import pandas as pd
 
 from statsmodels.regression.linear_model import OLS, yule_walker
+from statsmodels.tools.parallel import parallel_func
 from statsmodels.tools.sm_exceptions import (InterpolationWarning,
                                              MissingDataError,
                                              CollinearityWarning)
@@ -25,9 +26,10 @@ from statsmodels.tsa.arima_model import ARMA
 from statsmodels.tsa.tsatools import lagmat, lagmat2ds, add_trend
 
 __all__ = ['acovf', 'acf', 'pacf', 'pacf_yw', 'pacf_ols', 'ccovf', 'ccf',
-           'periodogram', 'q_stat', 'coint', 'arma_order_select_ic',
-           'adfuller', 'kpss', 'bds', 'pacf_burg', 'innovations_algo',
-           'innovations_filter', 'levinson_durbin_pacf', 'levinson_durbin',
+           'ccovf_matrix', 'ccf_matrix', 'periodogram', 'q_stat', 'coint',
+           'arma_order_select_ic', 'adfuller', 'adfuller_batch', 'kpss',
+           'bds', 'pacf_burg', 'innovations_algo', 'innovations_filter',
+           'levinson_durbin_pacf', 'levinson_durbin',
            'zivot_andrews']
 
 SQRTEPS = np.sqrt(np.finfo(np.double).eps)
@@ -84,13 +86,26 @@ def _autolag(mod, endog, exog, startlag, maxlag, method, modargs=(),
     where i goes from lagstart to lagstart+maxlag+1.  Therefore, lags are
     assumed to be in contiguous columns from low to high lag length with
     the highest lag in the last column.
+
+    If mod is OLS and the results are not returned, the regressions are not
+    estimated separately. The sums of squared residuals and the t-values of
+    the last lag of all nested regressions are then computed from a single
+    QR decomposition of the full design, see `_autolag_ols`.
+
+    If method is 't-stat' and no lag is significant, startlag is returned.
     """
     #TODO: can tcol be replaced by maxlag + 2?
     #TODO: This could be changed to laggedRHS and exog keyword arguments if
     #    this will be more general.
+    method = method.lower()
+    if method not in ('aic', 'bic', 't-stat'):
+        raise ValueError("Information Criterion %s not understood." % method)
+    if mod is OLS and not modargs and not regresults:
+        out = _autolag_ols(endog, exog, startlag, maxlag, method)
+        if out is not None:
+            return out
 
     results = {}
-    method = method.lower()
     for lag in range(startlag, startlag + maxlag + 1):
         mod_instance = mod(endog, exog[:, :lag], *modargs)
         results[lag] = mod_instance.fit()
@@ -99,17 +114,14 @@ def _autolag(mod, endog, exog, startlag, maxlag, method, modargs=(),
         icbest, bestlag = min((v.aic, k) for k, v in iteritems(results))
     elif method == "bic":
         icbest, bestlag = min((v.bic, k) for k, v in iteritems(results))
-    elif method == "t-stat":
+    else:
         #stop = stats.norm.ppf(.95)
         stop = 1.6448536269514722
         for lag in range(startlag + maxlag, startlag - 1, -1):
             icbest = np.abs(results[lag].tvalues[-1])
+            bestlag = lag
             if np.abs(icbest) >= stop:
-                bestlag = lag
-                icbest = icbest
                 break
-    else:
-        raise ValueError("Information Criterion %s not understood.") % method
 
     if not regresults:
         return icbest, bestlag
@@ -117,6 +129,50 @@ def _autolag(mod, endog, exog, startlag, maxlag, method, modargs=(),
         return icbest, bestlag, results
 
 
+def _autolag_ols(endog, exog, startlag, maxlag, method):
+    """
+    Order-recursive lag length selection for OLS
+
+    Parameters are as in `_autolag`. Returns icbest and bestlag, or None if
+    the full design is numerically rank deficient, in which case the
+    regressions must be estimated separately.
+
+    Notes
+    -----
+    With R the triangular factor of the QR decomposition of [exog, endog],
+    the regression of endog on the first i columns of exog has sum of
+    squared residuals sum(R[i:, -1]**2), and the t-value of its last
+    coefficient is R[i-1, -1] * sign(R[i-1, i-1]) / sqrt(scale). The
+    information criteria match those of RegressionResults.
+    """
+    nobs = exog.shape[0]
+    ncols = startlag + maxlag
+    r = np.linalg.qr(np.column_stack((exog[:, :ncols], endog)), mode='r')
+    if r.shape[0] <= ncols:
+        return None
+    diag = np.abs(np.diag(r)[:ncols])
+    if diag.min() <= diag.max() * max(nobs, ncols) * np.finfo(float).eps:
+        return None
+
+    lags = np.arange(startlag, ncols + 1)
+    ssr = np.cumsum(r[::-1, -1] ** 2)[::-1][lags]
+    if method in ('aic', 'bic'):
+        llf = -nobs / 2. * (np.log(2 * np.pi) + np.log(ssr / nobs) + 1)
+        penalty = 2. if method == 'aic' else np.log(nobs)
+        ic = -2 * llf + penalty * lags
+        idx = np.argmin(ic)
+        return ic[idx], lags[idx]
+
+    #stop = stats.norm.ppf(.95)
+    stop = 1.6448536269514722
+    scale = ssr / (nobs - lags)
+    tvalues = (r[lags - 1, -1] * np.sign(r[lags - 1, lags - 1])
+               / np.sqrt(scale))
+    significant = np.nonzero(np.abs(tvalues) >= stop)[0]
+    idx = significant[-1] if len(significant) else 0
+    return np.abs(tvalues[idx]), lags[idx]
+
+
 #this needs to be converted to a class like HetGoldfeldQuandt,
 # 3 different returns are a mess
 # See:
@@ -321,6 +377,212 @@ def adfuller(x, maxlag=None, regression="c", autolag='AIC',
             return adfstat, pvalue, usedlag, nobs, critvalues, icbest
 
 
+def _nested_ols_batch(z, ntrend):
+    """
+    Nested regressions of z[:, -1] on z[:, :m] for a batch of designs
+
+    Parameters
+    ----------
+    z : ndarray
+        Array shaped (nseries, p, nobs) with the regressors in the first
+        p - 1 rows and the dependent variable in the last.
+    ntrend : int
+        Number of deterministic trend terms, 1, t, t**2, ..., that are
+        included in all regressions.
+
+    Returns
+    -------
+    ssr : ndarray
+        Sums of squared residuals, shaped (nseries, p), for m = 0, ..., p-1.
+    tvalues : ndarray
+        t-values of the last regressor, shaped (nseries, p - 1), for
+        m = 1, ..., p-1.
+
+    Notes
+    -----
+    The trend is partialled out and the Cholesky factor of the scaled cross
+    products of z is used as the triangular factor of a QR decomposition.
+    The results are nan for series with a singular design.
+    """
+    nseries, p, nobs = z.shape
+    if ntrend > 0:
+        trend = np.vander(np.arange(1., nobs + 1), ntrend, increasing=True)
+        q = np.linalg.qr(trend)[0]
+        z = z.reshape(-1, nobs)
+        z = (z - np.dot(np.dot(z, q), q.T)).reshape(nseries, p, nobs)
+    gram = np.matmul(z, z.swapaxes(1, 2))
+    scale = np.sqrt(np.diagonal(gram, axis1=1, axis2=2))
+    scale = np.where(scale > 0, scale, 1)
+    gram /= scale[:, :, None] * scale[:, None, :]
+    try:
+        r = np.linalg.cholesky(gram)[:, -1]
+    except np.linalg.LinAlgError:
+        r = np.full((nseries, p), np.nan)
+        for i in range(nseries):
+            try:
+                r[i] = np.linalg.cholesky(gram[i])[-1]
+            except np.linalg.LinAlgError:
+                pass
+    ssr = np.cumsum(r[:, ::-1] ** 2, axis=1)[:, ::-1]
+    df_resid = nobs - ntrend - np.arange(1, p)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        tvalues = r[:, :-1] / np.sqrt(ssr[:, 1:] / df_resid)
+    return ssr * scale[:, -1:] ** 2, tvalues
+
+
+def _adf_design(xt, xdiff, nlags, lags_first):
+    """
+    ADF regressors and dependent variable for the rows of xt, with either
+    [level, lags, xdiff] or [lags, level, xdiff] in the second axis.
+    """
+    nseries, nobs_tot = xt.shape
+    nobs = nobs_tot - 1 - nlags
+    z = np.empty((nseries, nlags + 2, nobs))
+    level = nlags if lags_first else 0
+    z[:, level] = xt[:, nlags:nobs_tot - 1]
+    for j in range(1, nlags + 1):
+        row = j - 1 if lags_first else j
+        z[:, row] = xdiff[:, nlags - j:nobs_tot - 1 - j]
+    z[:, -1] = xdiff[:, nlags:]
+    return z
+
+
+def adfuller_batch(x, maxlag=None, regression="c", autolag='AIC',
+                   chunksize=None):
+    """
+    Augmented Dickey-Fuller unit root tests of the columns of a 2-d array.
+
+    Parameters
+    ----------
+    x : array_like, 2d
+        The data, shaped (nobs, nseries), with one series in each column.
+    maxlag : int
+        Maximum lag which is included in test, default 12*(nobs/100)^{1/4}.
+    regression : {'c','ct','ctt','nc'}
+        Constant and trend order to include in regression. See `adfuller`.
+    autolag : {'AIC', 'BIC', 't-stat', None}
+        Method to use when automatically determining the lag. See
+        `adfuller`.
+    chunksize : {int, None}
+        Number of series that are processed at once. The default limits the
+        lagged design to about 2**24 elements.
+
+    Returns
+    -------
+    adf : ndarray
+        The test statistics.
+    pvalue : ndarray
+        MacKinnon's approximate p-values based on MacKinnon (1994, 2010).
+    usedlag : ndarray
+        The number of lags used.
+    nobs : ndarray
+        The number of observations used for the ADF regressions and the
+        calculation of the critical values.
+    critical values : dict
+        Arrays of critical values for the test statistic at the 1 %, 5 %,
+        and 10 % levels.
+    icbest : ndarray
+        The maximized information criterion if autolag is not None.
+
+    See Also
+    --------
+    adfuller
+
+    Notes
+    -----
+    The results are the same as those of `adfuller` applied to each column.
+    Rather than estimating one regression per lag and series, the sums of
+    squared residuals and t-values of all nested lag lengths are computed
+    from the Cholesky factor of the cross products of the full lagged
+    design, one batch of series at a time. The final regressions are then
+    estimated at once for all series with the same selected lag. Series
+    whose design is singular are tested separately by `adfuller`.
+    """
+    x = array_like(x, 'x', ndim=2)
+    maxlag = int_like(maxlag, 'maxlag', optional=True)
+    regression = string_like(regression, 'regression',
+                             options=('c', 'ct', 'ctt', 'nc'))
+    autolag = string_like(autolag, 'autolag', optional=True,
+                          options=('aic', 'bic', 't-stat'))
+    chunksize = int_like(chunksize, 'chunksize', optional=True)
+
+    nobs_tot, nseries = x.shape
+    ntrend = len(regression) if regression != 'nc' else 0
+    if maxlag is None:
+        # from Greene referencing Schwert 1989
+        maxlag = int(np.ceil(12. * np.power(nobs_tot / 100., 1 / 4.)))
+        # -1 for the diff
+        maxlag = min(nobs_tot // 2 - ntrend - 1, maxlag)
+        if maxlag < 0:
+            raise ValueError('sample size is too short to use selected '
+                             'regression component')
+    elif maxlag > nobs_tot // 2 - ntrend - 1:
+        raise ValueError('maxlag must be less than (nobs/2 - 1 - ntrend) '
+                         'where n trend is the number of included '
+                         'deterministic regressors')
+    if chunksize is None:
+        chunksize = max(1, 2 ** 24 // (nobs_tot * (maxlag + 2)))
+    # one series per row, so that the lagged designs are contiguous copies
+    xt = np.ascontiguousarray(x.T)
+    xdiff = np.diff(xt, axis=1)
+
+    adfstat = np.empty(nseries)
+    usedlag = np.full(nseries, maxlag)
+    icbest = np.full(nseries, np.nan)
+    if autolag:
+        nobs = nobs_tot - 1 - maxlag
+        lags = np.arange(maxlag + 1)
+        for start in range(0, nseries, chunksize):
+            cols = slice(start, start + chunksize)
+            z = _adf_design(xt[cols], xdiff[cols], maxlag, False)
+            ssr, tvalues = _nested_ols_batch(z, ntrend)
+            if autolag in ('aic', 'bic'):
+                # see _autolag_ols
+                llf = -nobs / 2. * (np.log(2 * np.pi)
+                                    + np.log(ssr[:, 1:] / nobs) + 1)
+                penalty = 2. if autolag == 'aic' else np.log(nobs)
+                ic = -2 * llf + penalty * (ntrend + 1 + lags)
+                best = np.argmin(ic, axis=1)
+                icbest[cols] = ic[np.arange(len(best)), best]
+            else:
+                significant = np.abs(tvalues) >= 1.6448536269514722
+                # last significant lag, or 0 if there is none
+                best = maxlag - np.argmax(significant[:, ::-1], axis=1)
+                best[~significant.any(1)] = 0
+                icbest[cols] = np.abs(tvalues[np.arange(len(best)), best])
+            usedlag[cols] = best
+
+    for lag in np.unique(usedlag):
+        index = np.nonzero(usedlag == lag)[0]
+        for start in range(0, len(index), chunksize):
+            cols = index[start:start + chunksize]
+            z = _adf_design(xt[cols], xdiff[cols], lag, True)
+            adfstat[cols] = _nested_ols_batch(z, ntrend)[1][:, -1]
+    nobs = nobs_tot - 1 - usedlag
+    critvalues = mackinnoncrit(N=1, regression=regression,
+                               nobs=nobs[:, None])
+
+    # series with singular designs
+    with np.errstate(invalid='ignore'):
+        failed = ~np.isfinite(adfstat)
+        if autolag:
+            failed |= ~np.isfinite(icbest)
+    for i in np.nonzero(failed)[0]:
+        res = adfuller(x[:, i], maxlag=maxlag, regression=regression,
+                       autolag=autolag)
+        adfstat[i], usedlag[i], nobs[i] = res[0], res[2], res[3]
+        critvalues[i] = [res[4][key] for key in ("1%", "5%", "10%")]
+        if autolag:
+            icbest[i] = res[5]
+
+    pvalue = mackinnonp(adfstat, regression=regression, N=1)
+    critvalues = {"1%": critvalues[:, 0], "5%": critvalues[:, 1],
+                  "10%": critvalues[:, 2]}
+    if not autolag:
+        return adfstat, pvalue, usedlag, nobs, critvalues
+    return adfstat, pvalue, usedlag, nobs, critvalues, icbest
+
+
 def acovf(x, unbiased=False, demean=True, fft=None, missing='none', nlag=None):
     """
     Estimate autocovariances.
@@ -883,7 +1145,7 @@ def pacf(x, nlags=40, method='ywunbiased', alpha=None):
         return ret
 
 
-def ccovf(x, y, unbiased=True, demean=True):
+def ccovf(x, y, unbiased=True, demean=True, fft=False):
     """
     Calculate the crosscovariance between two series.
 
@@ -895,21 +1157,30 @@ def ccovf(x, y, unbiased=True, demean=True):
        If True, then denominators for autocovariance is n-k, otherwise n.
     demean : bool, optional
         Flag indicating whether to demean x and y.
+    fft : bool, optional
+        If True, use FFT convolution.  This method should be preferred
+        for long time series.
 
     Returns
     -------
     ndarray
         The estimated crosscovariance function.
 
+    See Also
+    --------
+    ccovf_matrix
+        Crosscovariances of all pairs of columns of a 2-d array.
+
     Notes
     -----
-    This uses np.correlate which does full convolution. For very long time
-    series it is recommended to use fft convolution instead.
+    If fft is False, this uses np.correlate which does full convolution. For
+    very long time series it is recommended to use fft convolution instead.
     """
     x = array_like(x, 'x')
     y = array_like(y, 'y')
     unbiased = bool_like(unbiased, 'unbiased')
     demean = bool_like(demean, 'demean')
+    fft = bool_like(fft, 'fft')
 
     n = len(x)
     if demean:
@@ -919,14 +1190,17 @@ def ccovf(x, y, unbiased=True, demean=True):
         xo = x
         yo = y
     if unbiased:
-        xi = np.ones(n)
-        d = np.correlate(xi, xi, 'full')
+        d = n - np.arange(n)
     else:
         d = n
-    return (np.correlate(xo, yo, 'full') / d)[n - 1:]
+    if fft:
+        nfft = _next_regular(2 * max(n, len(y)) - 1)
+        cross = np.fft.rfft(xo, n=nfft) * np.conjugate(np.fft.rfft(yo, n=nfft))
+        return np.fft.irfft(cross, n=nfft)[:n] / d
+    return np.correlate(xo, yo, 'full')[n - 1:] / d
 
 
-def ccf(x, y, unbiased=True):
+def ccf(x, y, unbiased=True, fft=False):
     """
     The cross-correlation function.
 
@@ -936,16 +1210,25 @@ def ccf(x, y, unbiased=True):
        The time series data to use in the calculation.
     unbiased : bool
        If True, then denominators for autocovariance is n-k, otherwise n.
+    fft : bool, optional
+        If True, use FFT convolution.  This method should be preferred
+        for long time series.
 
     Returns
     -------
     ndarray
         The cross-correlation function of x and y.
 
+    See Also
+    --------
+    ccf_matrix
+        Cross-correlations of all pairs of columns of a 2-d array.
+
     Notes
     -----
-    This is based np.correlate which does full convolution. For very long time
-    series it is recommended to use fft convolution instead.
+    If fft is False, this is based np.correlate which does full convolution.
+    For very long time series it is recommended to use fft convolution
+    instead.
 
     If unbiased is true, the denominator for the autocovariance is adjusted
     but the autocorrelation is not an unbiased estimator.
@@ -953,11 +1236,125 @@ def ccf(x, y, unbiased=True):
     x = array_like(x, 'x')
     y = array_like(y, 'y')
     unbiased = bool_like(unbiased, 'unbiased')
+    fft = bool_like(fft, 'fft')
 
-    cvf = ccovf(x, y, unbiased=unbiased, demean=True)
+    cvf = ccovf(x, y, unbiased=unbiased, demean=True, fft=fft)
     return cvf / (np.std(x) * np.std(y))
 
 
+def ccovf_matrix(x, nlags=None, unbiased=True, demean=True, fft=None):
+    """
+    Calculate the crosscovariances between all columns of a 2-d array.
+
+    Parameters
+    ----------
+    x : array_like
+        Time series data, shaped (nobs, k), with one series per column.
+    nlags : {int, None}
+        Number of lags to return. If None, all nobs - 1 lags are returned.
+    unbiased : bool, optional
+       If True, then denominators for autocovariance is n-k, otherwise n.
+    demean : bool, optional
+        Flag indicating whether to demean the columns of x.
+    fft : {bool, None}, optional
+        If True, the columns are transformed by a single FFT and the
+        crosscovariances of each pair are computed from their cross
+        spectrum. If False, the crosscovariances at each lag are computed
+        as one matrix product. If None, the FFT is used when nlags is
+        larger than 20 * log2(2 * nobs), roughly where it becomes faster
+        than the direct computation.
+
+    Returns
+    -------
+    ndarray
+        Array shaped (nlags + 1, k, k). Element [h, i, j] is the
+        crosscovariance of x[t + h, i] and x[t, j], which is equal to
+        ``ccovf(x[:, i], x[:, j])[h]``. Negative lags of the pair are
+        available as [h, j, i].
+
+    See Also
+    --------
+    ccovf
+    ccf_matrix
+    """
+    x = array_like(x, 'x', ndim=2)
+    nlags = int_like(nlags, 'nlags', optional=True)
+    unbiased = bool_like(unbiased, 'unbiased')
+    demean = bool_like(demean, 'demean')
+    fft = bool_like(fft, 'fft', optional=True)
+
+    nobs, k = x.shape
+    if nlags is None:
+        nlags = nobs - 1
+    elif nlags > nobs - 1:
+        raise ValueError('nlags must be smaller than nobs')
+    xo = x - x.mean(0) if demean else x
+
+    nfft = _next_regular(2 * nobs - 1)
+    if fft is None:
+        fft = nlags > 20 * np.log2(nfft)
+    if fft:
+        fx = np.fft.rfft(xo, n=nfft, axis=0)
+        cov = np.empty((nlags + 1, k, k))
+        # Cross spectra of one column with all others at a time, to limit
+        # the memory to O(nfft * k)
+        for i in range(k):
+            cross = fx[:, i:i + 1] * np.conjugate(fx)
+            cov[:, i] = np.fft.irfft(cross, n=nfft, axis=0)[:nlags + 1]
+    else:
+        cov = np.empty((nlags + 1, k, k))
+        for h in range(nlags + 1):
+            cov[h] = np.dot(xo[h:].T, xo[:nobs - h])
+
+    if unbiased:
+        cov /= (nobs - np.arange(nlags + 1))[:, None, None]
+    else:
+        cov /= nobs
+    return cov
+
+
+def ccf_matrix(x, nlags=None, unbiased=True, fft=None):
+    """
+    The cross-correlation functions of all columns of a 2-d array.
+
+    Parameters
+    ----------
+    x : array_like
+        Time series data, shaped (nobs, k), with one series per column.
+    nlags : {int, None}
+        Number of lags to return. If None, all nobs - 1 lags are returned.
+    unbiased : bool
+       If True, then denominators for autocovariance is n-k, otherwise n.
+    fft : {bool, None}, optional
+        If True, use a single batched FFT, if False compute each lag
+        directly, and if None choose based on nlags. See `ccovf_matrix`.
+
+    Returns
+    -------
+    ndarray
+        Array shaped (nlags + 1, k, k). Element [h, i, j] is the
+        cross-correlation of x[t + h, i] and x[t, j], which is equal to
+        ``ccf(x[:, i], x[:, j])[h]``.
+
+    See Also
+    --------
+    ccf
+    ccovf_matrix
+
+    Notes
+    -----
+    Screening for leads and lags across many series only requires the
+    maximum of the absolute cross-correlations over the first axis, and the
+    argmax of the stacked [h, i, j] and [h, j, i] gives the dominant lead or
+    lag of each pair.
+    """
+    x = array_like(x, 'x', ndim=2)
+    cvf = ccovf_matrix(x, nlags=nlags, unbiased=unbiased, demean=True,
+                       fft=fft)
+    std = np.std(x, axis=0)
+    return cvf / np.outer(std, std)
+
+
 def periodogram(x):
     """
     Compute the periodogram for the natural frequency of x.
@@ -1282,6 +1679,189 @@ def grangercausalitytests(x, maxlag, addconst=True, verbose=True):
     return resli
 
 
+def _granger_ssr(x, caused, causing, lags, addconst, chunksize):
+    """
+    Restricted and unrestricted ssr of Granger causality regressions
+
+    The regressions of x[:, caused] on its own lags, with and without the
+    lags of each column in causing. Returns an array shaped
+    (len(lags), len(causing), 3) with the two ssr and the rank of the
+    unrestricted design.
+
+    Notes
+    -----
+    For each lag length, the own lags and the constant are factored once
+    and partialled out of the dependent variable and of the lags of all
+    causing series. The reduction in the ssr from adding the lags of a
+    causing series is then b' G^{-1} b, with G and b the cross products of
+    its residualized lags, computed for a batch of causing series at once.
+    The lags are scaled by their norms before residualization, and
+    eigenvalues of G below 1e-13 are treated as zero.
+    """
+    nobs_tot = x.shape[0]
+    y_all = x[:, caused]
+    xc = np.ascontiguousarray(x[:, causing].T)
+    out = np.empty((len(lags), len(causing), 3))
+    for ilag, lag in enumerate(lags):
+        nobs = nobs_tot - lag
+        own = [y_all[lag - j:nobs_tot - j] for j in range(1, lag + 1)]
+        if addconst:
+            own.append(np.ones(nobs))
+        own = np.column_stack(own)
+        q = np.linalg.qr(own)[0]
+        y = y_all[lag:]
+        resid = y - np.dot(q, np.dot(q.T, y))
+        ssr_own = np.dot(resid, resid)
+        out[ilag, :, 0] = ssr_own
+        rank_own = np.linalg.matrix_rank(own)
+        for start in range(0, len(causing), chunksize):
+            xcc = xc[start:start + chunksize]
+            z = np.empty((len(xcc), lag, nobs))
+            for j in range(1, lag + 1):
+                z[:, j - 1] = xcc[:, lag - j:nobs_tot - j]
+            norm = np.sqrt((z ** 2).sum(2))
+            norm[norm == 0] = 1
+            z2 = z.reshape(-1, nobs)
+            z2 -= np.dot(np.dot(z2, q), q.T)
+            z /= norm[:, :, None]
+            gram = np.matmul(z, z.swapaxes(1, 2))
+            b = np.matmul(z, resid)
+            # Directions of the lags that are collinear with the own lags,
+            # e.g. if a series is tested against itself, do not reduce the
+            # ssr, as with the generalized inverse in OLS
+            eigvals, eigvecs = np.linalg.eigh(gram)
+            keep = eigvals > 1e-13
+            vb = np.matmul(b[:, None, :], eigvecs)[:, 0]
+            reduction = np.where(keep, vb ** 2, 0) / np.where(keep, eigvals, 1)
+            out[ilag, start:start + chunksize, 1] = ssr_own - reduction.sum(1)
+            out[ilag, start:start + chunksize, 2] = rank_own + keep.sum(1)
+    return out
+
+
+def grangercausalitytests_batch(x, pairs, maxlag, addconst=True, n_jobs=1,
+                                chunksize=None):
+    """
+    Granger non causality tests for many pairs of time series.
+
+    Parameters
+    ----------
+    x : array_like
+        The data, shaped (nobs, nseries), with one time series per column.
+        Missing values are not supported.
+    pairs : Iterable
+        Pairs (caused, causing) of column labels, if x is a DataFrame, or
+        column indices. Each pair tests whether the series `causing` Granger
+        causes the series `caused`.
+    maxlag : {int, Iterable[int]}
+        If an integer, computes the test for all lags up to maxlag. If an
+        iterable, computes the tests only for the lags in maxlag.
+    addconst : bool
+        Include a constant in the model.
+    n_jobs : int
+        Number of jobs to run in parallel, using joblib. The pairs are
+        distributed across jobs by caused series.
+    chunksize : {int, None}
+        Number of causing series whose lags are processed at once. The
+        default limits the lagged regressors to about 2**24 elements.
+
+    Returns
+    -------
+    DataFrame
+        One row per pair and lag with columns caused, causing, lag,
+        ssr_ftest, ssr_ftest_pvalue, ssr_chi2test, ssr_chi2test_pvalue,
+        lrtest, lrtest_pvalue and df_denom. The degrees of freedom of the
+        numerator of the F test and of the chi-square tests are equal to the
+        lag.
+
+    See Also
+    --------
+    grangercausalitytests
+
+    Notes
+    -----
+    The statistics are the same as the ones of `grangercausalitytests`. The
+    parameter F test of `grangercausalitytests` is identical to the ssr
+    based F test and is not repeated.
+
+    The regressions are not estimated separately. The own lags of each
+    caused series are factored once per lag length and shared by all pairs
+    with that caused series, and only the sums of squared residuals of the
+    restricted and unrestricted models are computed.
+
+    Examples
+    --------
+    >>> import statsmodels.api as sm
+    >>> from statsmodels.tsa.stattools import grangercausalitytests_batch
+    >>> data = sm.datasets.macrodata.load_pandas()
+    >>> data = data.data[['realgdp', 'realcons', 'realinv']]
+    >>> data = data.pct_change().dropna()
+    >>> pairs = [('realgdp', 'realcons'), ('realgdp', 'realinv'),
+    ...          ('realcons', 'realinv')]
+    >>> res = grangercausalitytests_batch(data, pairs, 4)
+    """
+    columns = x.columns if isinstance(x, pd.DataFrame) else None
+    x = array_like(x, 'x', ndim=2)
+    if not np.isfinite(x).all():
+        raise ValueError('x contains NaN or inf values.')
+    addconst = bool_like(addconst, 'addconst')
+    n_jobs = int_like(n_jobs, 'n_jobs')
+    chunksize = int_like(chunksize, 'chunksize', optional=True)
+    try:
+        lags = np.array([int(lag) for lag in maxlag])
+        maxlag = lags.max()
+        if lags.min() <= 0 or lags.size == 0:
+            raise ValueError('maxlag must be a non-empty list containing only '
+                             'positive integers')
+    except Exception:
+        maxlag = int_like(maxlag, 'maxlag')
+        if maxlag <= 0:
+            raise ValueError('maxlag must a a positive integer')
+        lags = np.arange(1, maxlag + 1)
+
+    if x.shape[0] <= 3 * maxlag + int(addconst):
+        raise ValueError("Insufficient observations. Maximum allowable "
+                         "lag is {0}".format(int((x.shape[0] - int(addconst)) /
+                                                 3) - 1))
+    pairs = list(pairs)
+    if columns is not None:
+        index = np.array([[columns.get_loc(c) for c in pair]
+                          for pair in pairs], dtype=int).reshape(-1, 2)
+    else:
+        index = np.array(pairs, dtype=int).reshape(-1, 2)
+    if chunksize is None:
+        chunksize = max(1, 2 ** 24 // (x.shape[0] * maxlag))
+
+    caused = np.unique(index[:, 0])
+    groups = [np.nonzero(index[:, 0] == i)[0] for i in caused]
+    parallel, p_func, n_jobs = parallel_func(_granger_ssr, n_jobs, verbose=0)
+    ssr_groups = parallel(p_func(x, i, index[group, 1], lags, addconst,
+                                 chunksize)
+                          for i, group in zip(caused, groups))
+    ssr = np.empty((len(pairs), len(lags), 3))
+    for group, ssr_group in zip(groups, ssr_groups):
+        ssr[group] = ssr_group.swapaxes(0, 1)
+
+    ssr_own, ssr_joint = ssr[..., 0], ssr[..., 1]
+    nobs = x.shape[0] - lags
+    df_denom = (nobs - ssr[..., 2]).astype(int)
+    fgc1 = (ssr_own - ssr_joint) / ssr_joint / lags * df_denom
+    fgc2 = nobs * (ssr_own - ssr_joint) / ssr_joint
+    lr = nobs * np.log(ssr_own / ssr_joint)
+
+    labels = np.asarray(pairs, dtype=object).reshape(-1, 2)
+    return pd.DataFrame({
+        'caused': np.repeat(labels[:, 0], len(lags)),
+        'causing': np.repeat(labels[:, 1], len(lags)),
+        'lag': np.tile(lags, len(pairs)),
+        'ssr_ftest': fgc1.ravel(),
+        'ssr_ftest_pvalue': stats.f.sf(fgc1, lags, df_denom).ravel(),
+        'ssr_chi2test': fgc2.ravel(),
+        'ssr_chi2test_pvalue': stats.chi2.sf(fgc2, lags).ravel(),
+        'lrtest': lr.ravel(),
+        'lrtest_pvalue': stats.chi2.sf(lr, lags).ravel(),
+        'df_denom': df_denom.ravel()})
+
+
 def coint(y0, y1, trend='c', method='aeg', maxlag=None, autolag='aic',
           return_results=None):
     """
@@ -174,6 +174,84 @@ def test_arma_impulse_response():
     assert_array_almost_equal(-armarep.arrep.ravel(), arrep, 14)
 
 
+def _batch_polys(lists):
+    # Stack lag polynomials of different lengths into a 2-d array
+    out = np.zeros((len(lists), max(len(x) for x in lists)))
+    for i, x in enumerate(lists):
+        out[i, :len(x)] = x
+    return out
+
+
+def test_arma_impulse_response_batch():
+    ar = _batch_polys(arlist)
+    ma = _batch_polys(malist)
+    irf = arma_impulse_response(ar, ma, leads=50)
+    irf_fft = arma_impulse_response(ar, ma, leads=50, fft=True)
+    for i in range(len(arlist)):
+        expected = arma_impulse_response(arlist[i], malist[i], leads=50)
+        assert_allclose(irf[i], expected, rtol=1e-13, atol=1e-14)
+        assert_allclose(irf_fft[i], expected, rtol=1e-12, atol=1e-13)
+        assert_allclose(
+            arma_impulse_response(arlist[i], malist[i], leads=50, fft=True),
+            expected, rtol=1e-12, atol=1e-13)
+
+    # a single polynomial is shared by all rows
+    irf = arma_impulse_response([1, -0.5], ma, leads=50)
+    assert_equal(irf.shape, (len(malist), 50))
+    assert_allclose(irf[3], arma_impulse_response([1, -0.5], malist[3], 50))
+
+    # the FFT method requires a stationary process
+    assert_raises(ValueError, arma_impulse_response, [1, -1.01], [1], 10,
+                  fft=True)
+
+
+@pytest.mark.parametrize('ar', arlist)
+@pytest.mark.parametrize('ma', malist)
+def test_arma_acovf_fft(ar, ma):
+    expected = arma_acovf(np.array(ar), np.array(ma), nobs=100, sigma2=2.)
+    acovf = arma_acovf(np.array(ar), np.array(ma), nobs=100, sigma2=2.,
+                       fft=True)
+    assert_allclose(acovf, expected, rtol=1e-12, atol=1e-13)
+
+
+def test_arma_acovf_batch():
+    ar = _batch_polys(arlist)
+    ma = _batch_polys(malist[::-1])
+    sigma2 = np.array([0.5, 1., 1.5, 2.])
+    acovf = arma_acovf(ar, ma, nobs=30, sigma2=sigma2)
+    acovf_fft = arma_acovf(ar, ma, nobs=30, sigma2=sigma2, fft=True)
+    assert_equal(acovf.shape, (4, 30))
+    for i in range(len(arlist)):
+        expected = arma_acovf(np.array(arlist[i]), np.array(malist[::-1][i]),
+                              nobs=30, sigma2=sigma2[i])
+        assert_allclose(acovf[i], expected, rtol=1e-13, atol=1e-14)
+        assert_allclose(acovf_fft[i], expected, rtol=1e-12, atol=1e-13)
+
+
+def test_arma_generate_sample_batch():
+    ar = _batch_polys(arlist)
+    ma = _batch_polys(malist)
+    np.random.seed(1234)
+    y = arma_generate_sample(ar, ma, 100, scale=[1., 2., 3., 4.], burnin=10)
+    assert_equal(y.shape, (100, 4))
+    np.random.seed(1234)
+    eta = np.random.normal(size=(110, 4)) * [1., 2., 3., 4.]
+    for i in range(len(arlist)):
+        ar_params = -1 * np.array(arlist[i][1:])
+        ma_params = np.array(malist[i][1:])
+        expected = _manual_arma_generate_sample(ar_params, ma_params,
+                                                eta[:, i])[10:]
+        assert_allclose(y[:, i], expected, rtol=1e-12, atol=1e-12)
+
+    # identical processes give the same paths as the 1-d call
+    np.random.seed(1234)
+    y = arma_generate_sample(np.tile(arlist[3], (5, 1)), malist[3], 100,
+                             axis=1)
+    np.random.seed(1234)
+    expected = arma_generate_sample(arlist[3], malist[3], (100, 5))
+    assert_allclose(y, expected.T, rtol=1e-13)
+
+
 @pytest.mark.parametrize('ar', arlist)
 @pytest.mark.parametrize('ma', malist)
 def test_spectrum(ar, ma):
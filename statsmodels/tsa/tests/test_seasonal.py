@@ -4,7 +4,8 @@ import pytest
 from numpy.testing import (assert_almost_equal, assert_equal, assert_raises,
                            assert_allclose)
 
-from statsmodels.tsa.seasonal import seasonal_decompose
+from statsmodels.tsa.seasonal import (seasonal_decompose,
+                                      StreamingSeasonalDecompose)
 
 # Verification values for tests
 SEASONAL = [62.46, 86.17, -88.38, -60.25, 62.46, 86.17, -88.38,
@@ -323,3 +324,30 @@ def test_seasonal_decompose_plot(model, freq, two_sided, extrapolate_trend):
     res = seasonal_decompose(x, period=freq, two_sided=two_sided,
                              extrapolate_trend=extrapolate_trend)
     res.plot()
+
+
+@pytest.mark.parametrize('model', ['additive', 'multiplicative'])
+@pytest.mark.parametrize('window', [None, 30])
+@pytest.mark.parametrize('period', [4, 7])
+def test_streaming_seasonal_decompose(reset_randomstate, model, window,
+                                      period):
+    x = np.exp(0.1 * np.random.standard_normal(100).cumsum())
+    x *= 1 + 0.2 * np.sin(2 * np.pi * np.arange(100) / period)
+    stream = StreamingSeasonalDecompose(period, model=model, window=window)
+    out = np.array([stream.update(v) for v in x])
+    nfilt = period + 1 - (period % 2)
+    assert np.all(np.isnan(out[:nfilt - 1, 0]))
+    for i in (40, 77, 99):
+        start = 0 if window is None else i + 1 - (window + nfilt - 1)
+        res = seasonal_decompose(x[start:i + 1], model=model, period=period,
+                                 two_sided=False)
+        expected = [res.trend[-1], res.seasonal[-1], res.resid[-1]]
+        assert_allclose(out[i], expected)
+
+
+def test_streaming_seasonal_decompose_raises():
+    with pytest.raises(ValueError, match='window must be at least period'):
+        StreamingSeasonalDecompose(12, window=6)
+    stream = StreamingSeasonalDecompose(4, model='multiplicative')
+    with pytest.raises(ValueError, match='Multiplicative seasonality'):
+        stream.update(0.0)
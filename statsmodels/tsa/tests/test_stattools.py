@@ -18,13 +18,16 @@ from statsmodels.tools.sm_exceptions import (CollinearityWarning,
                                              InterpolationWarning)
 from statsmodels.tsa.arima_process import arma_acovf
 from statsmodels.tsa.statespace.sarimax import SARIMAX
-from statsmodels.tsa.stattools import (adfuller, acf, pacf_yw, pacf_ols,
-                                       pacf, grangercausalitytests,
+from statsmodels.tsa.stattools import (adfuller, adfuller_batch, acf,
+                                       pacf_yw, pacf_ols, pacf,
+                                       grangercausalitytests,
+                                       grangercausalitytests_batch,
                                        coint, acovf, kpss,
                                        arma_order_select_ic, levinson_durbin,
                                        levinson_durbin_pacf, pacf_burg,
                                        innovations_algo, innovations_filter,
-                                       periodogram, zivot_andrews)
+                                       periodogram, zivot_andrews, ccovf, ccf,
+                                       ccovf_matrix, ccf_matrix)
 
 DECIMAL_8 = 8
 DECIMAL_6 = 6
@@ -154,6 +157,27 @@ class TestADFNoConstant2(CheckADF):
         assert_equal(self.store.__str__(), 'Augmented Dickey-Fuller Test Results')
 
 
+@pytest.mark.parametrize('regression', ['nc', 'c', 'ct', 'ctt'])
+@pytest.mark.parametrize('autolag', ['aic', 'bic', 't-stat', None])
+def test_adfuller_batch(regression, autolag):
+    data = macrodata.load_pandas().data
+    x = np.log(data[['realgdp', 'realcons', 'realinv', 'cpi']].values)
+    x = np.column_stack((x, data['infl'].values, np.ones(len(x))))
+    res = adfuller_batch(x, regression=regression, autolag=autolag,
+                         chunksize=4)
+    for i in range(x.shape[1]):
+        res1 = adfuller(x[:, i], regression=regression, autolag=autolag)
+        assert_allclose(res[0][i], res1[0], rtol=1e-8)
+        assert_allclose(res[1][i], res1[1], rtol=1e-8, atol=1e-12)
+        assert_equal(res[2][i], res1[2])
+        assert_equal(res[3][i], res1[3])
+        for level in ['1%', '5%', '10%']:
+            assert_allclose(res[4][level][i], res1[4][level])
+        if autolag is not None:
+            assert_allclose(res[5][i], res1[5], rtol=1e-8)
+    assert_equal(len(res), 5 if autolag is None else 6)
+
+
 class CheckCorrGram(object):
     """
     Set up for ACF, PACF tests.
@@ -475,6 +499,37 @@ class TestGrangerCausality(object):
         with pytest.raises(ValueError, match="x contains NaN"):
             grangercausalitytests(x, 2)
 
+    @pytest.mark.parametrize('n_jobs', [1, 2])
+    def test_grangercausality_batch(self, n_jobs):
+        mdata = macrodata.load_pandas().data
+        mdata = mdata[['realgdp', 'realcons', 'realinv', 'infl']]
+        data = np.log(mdata[['realgdp', 'realcons', 'realinv']]).diff()
+        data['infl'] = mdata['infl']
+        data = data.iloc[1:]
+        # includes a series tested against itself
+        pairs = [('realgdp', 'realcons'), ('realcons', 'realgdp'),
+                 ('realgdp', 'infl'), ('infl', 'realinv'),
+                 ('infl', 'infl')]
+        res = grangercausalitytests_batch(data, pairs, 3, n_jobs=n_jobs,
+                                          chunksize=1)
+        assert_equal(res.shape[0], 3 * len(pairs))
+        for k, (caused, causing) in enumerate(pairs):
+            gr = grangercausalitytests(data[[caused, causing]], 3,
+                                       verbose=False)
+            for lag in range(1, 4):
+                row = res.iloc[3 * k + lag - 1]
+                assert_equal([row['caused'], row['causing'], row['lag']],
+                             [caused, causing, lag])
+                for test in ['ssr_ftest', 'ssr_chi2test', 'lrtest']:
+                    assert_allclose(row[test], gr[lag][0][test][0],
+                                    rtol=1e-7, atol=1e-10)
+                    assert_allclose(row[test + '_pvalue'],
+                                    gr[lag][0][test][1], rtol=1e-7)
+                assert_equal(row['df_denom'], gr[lag][0]['ssr_ftest'][2])
+
+        res2 = grangercausalitytests_batch(data.values, [(0, 1)], [2])
+        assert_allclose(res2['ssr_ftest'], res['ssr_ftest'].iloc[1])
+
 
 class SetupKPSS(object):
     data = macrodata.load_pandas()
@@ -638,6 +693,40 @@ def test_acovf_fft_vs_convolution(demean, unbiased):
     assert_almost_equal(F1, F2, decimal=7)
 
 
+@pytest.mark.parametrize('demean', [True, False])
+@pytest.mark.parametrize('unbiased', [True, False])
+def test_ccovf_fft_vs_convolution(demean, unbiased):
+    rs = np.random.RandomState(1)
+    x = rs.normal(size=100)
+    y = rs.normal(size=100)
+
+    F1 = ccovf(x, y, demean=demean, unbiased=unbiased, fft=True)
+    F2 = ccovf(x, y, demean=demean, unbiased=unbiased, fft=False)
+    assert_almost_equal(F1, F2, decimal=10)
+    assert_almost_equal(ccf(x, y, unbiased=unbiased, fft=True),
+                        ccf(x, y, unbiased=unbiased, fft=False), decimal=10)
+
+
+@pytest.mark.parametrize('fft', [True, False, None])
+@pytest.mark.parametrize('nlags', [None, 10])
+@pytest.mark.parametrize('unbiased', [True, False])
+def test_ccf_matrix(fft, nlags, unbiased):
+    x = np.random.RandomState(2).normal(size=(60, 3))
+    cov = ccovf_matrix(x, nlags=nlags, unbiased=unbiased, fft=fft)
+    corr = ccf_matrix(x, nlags=nlags, unbiased=unbiased, fft=fft)
+    nlags = 59 if nlags is None else nlags
+    assert_equal(cov.shape, (nlags + 1, 3, 3))
+    for i in range(3):
+        for j in range(3):
+            desired = ccovf(x[:, i], x[:, j], unbiased=unbiased)
+            assert_allclose(cov[:, i, j], desired[:nlags + 1], atol=1e-12)
+            desired = ccf(x[:, i], x[:, j], unbiased=unbiased)
+            assert_allclose(corr[:, i, j], desired[:nlags + 1], atol=1e-12)
+
+    with pytest.raises(ValueError):
+        ccovf_matrix(x, nlags=60)
+
+
 @pytest.mark.smoke
 @pytest.mark.slow
 def test_arma_order_select_ic():
@@ -5,7 +5,7 @@ import pandas as pd
 import pytest
 from numpy.testing import assert_allclose
 
-from statsmodels.tsa.seasonal import STL
+from statsmodels.tsa.seasonal import MSTL, STL, StreamingSTL, batch_stl
 
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 file_path = os.path.join(cur_dir, 'results', 'stl_test_results.csv')
@@ -269,3 +269,115 @@ def test_plot(default_kwargs):
     class_kwargs['endog'] = pd.Series(class_kwargs['endog'], name='CO2')
     res = STL(**class_kwargs).fit()
     res.plot()
+
+
+@pytest.fixture(scope='module')
+def multi_seasonal():
+    rs = np.random.RandomState(0)
+    t = np.arange(24 * 7 * 4)
+    y = (np.sin(2 * np.pi * t / 24) + np.cos(2 * np.pi * t / (24 * 7))
+         + 0.01 * t)
+    return y[:, None] + 0.2 * rs.standard_normal((t.shape[0], 5))
+
+
+def test_mstl(multi_seasonal):
+    y = multi_seasonal[:, 0]
+    res = MSTL(y, periods=(168, 24)).fit()
+    assert res.seasonal.shape == (y.shape[0], 2)
+    assert_allclose(res.seasonal.sum(1) + res.trend + res.resid, y)
+    t = np.arange(y.shape[0])
+    daily = np.sin(2 * np.pi * t / 24)
+    assert np.corrcoef(res.seasonal[:, 0], daily)[0, 1] > 0.95
+    assert np.std(res.resid) < 0.25
+
+    res1 = MSTL(y, periods=24).fit()
+    expected = STL(y, period=24).fit()
+    assert_allclose(res1.seasonal[:, 0], expected.seasonal)
+    assert_allclose(res1.trend, expected.trend)
+
+
+def test_mstl_pandas(multi_seasonal):
+    index = pd.date_range('2000-1-1', periods=multi_seasonal.shape[0],
+                          freq='H')
+    y = pd.Series(multi_seasonal[:, 0], index=index, name='y')
+    res = MSTL(y, periods=(24, 168), stl_kwargs={'robust': True}).fit()
+    assert isinstance(res.seasonal, pd.DataFrame)
+    assert list(res.seasonal.columns) == ['seasonal_24', 'seasonal_168']
+    assert isinstance(res.trend, pd.Series)
+    assert isinstance(res.weights, pd.Series)
+
+
+def test_mstl_errors(multi_seasonal):
+    y = multi_seasonal[:, 0]
+    with pytest.raises(ValueError, match='at least 2 complete cycles'):
+        MSTL(y, periods=(24, 24 * 7 * 3))
+    with pytest.raises(ValueError, match='windows must have the same'):
+        MSTL(y, periods=(24, 168), windows=(7,))
+    with pytest.raises(ValueError, match='period cannot be set'):
+        MSTL(y, periods=(24, 168), stl_kwargs={'period': 12})
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_batch_stl(multi_seasonal, n_jobs):
+    y = multi_seasonal
+    res = batch_stl(y, period=24, n_jobs=n_jobs, robust=True)
+    assert res.seasonal.shape == y.shape
+    for i in range(y.shape[1]):
+        expected = STL(y[:, i], period=24, robust=True).fit()
+        assert_allclose(res.seasonal[:, i], expected.seasonal)
+        assert_allclose(res.trend[:, i], expected.trend)
+        assert_allclose(res.resid[:, i], expected.resid)
+        assert_allclose(res.weights[:, i], expected.weights)
+
+
+def test_batch_mstl(multi_seasonal):
+    index = pd.date_range('2000-1-1', periods=multi_seasonal.shape[0],
+                          freq='H')
+    y = pd.DataFrame(multi_seasonal, index=index,
+                     columns=['s{0}'.format(i) for i in range(5)])
+    res = batch_stl(y, period=(24, 168), n_jobs=2)
+    assert isinstance(res.trend, pd.DataFrame)
+    assert res.seasonal.shape == (y.shape[0], 10)
+    expected = MSTL(y['s3'], periods=(24, 168)).fit()
+    assert_allclose(res.seasonal['s3'], expected.seasonal)
+    assert_allclose(res.resid['s3'], expected.resid)
+
+    res = batch_stl(y.values, period=(24, 168))
+    assert res.seasonal.shape == (y.shape[0], 5, 2)
+
+
+def test_streaming_stl(multi_seasonal):
+    y = multi_seasonal[:400, 0]
+    stream = StreamingSTL(24, window=120, warm_start=False, robust=True)
+    for i, value in enumerate(y):
+        res = stream.update(value)
+        if i < 47:
+            assert res is None
+        elif i in (47, 100, 399):
+            start = max(0, i + 1 - 120)
+            expected = STL(y[start:i + 1], period=24, robust=True).fit()
+            assert_allclose(res.trend, expected.trend)
+            assert_allclose(res.seasonal, expected.seasonal)
+            assert_allclose(res.resid, expected.resid)
+    assert stream.nobs_seen == 400
+    assert_allclose(stream.data, y[-120:])
+
+
+def test_streaming_stl_warm_start(multi_seasonal):
+    y = multi_seasonal[:400, 0]
+    stream = StreamingSTL(24, window=120)
+    for value in y:
+        res = stream.update(value)
+    expected = STL(y[-120:], period=24).fit()
+    assert_allclose(res.trend, expected.trend, atol=0.05)
+    assert_allclose(res.seasonal, expected.seasonal, atol=0.05)
+
+    stream = StreamingSTL(24, window=120)
+    for values in np.array_split(y, 7):
+        res = stream.update(values)
+    assert_allclose(res.trend, expected.trend)
+
+
+def test_streaming_stl_errors():
+    with pytest.raises(ValueError, match='window must be at least'):
+        StreamingSTL(24, window=30)
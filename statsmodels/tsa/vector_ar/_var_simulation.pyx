@@ -0,0 +1,53 @@
+#cython: language_level=3, wraparound=False, cdivision=True, boundscheck=False
+"""
+Compiled recursion for simulating VAR(p) processes
+
+License: BSD-3
+"""
+cimport scipy.linalg.cython_blas as blas
+
+
+def var_recursion(double[:, ::1] stacked_coefs, double[:, :, ::1] result):
+    """
+    var_recursion(stacked_coefs, result)
+
+    Apply the VAR(p) recursion in place to a batch of paths.
+
+    Parameters
+    ----------
+    stacked_coefs : ndarray
+        Lag coefficients stacked as [A_p, ..., A_1], shaped (k, p * k).
+    result : ndarray
+        Array shaped (nsimulations, steps, k) that holds the intercept (or
+        offset) plus innovations on entry. On exit, for t >= p each row holds
+        y_t = result[t] + A_1 y_{t-1} + ... + A_p y_{t-p}.
+
+    Notes
+    -----
+    For each path and period, the lagged values y_{t-p}, ..., y_{t-1} are a
+    contiguous block of `result`, so that each step is a single BLAS matrix
+    vector product. The loop runs without the GIL.
+    """
+    cdef int nsimulations = result.shape[0]
+    cdef int steps = result.shape[1]
+    cdef int k = result.shape[2]
+    cdef int kp = stacked_coefs.shape[1]
+    cdef int p = kp // k
+    cdef int inc = 1
+    cdef int s, t
+    cdef double alpha = 1.0
+    cdef double beta = 1.0
+
+    if stacked_coefs.shape[0] != k or not kp == p * k:
+        raise ValueError('stacked_coefs must be shaped (k, p * k)')
+    if p == 0:
+        return
+
+    # In Fortran order stacked_coefs is the (p * k, k) transpose, hence the
+    # transposed product
+    with nogil:
+        for s in range(nsimulations):
+            for t in range(p, steps):
+                blas.dgemv('T', &kp, &k, &alpha, &stacked_coefs[0, 0], &kp,
+                           &result[s, t - p, 0], &inc, &beta,
+                           &result[s, t, 0], &inc)
@@ -282,20 +282,27 @@ class IRAnalysis(BaseIRAnalysis):
         return covs
 
     def errband_mc(self, orth=False, svar=False, repl=1000,
-                   signif=0.05, seed=None, burn=100):
+                   signif=0.05, seed=None, burn=100, resample=False,
+                   n_jobs=1):
         """
         IRF Monte Carlo integrated error bands
+
+        If resample is True, the innovations are resampled from the
+        estimated residuals rather than drawn from a normal distribution.
+        n_jobs sets the number of jobs used to compute the replications.
         """
         model = self.model
         periods = self.periods
         if svar:
             return model.sirf_errband_mc(orth=orth, repl=repl, steps=periods,
                                          signif=signif, seed=seed,
-                                         burn=burn, cum=False)
+                                         burn=burn, cum=False,
+                                         resample=resample, n_jobs=n_jobs)
         else:
             return model.irf_errband_mc(orth=orth, repl=repl, steps=periods,
                                         signif=signif, seed=seed,
-                                        burn=burn, cum=False)
+                                        burn=burn, cum=False,
+                                        resample=resample, n_jobs=n_jobs)
 
     def err_band_sz1(self, orth=False, svar=False, repl=1000,
                      signif=0.05, seed=None, burn=100, component=None):
@@ -387,8 +394,8 @@ class IRAnalysis(BaseIRAnalysis):
         periods = self.periods
         irfs = self._choose_irfs(orth, svar)
         neqs = self.neqs
-        irf_resim = model.irf_resim(orth=orth, repl=repl, T=periods, seed=seed,
-                                    burn=100)
+        irf_resim = model.irf_resim(orth=orth, repl=repl, steps=periods,
+                                    seed=seed, burn=100)
 
         W, eigva, k = self._eigval_decomp_SZ(irf_resim)
 
@@ -450,8 +457,8 @@ class IRAnalysis(BaseIRAnalysis):
         periods = self.periods
         irfs = self._choose_irfs(orth, svar)
         neqs = self.neqs
-        irf_resim = model.irf_resim(orth=orth, repl=repl, T=periods, seed=seed,
-                                    burn=100)
+        irf_resim = model.irf_resim(orth=orth, repl=repl, steps=periods,
+                                    seed=seed, burn=100)
         stack = np.zeros((neqs, repl, periods*neqs))
 
         #stack left to right, up and down
@@ -463,7 +470,7 @@ class IRAnalysis(BaseIRAnalysis):
         stack_cov=np.zeros((neqs, periods*neqs, periods*neqs))
         W = np.zeros((neqs, periods*neqs, periods*neqs))
         eigva = np.zeros((neqs, periods*neqs))
-        k = np.zeros((neqs))
+        k = np.zeros((neqs), dtype=int)
 
         if component is not None:
             if np.size(component) != (neqs):
@@ -517,7 +524,7 @@ class IRAnalysis(BaseIRAnalysis):
 
         W = np.zeros((neqs, neqs, periods, periods))
         eigva = np.zeros((neqs, neqs, periods, 1))
-        k = np.zeros((neqs, neqs))
+        k = np.zeros((neqs, neqs), dtype=int)
 
         for i in range(neqs):
             for j in range(neqs):
@@ -624,14 +631,16 @@ class IRAnalysis(BaseIRAnalysis):
         return covs
 
     def cum_errband_mc(self, orth=False, repl=1000,
-                       signif=0.05, seed=None, burn=100):
+                       signif=0.05, seed=None, burn=100, resample=False,
+                       n_jobs=1):
         """
         IRF Monte Carlo integrated error bands of cumulative effect
         """
         model = self.model
         periods = self.periods
         return model.irf_errband_mc(orth=orth, repl=repl,
-                                    T=periods, signif=signif, seed=seed, burn=burn, cum=True)
+                                    T=periods, signif=signif, seed=seed, burn=burn, cum=True,
+                                    resample=resample, n_jobs=n_jobs)
 
     def lr_effect_cov(self, orth=False):
         """
@@ -15,13 +15,31 @@ from statsmodels.compat.pandas import deprecate_kwarg
 
 from statsmodels.tools.decorators import deprecated_alias
 from statsmodels.tools.numdiff import approx_hess, approx_fprime
+from statsmodels.tools.parallel import parallel_func
 from statsmodels.tsa.vector_ar.irf import IRAnalysis
-from statsmodels.tsa.vector_ar.var_model import VARProcess, VARResults
+from statsmodels.tsa.vector_ar.var_model import (
+    VARProcess, VARResults, _var_resim_innovations)
 
 import statsmodels.tsa.vector_ar.util as util
 import statsmodels.tsa.base.tsa_model as tsbase
 
 
+def _sirf_resim_fit(sim, svar_type, A, B, k_ar, A_guess, B_guess, steps,
+                    cum):
+    """
+    Fit an SVAR to a simulated series and compute its impulse responses
+
+    Returns the impulse responses and the estimated free parameters of A and
+    B, which may be used as starting values.
+    """
+    sres = SVAR(sim, svar_type=svar_type, A=A, B=B).fit(
+        maxlags=k_ar, A_guess=A_guess, B_guess=B_guess)
+    ma = sres.svar_ma_rep(maxn=steps)
+    if cum:
+        ma = ma.cumsum(axis=0)
+    return ma, np.append(sres.A[sres.A_mask], sres.B[sres.B_mask])
+
+
 def svar_ckerr(svar_type, A, B):
     if A is None and (svar_type == 'A' or svar_type == 'AB'):
         raise ValueError('SVAR of type A or AB but A array not given.')
@@ -627,7 +645,8 @@ class SVARResults(SVARProcess, VARResults):
 
     @deprecate_kwarg('T', 'steps')
     def sirf_errband_mc(self, orth=False, repl=1000, steps=10,
-                        signif=0.05, seed=None, burn=100, cum=False):
+                        signif=0.05, seed=None, burn=100, cum=False,
+                        resample=False, n_jobs=1):
         """
         Compute Monte Carlo integrated error bands assuming normally
         distributed for impulse response functions
@@ -648,22 +667,31 @@ class SVARResults(SVARProcess, VARResults):
             number of initial observations to discard for simulation
         cum: bool, default False
             produce cumulative irf error bands
+        resample: bool, default False
+            If True, draw the innovations with replacement from the estimated
+            residuals (residual bootstrap) rather than from a normal
+            distribution.
+        n_jobs: int, default 1
+            Number of jobs used to fit the replications in parallel. -1 uses
+            all cores.
 
         Notes
         -----
         Lütkepohl (2005) Appendix D
 
+        All replications are simulated jointly. The first 10 replications are
+        fit sequentially and used to update the starting values of the
+        remaining fits, which may then be run in parallel.
+
         Returns
         -------
         Tuple of lower and upper arrays of ma_rep monte carlo standard errors
         """
         neqs = self.neqs
-        mean = self.mean()
         k_ar = self.k_ar
         coefs = self.coefs
         sigma_u = self.sigma_u
         intercept = self.intercept
-        df_model = self.df_model
         nobs = self.nobs
 
         ma_coll = np.zeros((repl, steps + 1, neqs, neqs))
@@ -675,36 +703,36 @@ class SVARResults(SVARProcess, VARResults):
         B_pass = self.model.B_original
         s_type = self.model.svar_type
 
-        g_list = []
+        # discard first burn to correct for starting bias
+        random_state = np.random.RandomState(seed=seed)
+        innovations = _var_resim_innovations(random_state, sigma_u,
+                                             self.resid, repl, nobs + burn,
+                                             resample=resample)
+        sims = util._varsim_innovations(coefs, intercept, innovations)
+        sims = sims[:, burn:]
 
-        def agg(impulses):
-            if cum:
-                return impulses.cumsum(axis=0)
-            return impulses
-
-        opt_A = A[A_mask]
-        opt_B = B[B_mask]
-        for i in range(repl):
-            # discard first hundred to correct for starting bias
-            sim = util.varsim(coefs, intercept, sigma_u, seed=seed,
-                              steps=nobs + burn)
-            sim = sim[burn:]
-
-            smod = SVAR(sim, svar_type=s_type, A=A_pass, B=B_pass)
-            if i == 10:
-                # Use first 10 to update starting val for remainder of fits
-                mean_AB = np.mean(g_list, axis=0)
-                split = len(A[A_mask])
-                opt_A = mean_AB[:split]
-                opt_B = mean_AB[split:]
-
-            sres = smod.fit(maxlags=k_ar, A_guess=opt_A, B_guess=opt_B)
-
-            if i < 10:
-                # save estimates for starting val if in first 10
-                g_list.append(np.append(sres.A[A_mask].tolist(),
-                                        sres.B[B_mask].tolist()))
-            ma_coll[i] = agg(sres.svar_ma_rep(maxn=steps))
+        g_list = []
+        n_start = min(repl, 10)
+        for i in range(n_start):
+            ma_coll[i], params = _sirf_resim_fit(
+                sims[i], s_type, A_pass, B_pass, k_ar, A[A_mask], B[B_mask],
+                steps, cum)
+            # save estimates for starting val if in first 10
+            g_list.append(params)
+
+        if repl > n_start:
+            # Use first 10 to update starting val for remainder of fits
+            mean_AB = np.mean(g_list, axis=0)
+            split = len(A[A_mask])
+            opt_A = mean_AB[:split]
+            opt_B = mean_AB[split:]
+
+            parallel, p_func, n_jobs = parallel_func(_sirf_resim_fit, n_jobs,
+                                                     verbose=0)
+            out = parallel(p_func(sim, s_type, A_pass, B_pass, k_ar, opt_A,
+                                  opt_B, steps, cum)
+                           for sim in sims[n_start:])
+            ma_coll[n_start:] = [ma for ma, _ in out]
 
         ma_sort = np.sort(ma_coll, axis=0)  # sort to get quantiles
         index = (int(round(signif / 2 * repl) - 1),
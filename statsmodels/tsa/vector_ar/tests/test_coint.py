@@ -5,15 +5,17 @@ Created on Thu Aug 30 21:51:08 2012
 Author: Josef Perktold
 
 """
+from itertools import combinations
 import os
 import warnings
 
 import numpy as np
-from numpy.testing import assert_almost_equal, assert_equal
+from numpy.testing import assert_allclose, assert_almost_equal, assert_equal
 import pandas as pd
 import pytest
 
-from statsmodels.tsa.vector_ar.vecm import coint_johansen
+from statsmodels.tsa.vector_ar.vecm import (coint_johansen,
+                                             coint_johansen_batch)
 from statsmodels.tools.sm_exceptions import HypothesisTestWarning
 
 current_path = os.path.dirname(os.path.abspath(__file__))
@@ -157,3 +159,35 @@ def test_coint_johansen_0lag(reset_randomstate):
     data = pd.concat([x, y], axis=1)
     result = coint_johansen(data, det_order=-1, k_ar_diff=0)
     assert result.eig.shape == (2,)
+
+
+@pytest.mark.parametrize("det_order", [-1, 0, 1])
+@pytest.mark.parametrize("k_ar_diff", [0, 2])
+@pytest.mark.parametrize("neqs", [2, 3])
+def test_coint_johansen_batch(det_order, k_ar_diff, neqs):
+    data = dta[:, :6]
+    groups = [list(g) for g in combinations(range(6), neqs)]
+    # unsorted groups give the same statistics
+    groups[1] = groups[1][::-1]
+    res = coint_johansen_batch(data, det_order, k_ar_diff, groups=groups,
+                               chunksize=4)
+    assert_equal(res.groups, groups)
+    for i, group in enumerate(groups):
+        expected = coint_johansen(data[:, group], det_order, k_ar_diff)
+        assert_allclose(res.eig[i], expected.eig, rtol=1e-10, atol=1e-12)
+        assert_allclose(res.trace_stat[i], expected.trace_stat, rtol=1e-10,
+                        atol=1e-8)
+        assert_allclose(res.max_eig_stat[i], expected.max_eig_stat,
+                        rtol=1e-10, atol=1e-8)
+        assert_equal(res.trace_stat_crit_vals, expected.trace_stat_crit_vals)
+        assert_equal(res.max_eig_stat_crit_vals,
+                     expected.max_eig_stat_crit_vals)
+
+    # default is all pairs, labels can be used with DataFrames
+    res = coint_johansen_batch(data, det_order, k_ar_diff, n_jobs=2)
+    assert_equal(res.groups, list(combinations(range(6), 2)))
+    df = pd.DataFrame(data, columns=list('abcdef'))
+    res_df = coint_johansen_batch(df, det_order, k_ar_diff,
+                                  groups=[['b', 'a'], ['c', 'f']])
+    assert_equal(res_df.groups, [[1, 0], [2, 5]])
+    assert_allclose(res_df.trace_stat[1], res.trace_stat[11], rtol=1e-10)
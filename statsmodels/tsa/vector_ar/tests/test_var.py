@@ -20,7 +20,8 @@ import statsmodels.tools.data as data_util
 import statsmodels.tsa.vector_ar.util as util
 from statsmodels.compat.python import iteritems, lrange
 from statsmodels.tools.sm_exceptions import ValueWarning
-from statsmodels.tsa.vector_ar.var_model import VAR, var_acf
+from statsmodels.tsa.vector_ar.var_model import (VAR, var_acf, ma_rep,
+                                                  _estimate_var_batch)
 
 DECIMAL_12 = 12
 DECIMAL_6 = 6
@@ -843,3 +844,144 @@ def test_summaries_exog(reset_randomstate):
     assert 'exog_1' in summ
     assert 'exog_2' in summ
     assert 'exog_3' in summ
+
+
+@pytest.mark.parametrize('trend', ['nc', 'c', 'ct', 'ctt'])
+def test_estimate_var_batch(bivariate_var_data, trend):
+    endog = np.stack([bivariate_var_data, bivariate_var_data[::-1]])
+    coefs, sigma_u = _estimate_var_batch(endog, 2, trend=trend)
+    for i in range(2):
+        res = VAR(endog[i].copy()).fit(maxlags=2, trend=trend)
+        assert_allclose(coefs[i], res.coefs, rtol=1e-10, atol=1e-12)
+        assert_allclose(sigma_u[i], res.sigma_u, rtol=1e-10)
+
+    phis = ma_rep(coefs, maxn=5)
+    assert_allclose(phis[1], ma_rep(coefs[1], maxn=5))
+
+
+def test_irf_resim(bivariate_var_result):
+    res = bivariate_var_result
+    resim = res.irf_resim(orth=True, repl=20, steps=5, seed=1234)
+    assert_equal(resim.shape, (20, 6, 2, 2))
+    # replications are distinct, and the seed reproduces them
+    assert np.all(np.std(resim[:, 1], axis=0) > 0)
+    assert_allclose(res.irf_resim(orth=True, repl=20, steps=5, seed=1234),
+                    resim)
+
+    # Check a single replication against simulating and fitting a VAR
+    innovations = np.random.RandomState(1234).multivariate_normal(
+        np.zeros(2), res.sigma_u, size=(20, res.nobs + 100))
+    sim = util._varsim_innovations(res.coefs, res.intercept,
+                                   innovations[3:4])[0, 100:]
+    desired = VAR(sim).fit(maxlags=res.k_ar).orth_ma_rep(maxn=5)
+    assert_allclose(resim[3], desired, rtol=1e-8, atol=1e-12)
+
+    cum = res.irf_resim(orth=True, repl=20, steps=5, seed=1234, cum=True)
+    assert_allclose(cum, resim.cumsum(axis=1))
+
+    bootstrap = res.irf_resim(repl=20, steps=5, seed=1234, resample=True,
+                              n_jobs=2)
+    assert_allclose(res.irf_resim(repl=20, steps=5, seed=1234,
+                                  resample=True), bootstrap)
+    lower, upper = res.irf_errband_mc(repl=20, steps=5, seed=1234,
+                                      resample=True)
+    assert np.all(lower <= upper)
+
+
+def test_irf_resim_deprecated_t(bivariate_var_result):
+    res = bivariate_var_result
+    resim = res.irf_resim(repl=20, steps=5, seed=1234)
+    with pytest.warns(FutureWarning):
+        resim_t = res.irf_resim(repl=20, T=5, seed=1234)
+    assert_allclose(resim_t, resim)
+
+
+@pytest.mark.parametrize('method', ['err_band_sz1', 'err_band_sz2',
+                                    'err_band_sz3'])
+def test_irf_err_band_sz(bivariate_var_result, method):
+    irf = bivariate_var_result.irf(periods=5)
+    lower, upper = getattr(irf, method)(orth=True, repl=50, seed=1234)
+    assert_equal(lower.shape, (6, 2, 2))
+    assert_equal(upper.shape, (6, 2, 2))
+    assert np.all(np.isfinite(lower)) and np.all(np.isfinite(upper))
+    if method == 'err_band_sz1':
+        # the sign of the eigenvector is arbitrary, bands are symmetric
+        assert_allclose((lower + upper) / 2, irf.orth_irfs, atol=1e-12)
+    else:
+        assert np.all(lower <= upper)
+
+
+@pytest.mark.parametrize('lags', [0, 1, 3])
+def test_get_var_endog(lags):
+    y = np.random.RandomState(0).standard_normal((20, 3))
+    desired = np.array([y[t - lags:t][::-1].ravel()
+                        for t in range(lags, 20)]).reshape(20 - lags, -1)
+    assert_equal(util.get_var_endog(y, lags, trend='nc'), desired)
+    z = util.get_var_endog(y, lags, trend='c')
+    assert_equal(z[:, 0], 1)
+    assert_equal(z[:, 1:], desired)
+
+
+def test_varsim_nsimulations(bivariate_var_result):
+    res = bivariate_var_result
+    steps = 50
+    sim = res.simulate_var(steps=steps, seed=987, nsimulations=4)
+    assert_equal(sim.shape, (4, steps, 2))
+
+    # Compare to a Python loop over the innovations of each path
+    ugen = np.random.RandomState(987).multivariate_normal(
+        np.zeros(2), res.sigma_u, size=(4, steps))
+    p = res.k_ar
+    for i in range(4):
+        desired = np.zeros((steps, 2)) + res.intercept
+        desired[p:] += ugen[i, p:]
+        for t in range(p, steps):
+            for j in range(p):
+                desired[t] += res.coefs[j].dot(desired[t - j - 1])
+        assert_allclose(sim[i], desired, rtol=1e-12)
+
+    single = res.simulate_var(steps=steps, seed=987)
+    assert_equal(single.shape, (steps, 2))
+
+
+@pytest.mark.parametrize('trend', ['nc', 'c', 'ctt'])
+@pytest.mark.parametrize('exog', [False, True])
+def test_select_order_refit(bivariate_var_data, trend, exog):
+    nobs = len(bivariate_var_data)
+    if exog:
+        exog = np.random.RandomState(0).standard_normal((nobs, 2))
+        # collinear with the trend
+        exog = np.column_stack((exog, np.ones(nobs)))
+    else:
+        exog = None
+    model = VAR(bivariate_var_data, exog=exog)
+    res = model.select_order(6, trend=trend)
+    p_min = 0 if exog is not None or trend != 'nc' else 1
+    for p in range(p_min, 7):
+        desired = model._estimate_var(p, offset=6 - p,
+                                      trend=trend).info_criteria
+        for ic in ['aic', 'bic', 'hqic', 'fpe']:
+            assert_allclose(res.ics[ic][p - p_min], desired[ic], rtol=1e-10)
+
+
+@pytest.mark.parametrize('trend', ['nc', 'c', 'ct', 'ctt'])
+@pytest.mark.parametrize('exog', [False, True])
+@pytest.mark.parametrize('chunksize', [1, 10, 1000])
+def test_var_chunksize(bivariate_var_data, trend, exog, chunksize):
+    nobs = len(bivariate_var_data)
+    exog = (np.random.RandomState(0).standard_normal((nobs, 2))
+            if exog else None)
+    res = VAR(bivariate_var_data, exog=exog).fit(3, trend=trend)
+    res_chunked = VAR(bivariate_var_data, exog=exog).fit(3, trend=trend,
+                                                         chunksize=chunksize)
+    assert_allclose(res_chunked.params, res.params, rtol=1e-9, atol=1e-12)
+    assert_allclose(res_chunked.sigma_u, res.sigma_u, rtol=1e-9)
+    assert_allclose(res_chunked.bse, res.bse, rtol=1e-8)
+    assert_allclose(res_chunked.llf, res.llf, rtol=1e-10)
+    assert_allclose(res_chunked.resid_corr, res.resid_corr, rtol=1e-9,
+                    atol=1e-12)
+    res_chunked.summary()
+    # the regressors are computed only when needed
+    assert res_chunked._endog_lagged is None
+    assert_allclose(res_chunked.endog_lagged, res.endog_lagged, rtol=1e-12)
+    assert_allclose(res_chunked.resid, res.resid, atol=1e-10)
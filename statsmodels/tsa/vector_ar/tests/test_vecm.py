@@ -1408,3 +1408,25 @@ def test_VECM_seasonal_forecast():
         assert_array_equal(dips, dips_true)
 
     # res2.plot_forecast(steps=18, alpha=0.1, n_last_obs=4*seasons)
+
+
+@pytest.mark.parametrize('deterministic, seasons, exog',
+                         [('n', 0, None), ('co', 4, None), ('ci', 0, None),
+                          ('lo', 3, None), ('li', 0, None),
+                          ('colo', 0, 'exog'), ('cili', 0, 'exog_coint')])
+def test_vecm_chunksize(deterministic, seasons, exog):
+    data = e6.load_pandas().data[['Dp', 'R']].values
+    kwargs = {}
+    if exog is not None:
+        kwargs[exog] = np.random.RandomState(0).standard_normal((len(data), 1))
+    model = VECM(data, k_ar_diff=3, coint_rank=1,
+                 deterministic=deterministic, seasons=seasons,
+                 first_season=1, **kwargs)
+    res = model.fit()
+    res_chunked = model.fit(chunksize=17)
+    for attr in ['alpha', 'beta', 'gamma', 'det_coef', 'det_coef_coint',
+                 'sigma_u', 'llf', 'stderr_params', 'stderr_coint']:
+        assert_allclose(getattr(res_chunked, attr), getattr(res, attr),
+                        rtol=1e-8, atol=1e-12, err_msg=attr)
+    # the data matrices are computed when needed
+    assert_allclose(res_chunked.resid, res.resid, atol=1e-10)
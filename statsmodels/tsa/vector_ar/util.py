@@ -10,6 +10,7 @@ import scipy.linalg.decomp as decomp
 import pandas as pd
 
 import statsmodels.tsa.tsatools as tsa
+from statsmodels.tsa.vector_ar._var_simulation import var_recursion
 
 
 #-------------------------------------------------------------------------------
@@ -26,9 +27,11 @@ def get_var_endog(y, lags, trend='c', has_constant='skip'):
 
     has_constant can be 'raise', 'add', or 'skip'. See add_constant.
     """
-    nobs = len(y)
+    y = np.asarray(y)
+    if y.ndim == 1:
+        y = y[:, None]
     # Ravel C order, need to put in descending order
-    Z = np.array([y[t-lags : t][::-1].ravel() for t in range(lags, nobs)])
+    Z = _stack_lags(y, lags)
 
     # Add constant, trend, etc.
     if trend != 'nc':
@@ -188,7 +191,8 @@ def acf_to_acorr(acf):
     return acf / np.sqrt(np.outer(diag, diag))
 
 
-def varsim(coefs, intercept, sig_u, steps=100, initvalues=None, seed=None):
+def varsim(coefs, intercept, sig_u, steps=100, initvalues=None, seed=None,
+           nsimulations=None):
     """
     Simulate VAR(p) process, given coefficients and assuming Gaussian noise
 
@@ -216,39 +220,103 @@ def varsim(coefs, intercept, sig_u, steps=100, initvalues=None, seed=None):
     seed : {None, int}
         If seed is not None, then it will be used with for the random
         variables generated by numpy.random.
+    nsimulations : {None, int}
+        Number of paths to simulate. If None, a single path is simulated.
 
     Returns
     -------
     endog_simulated : nd_array
-        Endog of the simulated VAR process
+        Endog of the simulated VAR process, shaped (steps, neqs) or, if
+        nsimulations is not None, (nsimulations, steps, neqs).
+
+    Notes
+    -----
+    The recursion is computed in compiled code for all paths at once.
     """
     rs = np.random.RandomState(seed=seed)
     rmvnorm = rs.multivariate_normal
     p, k, k = coefs.shape
     if sig_u is None:
         sig_u = np.eye(k)
-    ugen = rmvnorm(np.zeros(len(sig_u)), sig_u, steps)
-    result = np.zeros((steps, k))
     if intercept is not None:
         # intercept can be 2-D like an offset variable
         if np.ndim(intercept) > 1:
-            if not len(intercept) == len(ugen):
+            if not len(intercept) == steps:
                 raise ValueError('2-D intercept needs to have length `steps`')
-        # add intercept/offset also to intial values
+
+    if nsimulations is None:
+        ugen = rmvnorm(np.zeros(len(sig_u)), sig_u, steps)
+        return _varsim_innovations(coefs, intercept, ugen[None])[0]
+
+    ugen = rmvnorm(np.zeros(len(sig_u)), sig_u, (nsimulations, steps))
+    return _varsim_innovations(coefs, intercept, ugen)
+
+
+def _varsim_innovations(coefs, intercept, innovations):
+    """
+    Simulate a batch of VAR(p) processes from given innovations
+
+    Parameters
+    ----------
+    coefs : ndarray
+        Coefficients for the VAR lags of endog, shaped (p, k, k).
+    intercept : None or ndarray 1-D (k,) or 2-D (steps, k)
+        Intercept or offset, as in `varsim`. It is also added to the initial
+        observations.
+    innovations : ndarray
+        Innovations, shaped (nsimulations, steps, k). As in `varsim`, the
+        first p innovations of each path are not used.
+
+    Returns
+    -------
+    endog_simulated : ndarray
+        Endog of the simulated VAR processes, shaped (nsimulations, steps, k)
+    """
+    p, k, k = coefs.shape
+    nsimulations, steps = innovations.shape[:2]
+    result = np.zeros((nsimulations, steps, k))
+    if intercept is not None:
         result += intercept
-        result[p:] += ugen[p:]
-    else:
-        result[p:] = ugen[p:]
+    result[:, p:] += innovations[:, p:]
+    if p == 0:
+        return result
 
-    # add in AR terms
-    for t in range(p, steps):
-        ygen = result[t]
-        for j in range(p):
-            ygen += np.dot(coefs[j], result[t-j-1])
+    # Lag coefficients stacked as [A_p, ..., A_1] to match the ordering of
+    # the contiguous block of lagged values y_{t-p}, ..., y_{t-1}
+    stacked_coefs = np.ascontiguousarray(
+        np.concatenate(coefs[::-1], axis=1), dtype=float)
+    var_recursion(stacked_coefs.reshape(k, p * k), result)
 
     return result
 
 
+def _stack_lags(y, lags):
+    """
+    Stack lagged values [y_{t-1}, ..., y_{t-lags}] for t = lags, ..., nobs - 1
+
+    Parameters
+    ----------
+    y : ndarray
+        Array shaped (..., nobs, k).
+    lags : int
+        Number of lags.
+
+    Returns
+    -------
+    lagged : ndarray
+        Array shaped (..., nobs - lags, lags * k), built from a strided view
+        of y rather than a Python loop over observations.
+    """
+    y = np.asarray(y)
+    nobs, k = y.shape[-2:]
+    shape = y.shape[:-2] + (nobs - lags, lags, k)
+    strides = y.strides[:-2] + (y.strides[-2],) + y.strides[-2:]
+    windows = np.lib.stride_tricks.as_strided(y, shape=shape, strides=strides,
+                                              writeable=False)
+    return windows[..., ::-1, :].reshape(y.shape[:-2] +
+                                         (nobs - lags, lags * k))
+
+
 def get_index(lst, name):
     try:
         result = lst.index(name)
@@ -23,6 +23,7 @@ import statsmodels.tsa.tsatools as tsa
 from statsmodels.iolib.table import SimpleTable
 from statsmodels.tools.decorators import cache_readonly, deprecated_alias
 from statsmodels.tools.linalg import logdet_symm
+from statsmodels.tools.parallel import parallel_func
 from statsmodels.tools.sm_exceptions import OutputWarning
 from statsmodels.tsa.tsatools import vec, unvec, duplication_matrix
 from statsmodels.tsa.vector_ar import output, plotting, util
@@ -42,6 +43,8 @@ def ma_rep(coefs, maxn=10):
     Parameters
     ----------
     coefs : ndarray (p x k x k)
+        Coefficient matrices. Leading dimensions are treated as a batch of
+        VAR(p) processes, e.g. (nsim x p x k x k).
     maxn : int
         Number of MA matrices to compute
 
@@ -60,10 +63,11 @@ def ma_rep(coefs, maxn=10):
     Returns
     -------
     phis : ndarray (maxn + 1 x k x k)
+        With batch dimensions, shaped (nsim x maxn + 1 x k x k).
     """
-    p, k, k = coefs.shape
-    phis = np.zeros((maxn+1, k, k))
-    phis[0] = np.eye(k)
+    p, k, k = coefs.shape[-3:]
+    phis = np.zeros(coefs.shape[:-3] + (maxn+1, k, k))
+    phis[..., 0, :, :] = np.eye(k)
 
     # recursively compute Phi matrices
     for i in range(1, maxn + 1):
@@ -71,11 +75,148 @@ def ma_rep(coefs, maxn=10):
             if j > p:
                 break
 
-            phis[i] += np.dot(phis[i-j], coefs[j-1])
+            phis[..., i, :, :] += np.matmul(phis[..., i-j, :, :],
+                                            coefs[..., j-1, :, :])
 
     return phis
 
 
+def _estimate_var_batch(endog, lags, trend='c'):
+    """
+    Least squares estimation of VAR(p) models for a batch of series
+
+    Parameters
+    ----------
+    endog : ndarray (nsim x nobs x k)
+    lags : int
+    trend : str {"nc", "c", "ct", "ctt"}
+
+    Returns
+    -------
+    coefs : ndarray (nsim x lags x k x k)
+    sigma_u : ndarray (nsim x k x k)
+
+    Notes
+    -----
+    The regressors are constructed as in `VAR.fit`, including the
+    adjustment of the trend terms, and all models are estimated by a
+    single batched solve of the normal equations.
+    """
+    nsim, nobs, neqs = endog.shape
+    k_trend = util.get_trendorder(trend)
+    z = np.empty((nsim, nobs - lags, k_trend + neqs * lags))
+    z[..., :k_trend] = np.vander(np.arange(lags + 1, nobs + 1), k_trend,
+                                 increasing=True)
+    z[..., k_trend:] = util._stack_lags(endog, lags)
+    y_sample = endog[:, lags:]
+
+    zt = z.swapaxes(1, 2)
+    params = np.linalg.solve(np.matmul(zt, z), np.matmul(zt, y_sample))
+    resid = y_sample - np.matmul(z, params)
+    df_resid = nobs - lags - (neqs * lags + k_trend)
+    sigma_u = np.matmul(resid.swapaxes(1, 2), resid) / df_resid
+
+    coefs = params[:, k_trend:].reshape((nsim, lags, neqs, neqs))
+    return coefs.swapaxes(2, 3), sigma_u
+
+
+def _lag_order_info_criteria(endog, maxlags, trend='c', exog=None, p_min=0):
+    """
+    Information criteria of VAR(p) models for p = p_min, ..., maxlags
+
+    Parameters
+    ----------
+    endog : ndarray (nobs_tot x k)
+    maxlags : int
+    trend : str {"nc", "c", "ct", "ctt"}
+    exog : {None, ndarray}
+        Deterministic terms included in addition to the trend.
+    p_min : int
+
+    Returns
+    -------
+    ics : defaultdict
+        Lists of the aic, bic, hqic and fpe for each lag order.
+
+    Notes
+    -----
+    All models use the last nobs_tot - maxlags observations and give the
+    same results as `VAR._estimate_var` with offset maxlags - p. The
+    regressors of successive lag orders are nested, so that the residual
+    cross products of all models are available from a single QR
+    decomposition of [deterministic terms, y_{t-1}, ..., y_{t-maxlags}, y_t].
+    The deterministic terms are first replaced by an orthonormal basis of
+    their column space, which drops collinear terms as the least squares
+    solution in `_estimate_var` does.
+    """
+    endog = np.asarray(endog)
+    nobs_tot, neqs = endog.shape
+    nobs = nobs_tot - maxlags
+    k_trend = util.get_trendorder(trend)
+    det = np.vander(np.arange(1., nobs + 1), k_trend, increasing=True)
+    if exog is not None:
+        det = np.column_stack((det, np.asarray(exog)[maxlags:]))
+    k_det = det.shape[1]
+
+    if k_det > 0:
+        u, s, _ = np.linalg.svd(det, full_matrices=False)
+        tol = s.max() * max(det.shape) * np.finfo(float).eps
+        det = u[:, s > tol]
+    rank_det = det.shape[1]
+    x = np.column_stack((det, util._stack_lags(endog, maxlags),
+                         endog[maxlags:]))
+    r = np.linalg.qr(x, mode='r')[:, -neqs:]
+
+    ics = defaultdict(list)
+    for p in range(p_min, maxlags + 1):
+        r_resid = r[rank_det + p * neqs:]
+        sigma_u_mle = np.dot(r_resid.T, r_resid) / nobs
+        ld = logdet_symm(sigma_u_mle)
+        # See VARResults.info_criteria
+        df_model = neqs * p + k_det
+        free_params = p * neqs ** 2 + neqs * k_det
+        ics['aic'].append(ld + (2. / nobs) * free_params)
+        ics['bic'].append(ld + (np.log(nobs) / nobs) * free_params)
+        ics['hqic'].append(ld + (2. * np.log(np.log(nobs)) / nobs)
+                           * free_params)
+        ics['fpe'].append(((nobs + df_model) / (nobs - df_model)) ** neqs
+                          * np.exp(ld))
+    return ics
+
+
+def _var_resim_innovations(random_state, sigma_u, resid, repl, steps,
+                           resample=False):
+    """
+    Innovations for Monte Carlo or bootstrap replications of a VAR
+
+    If resample is True, innovations are drawn with replacement from the
+    centered residuals, otherwise from a normal distribution with covariance
+    sigma_u. Returns an array shaped (repl x steps x k).
+    """
+    if resample:
+        resid = np.asarray(resid)
+        resid = resid - resid.mean(0)
+        index = random_state.randint(0, len(resid), size=(repl, steps))
+        return resid[index]
+    return random_state.multivariate_normal(np.zeros(len(sigma_u)), sigma_u,
+                                            size=(repl, steps))
+
+
+def _irf_resim_batch(coefs, intercept, innovations, lags, trend, burn, steps,
+                     orth, cum):
+    """
+    Simulate, re-estimate and compute impulse responses for a batch of
+    replications
+    """
+    sim = util._varsim_innovations(coefs, intercept, innovations)[:, burn:]
+    sim_coefs, sim_sigma_u = _estimate_var_batch(sim, lags, trend=trend)
+    ma_coll = ma_rep(sim_coefs, maxn=steps)
+    if orth:
+        ma_coll = np.matmul(ma_coll,
+                            np.linalg.cholesky(sim_sigma_u)[:, None])
+    return ma_coll.cumsum(axis=1) if cum else ma_coll
+
+
 def is_stable(coefs, verbose=False):
     """
     Determine stability of VAR(p) system by examining the eigenvalues of the
@@ -566,7 +707,7 @@ class VAR(TimeSeriesModel):
         return predictedvalues
 
     def fit(self, maxlags=None, method='ols', ic=None, trend='c',
-            verbose=False):
+            verbose=False, chunksize=None):
         # todo: this code is only supporting deterministic terms as exog.
         # This means that all exog-variables have lag 0. If dealing with
         # different exogs is necessary, a `lags_exog`-parameter might make
@@ -597,6 +738,16 @@ class VAR(TimeSeriesModel):
             "ctt" - constant, linear and quadratic trend
             "n", "nc" - co constant, no trend
             Note that these are prepended to the columns of the dataset.
+        chunksize : int, optional
+            If given, the matrix of regressors is never constructed in full.
+            Instead the least squares problem is reduced by QR decompositions
+            of chunks of `chunksize` observations, and the estimates are
+            computed from the triangular factor. The memory needed in
+            addition to the data then does not depend on the number of
+            observations, which allows to estimate models on very long time
+            series. The estimates are the same up to floating point
+            precision. The regressors are only computed if needed, e.g. for
+            the residuals.
 
         Returns
         -------
@@ -643,9 +794,9 @@ class VAR(TimeSeriesModel):
                                 self.data.xnames[k_trend:])
         self.data.cov_names = pd.MultiIndex.from_product((self.data.xnames,
                                                           self.data.ynames))
-        return self._estimate_var(lags, trend=trend)
+        return self._estimate_var(lags, trend=trend, chunksize=chunksize)
 
-    def _estimate_var(self, lags, offset=0, trend='c'):
+    def _estimate_var(self, lags, offset=0, trend='c', chunksize=None):
         """
         lags : int
             Lags of the endogenous variable.
@@ -654,6 +805,8 @@ class VAR(TimeSeriesModel):
             apples-to-apples comparison
         trend : {str, None}
             As per above
+        chunksize : {int, None}
+            As per above
         """
         # have to do this again because select_order does not call fit
         self.k_trend = k_trend = util.get_trendorder(trend)
@@ -664,6 +817,9 @@ class VAR(TimeSeriesModel):
         nobs = self.n_totobs - lags - offset
         endog = self.endog[offset:]
         exog = None if self.exog is None else self.exog[offset:]
+        if chunksize is not None:
+            return self._estimate_var_chunked(endog, exog, lags, trend,
+                                              chunksize)
         z = util.get_var_endog(endog, lags, trend=trend,
                                has_constant='raise')
         if exog is not None:
@@ -715,6 +871,60 @@ class VAR(TimeSeriesModel):
                             dates=self.data.dates, model=self, exog=self.exog)
         return VARResultsWrapper(varfit)
 
+    def _estimate_var_chunked(self, endog, exog, lags, trend, chunksize):
+        """
+        Same as `_estimate_var`, but reducing the data chunk by chunk
+
+        The R factor of the QR decomposition of [Z, Y] is updated with each
+        chunk of rows of Z and Y, so that Z is never constructed in full.
+        Since R'R = [Z, Y]'[Z, Y], the least squares solution, the sum of
+        squared residuals and Z'Z all follow from R. The column sums of
+        [Z, Y] are accumulated for the centered residual correlation.
+        """
+        nobs = endog.shape[0] - lags
+        k_trend = util.get_trendorder(trend)
+        if 'c' in trend:
+            # Same check as has_constant='raise' in util.get_var_endog
+            for j in range(1, lags + 1):
+                lagged = endog[lags - j:lags - j + nobs]
+                if np.any((np.ptp(lagged, axis=0) == 0) & (lagged[0] != 0)):
+                    raise ValueError("x contains a constant. Adding a "
+                                     "constant with trend='{0}' is not "
+                                     "allowed.".format(trend))
+
+        k_exog = 0 if exog is None else exog.shape[1]
+        k_z = k_trend + k_exog + self.neqs * lags
+        ncols = k_z + self.neqs
+        r = np.zeros((0, ncols))
+        col_sum = np.zeros(ncols)
+        for start in range(0, nobs, chunksize):
+            z = _var_design(endog, exog, lags, trend, start,
+                            start + chunksize)
+            y = endog[lags + start:lags + start + z.shape[0]]
+            zy = np.column_stack((z, y))
+            col_sum += zy.sum(0)
+            r = np.linalg.qr(np.vstack((r, zy)), mode='r')
+        if r.shape[0] < ncols:
+            r = np.vstack((r, np.zeros((ncols - r.shape[0], ncols))))
+
+        r_zz = r[:k_z, :k_z]
+        params = np.linalg.lstsq(r_zz, r[:k_z, k_z:], rcond=1e-15)[0]
+        # The residuals are [Z, Y] [-params', I]', with the same norms as
+        # R [-params', I]'
+        resid_r = np.dot(r, np.vstack((-params, np.eye(self.neqs))))
+        df_resid = nobs - (self.neqs * lags + k_trend + k_exog)
+        sse = np.dot(resid_r.T, resid_r)
+        omega = sse / df_resid
+        resid_mean = (col_sum[k_z:] - np.dot(col_sum[:k_z], params)) / nobs
+        resid_acov0 = sse / nobs - np.outer(resid_mean, resid_mean)
+
+        varfit = VARResults(endog, None, params, omega, lags,
+                            names=self.endog_names, trend=trend,
+                            dates=self.data.dates, model=self, exog=self.exog)
+        varfit._cache = {'_zz': np.dot(r_zz.T, r_zz),
+                         'resid_corr': _acovs_to_acorrs(resid_acov0[None])[0]}
+        return VARResultsWrapper(varfit)
+
     def select_order(self, maxlags=None, trend="c"):
         """
         Compute lag order selections based on each of the available information
@@ -741,15 +951,13 @@ class VAR(TimeSeriesModel):
             # it multiplies by 4 instead of 12.  Let's put these all in
             # one place and document when to use which variant.
 
-        ics = defaultdict(list)
+        # have to do this again because select_order does not call fit
+        self.k_trend = util.get_trendorder(trend)
         p_min = 0 if self.exog is not None or trend != "nc" else 1
-        for p in range(p_min, maxlags + 1):
-            # exclude some periods to same amount of data used for each lag
-            # order
-            result = self._estimate_var(p, offset=maxlags - p, trend=trend)
-
-            for k, v in iteritems(result.info_criteria):
-                ics[k].append(v)
+        # the same amount of data is used for each lag order, see
+        # _lag_order_info_criteria
+        ics = _lag_order_info_criteria(self.endog, maxlags, trend=trend,
+                                       exog=self.exog, p_min=p_min)
 
         selected_orders = dict((k, np.array(v).argmin() + p_min)
                                for k, v in iteritems(ics))
@@ -757,6 +965,25 @@ class VAR(TimeSeriesModel):
         return LagOrderResults(ics, selected_orders, vecm=False)
 
 
+def _var_design(endog, exog, lags, trend, start=0, stop=None):
+    """
+    Rows `start`, ..., `stop`-1 of the matrix of regressors of a VAR
+
+    The columns are the deterministic terms, `exog` and the lags of `endog`,
+    with the trend terms adjusted as in `VAR._estimate_var` (to get the same
+    results as JMulTi). Only the data needed for these rows is used.
+    """
+    nobs = endog.shape[0] - lags
+    stop = nobs if stop is None else min(stop, nobs)
+    k_trend = util.get_trendorder(trend)
+    trendarr = np.arange(lags + 1 + start, lags + 1 + stop, dtype=np.float64)
+    z = [np.vander(trendarr, k_trend, increasing=True)]
+    if exog is not None:
+        z.append(exog[-nobs:][start:stop])
+    z.append(util._stack_lags(endog[start:stop + lags], lags))
+    return np.column_stack(z)
+
+
 class VARProcess(object):
     """
     Class represents a known VAR(p) process
@@ -833,7 +1060,8 @@ class VARProcess(object):
         """
         return is_stable(self.coefs, verbose=verbose)
 
-    def simulate_var(self, steps=None, offset=None, seed=None):
+    def simulate_var(self, steps=None, offset=None, seed=None,
+                     nsimulations=None):
         """
         simulate the VAR(p) process for the desired number of steps
 
@@ -854,11 +1082,14 @@ class VARProcess(object):
         seed : {None, int}
             If seed is not None, then it will be used with for the random
             variables generated by numpy.random.
+        nsimulations : {None, int}
+            Number of paths to simulate. If None, a single path is returned.
 
         Returns
         -------
         endog_simulated : nd_array
-            Endog of the simulated VAR process
+            Endog of the simulated VAR process. Shaped (steps, neqs) if
+            nsimulations is None, else (nsimulations, steps, neqs).
         """
         steps_ = None
         if offset is None:
@@ -885,7 +1116,8 @@ class VARProcess(object):
                 raise ValueError('if exog or offset are used, then steps must'
                                  'be equal to their length or None')
 
-        y = util.varsim(self.coefs, offset, self.sigma_u, steps=steps, seed=seed)
+        y = util.varsim(self.coefs, offset, self.sigma_u, steps=steps,
+                        seed=seed, nsimulations=nsimulations)
         return y
 
     def plotsim(self, steps=None, offset=None, seed=None):
@@ -1156,7 +1388,8 @@ class VARResults(VARProcess):
     Parameters
     ----------
     endog : ndarray
-    endog_lagged : ndarray
+    endog_lagged : ndarray or None
+        The regressors. If None, they are computed when needed.
     params : ndarray
     sigma_u : ndarray
     lag_order : int
@@ -1204,7 +1437,7 @@ class VARResults(VARProcess):
 
         self.model = model
         self.endog = endog
-        self.endog_lagged = endog_lagged
+        self._endog_lagged = endog_lagged
         self.dates = dates
 
         self.n_totobs, neqs = self.endog.shape
@@ -1243,6 +1476,17 @@ class VARResults(VARProcess):
                                          names=names,
                                          _params_info=_params_info)
 
+    @property
+    def endog_lagged(self):
+        if self._endog_lagged is None:
+            self._endog_lagged = _var_design(self.endog, self.exog,
+                                             self.k_ar, self.trend)
+        return self._endog_lagged
+
+    @endog_lagged.setter
+    def endog_lagged(self, value):
+        self._endog_lagged = value
+
     def plot(self):
         """Plot input time series"""
         return plotting.plot_mts(self.endog, names=self.names,
@@ -1355,8 +1599,7 @@ class VARResults(VARProcess):
         Adjusted to be an unbiased estimator
         Ref: Lütkepohl p.74-75
         """
-        z = self.endog_lagged
-        return np.kron(np.linalg.inv(z.T @ z), self.sigma_u)
+        return np.kron(np.linalg.inv(self._zz), self.sigma_u)
 
     def cov_ybar(self):
         r"""Asymptotically consistent estimate of covariance of the sample mean
@@ -1407,7 +1650,10 @@ class VARResults(VARProcess):
     @cache_readonly
     def llf(self):
         "Compute VAR(p) loglikelihood"
-        return var_loglike(self.resid, self.sigma_u_mle, self.nobs)
+        # only depends on sigma_u_mle, resid is not needed
+        logdet = logdet_symm(np.asarray(self.sigma_u_mle))
+        return -(self.nobs / 2) * (self.neqs * np.log(2 * np.pi) + logdet +
+                                   self.neqs)
 
     @cache_readonly
     def stderr(self):
@@ -1518,7 +1764,8 @@ class VARResults(VARProcess):
     # Monte Carlo irf standard errors
     @deprecate_kwarg('T', 'steps')
     def irf_errband_mc(self, orth=False, repl=1000, steps=10,
-                       signif=0.05, seed=None, burn=100, cum=False):
+                       signif=0.05, seed=None, burn=100, cum=False,
+                       resample=False, n_jobs=1):
         """
         Compute Monte Carlo integrated error bands assuming normally
         distributed for impulse response functions
@@ -1539,6 +1786,13 @@ class VARResults(VARProcess):
             number of initial observations to discard for simulation
         cum: bool, default False
             produce cumulative irf error bands
+        resample: bool, default False
+            If True, draw the innovations with replacement from the estimated
+            residuals (residual bootstrap) rather than from a normal
+            distribution.
+        n_jobs: int, default 1
+            Number of jobs used to compute the replications in parallel.
+            -1 uses all cores.
 
         Notes
         -----
@@ -1549,7 +1803,8 @@ class VARResults(VARProcess):
         Tuple of lower and upper arrays of ma_rep monte carlo standard errors
         """
         ma_coll = self.irf_resim(orth=orth, repl=repl, steps=steps,
-                                 seed=seed, burn=burn, cum=cum)
+                                 seed=seed, burn=burn, cum=cum,
+                                 resample=resample, n_jobs=n_jobs)
 
         ma_sort = np.sort(ma_coll, axis=0)  # sort to get quantiles
         # python 2: round returns float
@@ -1561,7 +1816,7 @@ class VARResults(VARProcess):
 
     @deprecate_kwarg('T', 'steps')
     def irf_resim(self, orth=False, repl=1000, steps=10,
-                  seed=None, burn=100, cum=False):
+                  seed=None, burn=100, cum=False, resample=False, n_jobs=1):
         """
         Simulates impulse response function, returning an array of simulations.
         Used for Sims-Zha error band calculation.
@@ -1582,9 +1837,22 @@ class VARResults(VARProcess):
             number of initial observations to discard for simulation
         cum: bool, default False
             produce cumulative irf error bands
+        resample: bool, default False
+            If True, draw the innovations with replacement from the estimated
+            residuals (residual bootstrap) rather than from a normal
+            distribution.
+        n_jobs: int, default 1
+            Number of jobs used to compute the replications in parallel.
+            -1 uses all cores.
 
         Notes
         -----
+        All replications are simulated jointly and re-estimated by a batched
+        least squares solve, so that no VAR model is constructed per
+        replication. With `n_jobs` different from 1, the replications are
+        split into chunks that are processed in parallel. The innovations are
+        always drawn up front, so that results do not depend on `n_jobs`.
+
         .. [*] Sims, Christoper A., and Tao Zha. 1999. "Error Bands for Impulse
            Response." Econometrica 67: 1113-1155.
 
@@ -1592,28 +1860,25 @@ class VARResults(VARProcess):
         -------
         Array of simulated impulse response functions
         """
-        neqs = self.neqs
-        k_ar = self.k_ar
-        coefs = self.coefs
-        sigma_u = self.sigma_u
-        intercept = self.intercept
-        nobs = self.nobs
-
-        ma_coll = np.zeros((repl, steps + 1, neqs, neqs))
-
-        def fill_coll(sim):
-            ret = VAR(sim, exog=self.exog).fit(maxlags=k_ar, trend=self.trend)
-            ret = ret.orth_ma_rep(maxn=steps) if orth else ret.ma_rep(maxn=steps)
-            return ret.cumsum(axis=0) if cum else ret
-
-        for i in range(repl):
-            # discard first burn to eliminate correct for starting bias
-            sim = util.varsim(coefs, intercept, sigma_u,
-                              seed=seed, steps=nobs+burn)
-            sim = sim[burn:]
-            ma_coll[i, :, :, :] = fill_coll(sim)
-
-        return ma_coll
+        if self.exog is not None:
+            raise NotImplementedError('Simulated impulse responses are not'
+                                      ' available for models with exog.')
+        random_state = np.random.RandomState(seed=seed)
+        innovations = _var_resim_innovations(random_state, self.sigma_u,
+                                             self.resid, repl,
+                                             self.nobs + burn,
+                                             resample=resample)
+
+        parallel, p_func, n_jobs = parallel_func(_irf_resim_batch, n_jobs,
+                                                 verbose=0)
+        chunks = [chunk for chunk in np.array_split(innovations, n_jobs)
+                  if len(chunk)]
+        ma_coll = parallel(p_func(self.coefs, self.intercept, chunk,
+                                  self.k_ar, self.trend, burn, steps, orth,
+                                  cum)
+                           for chunk in chunks)
+
+        return np.concatenate(ma_coll)
 
     def _omega_forc_cov(self, steps):
         # Approximate MSE matrix \Omega(h) as defined in Lut p97
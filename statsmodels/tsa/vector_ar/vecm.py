@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 
-from collections import defaultdict
 import numpy as np
 from numpy import hstack, vstack
 from numpy.linalg import inv, svd
@@ -11,7 +10,9 @@ from statsmodels.compat.python import iteritems
 from statsmodels.iolib.summary import Summary
 from statsmodels.iolib.table import SimpleTable
 from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.parallel import parallel_func
 from statsmodels.tools.sm_exceptions import HypothesisTestWarning
+from statsmodels.tools.tools import Bunch
 from statsmodels.tsa.tsatools import duplication_matrix, vec, lagmat
 
 import statsmodels.tsa.base.tsa_model as tsbase
@@ -19,9 +20,11 @@ import statsmodels.tsa.vector_ar.irf as irf
 import statsmodels.tsa.vector_ar.plotting as plot
 from statsmodels.tsa.vector_ar.hypothesis_test_results import \
     CausalityTestResults, WhitenessTestResults
-from statsmodels.tsa.vector_ar.util import get_index, seasonal_dummies
+from statsmodels.tsa.vector_ar.util import (get_index, seasonal_dummies,
+                                            _stack_lags)
 from statsmodels.tsa.vector_ar.var_model import forecast, forecast_interval, \
-    VAR, ma_rep, orth_ma_rep, test_normality, LagOrderResults, _compute_acov
+    VAR, ma_rep, orth_ma_rep, test_normality, LagOrderResults, _compute_acov, \
+    _lag_order_info_criteria
 from statsmodels.tsa.coint_tables import c_sja, c_sjt
 
 
@@ -59,27 +62,24 @@ def select_order(data, maxlags, deterministic="nc", seasons=0, exog=None,
     -------
     selected_orders : :class:`statsmodels.tsa.vector_ar.var_model.LagOrderResults`
     """
-    ic = defaultdict(list)
-    for p in range(1, maxlags + 2):  # +2 because k_ar_VECM == k_ar_VAR - 1
-        exogs = []
-        if "co" in deterministic or "ci" in deterministic:
-            exogs.append(np.ones(len(data)).reshape(-1, 1))
-        if "lo" in deterministic or "li" in deterministic:
-            exogs.append(1 + np.arange(len(data)).reshape(-1, 1))
-        if exog_coint is not None:
-            exogs.append(exog_coint)
-        if seasons > 0:
-            exogs.append(seasonal_dummies(seasons, len(data)
-                                          ).reshape(-1, seasons-1))
-        if exog is not None:
-            exogs.append(exog)
-        exogs = hstack(exogs) if exogs else None
-        var_model = VAR(data, exogs)
-        # exclude some periods ==> same amount of data used for each lag order
-        var_result = var_model._estimate_var(lags=p, offset=maxlags+1-p)
-
-        for k, v in iteritems(var_result.info_criteria):
-            ic[k].append(v)
+    exogs = []
+    if "co" in deterministic or "ci" in deterministic:
+        exogs.append(np.ones(len(data)).reshape(-1, 1))
+    if "lo" in deterministic or "li" in deterministic:
+        exogs.append(1 + np.arange(len(data)).reshape(-1, 1))
+    if exog_coint is not None:
+        exogs.append(exog_coint)
+    if seasons > 0:
+        exogs.append(seasonal_dummies(seasons, len(data)
+                                      ).reshape(-1, seasons-1))
+    if exog is not None:
+        exogs.append(exog)
+    exogs = hstack(exogs) if exogs else None
+    var_model = VAR(data, exogs)
+    # +1 because k_ar_VECM == k_ar_VAR - 1. The same amount of data is used
+    # for each lag order and all orders are estimated at once.
+    ic = _lag_order_info_criteria(var_model.endog, maxlags + 1,
+                                  exog=var_model.exog, p_min=1)
     # -1+1 in the following line is only here for clarification.
     # -1 because k_ar_VECM == k_ar_VAR - 1
     # +1 because p == index +1 (we start with p=1, not p=0)
@@ -225,7 +225,7 @@ def _mat_sqrt(_2darray):
 
 
 def _endog_matrices(endog, exog, exog_coint, diff_lags, deterministic,
-                    seasons=0, first_season=0):
+                    seasons=0, first_season=0, start=0, stop=None):
     """
     Returns different matrices needed for parameter estimation.
 
@@ -258,6 +258,13 @@ def _endog_matrices(endog, exog, exog_coint, diff_lags, deterministic,
     first_season : int, default: 0
         The season of the first observation. `0` means first season, `1` means
         second season, ..., `seasons-1` means the last season.
+    start : int, default: 0
+        First period (excluding the presample) to return.
+    stop : int or None, default: None
+        Period (excluding the presample) at which to stop. `None` means the
+        end of the sample. Only the data needed for the periods `start`,
+        ..., `stop`-1 is used, so that chunks of the matrices can be
+        computed without constructing the full matrices.
 
     Returns
     -------
@@ -282,8 +289,9 @@ def _endog_matrices(endog, exog, exog_coint, diff_lags, deterministic,
     """
     # p. 286:
     p = diff_lags+1
-    y = endog
-    K = y.shape[0]
+    nobs = endog.shape[1] - p
+    stop = nobs if stop is None else min(stop, nobs)
+    y = endog[:, start:stop + p]
     y_1_T = y[:, p:]
     T = y_1_T.shape[1]
     delta_y = np.diff(y)
@@ -297,34 +305,69 @@ def _endog_matrices(endog, exog, exog_coint, diff_lags, deterministic,
     if "ci" in deterministic:  # pp. 257, 299, 306, 307
         y_lag1_stack.append(np.ones(T))
     if "li" in deterministic:  # p. 299
-        y_lag1_stack.append(_linear_trend(T, p, coint=True))
+        y_lag1_stack.append(_linear_trend(T, p, coint=True) + start)
     if exog_coint is not None:
-        y_lag1_stack.append(exog_coint[-T-1:-1].T)
+        y_lag1_stack.append(exog_coint[-nobs-1:-1][start:stop].T)
     y_lag1 = np.row_stack(y_lag1_stack)
 
-    # p. 286:
-    delta_x = np.zeros((diff_lags*K, T))
-    if diff_lags > 0:
-        for j in range(delta_x.shape[1]):
-            delta_x[:, j] = (delta_y[:, j+p-2:None if j-1 < 0 else j-1:-1]
-                             .T.reshape(K*(p-1)))
+    # p. 286: columns hold (delta_y_{t-1}, ..., delta_y_{t-p+1})
+    delta_x = _stack_lags(delta_y.T, diff_lags).T
     delta_x_stack = [delta_x]
     # p. 299, p. 303:
     if "co" in deterministic:
         delta_x_stack.append(np.ones(T))
     if seasons > 0:
+        first_period = first_season + diff_lags + 1 + start
         delta_x_stack.append(seasonal_dummies(seasons, delta_x.shape[1],
-                                              first_period=first_season + diff_lags + 1,
+                                              first_period=first_period,
                                               centered=True).T)
     if "lo" in deterministic:
-        delta_x_stack.append(_linear_trend(T, p))
+        delta_x_stack.append(_linear_trend(T, p) + start)
     if exog is not None:
-        delta_x_stack.append(exog[-T:].T)
+        delta_x_stack.append(exog[-nobs:][start:stop].T)
     delta_x = np.row_stack(delta_x_stack)
 
     return y_1_T, delta_y_1_T, y_lag1, delta_x
 
 
+def _vecm_moments(endog, exog, exog_coint, diff_lags, deterministic,
+                  seasons=0, first_season=0, chunksize=100000):
+    """
+    Moment matrix of the data of a VECM accumulated over chunks of time.
+
+    Parameters
+    ----------
+    endog, exog, exog_coint, diff_lags, deterministic, seasons, first_season
+        See `_endog_matrices`.
+    chunksize : int
+        Number of periods in each chunk.
+
+    Returns
+    -------
+    moments : ndarray
+        The matrix W W' with W = (delta_y_1_T', y_lag1', delta_x')' as
+        returned by `_endog_matrices`.
+    nobs : int
+        Number of observations (excluding the presample).
+    k_lag1 : int
+        Number of rows of y_lag1.
+
+    Notes
+    -----
+    Only one chunk of the data matrices exists at a time, so that the
+    memory needed does not depend on the number of observations.
+    """
+    nobs = endog.shape[1] - diff_lags - 1
+    moments = 0
+    for start in range(0, nobs, chunksize):
+        _, delta_y_1_T, y_lag1, delta_x = _endog_matrices(
+            endog, exog, exog_coint, diff_lags, deterministic, seasons,
+            first_season, start=start, stop=start + chunksize)
+        w = np.row_stack((delta_y_1_T, y_lag1, delta_x))
+        moments = moments + np.dot(w, w.T)
+    return moments, nobs, y_lag1.shape[0]
+
+
 def _r_matrices(delta_y_1_T, y_lag1, delta_x):
     """Returns two ndarrays needed for parameter estimation as well as the
     calculation of standard errors.
@@ -394,8 +437,35 @@ def _sij(delta_x, delta_y_1_T, y_lag1):
     r0, r1 = _r_matrices(delta_y_1_T, y_lag1, delta_x)
     s00 = np.dot(r0, r0.T) / nobs
     s01 = np.dot(r0, r1.T) / nobs
-    s10 = s01.T
     s11 = np.dot(r1, r1.T) / nobs
+    return _sij_eig(s00, s01, s11)
+
+
+def _partial_moments(moments, neqs, k_lag1):
+    """
+    Moments of R_0 and R_1 (p. 292 in Lütkepohl) from the moments of the
+    data as returned by `_vecm_moments`.
+    """
+    k = neqs + k_lag1
+    m_ww = moments[:k, :k]
+    if moments.shape[0] > k:
+        m_wx = moments[:k, k:]
+        m_ww = m_ww - m_wx.dot(inv(moments[k:, k:])).dot(m_wx.T)
+    return m_ww[:neqs, :neqs], m_ww[:neqs, neqs:], m_ww[neqs:, neqs:]
+
+
+def _sij_moments(moments, neqs, k_lag1, nobs):
+    """
+    Same as `_sij`, but computed from the moments of the data as returned
+    by `_vecm_moments`.
+    """
+    s00, s01, s11 = _partial_moments(moments, neqs, k_lag1)
+    return _sij_eig(s00 / nobs, s01 / nobs, s11 / nobs)
+
+
+def _sij_eig(s00, s01, s11):
+    """Remaining matrices and eigen decomposition of `_sij`"""
+    s10 = s01.T
     s11_ = inv(_mat_sqrt(s11))
     # p. 295:
     s01_s11_ = np.dot(s01, s11_)
@@ -649,6 +719,234 @@ def coint_johansen(endog, det_order, k_ar_diff):
     return JohansenTestResult(rkt, r0t, a, d, lr1, lr2, cvt, cvm, aind)
 
 
+def _johansen_blocks(endog, det_order, k_ar_diff):
+    """
+    Per-variable data used in Johansen's test for subsets of variables
+
+    Parameters
+    ----------
+    endog : ndarray
+        Data, shaped (nobs_tot, nvars).
+    det_order : int
+        See `coint_johansen`.
+    k_ar_diff : int
+        See `coint_johansen`.
+
+    Returns
+    -------
+    ndarray
+        Array shaped (nobs_r, nvars, k_ar_diff + 2). For each variable it
+        holds the differences, the lagged levels and the lagged differences,
+        detrended as in `coint_johansen`. Since all of these transformations
+        act variable by variable, the blocks of any subset of variables are
+        the data of the test for that subset.
+    """
+    nobs = endog.shape[0]
+    if det_order > -1:
+        trend = np.vander(np.linspace(-1, 1, nobs), det_order + 1)
+        endog = endog - np.dot(trend, np.linalg.lstsq(trend, endog,
+                                                       rcond=None)[0])
+    dx = np.diff(endog, 1, axis=0)
+    nobs_r = nobs - 1 - k_ar_diff
+    blocks = np.empty((nobs_r, endog.shape[1], k_ar_diff + 2))
+    blocks[:, :, 0] = dx[k_ar_diff:]
+    blocks[:, :, 1] = endog[1:nobs - k_ar_diff]
+    for j in range(1, k_ar_diff + 1):
+        blocks[:, :, j + 1] = dx[k_ar_diff - j:nobs - 1 - j]
+    if det_order > -1:
+        blocks -= blocks.mean(0)
+    return blocks
+
+
+def _johansen_eig(gram, neqs, nobs_r):
+    """
+    Eigenvalues of Johansen's test from the moment matrices of the data
+
+    `gram` is shaped (ngroups, d, d) with the variables ordered as
+    differences, lagged levels and lagged differences.
+    """
+    w = 2 * neqs
+    s = gram[:, :w, :w]
+    if gram.shape[1] > w:
+        szz = gram[:, w:, w:]
+        szw = gram[:, w:, :w]
+        try:
+            coef = np.linalg.solve(szz, szw)
+        except np.linalg.LinAlgError:
+            coef = np.matmul(np.linalg.pinv(szz), szw)
+        s = s - np.matmul(szw.transpose(0, 2, 1), coef)
+    s = s / nobs_r
+    s00 = s[:, :neqs, :neqs]
+    sk0 = s[:, neqs:, :neqs]
+    skk = s[:, neqs:, neqs:]
+    # The eigenvalues of inv(skk) sk0 inv(s00) sk0' are those of the
+    # symmetric inv(L) sk0 inv(s00) sk0' inv(L)' with skk = L L'
+    chol = np.linalg.cholesky(skk)
+    x = np.linalg.solve(chol, sk0)
+    sym = np.matmul(x, np.linalg.solve(s00, x.transpose(0, 2, 1)))
+    return np.linalg.eigvalsh(sym)[:, ::-1]
+
+
+def _johansen_chunk(blocks, diag, groups, max_cross=2 ** 22):
+    """
+    Eigenvalues of Johansen's test for a chunk of sorted groups
+    """
+    nobs_r, _, d1 = blocks.shape
+    ngroups, neqs = groups.shape
+
+    # Cross products between the blocks of all variables in the chunk,
+    # from a single matrix product if the result is not too large
+    first = np.unique(groups[:, :-1])
+    second = np.unique(groups[:, 1:])
+    use_cross = len(first) * len(second) * d1 ** 2 <= max_cross
+    if use_cross and neqs > 1:
+        cross = np.dot(blocks[:, first].reshape(nobs_r, -1).T,
+                       blocks[:, second].reshape(nobs_r, -1))
+        cross = cross.reshape(len(first), d1, len(second), d1)
+        ifirst = np.searchsorted(first, groups)
+        isecond = np.searchsorted(second, groups)
+
+    gram = np.empty((ngroups, neqs, d1, neqs, d1))
+    for i in range(neqs):
+        gram[:, i, :, i, :] = diag[groups[:, i]]
+        for j in range(i + 1, neqs):
+            if use_cross:
+                block = cross[ifirst[:, i], :, isecond[:, j], :]
+            else:
+                block = np.einsum('tgi,tgj->gij', blocks[:, groups[:, i]],
+                                  blocks[:, groups[:, j]])
+            gram[:, i, :, j, :] = block
+            gram[:, j, :, i, :] = block.transpose(0, 2, 1)
+    # Order as differences, lagged levels and lagged differences
+    gram = gram.transpose(0, 2, 1, 4, 3).reshape(ngroups, neqs * d1, -1)
+
+    try:
+        return _johansen_eig(gram, neqs, nobs_r)
+    except np.linalg.LinAlgError:
+        eig = np.full((ngroups, neqs), np.nan)
+        for i in range(ngroups):
+            try:
+                eig[i] = _johansen_eig(gram[i:i + 1], neqs, nobs_r)
+            except np.linalg.LinAlgError:
+                pass
+        return eig
+
+
+def coint_johansen_batch(endog, det_order, k_ar_diff, groups=None,
+                         n_jobs=1, chunksize=None):
+    """
+    Johansen cointegration tests for many subsets of variables
+
+    Parameters
+    ----------
+    endog : array_like (nobs_tot x nvars)
+        Data of all variables. Each test uses the columns given by a row of
+        `groups`.
+    det_order : int
+        * -1 - no deterministic terms
+        * 0 - constant term
+        * 1 - linear trend
+    k_ar_diff : int, nonnegative
+        Number of lagged differences in the model.
+    groups : array_like, optional
+        Integer array shaped (ngroups, neqs) where each row holds the
+        positions of the columns of `endog` in one test. If `endog` is a
+        DataFrame, column labels can be used instead. The default is all
+        pairs of columns.
+    n_jobs : int, optional
+        Number of jobs to run in parallel. Default is 1. The work is mainly
+        in numpy linear algebra that releases the GIL, so jobs are run in
+        threads.
+    chunksize : int, optional
+        Number of groups handled together. Default is 4096.
+
+    Returns
+    -------
+    Bunch
+        A dictionary-like object with attributes
+
+        * groups - The column positions of each test, shaped
+          (ngroups, neqs).
+        * eig - The eigenvalues of each test, in descending order.
+        * trace_stat and max_eig_stat - The test statistics, shaped
+          (ngroups, neqs).
+        * trace_stat_crit_vals and max_eig_stat_crit_vals - Critical
+          values (90%, 95%, 99%), shaped (neqs, 3). These only depend on
+          the number of variables and are the same for all tests.
+
+    See Also
+    --------
+    coint_johansen
+
+    Notes
+    -----
+    The results are the same as calling `coint_johansen` on
+    ``endog[:, group]`` for each group, but the detrending, differencing and
+    lags are computed once for all variables. For a chunk of groups the
+    moment matrices are built from the cross products of the blocks of the
+    variables in the chunk, which for sorted groups such as all pairs
+    mostly come from one matrix product. The eigenvalue problems of the
+    chunk are then solved together. Tests that cannot be computed because
+    the data of a group is singular have NaN statistics.
+    """
+    import warnings
+    if det_order not in [-1, 0, 1]:
+        warnings.warn("Critical values are only available for a det_order of "
+                      "-1, 0, or 1.", category=HypothesisTestWarning)
+
+    columns = getattr(endog, 'columns', None)
+    endog = np.asarray(endog, dtype=float)
+    nobs, nvars = endog.shape
+    if groups is None:
+        groups = np.column_stack(np.triu_indices(nvars, 1))
+    else:
+        groups = np.asarray(groups)
+        if columns is not None and not np.issubdtype(groups.dtype,
+                                                     np.integer):
+            positions = columns.get_indexer(groups.ravel())
+            if np.any(positions < 0):
+                raise ValueError('groups contains labels that are not '
+                                 'columns of endog.')
+            groups = positions.reshape(groups.shape)
+        groups = np.atleast_2d(groups).astype(np.intp)
+    ngroups, neqs = groups.shape
+    if np.any((groups < 0) | (groups >= nvars)):
+        raise ValueError('groups must contain column positions of endog.')
+    sorted_groups = np.sort(groups, axis=1)
+    if neqs > 1 and np.any(np.diff(sorted_groups, axis=1) == 0):
+        raise ValueError('The variables in a group must be distinct.')
+    if neqs > 12:
+        warnings.warn("Critical values are only available for time series "
+                      "with 12 variables at most.",
+                      category=HypothesisTestWarning)
+
+    blocks = _johansen_blocks(endog, det_order, k_ar_diff)
+    nobs_r = blocks.shape[0]
+    diag = np.einsum('tni,tnj->nij', blocks, blocks)
+
+    # The statistics do not depend on the order of the variables, so
+    # groups are sorted to share cross products within chunks
+    order = np.lexsort(sorted_groups.T[::-1])
+    chunksize = 4096 if chunksize is None else int(chunksize)
+    chunks = [order[i:i + chunksize] for i in range(0, ngroups, chunksize)]
+    parallel, p_func, n_jobs = parallel_func(_johansen_chunk, n_jobs,
+                                             verbose=0, prefer='threads')
+    eig_chunks = parallel(p_func(blocks, diag, sorted_groups[idx])
+                          for idx in chunks)
+
+    eig = np.empty((ngroups, neqs))
+    for idx, eig_chunk in zip(chunks, eig_chunks):
+        eig[idx] = eig_chunk
+    max_eig_stat = -nobs_r * np.log(1 - eig)
+    trace_stat = np.cumsum(max_eig_stat[:, ::-1], axis=1)[:, ::-1]
+    cvt = np.array([c_sjt(neqs - i, det_order) for i in range(neqs)])
+    cvm = np.array([c_sja(neqs - i, det_order) for i in range(neqs)])
+
+    return Bunch(groups=groups, eig=eig, trace_stat=trace_stat,
+                 max_eig_stat=max_eig_stat, trace_stat_crit_vals=cvt,
+                 max_eig_stat_crit_vals=cvm)
+
+
 class JohansenTestResult(object):
     """
     Results class for Johansen's cointegration test
@@ -870,7 +1168,7 @@ class VECM(tsbase.TimeSeriesModel):
         self.first_season = first_season
         self.load_coef_repr = "ec"  # name for loading coef. (alpha) in summary
 
-    def fit(self, method="ml"):
+    def fit(self, method="ml", chunksize=None):
         """
         Estimates the parameters of a VECM.
 
@@ -880,6 +1178,15 @@ class VECM(tsbase.TimeSeriesModel):
         ----------
         method : str {"ml"}, default: "ml"
             Estimation method to use. "ml" stands for Maximum Likelihood.
+        chunksize : int or None, default: None
+            If given, the differenced and lagged data matrices are never
+            constructed in full. Instead their moment matrix is accumulated
+            over chunks of `chunksize` periods, and all estimates are
+            computed from it. The memory needed in addition to the data
+            then does not depend on the number of observations, which allows
+            to estimate models on very long time series. The estimates are
+            the same up to floating point precision. The data matrices are
+            only computed if needed, e.g. for the residuals.
 
         Returns
         -------
@@ -890,18 +1197,31 @@ class VECM(tsbase.TimeSeriesModel):
         .. [1] Lütkepohl, H. 2005. *New Introduction to Multiple Time Series Analysis*. Springer.
         """
         if method == "ml":
-            return self._estimate_vecm_ml()
+            return self._estimate_vecm_ml(chunksize=chunksize)
         else:
             raise ValueError("%s not recognized, must be among %s"
                              % (method, "ml"))
 
-    def _estimate_vecm_ml(self):
-        y_1_T, delta_y_1_T, y_lag1, delta_x = _endog_matrices(
+    def _estimate_vecm_ml(self, chunksize=None):
+        moments = None
+        if chunksize is None:
+            y_1_T, delta_y_1_T, y_lag1, delta_x = _endog_matrices(
+                    self.y, self.exog, self.exog_coint, self.k_ar_diff,
+                    self.deterministic, self.seasons, self.first_season)
+            T = y_1_T.shape[1]
+
+            s00, s01, s10, s11, s11_, _, v = _sij(delta_x, delta_y_1_T,
+                                                  y_lag1)
+        else:
+            moments = _vecm_moments(
                 self.y, self.exog, self.exog_coint, self.k_ar_diff,
-                self.deterministic, self.seasons, self.first_season)
-        T = y_1_T.shape[1]
+                self.deterministic, self.seasons, self.first_season,
+                chunksize=chunksize)
+            m, T, k_lag1 = moments
+            delta_y_1_T = y_lag1 = delta_x = None
 
-        s00, s01, s10, s11, s11_, _, v = _sij(delta_x, delta_y_1_T, y_lag1)
+            s00, s01, s10, s11, s11_, _, v = _sij_moments(m, self.neqs,
+                                                          k_lag1, T)
 
         beta_tilde = (v[:, :self.coint_rank].T.dot(s11_)).T
         beta_tilde = np.real_if_close(beta_tilde)
@@ -909,11 +1229,22 @@ class VECM(tsbase.TimeSeriesModel):
         beta_tilde = np.dot(beta_tilde, inv(beta_tilde[:self.coint_rank]))
         alpha_tilde = s01.dot(beta_tilde).dot(
                 inv(beta_tilde.T.dot(s11).dot(beta_tilde)))
-        gamma_tilde = (delta_y_1_T - alpha_tilde.dot(beta_tilde.T).dot(y_lag1)
-                       ).dot(delta_x.T).dot(inv(np.dot(delta_x, delta_x.T)))
-        temp = (delta_y_1_T - alpha_tilde.dot(beta_tilde.T).dot(y_lag1) -
-                gamma_tilde.dot(delta_x))
-        sigma_u_tilde = temp.dot(temp.T) / T
+        if moments is None:
+            gamma_tilde = (
+                delta_y_1_T - alpha_tilde.dot(beta_tilde.T).dot(y_lag1)
+            ).dot(delta_x.T).dot(inv(np.dot(delta_x, delta_x.T)))
+            temp = (delta_y_1_T - alpha_tilde.dot(beta_tilde.T).dot(y_lag1) -
+                    gamma_tilde.dot(delta_x))
+            sigma_u_tilde = temp.dot(temp.T) / T
+        else:
+            # The same expressions in terms of the moments of
+            # W = (delta_y_1_T', y_lag1', delta_x')'
+            k = self.neqs + k_lag1
+            pi = alpha_tilde.dot(beta_tilde.T)
+            gamma_tilde = (m[:self.neqs, k:] - pi.dot(m[self.neqs:k, k:])
+                           ).dot(inv(m[k:, k:]))
+            coef = np.hstack((np.identity(self.neqs), -pi, -gamma_tilde))
+            sigma_u_tilde = coef.dot(m).dot(coef.T) / T
 
         return VECMResults(self.y, self.exog, self.exog_coint, self.k_ar,
                            self.coint_rank, alpha_tilde, beta_tilde,
@@ -922,7 +1253,7 @@ class VECM(tsbase.TimeSeriesModel):
                            seasons=self.seasons, delta_y_1_T=delta_y_1_T,
                            y_lag1=y_lag1, delta_x=delta_x, model=self,
                            names=self.endog_names, dates=self.data.dates,
-                           first_season=self.first_season)
+                           first_season=self.first_season, moments=moments)
 
     @property
     def _lagged_param_names(self):
@@ -1095,6 +1426,12 @@ class VECMResults(object):
         series.
     dates : array_like
         For example a DatetimeIndex of length nobs_tot.
+    moments : tuple or `None`, default: `None`
+        Moment matrix of the auxiliary arrays, the number of observations
+        and the number of rows of `y_lag1`, as computed by
+        ``VECM.fit(chunksize=...)``. If given, the loglikelihood and the
+        standard errors are computed from it, and the auxiliary arrays are
+        only calculated when needed.
 
     Attributes
     ----------
@@ -1235,7 +1572,8 @@ class VECMResults(object):
     def __init__(self, endog, exog, exog_coint, k_ar,
                  coint_rank, alpha, beta, gamma, sigma_u, deterministic='nc',
                  seasons=0, first_season=0, delta_y_1_T=None, y_lag1=None,
-                 delta_x=None, model=None, names=None, dates=None):
+                 delta_x=None, model=None, names=None, dates=None,
+                 moments=None):
         self.model = model
         self.y_all = endog
         self.exog = exog
@@ -1288,16 +1626,35 @@ class VECMResults(object):
 
         self.sigma_u = sigma_u
 
+        self._moments = moments
         if y_lag1 is not None and delta_x is not None \
                 and delta_y_1_T is not None:
-            self._delta_y_1_T = delta_y_1_T
-            self._y_lag1 = y_lag1
-            self._delta_x = delta_x
+            self._data_matrices = (delta_y_1_T, y_lag1, delta_x)
+        else:
+            self._data_matrices = None
+        if moments is not None:
+            self.nobs = moments[1]
         else:
-            _y_1_T, self._delta_y_1_T, self._y_lag1, self._delta_x = \
-                _endog_matrices(endog, self.exog, k_ar,
-                                deterministic, seasons)
-        self.nobs = self._y_lag1.shape[1]
+            self.nobs = self._y_lag1.shape[1]
+
+    def _get_data_matrices(self):
+        if self._data_matrices is None:
+            self._data_matrices = _endog_matrices(
+                self.y_all, self.exog, self.exog_coint, self.k_ar - 1,
+                self.deterministic, self.seasons, self.first_season)[1:]
+        return self._data_matrices
+
+    @property
+    def _delta_y_1_T(self):
+        return self._get_data_matrices()[0]
+
+    @property
+    def _y_lag1(self):
+        return self._get_data_matrices()[1]
+
+    @property
+    def _delta_x(self):
+        return self._get_data_matrices()[2]
 
     @cache_readonly
     def llf(self):  # Lutkepohl p. 295 (7.2.20)
@@ -1307,8 +1664,12 @@ class VECMResults(object):
         K = self.neqs
         T = self.nobs
         r = self.coint_rank
-        s00, _, _, _, _, lambd, _ = _sij(self._delta_x, self._delta_y_1_T,
-                                         self._y_lag1)
+        if self._moments is not None:
+            s00, _, _, _, _, lambd, _ = _sij_moments(self._moments[0], K,
+                                                     self._moments[2], T)
+        else:
+            s00, _, _, _, _, lambd, _ = _sij(self._delta_x,
+                                             self._delta_y_1_T, self._y_lag1)
         return - K * T * np.log(2*np.pi) / 2  \
             - T * (np.log(np.linalg.det(s00)) + sum(np.log(1-lambd)[:r])) / 2  \
             - K * T / 2
@@ -1336,12 +1697,19 @@ class VECMResults(object):
                                        np.identity(self.neqs * (self.k_ar-1) +
                                                    num_det))
 
-        y_lag1 = self._y_lag1
-        b_y = beta.T.dot(y_lag1)
-        omega11 = b_y.dot(b_y.T)
-        omega12 = b_y.dot(self._delta_x.T)
+        if self._moments is not None:
+            m, _, k_lag1 = self._moments
+            k = self.neqs + k_lag1
+            omega11 = beta.T.dot(m[self.neqs:k, self.neqs:k]).dot(beta)
+            omega12 = beta.T.dot(m[self.neqs:k, k:])
+            omega22 = m[k:, k:]
+        else:
+            y_lag1 = self._y_lag1
+            b_y = beta.T.dot(y_lag1)
+            omega11 = b_y.dot(b_y.T)
+            omega12 = b_y.dot(self._delta_x.T)
+            omega22 = self._delta_x.dot(self._delta_x.T)
         omega21 = omega12.T
-        omega22 = self._delta_x.dot(self._delta_x.T)
         omega = np.bmat([[omega11, omega12],
                          [omega21, omega22]]).A
 
@@ -1397,11 +1765,18 @@ class VECMResults(object):
         .. [1] Lütkepohl, H. 2005. *New Introduction to Multiple Time Series Analysis*. Springer.
         """
         r = self.coint_rank
-        _, r1 = _r_matrices(self._delta_y_1_T, self._y_lag1, self._delta_x)
-        r12 = r1[r:]
-        if r12.size == 0:
+        if self._moments is not None:
+            _, _, s11 = _partial_moments(self._moments[0], self.neqs,
+                                         self._moments[2])
+            r12_r12 = s11[r:, r:]
+        else:
+            _, r1 = _r_matrices(self._delta_y_1_T, self._y_lag1,
+                                self._delta_x)
+            r12 = r1[r:]
+            r12_r12 = r12.dot(r12.T)
+        if r12_r12.size == 0:
             return np.zeros((r, r))
-        mat1 = inv(r12.dot(r12.T))
+        mat1 = inv(r12_r12)
         mat1 = np.kron(mat1.T, np.identity(r))
         det = self.det_coef_coint.shape[0]
         mat2 = np.kron(np.identity(self.neqs-r+det),